@@ -6,7 +6,7 @@ echo ""
 
 # Install minimal required packages
 echo "📦 Installing core packages..."
-pip3 install flask flask-cors python-dotenv requests
+pip3 install fastapi uvicorn flask flask-cors python-dotenv requests
 
 echo "🤖 Installing AI APIs..."
 pip3 install openai anthropic google-generativeai
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Chunking Benchmark
+Compares the legacy 1000-char/200-overlap windows with structure-aware chunks:
+total chunks and tokens, embedding time, and retrieval hit-rate@k on a fixed
+query set derived from documented functions in the repo.
+
+Usage: python3 benchmark_chunking.py [--codebase-path ..] [--queries 200] [--hashing]
+"""
+
+import argparse
+import ast
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from document_indexer import LuxbinDocumentIndexer
+from code_chunker import DEFAULT_MAX_TOKENS, chunk_document, count_tokens
+
+DOC_COMMENT_RE = re.compile(r'((?:^[ \t]*///.*\n)+)[ \t]*(?:pub\s+)?(?:fn|function)\s+(\w+)', re.MULTILINE)
+
+
+def discover_files(root: Path) -> List[Path]:
+    """Same file set the indexer would index (discovery needs no ChromaDB or model state)"""
+    indexer = object.__new__(LuxbinDocumentIndexer)
+    return [path for path in indexer.walk_files(root)
+            if path.suffix.lower() not in ('.pdf', '.docx', '.html')]
+
+
+def build_query_set(texts: Dict[str, str], count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """(query, expected file) pairs from docstrings / doc comments of named functions"""
+    candidates = []
+    for path, text in texts.items():
+        if path.endswith('.py'):
+            try:
+                tree = ast.parse(text)
+            except (SyntaxError, ValueError):
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    doc = ast.get_docstring(node)
+                    if doc and len(doc.split()) >= 4:
+                        candidates.append((doc.strip().split('\n')[0], path))
+        elif path.endswith(('.rs', '.sol')):
+            for match in DOC_COMMENT_RE.finditer(text):
+                doc = ' '.join(line.strip().lstrip('/').strip() for line in match.group(1).splitlines())
+                if len(doc.split()) >= 4:
+                    candidates.append((doc.split('. ')[0], path))
+
+    # Queries that occur in several files (copy-pasted docstrings) have no single right answer
+    occurrences: Dict[str, set] = {}
+    for query, path in candidates:
+        occurrences.setdefault(query, set()).add(path)
+    unique = sorted({(q, p) for q, p in candidates if len(occurrences[q]) == 1})
+
+    random.Random(seed).shuffle(unique)
+    return unique[:count]
+
+
+def make_embedder(use_hashing: bool, model_name: str) -> Callable[[List[str]], np.ndarray]:
+    if not use_hashing:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name)
+        return lambda texts: model.encode(texts, batch_size=256, normalize_embeddings=True)
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent / 'memory'))
+    from embeddings import HashingEmbedder
+    return HashingEmbedder().embed
+
+
+def evaluate(name: str, texts: Dict[str, str], chunker: Callable[[str, str], List[str]],
+             embed: Callable[[List[str]], np.ndarray], queries: List[Tuple[str, str]], k: int):
+    start = time.perf_counter()
+    chunks, owners = [], []
+    for path, text in texts.items():
+        for chunk in chunker(text, path):
+            chunks.append(chunk)
+            owners.append(path)
+    chunk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = np.vstack([embed(chunks[i:i + 4096]) for i in range(0, len(chunks), 4096)])
+    embed_time = time.perf_counter() - start
+
+    query_vectors = embed([query for query, _ in queries])
+    scores = query_vectors @ matrix.T
+    hits = 0
+    for row, (_, expected) in enumerate(queries):
+        top = np.argpartition(-scores[row], k)[:k]
+        hits += any(owners[i] == expected for i in top)
+
+    tokens = sum(count_tokens(chunk) for chunk in chunks)
+    print(f"  {name:<10} | {len(chunks):>8,} chunks | {tokens:>11,} tokens | chunk {chunk_time:6.1f}s | "
+          f"embed {embed_time:7.1f}s | hit@{k} {hits / len(queries):.1%}")
+    return len(chunks), tokens, embed_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LUXBIN chunking benchmark")
+    parser.add_argument('--codebase-path', default=str(Path(__file__).resolve().parent.parent))
+    parser.add_argument('--queries', type=int, default=200, help="Size of the fixed query set")
+    parser.add_argument('--k', type=int, default=5, help="Hit if the source file is in the top k chunks")
+    parser.add_argument('--max-tokens', type=int, default=DEFAULT_MAX_TOKENS, help="Structure-aware chunk budget")
+    parser.add_argument('--model', default="all-MiniLM-L6-v2")
+    parser.add_argument('--hashing', action='store_true',
+                        help="Use the offline hashing embedder instead of sentence-transformers")
+    args = parser.parse_args()
+
+    root = Path(args.codebase_path).resolve()
+    texts = {}
+    for path in discover_files(root):
+        text = path.read_text(encoding='utf-8', errors='ignore')
+        if text.strip():
+            texts[str(path.relative_to(root))] = text
+
+    queries = build_query_set(texts, args.queries)
+    embed = make_embedder(args.hashing, args.model)
+
+    print("✂️  LUXBIN Chunking Benchmark")
+    print(f"  {len(texts):,} files under {root}, {len(queries)} queries")
+    print("=" * 100)
+
+    legacy = evaluate("windows", texts, lambda text, path: LuxbinDocumentIndexer.chunk_text(text),
+                      embed, queries, args.k)
+    structured = evaluate(
+        "structure", texts,
+        lambda text, path: chunk_document(text, LuxbinDocumentIndexer._detect_language(Path(path)),
+                                          args.max_tokens),
+        embed, queries, args.k
+    )
+
+    print("=" * 100)
+    print(f"  chunks {structured[0] / legacy[0] - 1:+.1%} | tokens {structured[1] / legacy[1] - 1:+.1%} | "
+          f"embedding time {structured[2] / legacy[2] - 1:+.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,26 +3,44 @@
 LUXBIN Chatbot API Server
 ==========================
 
-Flask API server that exposes the emotional AI chatbot with photonic encoding
-to the Next.js Vercel frontend.
+ASGI (FastAPI) server that exposes the emotional AI chatbot with photonic
+encoding to the Next.js Vercel frontend.
+
+Every client session gets its own conversation state from a bounded LRU
+session store, so concurrent users never see each other's history. Chat
+requests run up to a concurrency limit (the rest wait briefly, then get a
+503), blocking model, tool and memory calls run on a sized worker pool, and
+/metrics reports latency percentiles per endpoint.
 
 This chatbot is as smart as ChatGPT and Claude, with additional LUXBIN features.
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
 import os
-import sys
 import json
+import time
+import uuid
+import asyncio
 import logging
+import threading
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
 # Import the LUXBIN chatbot
-from rag_chatbot import LuxbinAutonomousAI
+from rag_chatbot import ConversationSession, LuxbinAutonomousAI
 
 # Configure logging
 logging.basicConfig(
@@ -31,215 +49,325 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize Flask app
-app = Flask(__name__)
-
-# Enable CORS for Next.js frontend (localhost:3000)
-CORS(app, resources={
-    r"/api/*": {
-        "origins": ["http://localhost:3000", "http://127.0.0.1:3000"],
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
-    }
-})
-
-# Initialize the AI chatbot
-logger.info("Initializing LUXBIN Autonomous AI chatbot...")
-try:
-    chatbot = LuxbinAutonomousAI()
-    logger.info("✓ Chatbot initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize chatbot: {e}")
-    chatbot = None
-
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'chatbot_ready': chatbot is not None,
-        'timestamp': datetime.now().isoformat()
-    })
-
-@app.route('/api/chat', methods=['POST', 'OPTIONS'])
-def chat():
+# Server limits (override with environment variables)
+MAX_SESSIONS = int(os.getenv('CHATBOT_MAX_SESSIONS', 1000))        # Conversations kept in memory
+MAX_CONCURRENT = int(os.getenv('CHATBOT_MAX_CONCURRENT', 32))      # Chat requests in progress at once
+QUEUE_TIMEOUT = float(os.getenv('CHATBOT_QUEUE_TIMEOUT', 10.0))    # Seconds a request waits for a slot
+WORKERS = int(os.getenv('CHATBOT_WORKERS', 32))                    # Threads for blocking model/tool calls
+
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
+
+UNAVAILABLE = {
+    'error': 'Chatbot not initialized',
+    'reply': 'Sorry, the AI is currently unavailable. Please try again later.'
+}
+INTERNAL_ERROR = {
+    'error': 'Internal server error',
+    'reply': 'Sorry, I encountered an error. Please try again.'
+}
+BUSY = {
+    'error': 'Server busy',
+    'reply': 'Sorry, I am talking to a lot of people right now. Please try again in a moment.'
+}
+
+# ===== SESSIONS =====
+
+class SessionStore:
     """
-    Main chat endpoint for conversational AI with emotional understanding
+    Conversation sessions by (user_id, session_id), least recently used evicted first
 
-    Request body:
-    {
-        "messages": [
-            {"role": "user", "content": "Hello!"},
-            {"role": "assistant", "content": "Hi there!"},
-            ...
-        ],
-        "user_id": "optional_user_id",
-        "session_id": "optional_session_id"
-    }
+    Only touched from the event loop, so it needs no lock. Sessions whose
+    turn lock is held are never evicted, so the store can briefly exceed
+    ``max_sessions`` when more sessions than that are mid-request. An evicted
+    session's next request starts a new one from the transcript the client
+    sends.
+    """
 
-    Response:
-    {
-        "reply": "AI response text",
-        "source": "luxbin-ai",
-        "metadata": {
-            "photonic_encoding": {...},
-            "emotion_detected": "positive",
-            "personality_traits": {...},
-            "function_calls": [],
-            "model_used": "claude-3-sonnet"
+    def __init__(self, max_sessions: int = MAX_SESSIONS, max_history: int = 20):
+        self.max_sessions = max_sessions
+        self.max_history = max_history
+        self._sessions: "OrderedDict[Tuple[str, str], Tuple[ConversationSession, asyncio.Lock]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, user_id: str, session_id: Optional[str] = None) -> Tuple[ConversationSession, asyncio.Lock]:
+        """The session and its turn lock (one request at a time per session)"""
+        if session_id is None:
+            session_id = f"session_{uuid.uuid4().hex}"
+        key = (user_id, session_id)
+        entry = self._sessions.get(key)
+        if entry is not None:
+            self._sessions.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = (ConversationSession(session_id, user_id, self.max_history), asyncio.Lock())
+        self._sessions[key] = entry
+        excess = len(self._sessions) - self.max_sessions
+        if excess > 0:
+            idle = []
+            for other, (_, lock) in self._sessions.items():  # Least recently used first
+                if other != key and not lock.locked():
+                    idle.append(other)
+                    if len(idle) == excess:
+                        break
+            for other in idle:
+                del self._sessions[other]
+            self.evictions += len(idle)
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'active': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
         }
-    }
+
+# ===== ADMISSION =====
+
+class ServerBusy(Exception):
+    """No request slot became free within the queue timeout"""
+
+
+class ConcurrencyLimiter:
     """
-    # Handle preflight OPTIONS request
-    if request.method == 'OPTIONS':
-        return '', 204
+    At most ``max_concurrent`` requests in progress; others wait up to ``queue_timeout`` seconds
 
-    try:
-        if chatbot is None:
-            return jsonify({
-                'error': 'Chatbot not initialized',
-                'reply': 'Sorry, the AI is currently unavailable. Please try again later.'
-            }), 503
-
-        # Parse request
-        data = request.get_json()
-        if not data or 'messages' not in data:
-            return jsonify({'error': 'Messages array is required'}), 400
-
-        messages = data.get('messages', [])
-        user_id = data.get('user_id', 'web_user')
-        session_id = data.get('session_id', None)
-
-        # Get the latest user message
-        user_message = None
-        for msg in reversed(messages):
-            if msg.get('role') == 'user':
-                user_message = msg.get('content', '')
-                break
-
-        if not user_message:
-            return jsonify({'error': 'No user message found'}), 400
-
-        logger.info(f"Received message from {user_id}: {user_message[:50]}...")
-
-        # Update chatbot conversation history with all messages
-        for msg in messages:
-            if msg.get('role') in ['user', 'assistant']:
-                chatbot.add_to_history(msg['role'], msg['content'])
-
-        # Generate AI response with emotional understanding and photonic encoding
-        response_text = chatbot.generate_response(
-            user_message,
-            user_id=user_id,
-            session_id=session_id
-        )
-
-        # Detect emotion from user message (simple sentiment analysis)
-        emotion = detect_emotion(user_message)
-
-        # Extract metadata
-        metadata = {
-            'emotion_detected': emotion,
-            'personality_traits': chatbot.personality.get('traits', {}),
-            'user_interests': chatbot.user_profile,
-            'conversation_length': len(chatbot.conversation_history),
-            'photonic_enabled': True,
-            'source': 'luxbin-autonomous-ai'
+    The wait includes the session's turn lock when one is passed, so a
+    request queued behind a long turn of its own session gets a 503 too.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, queue_timeout: float = QUEUE_TIMEOUT):
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak = 0
+        self.rejected = 0
+
+    async def acquire(self, lock: Optional[asyncio.Lock] = None) -> float:
+        """Wait for ``lock`` (if given), then a slot; returns the seconds spent waiting
+
+        If either isn't acquired within the queue timeout, raises ServerBusy with neither held.
+        """
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            if lock is not None:
+                await asyncio.wait_for(lock.acquire(), self.queue_timeout)
+            try:
+                remaining = self.queue_timeout - (time.perf_counter() - start)
+                await asyncio.wait_for(self._semaphore.acquire(), max(remaining, 0.0))
+            except BaseException:
+                if lock is not None:
+                    lock.release()
+                raise
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServerBusy() from None
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        return time.perf_counter() - start
+
+    def release(self, lock: Optional[asyncio.Lock] = None):
+        self.in_flight -= 1
+        self._semaphore.release()
+        if lock is not None:
+            lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_concurrent': self.max_concurrent,
+            'queue_timeout_seconds': self.queue_timeout,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'peak_in_flight': self.peak,
+            'rejected': self.rejected
         }
 
-        # Check if response includes photonic encoding
-        if '⚡' in response_text or 'Photonic' in response_text:
-            metadata['has_photonic_visualization'] = True
+# ===== METRICS =====
+
+class LatencyHistogram:
+    """Latency counts in fixed millisecond buckets"""
+
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000,
+                  float('inf'))
+
+    def __init__(self):
+        self.counts = [0] * len(self.BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000.0
+        self.counts[bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th percentile (ms)"""
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        seen = 0
+        for edge, count in zip(self.BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(edge, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max
+        }
 
-        logger.info(f"Generated response with emotion: {emotion}")
 
-        return jsonify({
-            'reply': response_text,
-            'source': 'luxbin-ai',
-            'metadata': metadata
-        })
+class QueuedCalls:
+    """Blocking calls handed to the worker pool that no worker has started yet"""
 
-    except Exception as e:
-        logger.error(f"Chat error: {e}", exc_info=True)
-        return jsonify({
-            'error': 'Internal server error',
-            'reply': 'Sorry, I encountered an error. Please try again.'
-        }), 500
+    def __init__(self):
+        self._lock = threading.Lock()  # Started on worker threads, submitted on the event loop
+        self.queued = 0
+        self.peak = 0
 
-@app.route('/api/stats', methods=['GET'])
-def get_stats():
-    """Get chatbot statistics"""
-    try:
-        if chatbot is None:
-            return jsonify({'error': 'Chatbot not initialized'}), 503
+    def track(self, func):
+        """Count ``func`` as queued; returns (wrapped func, dequeue) where dequeue is idempotent"""
+        pending = [True]
+        with self._lock:
+            self.queued += 1
+            self.peak = max(self.peak, self.queued)
 
-        stats = chatbot.get_stats()
-        return jsonify(stats)
+        def dequeue():
+            with self._lock:
+                if pending[0]:
+                    pending[0] = False
+                    self.queued -= 1
 
-    except Exception as e:
-        logger.error(f"Stats error: {e}")
-        return jsonify({'error': str(e)}), 500
+        def call():
+            dequeue()
+            return func()
 
-@app.route('/api/photonic/encode', methods=['POST'])
-def encode_photonic():
-    """
-    Encode code or text into photonic light language
+        return call, dequeue
 
-    Request body:
-    {
-        "code": "function example() { return 42; }",
-        "language": "javascript"  // optional
-    }
-    """
-    try:
-        if chatbot is None:
-            return jsonify({'error': 'Chatbot not initialized'}), 503
+    def get_stats(self) -> Dict[str, int]:
+        return {'queued_calls': self.queued, 'peak_queued_calls': self.peak}
 
-        data = request.get_json()
-        code = data.get('code', '')
-        language = data.get('language', 'auto')
 
-        if not code:
-            return jsonify({'error': 'Code parameter is required'}), 400
+class ServerMetrics:
+    """Request latencies and status codes per endpoint, plus named timings (queue wait, first token)"""
 
-        # Encode to photonic
-        encoding = chatbot.photonic_encoder.encode_code_to_photonic(code, language)
+    def __init__(self):
+        self.started = time.time()
+        self.requests: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.timings: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
 
-        return jsonify({
-            'success': True,
-            'encoding': encoding
-        })
+    def record_request(self, endpoint: str, status: int, seconds: float):
+        self.requests[endpoint].record(seconds)
+        self.statuses[endpoint][str(status)] += 1
 
-    except Exception as e:
-        logger.error(f"Photonic encoding error: {e}")
-        return jsonify({'error': str(e)}), 500
+    def record(self, name: str, seconds: float):
+        self.timings[name].record(seconds)
 
-@app.route('/api/memory/search', methods=['POST'])
-def search_memory():
-    """Search conversation memory"""
-    try:
-        if chatbot is None:
-            return jsonify({'error': 'Chatbot not initialized'}), 503
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'requests': {endpoint: dict(histogram.summary(), status=dict(self.statuses[endpoint]))
+                         for endpoint, histogram in self.requests.items()},
+            'timings': {name: histogram.summary() for name, histogram in self.timings.items()}
+        }
 
-        data = request.get_json()
-        user_id = data.get('user_id', 'web_user')
-        query = data.get('query', '')
-        limit = data.get('limit', 5)
 
-        if not query:
-            return jsonify({'error': 'Query parameter is required'}), 400
+class ReleasingStreamingResponse(StreamingResponse):
+    """Streaming response that calls ``on_close`` once it has finished, failed or been abandoned"""
 
-        # Search conversations
-        results = chatbot.memory_manager.search_conversations(user_id, query, limit)
+    def __init__(self, content, on_close, **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
 
-        return jsonify({
-            'success': True,
-            'results': results
-        })
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
+
+# ===== REQUEST HELPERS =====
+
+async def parse_chat_request(request: Request):
+    """
+    Parse a chat request body
+
+    Returns ((user_message, user_id, session_id, messages), None) or (None, error response)
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get('messages'), list):
+        return None, JSONResponse({'error': 'Messages array is required'}, status_code=400)
+
+    messages = [msg for msg in data['messages'] if isinstance(msg, dict)]
+    user_id = str(data.get('user_id') or 'web_user')
+    session_id = data.get('session_id')
+
+    # Get the latest user message
+    user_message = None
+    for msg in reversed(messages):
+        if msg.get('role') == 'user':
+            user_message = msg.get('content', '')
+            break
+
+    if not user_message:
+        return None, JSONResponse({'error': 'No user message found'}, status_code=400)
+
+    logger.info(f"Received message from {user_id}: {user_message[:50]}...")
+    return (user_message, user_id, None if session_id is None else str(session_id), messages), None
+
+def build_response_metadata(chatbot: LuxbinAutonomousAI, session: ConversationSession,
+                            user_message: str, response_text: str) -> dict:
+    """Metadata returned alongside a chat reply"""
+    # Detect emotion from user message (simple sentiment analysis)
+    emotion = detect_emotion(user_message)
+
+    # Extract metadata
+    metadata = {
+        'emotion_detected': emotion,
+        'personality_traits': chatbot.personality.get('traits', {}),
+        'user_interests': dict(session.user_profile),
+        'conversation_length': len(session.history),
+        'session_id': session.session_id,
+        'photonic_enabled': True,
+        'source': 'luxbin-autonomous-ai'
+    }
+
+    # Check if response includes photonic encoding
+    if '⚡' in response_text or 'Photonic' in response_text:
+        metadata['has_photonic_visualization'] = True
 
-    except Exception as e:
-        logger.error(f"Memory search error: {e}")
-        return jsonify({'error': str(e)}), 500
+    logger.info(f"Generated response with emotion: {emotion}")
+    return metadata
+
+def sse_event(data: dict, event: str = None) -> str:
+    """Format one Server-Sent Events message"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
 
 def detect_emotion(text: str) -> str:
     """
@@ -267,16 +395,306 @@ def detect_emotion(text: str) -> str:
     # Default: neutral
     return 'neutral'
 
+# ===== APP =====
+
+def create_app(chatbot: Optional[LuxbinAutonomousAI] = None,
+               max_sessions: int = MAX_SESSIONS,
+               max_concurrent: int = MAX_CONCURRENT,
+               queue_timeout: float = QUEUE_TIMEOUT,
+               workers: int = WORKERS) -> FastAPI:
+    """
+    Build the API app
+
+    Without a ``chatbot`` one is created at startup. The worker pool also
+    becomes the event loop's default executor, so the chatbot's own
+    asyncio.to_thread calls (streaming context lookups, token streams) share
+    its size limit.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chatbot-worker")
+    sessions = SessionStore(max_sessions)
+    limiter = ConcurrencyLimiter(max_concurrent, queue_timeout)
+    metrics = ServerMetrics()
+    queued_calls = QueuedCalls()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        asyncio.get_running_loop().set_default_executor(pool)
+        if app.state.chatbot is None:
+            logger.info("Initializing LUXBIN Autonomous AI chatbot...")
+            try:
+                app.state.chatbot = await run_blocking(LuxbinAutonomousAI)
+                logger.info("✓ Chatbot initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize chatbot: {e}")
+        yield
+        if app.state.chatbot is not None:
+            await run_blocking(app.state.chatbot.flush_persistence, 10.0)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    app = FastAPI(title="LUXBIN Chatbot API", lifespan=lifespan)
+    app.state.chatbot = chatbot
+    app.state.sessions = sessions
+    app.state.limiter = limiter
+    app.state.metrics = metrics
+
+    # Enable CORS for Next.js frontend (localhost:3000)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_methods=["GET", "POST", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization"]
+    )
+
+    async def run_blocking(func, *args, **kwargs):
+        """Run a blocking call (model, tools, memory) on the worker pool"""
+        call, dequeue = queued_calls.track(partial(func, *args, **kwargs))
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, call)
+        finally:
+            dequeue()  # Cancelled before a worker started it
+
+    @app.middleware("http")
+    async def record_latency(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        path = request.url.path
+        endpoint = path if path in known_paths else 'other'
+        metrics.record_request(endpoint, response.status_code, time.perf_counter() - start)
+        return response
+
+    @app.get('/health')
+    async def health_check():
+        """Health check endpoint"""
+        return {
+            'status': 'healthy',
+            'chatbot_ready': app.state.chatbot is not None,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    @app.get('/metrics')
+    async def get_metrics():
+        """Latency percentiles per endpoint, queue waits, concurrency, sessions and worker pool"""
+        return dict(metrics.summary(), concurrency=limiter.get_stats(), sessions=sessions.get_stats(),
+                    workers=dict(queued_calls.get_stats(), max_workers=workers))
+
+    @app.post('/api/chat')
+    async def chat(request: Request):
+        """
+        Main chat endpoint for conversational AI with emotional understanding
+
+        Request body:
+        {
+            "messages": [
+                {"role": "user", "content": "Hello!"},
+                {"role": "assistant", "content": "Hi there!"},
+                ...
+            ],
+            "user_id": "optional_user_id",
+            "session_id": "optional_session_id"
+        }
+
+        ``messages`` is the conversation so far; it replaces the session's
+        history. Without a session_id a new session is started and its ID
+        returned in ``metadata.session_id``.
+
+        Response:
+        {
+            "reply": "AI response text",
+            "source": "luxbin-ai",
+            "metadata": {
+                "emotion_detected": "positive",
+                "personality_traits": {...},
+                "session_id": "...",
+                ...
+            }
+        }
+        """
+        chatbot = app.state.chatbot
+        if chatbot is None:
+            return JSONResponse(UNAVAILABLE, status_code=503)
+
+        parsed, error = await parse_chat_request(request)
+        if error:
+            return error
+        user_message, user_id, session_id, messages = parsed
+
+        try:
+            session, lock = sessions.get(user_id, session_id)
+            # Turns of one session run in order; waiting for the turn counts as queueing
+            metrics.record('queue_wait', await limiter.acquire(lock))
+            try:
+                session.replace(messages)
+                # Generate AI response with emotional understanding and photonic encoding
+                response_text = await run_blocking(chatbot.generate_response, user_message, user_id=user_id,
+                                                   session_id=session.session_id, session=session)
+            finally:
+                limiter.release(lock)
+            metadata = build_response_metadata(chatbot, session, user_message, response_text)
+        except ServerBusy:
+            return JSONResponse(BUSY, status_code=503, headers={'Retry-After': '1'})
+        except Exception as e:
+            logger.error(f"Chat error: {e}", exc_info=True)
+            return JSONResponse(INTERNAL_ERROR, status_code=500)
+
+        return {
+            'reply': response_text,
+            'source': 'luxbin-ai',
+            'metadata': metadata
+        }
+
+    @app.post('/api/chat/stream')
+    async def chat_stream(request: Request):
+        """
+        Streaming chat endpoint (Server-Sent Events)
+
+        Same request body as /api/chat. The response is a text/event-stream:
+
+            data: {"token": "Hel"}
+            data: {"token": "lo!"}
+            ...
+            event: done
+            data: {"reply": "full text", "source": "luxbin-ai", "metadata": {...}}
+
+        Errors after the stream has started arrive as an "error" event.
+        """
+        chatbot = app.state.chatbot
+        if chatbot is None:
+            return JSONResponse(UNAVAILABLE, status_code=503)
+
+        parsed, error = await parse_chat_request(request)
+        if error:
+            return error
+        user_message, user_id, session_id, messages = parsed
+
+        # The session lock and request slot are held until the stream ends
+        session, lock = sessions.get(user_id, session_id)
+        try:
+            metrics.record('queue_wait', await limiter.acquire(lock))
+        except ServerBusy:
+            return JSONResponse(BUSY, status_code=503, headers={'Retry-After': '1'})
+        session.replace(messages)
+
+        def close():
+            limiter.release(lock)
+
+        async def generate():
+            start = time.perf_counter()
+            first_token = True
+            try:
+                async with aclosing(chatbot.generate_response_stream(
+                        user_message, user_id=user_id, session_id=session.session_id, session=session)) as events:
+                    async for event in events:
+                        if event['type'] == 'token':
+                            if first_token:
+                                metrics.record('stream_first_token', time.perf_counter() - start)
+                                first_token = False
+                            yield sse_event({'token': event['text']})
+                        elif event['type'] == 'done':
+                            metadata = build_response_metadata(chatbot, session, user_message, event['response'])
+                            metadata['model_used'] = event['model_used']
+                            metadata['function_calls'] = event['function_calls']
+                            yield sse_event({
+                                'reply': event['response'],
+                                'source': 'luxbin-ai',
+                                'metadata': metadata
+                            }, event='done')
+                metrics.record('stream_complete', time.perf_counter() - start)
+            except Exception as e:
+                logger.error(f"Chat stream error: {e}", exc_info=True)
+                yield sse_event(INTERNAL_ERROR, event='error')
+
+        return ReleasingStreamingResponse(generate(), close, media_type='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering so tokens arrive immediately
+        })
+
+    @app.get('/api/stats')
+    async def get_stats():
+        """Get chatbot statistics"""
+        chatbot = app.state.chatbot
+        if chatbot is None:
+            return JSONResponse({'error': 'Chatbot not initialized'}, status_code=503)
+        try:
+            return await run_blocking(chatbot.get_stats)
+        except Exception as e:
+            logger.error(f"Stats error: {e}")
+            return JSONResponse({'error': str(e)}, status_code=500)
+
+    @app.post('/api/photonic/encode')
+    async def encode_photonic(request: Request):
+        """
+        Encode code or text into photonic light language
+
+        Request body:
+        {
+            "code": "function example() { return 42; }",
+            "language": "javascript"  // optional
+        }
+        """
+        chatbot = app.state.chatbot
+        if chatbot is None:
+            return JSONResponse({'error': 'Chatbot not initialized'}, status_code=503)
+        try:
+            data = await request.json()
+            code = data.get('code', '')
+            language = data.get('language', 'auto')
+
+            if not code:
+                return JSONResponse({'error': 'Code parameter is required'}, status_code=400)
+
+            # Encode to photonic
+            encoding = await run_blocking(chatbot.photonic_encoder.encode_code_to_photonic, code, language)
+            return {
+                'success': True,
+                'encoding': encoding
+            }
+        except Exception as e:
+            logger.error(f"Photonic encoding error: {e}")
+            return JSONResponse({'error': str(e)}, status_code=500)
+
+    @app.post('/api/memory/search')
+    async def search_memory(request: Request):
+        """Search conversation memory"""
+        chatbot = app.state.chatbot
+        if chatbot is None:
+            return JSONResponse({'error': 'Chatbot not initialized'}, status_code=503)
+        try:
+            data = await request.json()
+            user_id = data.get('user_id', 'web_user')
+            query = data.get('query', '')
+            limit = data.get('limit', 5)
+
+            if not query:
+                return JSONResponse({'error': 'Query parameter is required'}, status_code=400)
+
+            # Search conversations
+            results = await run_blocking(chatbot.memory_manager.search_conversations, user_id, query, limit)
+            return {
+                'success': True,
+                'results': results
+            }
+        except Exception as e:
+            logger.error(f"Memory search error: {e}")
+            return JSONResponse({'error': str(e)}, status_code=500)
+
+    known_paths = {route.path for route in app.routes}
+    return app
+
+
+app = create_app()
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('DEBUG', 'False').lower() == 'true'
 
     logger.info(f"Starting LUXBIN Chatbot API Server on port {port}...")
     logger.info("Emotional AI with photonic encoding enabled")
-    logger.info("CORS enabled for http://localhost:3000")
+    logger.info(f"CORS enabled for {', '.join(CORS_ORIGINS)}")
 
-    app.run(
+    # One process: sessions live in this process's memory
+    uvicorn.run(
+        app,
         host='0.0.0.0',
         port=port,
-        debug=debug
+        log_level='debug' if debug else 'info'
     )
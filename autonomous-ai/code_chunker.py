@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Structure-Aware Chunker
+Splits code and docs on syntax boundaries for the RAG indexer:
+Python by AST, Rust/Solidity/TypeScript/JavaScript by brace blocks (fn, impl,
+contract, class...), Markdown by headings, everything else by paragraphs.
+Adjacent small units are packed together up to a token budget per chunk.
+"""
+
+import ast
+import re
+from typing import Callable, List, Optional, Tuple
+
+# Bump when chunk boundaries change so indexes built with older chunks are rebuilt
+CHUNKER_VERSION = 1
+
+DEFAULT_MAX_TOKENS = 200
+
+# Rough token count: words and individual punctuation marks
+TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+BRACE_LANGUAGES = {'rust', 'solidity', 'typescript', 'javascript'}
+
+# (start line, end line exclusive, line indices of enclosing headers)
+Span = Tuple[int, int, Tuple[int, ...]]
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count used for chunk budgets"""
+    return len(TOKEN_RE.findall(text))
+
+
+class _Document:
+    """Lines of a document with prefix sums of per-line token counts"""
+
+    def __init__(self, text: str):
+        self.lines = text.split('\n')
+        self.prefix = [0]
+        for line in self.lines:
+            self.prefix.append(self.prefix[-1] + count_tokens(line))
+
+    def tokens(self, lo: int, hi: int) -> int:
+        return self.prefix[hi] - self.prefix[lo]
+
+    def is_blank(self, index: int) -> bool:
+        return not self.lines[index].strip()
+
+
+def _attach_leading_lines(doc: _Document, boundary: int, lo: int,
+                          is_leading: Callable[[str], bool]) -> int:
+    """Move a boundary up over comment/attribute lines so they stay with the unit below"""
+    while boundary - 1 >= lo and is_leading(doc.lines[boundary - 1].strip()):
+        boundary -= 1
+    return boundary
+
+
+def _paragraph_boundaries(doc: _Document, lo: int, hi: int) -> List[int]:
+    """Start of every paragraph (first non-blank line after a blank line)"""
+    return [i for i in range(lo + 1, hi) if not doc.is_blank(i) and doc.is_blank(i - 1)]
+
+
+# ===== PYTHON =====
+
+def _is_python_leading(line: str) -> bool:
+    return line.startswith('#') or line.startswith('@')
+
+
+class _PythonStructure:
+    """Statement spans from the AST, indexed by their first line"""
+
+    def __init__(self, doc: _Document, text: str):
+        self.doc = doc
+        self.by_start = {}  # first line -> (end line, child statement spans) of the outermost statement
+        self.module_spans = self._statement_spans(ast.parse(text))
+
+    def _statement_spans(self, node) -> List[Tuple[int, int]]:
+        spans = []
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, ast.stmt):
+                continue
+            start = min([child.lineno] + [d.lineno for d in getattr(child, 'decorator_list', [])]) - 1
+            entry = [child.end_lineno, []]
+            self.by_start.setdefault(start, entry)
+            entry[1] = self._statement_spans(child)
+            spans.append((start, child.end_lineno))
+        return spans
+
+    def _outer_statements(self, lo: int, hi: int) -> List[Tuple[int, int, list]]:
+        statements = []
+        line = lo
+        while line < hi:
+            entry = self.by_start.get(line)
+            if entry is None:
+                line += 1
+                continue
+            statements.append((line, entry[0], entry[1]))
+            line = max(entry[0], line + 1)
+        return statements
+
+    def boundaries(self, lo: int, hi: int) -> List[int]:
+        if lo == 0 and hi == len(self.doc.lines):
+            starts = [start for start, _ in self.module_spans]
+        else:
+            statements = self._outer_statements(lo, hi)
+            if len(statements) == 1:
+                # A single statement: split its body (methods of a class, blocks of a function)
+                starts = [start for start, _ in statements[0][2]]
+            else:
+                starts = [start for start, _, _ in statements]
+        return sorted(set(_attach_leading_lines(self.doc, start, lo, _is_python_leading)
+                          for start in starts if lo < start < hi))
+
+    def header(self, lo: int, hi: int) -> Optional[int]:
+        statements = self._outer_statements(lo, min(lo + 50, hi))
+        if not statements:
+            return None
+        start, end, _ = statements[0]
+        for index in range(start, end):
+            line = self.doc.lines[index].strip()
+            if not line.startswith('@'):
+                return index if re.match(r'(async\s+def|def|class)\s', line) else None
+        return None
+
+
+# ===== BRACE LANGUAGES =====
+
+_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`')
+
+
+def _is_brace_leading(line: str) -> bool:
+    return line.startswith(('//', '/*', '*', '#[', '@'))
+
+
+class _BraceStructure:
+    """Brace depth at the start of each line, ignoring strings and comments"""
+
+    def __init__(self, doc: _Document):
+        self.doc = doc
+        self.depth = []
+        depth = 0
+        in_block_comment = False
+
+        for line in doc.lines:
+            self.depth.append(depth)
+            code = line
+            if in_block_comment:
+                end = code.find('*/')
+                if end < 0:
+                    continue
+                code = code[end + 2:]
+                in_block_comment = False
+
+            code = _STRING_RE.sub('""', code)
+            code = re.sub(r'/\*.*?\*/', '', code)
+            start = code.find('/*')
+            if start >= 0:
+                code = code[:start]
+                in_block_comment = True
+            code = code.split('//', 1)[0]
+
+            depth = max(0, depth + code.count('{') - code.count('}'))
+
+    def boundaries(self, lo: int, hi: int) -> List[int]:
+        # Items (fn, impl, contract, function, class...) start at the shallowest depth in the
+        # range; closing braces and comments never start one. If the range holds a single
+        # item, descend a level into its body.
+        inner = [i for i in range(lo, hi)
+                 if not self.doc.is_blank(i) and not _is_brace_leading(self.doc.lines[i].strip())
+                 and not self.doc.lines[i].strip().startswith('}')]
+
+        for level in sorted(set(self.depth[i] for i in inner)):
+            starts = [i for i in inner if self.depth[i] == level]
+            boundaries = sorted(set(_attach_leading_lines(self.doc, start, lo, _is_brace_leading)
+                                    for start in starts))
+            boundaries = [b for b in boundaries if lo < b < hi]
+            if boundaries:
+                return boundaries
+        return []
+
+    def header(self, lo: int, hi: int) -> Optional[int]:
+        for index in range(lo, min(lo + 20, hi)):
+            line = self.doc.lines[index].strip()
+            if line and not _is_brace_leading(line):
+                return index if line.endswith('{') else None
+        return None
+
+
+# ===== MARKDOWN =====
+
+class _MarkdownStructure:
+    """Heading levels outside fenced code blocks"""
+
+    def __init__(self, doc: _Document):
+        self.doc = doc
+        self.levels = {}
+        in_fence = False
+        for i, line in enumerate(doc.lines):
+            if line.lstrip().startswith('```'):
+                in_fence = not in_fence
+                continue
+            match = re.match(r'(#{1,6})\s', line)
+            if match and not in_fence:
+                self.levels[i] = len(match.group(1))
+
+    def boundaries(self, lo: int, hi: int) -> List[int]:
+        headings = [i for i in range(lo + 1, hi) if i in self.levels]
+        if not headings:
+            return []
+        top = min(self.levels[i] for i in headings)
+        return [i for i in headings if self.levels[i] == top]
+
+    def header(self, lo: int, hi: int) -> Optional[int]:
+        return lo if lo in self.levels else None
+
+
+# ===== CHUNKING ENGINE =====
+
+class StructureChunker:
+    """Recursively split a document on structural boundaries within a token budget"""
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS):
+        self.max_tokens = max_tokens
+
+    def chunk(self, text: str, language: str) -> List[str]:
+        if not text.strip():
+            return []
+
+        doc = _Document(text)
+        structure = self._structure_for(doc, text, language)
+
+        spans = self._split(doc, structure, 0, len(doc.lines), ())
+        chunks = []
+        for lo, hi, context in self._pack(doc, spans):
+            body = '\n'.join(doc.lines[lo:hi]).strip('\n')
+            if not body.strip():
+                continue
+            # Prefix enclosing headers ("class Foo:", "contract Bar {", "## Setup") for retrieval context
+            header_lines = [doc.lines[index].rstrip() for index in context]
+            chunk = '\n'.join(header_lines + [body])
+            chunks.extend(self._split_long_text(chunk))
+        return chunks
+
+    def _structure_for(self, doc: _Document, text: str, language: str):
+        if language == 'python':
+            try:
+                return _PythonStructure(doc, text)
+            except (SyntaxError, ValueError):
+                return None
+        if language in BRACE_LANGUAGES:
+            return _BraceStructure(doc)
+        if language == 'markdown':
+            return _MarkdownStructure(doc)
+        return None
+
+    def _split(self, doc: _Document, structure, lo: int, hi: int,
+               context: Tuple[int, ...]) -> List[Span]:
+        if doc.tokens(lo, hi) <= self.max_tokens or hi - lo <= 1:
+            return [(lo, hi, context)]
+
+        boundaries = structure.boundaries(lo, hi) if structure else []
+        if not boundaries:
+            boundaries = _paragraph_boundaries(doc, lo, hi)
+        if not boundaries:
+            # No structure left: one unit per line, packed back up to the budget
+            return [(i, i + 1, context) for i in range(lo, hi)]
+
+        # Units nested below this range carry its header (e.g. "class Foo:") as context;
+        # the whole document has no header of its own
+        header = None
+        if structure and (lo, hi) != (0, len(doc.lines)):
+            header = structure.header(lo, hi)
+        child_context = context + (header,) if header is not None else context
+
+        edges = [lo] + boundaries + [hi]
+        spans = []
+        for start, end in zip(edges, edges[1:]):
+            spans.extend(self._split(doc, structure, start, end,
+                                     context if start == lo else child_context))
+        return spans
+
+    def _pack(self, doc: _Document, spans: List[Span]) -> List[Span]:
+        """Greedily merge adjacent spans that share a context while under budget
+
+        A span that contains a header also absorbs the units nested under it
+        (e.g. a heading line followed by its first subsection).
+        """
+        packed: List[Span] = []
+        for lo, hi, context in spans:
+            if packed:
+                prev_lo, prev_hi, prev_context = packed[-1]
+                same_context = prev_context == context or (
+                    context[:-1] == prev_context and prev_lo <= context[-1] < prev_hi)
+                if same_context and prev_hi == lo and doc.tokens(prev_lo, hi) <= self.max_tokens:
+                    packed[-1] = (prev_lo, hi, prev_context)
+                    continue
+            packed.append((lo, hi, context))
+        return packed
+
+    def _split_long_text(self, chunk: str) -> List[str]:
+        """Hard-split a chunk that is still over budget (e.g. one minified line)"""
+        if count_tokens(chunk) <= self.max_tokens * 2:
+            return [chunk]
+        positions = [m.start() for m in TOKEN_RE.finditer(chunk)]
+        cuts = positions[::self.max_tokens][1:]
+        pieces, start = [], 0
+        for cut in cuts:
+            pieces.append(chunk[start:cut])
+            start = cut
+        pieces.append(chunk[start:])
+        return [piece for piece in pieces if piece.strip()]
+
+
+def chunk_document(text: str, language: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> List[str]:
+    """Split a document into structure-aligned chunks of at most ~``max_tokens`` tokens"""
+    return StructureChunker(max_tokens).chunk(text, language)
@@ -6,10 +6,15 @@ Indexes all LUXBIN files (Rust, Python, Solidity, TypeScript, docs) for RAG syst
 
 import os
 import sys
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import chromadb
 from sentence_transformers import SentenceTransformer
+from embedding_cache import EmbeddingCache
+from code_chunker import CHUNKER_VERSION, chunk_document
 import PyPDF2
 import docx
 from bs4 import BeautifulSoup
@@ -21,11 +26,41 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+COLLECTION_NAME = "luxbin_codebase"
+MANIFEST_FILE = "index_manifest.json"
+MANIFEST_VERSION = 2
+
+
+def _extract_and_chunk(path_str: str) -> Tuple[str, Optional[str], List[str], Optional[str]]:
+    """Process-pool worker: hash, extract and chunk one file.
+
+    Returns (path, sha256 of the raw bytes, chunks, error). On failure the
+    digest is None and error holds the message, so one unreadable file
+    doesn't abort the whole pool.map.
+    """
+    file_path = Path(path_str)
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if file_path.suffix.lower() in ('.pdf', '.docx', '.html', '.htm'):
+            text = LuxbinDocumentIndexer.extract_text_from_file(file_path)
+        else:
+            text = data.decode('utf-8', errors='ignore')
+
+        chunks = LuxbinDocumentIndexer.chunk_file_text(text, file_path) if text.strip() else []
+    except Exception as e:
+        return path_str, None, [], f"{type(e).__name__}: {e}"
+    return path_str, digest, chunks, None
+
+
 class LuxbinDocumentIndexer:
     def __init__(self, chroma_path="./luxbin_chroma_db", model_name="all-MiniLM-L6-v2"):
         """Initialize the document indexer with ChromaDB and sentence transformer."""
         self.chroma_path = chroma_path
         self.model_name = model_name
+        self.manifest_path = Path(chroma_path) / MANIFEST_FILE
 
         # Initialize ChromaDB client
         self.chroma_client = chromadb.PersistentClient(path=chroma_path)
@@ -33,14 +68,22 @@ class LuxbinDocumentIndexer:
         # Initialize sentence transformer for embeddings
         self.embedding_model = SentenceTransformer(model_name)
 
+        # Persistent embedding cache shared by indexing and search
+        self.embedding_cache = EmbeddingCache(self.embedding_model, model_name,
+                                              Path(chroma_path) / "embedding_cache")
+
         # Create or get collection
-        self.collection = self.chroma_client.get_or_create_collection(
-            name="luxbin_codebase",
-            metadata={"description": "LUXBIN blockchain and AI codebase"}
-        )
+        self.collection = self._get_collection()
 
         logger.info(f"Initialized indexer with ChromaDB at {chroma_path}")
 
+    def _get_collection(self):
+        """Create or get the codebase collection."""
+        return self.chroma_client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata={"description": "LUXBIN blockchain and AI codebase"}
+        )
+
     def get_file_extensions(self) -> List[str]:
         """Return list of file extensions to index."""
         return [
@@ -65,10 +108,9 @@ class LuxbinDocumentIndexer:
             '.yml',     # YAML configs
         ]
 
-    def should_index_file(self, file_path: Path) -> bool:
-        """Check if file should be indexed."""
-        # Skip common exclude patterns
-        exclude_patterns = [
+    def get_exclude_patterns(self) -> List[str]:
+        """Return path substrings that exclude a file or directory from indexing."""
+        return [
             '__pycache__',
             'node_modules',
             '.git',
@@ -81,10 +123,12 @@ class LuxbinDocumentIndexer:
             'luxbin_chroma_db',  # Don't index our own DB
         ]
 
+    def should_index_file(self, file_path: Path) -> bool:
+        """Check if file should be indexed."""
         file_str = str(file_path)
 
         # Check if file is in excluded directory
-        for pattern in exclude_patterns:
+        for pattern in self.get_exclude_patterns():
             if pattern in file_str:
                 return False
 
@@ -94,15 +138,37 @@ class LuxbinDocumentIndexer:
 
         return False
 
-    def extract_text_from_file(self, file_path: Path) -> str:
+    def walk_files(self, base_path: Path) -> List[Path]:
+        """Collect indexable files in a single directory walk, pruning excluded directories."""
+        exclude_patterns = self.get_exclude_patterns()
+        extensions = set(self.get_file_extensions())
+        files = []
+
+        for root, dirnames, filenames in os.walk(base_path):
+            # Prune in place so os.walk never descends into excluded trees
+            dirnames[:] = [
+                d for d in dirnames
+                if not any(pattern in os.path.join(root, d) for pattern in exclude_patterns)
+            ]
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() not in extensions:
+                    continue
+                file_path = Path(root) / filename
+                if self.should_index_file(file_path):
+                    files.append(file_path)
+
+        return sorted(files)
+
+    @staticmethod
+    def extract_text_from_file(file_path: Path) -> str:
         """Extract text content from various file types."""
         try:
             if file_path.suffix.lower() == '.pdf':
-                return self._extract_pdf_text(file_path)
+                return LuxbinDocumentIndexer._extract_pdf_text(file_path)
             elif file_path.suffix.lower() == '.docx':
-                return self._extract_docx_text(file_path)
+                return LuxbinDocumentIndexer._extract_docx_text(file_path)
             elif file_path.suffix.lower() in ['.html', '.htm']:
-                return self._extract_html_text(file_path)
+                return LuxbinDocumentIndexer._extract_html_text(file_path)
             else:
                 # Plain text files (including code)
                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -111,7 +177,8 @@ class LuxbinDocumentIndexer:
             logger.warning(f"Failed to extract text from {file_path}: {e}")
             return ""
 
-    def _extract_pdf_text(self, file_path: Path) -> str:
+    @staticmethod
+    def _extract_pdf_text(file_path: Path) -> str:
         """Extract text from PDF files."""
         text = ""
         with open(file_path, 'rb') as file:
@@ -120,7 +187,8 @@ class LuxbinDocumentIndexer:
                 text += page.extract_text() + "\n"
         return text
 
-    def _extract_docx_text(self, file_path: Path) -> str:
+    @staticmethod
+    def _extract_docx_text(file_path: Path) -> str:
         """Extract text from Word documents."""
         doc = docx.Document(file_path)
         text = ""
@@ -128,13 +196,24 @@ class LuxbinDocumentIndexer:
             text += paragraph.text + "\n"
         return text
 
-    def _extract_html_text(self, file_path: Path) -> str:
+    @staticmethod
+    def _extract_html_text(file_path: Path) -> str:
         """Extract text from HTML files."""
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             soup = BeautifulSoup(f.read(), 'html.parser')
             return soup.get_text()
 
-    def chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    @staticmethod
+    def chunk_file_text(text: str, file_path: Path) -> List[str]:
+        """Split a file on syntax boundaries (functions, contracts, headings...)."""
+        try:
+            return chunk_document(text, LuxbinDocumentIndexer._detect_language(file_path))
+        except (RecursionError, ValueError) as e:
+            logger.warning(f"Structure-aware chunking failed for {file_path}, using windows: {e}")
+            return LuxbinDocumentIndexer.chunk_text(text)
+
+    @staticmethod
+    def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
         """Split text into overlapping chunks for better retrieval."""
         chunks = []
         start = 0
@@ -169,20 +248,14 @@ class LuxbinDocumentIndexer:
             return 0
 
         # Create chunks
-        chunks = self.chunk_text(text)
+        chunks = self.chunk_file_text(text, file_path)
 
         # Create embeddings
-        embeddings = self.embedding_model.encode(chunks)
+        embeddings = self.embedding_cache.encode(chunks)
 
         # Prepare metadata and IDs
         relative_path = file_path.relative_to(base_path)
-        file_metadata = {
-            "file_path": str(relative_path),
-            "file_name": file_path.name,
-            "file_extension": file_path.suffix,
-            "file_size": file_path.stat().st_size,
-            "language": self._detect_language(file_path),
-        }
+        file_metadata = self._file_metadata(file_path, relative_path)
 
         # Add to ChromaDB
         ids = [f"{relative_path}_{i}" for i in range(len(chunks))]
@@ -198,7 +271,18 @@ class LuxbinDocumentIndexer:
 
         return len(chunks)
 
-    def _detect_language(self, file_path: Path) -> str:
+    def _file_metadata(self, file_path: Path, relative_path: Path) -> Dict[str, Any]:
+        """Metadata stored with every chunk of a file."""
+        return {
+            "file_path": str(relative_path),
+            "file_name": file_path.name,
+            "file_extension": file_path.suffix,
+            "file_size": file_path.stat().st_size,
+            "language": self._detect_language(file_path),
+        }
+
+    @staticmethod
+    def _detect_language(file_path: Path) -> str:
         """Detect programming language from file extension."""
         ext_to_lang = {
             '.rs': 'rust',
@@ -220,44 +304,192 @@ class LuxbinDocumentIndexer:
         }
         return ext_to_lang.get(file_path.suffix.lower(), 'unknown')
 
-    def index_codebase(self, codebase_path: str = "../../") -> Dict[str, Any]:
-        """Index the entire LUXBIN codebase."""
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the per-file manifest from the last indexing run.
+
+        Entries map a relative path to its mtime, size, sha256 and chunk count.
+        A manifest written for another embedding model or chunker version is ignored.
+        """
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if (manifest.get('version') != MANIFEST_VERSION or manifest.get('model_name') != self.model_name
+                or manifest.get('chunker_version') != CHUNKER_VERSION):
+            return {}
+        return manifest.get('files', {})
+
+    def save_manifest(self, files: Dict[str, Dict[str, Any]]):
+        """Atomically write the manifest."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'model_name': self.model_name,
+                       'chunker_version': CHUNKER_VERSION, 'files': files}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def remove_file(self, relative_path: str):
+        """Delete every chunk of a previously indexed file."""
+        self.collection.delete(where={"file_path": relative_path})
+
+    def index_codebase(self, codebase_path: str = "../../", incremental: bool = True,
+                       workers: Optional[int] = None, embed_batch_size: int = 256) -> Dict[str, Any]:
+        """Index the entire LUXBIN codebase.
+
+        With ``incremental`` (the default) only files whose size, mtime and content
+        hash differ from the manifest are re-indexed, and deleted files are removed.
+        Text extraction and chunking run in a process pool of ``workers``; chunks
+        from many files are embedded together in ``embed_batch_size`` encode calls.
+        """
         base_path = Path(codebase_path).resolve()
 
         if not base_path.exists():
             raise ValueError(f"Codebase path does not exist: {base_path}")
 
         logger.info(f"Starting to index codebase at: {base_path}")
+        start_time = time.perf_counter()
 
-        # Get all files to index
-        all_files = []
-        for ext in self.get_file_extensions():
-            all_files.extend(base_path.rglob(f"*{ext}"))
+        manifest = self.load_manifest() if incremental else {}
+        if not manifest and self.collection.count():
+            # No usable manifest (first run, or built by another model or chunker):
+            # the existing chunks can't be matched to files, so start over
+            self.chroma_client.delete_collection(COLLECTION_NAME)
+            self.collection = self._get_collection()
 
-        # Filter files
-        files_to_index = [f for f in all_files if self.should_index_file(f)]
+        # Get all files to index (one walk of the tree)
+        files_to_index = self.walk_files(base_path)
         logger.info(f"Found {len(files_to_index)} files to index")
 
-        # Index files with progress bar
-        total_chunks = 0
-        indexed_files = 0
-
-        with tqdm(total=len(files_to_index), desc="Indexing files") as pbar:
-            for file_path in files_to_index:
-                try:
-                    chunks_added = self.index_file(file_path, base_path)
-                    total_chunks += chunks_added
-                    indexed_files += 1
-                except Exception as e:
-                    logger.error(f"Failed to index {file_path}: {e}")
-                pbar.update(1)
+        # Cheap stat comparison first; only changed candidates are read and hashed
+        seen = set()
+        candidates = []
+        failed_files = 0
+        for file_path in files_to_index:
+            relative_path = str(file_path.relative_to(base_path))
+            seen.add(relative_path)
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                # Vanished or unreadable since the walk; keep its previous entry, if any
+                failed_files += 1
+                logger.error(f"Failed to stat {file_path}: {e}")
+                continue
+            entry = manifest.get(relative_path)
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                continue
+            candidates.append((file_path, relative_path, stat))
+
+        # Remove files deleted since the last run
+        deleted_files = [path for path in manifest if path not in seen]
+        for relative_path in deleted_files:
+            self.remove_file(relative_path)
+            del manifest[relative_path]
+
+        pending: List[Tuple[str, str, Dict[str, Any]]] = []  # (id, document, metadata)
+        remaining_chunks: Dict[str, int] = {}
+        pending_entries: Dict[str, Dict[str, Any]] = {}
+        counters = {'chunks': 0, 'indexed_files': 0, 'embed_calls': 0}
+
+        def flush(force: bool = False):
+            """Embed and store pending chunks in fixed-size batches."""
+            while pending and (force or len(pending) >= embed_batch_size):
+                batch = pending[:embed_batch_size]
+                del pending[:embed_batch_size]
+
+                embeddings = self.embedding_cache.encode(
+                    [document for _, document, _ in batch], batch_size=embed_batch_size
+                )
+                # Upsert so chunks left by an interrupted run are overwritten, not duplicated
+                self.collection.upsert(
+                    embeddings=embeddings.tolist(),
+                    documents=[document for _, document, _ in batch],
+                    metadatas=[metadata for _, _, metadata in batch],
+                    ids=[chunk_id for chunk_id, _, _ in batch]
+                )
+                counters['embed_calls'] += 1
+                counters['chunks'] += len(batch)
+
+                # A file is recorded in the manifest once all its chunks are stored
+                for _, _, metadata in batch:
+                    relative_path = metadata['file_path']
+                    remaining_chunks[relative_path] -= 1
+                    if remaining_chunks[relative_path] == 0:
+                        del remaining_chunks[relative_path]
+                        manifest[relative_path] = pending_entries.pop(relative_path)
+                        counters['indexed_files'] += 1
+
+        unchanged_files = len(files_to_index) - len(candidates) - failed_files
+        by_path = {str(file_path): (file_path, relative_path, stat)
+                   for file_path, relative_path, stat in candidates}
 
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_extract_and_chunk, list(by_path), chunksize=8)
+                with tqdm(total=len(candidates), desc="Indexing files") as pbar:
+                    for path_str, digest, chunks, error in results:
+                        file_path, relative_path, stat = by_path[path_str]
+                        if error:
+                            pbar.update(1)
+                            failed_files += 1
+                            logger.error(f"Failed to index {file_path}: {error}")
+                            continue
+
+                        entry = {
+                            'mtime': stat.st_mtime,
+                            'size': stat.st_size,
+                            'sha256': digest,
+                            'chunks': len(chunks)
+                        }
+                        pbar.update(1)
+
+                        previous = manifest.get(relative_path)
+                        if previous and previous['sha256'] == digest:
+                            # Touched but identical content: refresh stat data only
+                            manifest[relative_path] = entry
+                            unchanged_files += 1
+                            continue
+
+                        try:
+                            if previous:
+                                self.remove_file(relative_path)
+                                del manifest[relative_path]
+
+                            if not chunks:
+                                manifest[relative_path] = entry
+                                continue
+
+                            file_metadata = self._file_metadata(file_path, Path(relative_path))
+                            for i, chunk in enumerate(chunks):
+                                pending.append((f"{relative_path}_{i}", chunk, file_metadata.copy()))
+                            remaining_chunks[relative_path] = len(chunks)
+                            pending_entries[relative_path] = entry
+
+                            flush()
+                        except Exception as e:
+                            failed_files += 1
+                            logger.error(f"Failed to index {file_path}: {e}")
+
+            flush(force=True)
+        finally:
+            # Persist progress even if embedding failed part-way
+            self.save_manifest(manifest)
+
+        elapsed = time.perf_counter() - start_time
         result = {
             "total_files": len(files_to_index),
-            "indexed_files": indexed_files,
-            "total_chunks": total_chunks,
+            "indexed_files": counters['indexed_files'],
+            "unchanged_files": unchanged_files,
+            "deleted_files": len(deleted_files),
+            "failed_files": failed_files,
+            "total_chunks": counters['chunks'],
+            "embed_calls": counters['embed_calls'],
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_sec": round(len(candidates) / elapsed, 1) if elapsed else 0.0,
+            "chunks_per_sec": round(counters['chunks'] / elapsed, 1) if elapsed else 0.0,
             "database_path": self.chroma_path,
-            "collection_name": "luxbin_codebase"
+            "collection_name": COLLECTION_NAME
         }
 
         logger.info(f"Indexing complete: {result}")
@@ -265,22 +497,34 @@ class LuxbinDocumentIndexer:
 
     def search_similar(self, query: str, n_results: int = 5) -> Dict[str, Any]:
         """Search for similar content in the indexed codebase."""
-        # Create embedding for query
-        query_embedding = self.embedding_model.encode([query])[0]
+        return self.search_similar_many([query], n_results)[0]
+
+    def search_similar_many(self, queries: List[str], n_results: int = 5) -> List[Dict[str, Any]]:
+        """Search for several queries with one embedding batch and one ChromaDB query."""
+        if not queries:
+            return []
+
+        # Create embeddings for all queries at once
+        query_embeddings = self.embedding_cache.encode_queries(queries)
 
         # Search ChromaDB
         results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
+            query_embeddings=query_embeddings.tolist(),
             n_results=n_results,
             include=['documents', 'metadatas', 'distances']
         )
 
-        # Format results
-        formatted_results = []
-        if results['documents'] and results['documents'][0]:
-            for i, doc in enumerate(results['documents'][0]):
-                metadata = results['metadatas'][0][i] if results['metadatas'] else {}
-                distance = results['distances'][0][i] if results['distances'] else 0
+        # Format results, one set per query
+        searches = []
+        for q, query in enumerate(queries):
+            documents = results['documents'][q] if results['documents'] else []
+            metadatas = results['metadatas'][q] if results['metadatas'] else []
+            distances = results['distances'][q] if results['distances'] else []
+
+            formatted_results = []
+            for i, doc in enumerate(documents):
+                metadata = metadatas[i] if metadatas else {}
+                distance = distances[i] if distances else 0
 
                 formatted_results.append({
                     'content': doc,
@@ -290,11 +534,12 @@ class LuxbinDocumentIndexer:
                     'language': metadata.get('language', 'unknown')
                 })
 
-        return {
-            'query': query,
-            'results': formatted_results,
-            'total_results': len(formatted_results)
-        }
+            searches.append({
+                'query': query,
+                'results': formatted_results,
+                'total_results': len(formatted_results)
+            })
+        return searches
 
 def main():
     """Main function to run the indexer."""
@@ -303,6 +548,9 @@ def main():
     parser = argparse.ArgumentParser(description="Index LUXBIN codebase for RAG")
     parser.add_argument("--codebase-path", default="../../", help="Path to LUXBIN codebase")
     parser.add_argument("--db-path", default="./luxbin_chroma_db", help="Path for ChromaDB")
+    parser.add_argument("--full", action="store_true", help="Rebuild the index instead of updating changed files")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--embed-batch-size", type=int, default=256, help="Chunks per embedding call")
 
     args = parser.parse_args()
 
@@ -310,7 +558,8 @@ def main():
     indexer = LuxbinDocumentIndexer(chroma_path=args.db_path)
 
     # Index codebase
-    result = indexer.index_codebase(args.codebase_path)
+    result = indexer.index_codebase(args.codebase_path, incremental=not args.full,
+                                    workers=args.workers, embed_batch_size=args.embed_batch_size)
 
     # Save results
     with open("indexing_results.json", "w") as f:
@@ -318,7 +567,9 @@ def main():
 
     print("Indexing complete!")
     print(f"Indexed {result['indexed_files']} files")
-    print(f"Created {result['total_chunks']} chunks")
+    print(f"Created {result['total_chunks']} chunks "
+          f"({result['unchanged_files']} unchanged, {result['deleted_files']} deleted)")
+    print(f"Throughput: {result['files_per_sec']} files/sec, {result['chunks_per_sec']} chunks/sec")
     print(f"Database saved to: {result['database_path']}")
 
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Embedding Cache
+Persistent embedding cache keyed by (model name, sha256 of the text)
+Vectors live in an append-only float32 matrix that is memory-mapped for reads;
+an index file maps each digest to its row. Queries get an in-memory LRU on top.
+"""
+
+import json
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 32  # sha256
+
+
+def text_digest(text: str) -> bytes:
+    """Cache key for a chunk or query"""
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """Wraps an embedding model's ``encode`` with a persistent per-model cache
+
+    Files for a model (under ``cache_dir``):
+      <key>.json  model name and vector dimension
+      <key>.f32   row-major float32 matrix, one row per cached text
+      <key>.idx   sha256 digests, record i is the key of row i
+
+    Appends take an exclusive file lock, so an indexer run and a chat server can
+    share one cache directory. Rows written by other processes are picked up
+    the next time a lookup misses.
+    """
+
+    def __init__(self, model, model_name: str, cache_dir, query_cache_size: int = 1024):
+        self.model = model
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        key = hashlib.sha1(model_name.encode('utf-8')).hexdigest()[:16]
+        self.meta_path = self.cache_dir / f"{key}.json"
+        self.matrix_path = self.cache_dir / f"{key}.f32"
+        self.index_path = self.cache_dir / f"{key}.idx"
+
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._index_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.RLock()
+
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'query_hits': 0,
+            'query_misses': 0
+        }
+
+        if self.meta_path.exists():
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            self.dim = meta['dim']
+            self._refresh()
+
+    # ===== STORAGE =====
+
+    def _refresh(self):
+        """Load index records appended since the last refresh (by any process)"""
+        if not self.index_path.exists():
+            return
+        size = self.index_path.stat().st_size
+        usable = size - size % DIGEST_SIZE
+        if usable <= self._index_offset:
+            return
+
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_offset)
+            data = f.read(usable - self._index_offset)
+
+        row = self._index_offset // DIGEST_SIZE
+        for start in range(0, len(data), DIGEST_SIZE):
+            self._rows.setdefault(data[start:start + DIGEST_SIZE], row)
+            row += 1
+        self._index_offset = usable
+        self._matrix = None  # Remap to cover the new rows
+
+    def _mapped_matrix(self) -> np.memmap:
+        if self._matrix is None:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r',
+                                     shape=(self._index_offset // DIGEST_SIZE, self.dim))
+        return self._matrix
+
+    def _lookup(self, digests: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return cached vectors for whichever digests are present"""
+        rows = [(digest, self._rows[digest]) for digest in digests if digest in self._rows]
+        if not rows:
+            return {}
+        matrix = self._mapped_matrix()
+        vectors = np.asarray(matrix[[row for _, row in rows]])
+        return {digest: vectors[i] for i, (digest, _) in enumerate(rows)}
+
+    def _append(self, digests: List[bytes], vectors: np.ndarray):
+        """Persist new vectors; the matrix is written before the index that points into it"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            with open(self.meta_path, 'w') as f:
+                json.dump({'model_name': self.model_name, 'dim': self.dim}, f)
+
+        with open(self.index_path, 'ab') as index_file:
+            if fcntl:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                fresh = [i for i, digest in enumerate(digests) if digest not in self._rows]
+                if not fresh:
+                    return
+
+                # Drop a torn trailing record so new records start on a record boundary
+                if index_file.tell() != self._index_offset:
+                    index_file.truncate(self._index_offset)
+
+                first_row = self._index_offset // DIGEST_SIZE
+                # Seek rather than append so rows stay aligned even after a torn write
+                with open(self.matrix_path, 'r+b' if self.matrix_path.exists() else 'wb') as matrix_file:
+                    matrix_file.seek(first_row * self.dim * 4)
+                    matrix_file.write(vectors[fresh].tobytes())
+
+                index_file.write(b''.join(digests[i] for i in fresh))
+                index_file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+
+        self._refresh()
+
+    # ===== ENCODING =====
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Embed texts, running the model only for texts not already cached"""
+        digests = [text_digest(text) for text in texts]
+
+        with self._lock:
+            found = self._lookup(digests)
+            if len(found) < len(set(digests)):
+                self._refresh()  # Another process may have embedded them
+                found = self._lookup(digests)
+
+            missing: Dict[bytes, str] = {}
+            for digest, text in zip(digests, texts):
+                if digest not in found:
+                    missing.setdefault(digest, text)
+
+            self.stats['hits'] += len(texts) - sum(1 for d in digests if d in missing)
+            self.stats['misses'] += len(missing)
+
+            if missing:
+                new_digests = list(missing)
+                new_vectors = np.asarray(
+                    self.model.encode(list(missing.values()), batch_size=batch_size),
+                    dtype=np.float32
+                )
+                self._append(new_digests, new_vectors)
+                found.update(zip(new_digests, new_vectors))
+
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.stack([found[digest] for digest in digests])
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """Embed a search query through the in-memory LRU, then the disk cache"""
+        return self.encode_queries([query])[0]
+
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed search queries, running the model once for all LRU misses"""
+        digests = [text_digest(query) for query in queries]
+        vectors: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for digest in digests:
+                vector = self._query_cache.get(digest)
+                if vector is not None:
+                    self._query_cache.move_to_end(digest)
+                    vectors[digest] = vector
+            self.stats['query_hits'] += sum(1 for digest in digests if digest in vectors)
+            self.stats['query_misses'] += sum(1 for digest in digests if digest not in vectors)
+
+        missing = {digest: query for digest, query in zip(digests, queries) if digest not in vectors}
+        if missing:
+            encoded = self.encode(list(missing.values()))
+            with self._lock:
+                for digest, vector in zip(missing, encoded):
+                    vectors[digest] = vector
+                    self._query_cache[digest] = vector
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        if not queries:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.stack([vectors[digest] for digest in digests])
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['cached_vectors'] = len(self._rows)
+            stats['disk_bytes'] = (self.matrix_path.stat().st_size
+                                   if self.matrix_path.exists() else 0)
+            stats['query_cache_entries'] = len(self._query_cache)
+            return stats
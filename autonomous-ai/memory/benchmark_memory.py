@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Memory Benchmark
+Measures chat turns/sec through LuxbinMemoryManager at 1, 8 and 32 concurrent users,
+and full-text conversation search latency over a large message store
+
+Usage: python3 benchmark_memory.py [--turns 50] [--users 1,8,32] [--search-messages 1000000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from memory_manager import LuxbinMemoryManager
+
+USER_MESSAGES = [
+    "How does quantum cryptography protect my wallet?",
+    "Can you check the security of this smart contract?",
+    "What is the temporal key derivation used by LUXBIN?",
+    "Explain photonic encoding and why it is fast",
+]
+
+
+def simulate_turn(memory: LuxbinMemoryManager, user_id: str, session_id: str, turn: int):
+    """Replay the memory calls made by one LuxbinAutonomousAI.generate_response turn"""
+    query = USER_MESSAGES[turn % len(USER_MESSAGES)]
+    memory.store_conversation(user_id, session_id, 'user', query,
+                              {'function_calls': [], 'response_quality': 0.8})
+    memory.get_or_create_user(user_id)
+    memory.get_user_preferences(user_id)
+    memory.search_conversations(user_id, query, limit=3)
+    memory.get_conversation_history(user_id, limit=8, session_id=session_id)
+    memory.store_conversation(user_id, session_id, 'assistant',
+                              f"Here is what I found about: {query}",
+                              {'function_calls': [], 'response_quality': 0.85})
+    memory.learn_from_interaction(user_id, {
+        'type': 'ai_response',
+        'topics': ['quantum'],
+        'sentiment': 0.0,
+        'function_calls': [],
+        'response_quality': 0.85
+    })
+
+
+def run_benchmark(concurrent_users: int, turns_per_user: int) -> float:
+    """Run concurrent chat turns against a fresh database and return turns/sec"""
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = LuxbinMemoryManager(db_path=f"{tmp}/bench.db", memory_dir=f"{tmp}/memory")
+        barrier = threading.Barrier(concurrent_users + 1)
+
+        def worker(index: int):
+            user_id = f"bench_user_{index}"
+            session_id = f"bench_session_{index}"
+            barrier.wait()
+            for turn in range(turns_per_user):
+                simulate_turn(memory, user_id, session_id, turn)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrent_users)]
+        for thread in threads:
+            thread.start()
+
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        storage_stats = memory.get_memory_stats()['storage']
+        memory.close()
+
+    total_turns = concurrent_users * turns_per_user
+    turns_per_sec = total_turns / elapsed
+    print(f"  {concurrent_users:>3} users | {total_turns:>5} turns | {elapsed:7.2f}s | "
+          f"{turns_per_sec:8.1f} turns/sec | avg write batch {storage_stats['avg_batch_size']:.1f}")
+    return turns_per_sec
+
+
+def run_search_benchmark(total_messages: int, users: int = 1000, queries: int = 500):
+    """Bulk-load messages, then time search_conversations over each user's full history"""
+    rng = random.Random(42)
+    vocabulary = [f"term{i}" for i in range(5000)] + [
+        'quantum', 'wallet', 'contract', 'photonic', 'temporal', 'security', 'bridge', 'validator'
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = LuxbinMemoryManager(db_path=f"{tmp}/search.db", memory_dir=f"{tmp}/memory")
+
+        start = time.perf_counter()
+        batch_size = 20000
+        for offset in range(0, total_messages, batch_size):
+            rows = [
+                (f"user_{(offset + i) % users}", f"session_{(offset + i) % 97}", 'user',
+                 " ".join(rng.choices(vocabulary, k=rng.randint(8, 40))))
+                for i in range(min(batch_size, total_messages - offset))
+            ]
+            memory.store.write(lambda conn, rows=rows: conn.executemany(
+                "INSERT INTO conversations (user_id, session_id, message_type, content) VALUES (?, ?, ?, ?)",
+                rows
+            ))
+        load_time = time.perf_counter() - start
+
+        latencies = []
+        for _ in range(queries):
+            user_id = f"user_{rng.randrange(users)}"
+            query = " ".join(rng.choices(vocabulary, k=2))
+            query_start = time.perf_counter()
+            memory.search_conversations(user_id, query, limit=3)
+            latencies.append((time.perf_counter() - query_start) * 1000)
+
+        memory.close()
+
+    latencies.sort()
+    print(f"  {total_messages:,} messages / {users:,} users loaded in {load_time:.1f}s")
+    print(f"  search p50 {statistics.median(latencies):.3f}ms | "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms | "
+          f"max {latencies[-1]:.3f}ms over {queries} queries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LUXBIN memory manager throughput benchmark")
+    parser.add_argument('--turns', type=int, default=50, help="Chat turns per user")
+    parser.add_argument('--users', default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument('--search-messages', type=int, default=0,
+                        help="Also benchmark full-text search over this many stored messages")
+    args = parser.parse_args()
+
+    print("🧠 LUXBIN Memory Benchmark")
+    print("=" * 70)
+    for users in (int(u) for u in args.users.split(',')):
+        run_benchmark(users, args.turns)
+
+    if args.search_messages:
+        print("\n🔎 Conversation Search Benchmark")
+        print("=" * 70)
+        run_search_benchmark(args.search_messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Memory Cache
+Thread-safe LRU cache with TTL expiry, entry and byte limits, and hit/miss/eviction counters
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Approximate deep size in bytes of a cached value
+
+    Objects exposing ``nbytes`` (NumPy arrays, vector indexes) report that directly.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    return size
+
+
+class LRUTTLCache:
+    """Bounded cache evicting least-recently-used entries past ``max_entries`` or ``max_bytes``
+
+    Entries older than ``ttl`` seconds are treated as misses and dropped on access
+    (or by ``purge_expired``). All operations take a single lock.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None, size_of: Callable[[Any], int] = estimate_size):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of
+
+        self._lock = threading.RLock()
+        # key -> (value, size_bytes, stored_at)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """Get a cached value and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[2], time.monotonic()):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        """Insert or replace a value, evicting LRU entries to stay within limits"""
+        size = self.size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                if oldest == key and len(self._entries) == 1:
+                    break  # Never evict the only (just inserted) entry
+                self._remove(oldest)
+                self.evictions += 1
+
+    def update(self, key: Hashable, mutate: Callable[[Any], None]) -> bool:
+        """Apply ``mutate`` to a cached value in place (write-through); False if not cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            value, old_size, stored_at = entry
+            mutate(value)
+            new_size = self.size_of(value)
+            self._entries[key] = (value, new_size, stored_at)
+            self._bytes += new_size - old_size
+            return True
+
+    def resize(self, key: Hashable):
+        """Re-measure an entry whose value grew in place (e.g. an appended index)"""
+        self.update(key, lambda value: None)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Invalidate an entry, returning its value"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        if self.ttl is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, _, stored_at) in self._entries.items()
+                       if self._is_expired(stored_at, now)]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache occupancy and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
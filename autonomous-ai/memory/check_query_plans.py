@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Memory Query Plan Check
+Fails (exit code 1) if a conversation history query falls back to a table scan
+or a temporary sort. Run after any schema or query change:
+
+    python3 check_query_plans.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from memory_manager import LuxbinMemoryManager, HISTORY_QUERY, SESSION_HISTORY_QUERY
+
+# (name, sql, params) for every hot-path conversation query
+CHECKED_QUERIES = [
+    ('history', HISTORY_QUERY, ('plan_user', 20)),
+    ('session_history', SESSION_HISTORY_QUERY, ('plan_user', 'plan_session', 20)),
+]
+
+
+def find_plan_problems(memory: LuxbinMemoryManager) -> list:
+    """Return a list of (query name, plan detail) for every scan or temp sort"""
+    problems = []
+    conn = memory.store.connection()
+
+    for name, sql, params in CHECKED_QUERIES:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        for row in plan:
+            detail = row[-1]
+            if detail.startswith('SCAN') or 'TEMP B-TREE' in detail:
+                problems.append((name, detail))
+
+    return problems
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = LuxbinMemoryManager(db_path=f"{tmp}/plans.db", memory_dir=f"{tmp}/memory")
+
+        # Populate a few users so the planner sees a realistic distribution
+        for i in range(200):
+            memory.store_conversation(f"user_{i % 20}", f"session_{i % 7}", 'user', f"message {i}")
+        memory.store.execute("ANALYZE")
+
+        problems = find_plan_problems(memory)
+        schema_version = memory.get_schema_version()
+        memory.close()
+
+    print(f"🔍 Memory schema v{schema_version}: checked {len(CHECKED_QUERIES)} queries")
+    if problems:
+        for name, detail in problems:
+            print(f"❌ {name}: {detail}")
+        return 1
+
+    print("✅ All conversation queries use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Memory Embeddings
+Pluggable text embedders and an in-process NumPy vector index for semantic recall
+Works fully offline: the default embedder is a deterministic local hashing model
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Vectors are persisted as packed little-endian float32
+EMBEDDING_DTYPE = np.dtype('<f4')
+
+
+def vector_to_blob(vector: np.ndarray) -> bytes:
+    """Pack a vector into a float32 BLOB"""
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def blob_to_vector(blob: bytes) -> np.ndarray:
+    """Unpack a float32 BLOB into a vector"""
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str, dim: int) -> Tuple[int, float]:
+    """Stable (index, sign) for a hashed feature; independent of PYTHONHASHSEED"""
+    value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value % dim, (1.0 if value >> 63 else -1.0)
+
+
+class HashingEmbedder:
+    """Deterministic local embedder: signed feature hashing of words and word bigrams"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.name = f"luxbin-hashing-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into L2-normalized float32 vectors"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            words = re.findall(r'\w+', text.lower())
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for feature in features:
+                index, sign = _feature_slot(feature, self.dim)
+                vectors[row, index] += sign
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SentenceTransformerEmbedder:
+    """Embedder backed by a sentence-transformers model (optional dependency)"""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers/{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into L2-normalized float32 vectors"""
+        vectors = self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32)
+
+
+def get_default_embedder():
+    """Get the configured embedder
+
+    Set LUXBIN_MEMORY_EMBEDDER=sentence-transformers to use a transformer model;
+    anything else (or a failed load) uses the offline hashing embedder.
+    """
+    if os.getenv('LUXBIN_MEMORY_EMBEDDER', '').lower() == 'sentence-transformers':
+        try:
+            return SentenceTransformerEmbedder(os.getenv('LUXBIN_MEMORY_EMBEDDING_MODEL', 'all-MiniLM-L6-v2'))
+        except Exception as e:
+            logger.warning(f"Sentence transformer embedder unavailable, using hashing fallback: {e}")
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """Growable in-memory matrix of unit vectors with top-k cosine search
+
+    With ``quantize=True`` rows are stored as int8 with a per-row scale,
+    cutting memory 4x at a small cost in score precision.
+    """
+
+    def __init__(self, dim: int, quantize: bool = False, initial_capacity: int = 256):
+        self.dim = dim
+        self.quantize = quantize
+        self._lock = threading.Lock()
+        self._size = 0
+        self._ids = np.empty(initial_capacity, dtype=np.int64)
+        self._id_set = set()
+        if quantize:
+            self._matrix = np.empty((initial_capacity, dim), dtype=np.int8)
+            self._scales = np.empty(initial_capacity, dtype=np.float32)
+        else:
+            self._matrix = np.empty((initial_capacity, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated array memory (capacity, not just filled rows)"""
+        total = self._ids.nbytes + self._matrix.nbytes
+        if self.quantize:
+            total += self._scales.nbytes
+        return total
+
+    def _grow(self, needed: int):
+        """Double capacity until ``needed`` rows fit"""
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        self._ids = np.resize(self._ids, capacity)
+        matrix = np.empty((capacity, self.dim), dtype=self._matrix.dtype)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+        if self.quantize:
+            self._scales = np.resize(self._scales, capacity)
+
+    def add(self, ids: List[int], vectors: np.ndarray):
+        """Add vectors (one row per id); ids already present are skipped"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+
+        with self._lock:
+            keep = [i for i, item_id in enumerate(ids) if item_id not in self._id_set]
+            if not keep:
+                return
+            vectors = vectors[keep]
+            new_ids = [ids[i] for i in keep]
+
+            start = self._size
+            end = start + len(new_ids)
+            self._grow(end)
+
+            self._ids[start:end] = new_ids
+            if self.quantize:
+                scales = np.abs(vectors).max(axis=1) / 127.0
+                scales[scales == 0] = 1.0
+                self._matrix[start:end] = np.round(vectors / scales[:, None]).astype(np.int8)
+                self._scales[start:end] = scales
+            else:
+                self._matrix[start:end] = vectors
+
+            self._id_set.update(new_ids)
+            self._size = end
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (id, cosine similarity) pairs, best first"""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+
+        with self._lock:
+            size = self._size
+            if size == 0 or k <= 0:
+                return []
+            if self.quantize:
+                scores = (self._matrix[:size] @ query) * self._scales[:size]
+            else:
+                scores = self._matrix[:size] @ query
+            ids = self._ids[:size].copy()
+
+        k = min(k, size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
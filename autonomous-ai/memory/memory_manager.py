@@ -13,31 +13,88 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import logging
+import re
+import time
 import threading
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    from memory.storage import LuxbinMemoryStore
+    from memory.cache import LRUTTLCache
+    from memory.embeddings import VectorIndex, get_default_embedder, vector_to_blob, blob_to_vector
+except ImportError:
+    from storage import LuxbinMemoryStore
+    from cache import LRUTTLCache
+    from embeddings import VectorIndex, get_default_embedder, vector_to_blob, blob_to_vector
+
 logger = logging.getLogger(__name__)
 
+# Conversation history queries; each is served by a composite index (schema v2)
+HISTORY_QUERY = """
+    SELECT id, session_id, message_type, content, timestamp, metadata
+    FROM conversations
+    WHERE user_id = ?
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ?
+"""
+
+SESSION_HISTORY_QUERY = """
+    SELECT id, session_id, message_type, content, timestamp, metadata
+    FROM conversations
+    WHERE user_id = ? AND session_id = ?
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ?
+"""
+
+# Full-text search over a user's whole history (schema v3), ranked by BM25.
+# user_key is a single per-user token ('u' || hex(user_id)) with zero BM25 weight;
+# it restricts the match to the user's own postings.
+SEARCH_QUERY = """
+    SELECT c.id, c.session_id, c.message_type, c.content, c.timestamp, c.metadata,
+           bm25(conversations_fts, 1.0, 0.0) AS rank,
+           snippet(conversations_fts, 0, '**', '**', '...', 16) AS snippet
+    FROM conversations_fts
+    JOIN conversations c ON c.id = conversations_fts.rowid
+    WHERE conversations_fts MATCH ? AND c.user_id = ?
+    ORDER BY rank, c.id DESC
+    LIMIT ?
+"""
+
 class LuxbinMemoryManager:
     """Comprehensive memory system for LUXBIN AI"""
 
-    def __init__(self, db_path: str = "./luxbin_memory.db", memory_dir: str = "./memory"):
+    def __init__(self, db_path: str = "./luxbin_memory.db", memory_dir: str = "./memory",
+                 embedder=None, quantize_embeddings: bool = False):
         self.db_path = Path(db_path)
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(exist_ok=True)
 
+        # Embedder for semantic recall (pluggable; offline hashing model by default)
+        self.embedder = embedder or get_default_embedder()
+        self.quantize_embeddings = quantize_embeddings
+
+        # Pooled WAL-mode storage with a group-committing writer
+        self.store = LuxbinMemoryStore(self.db_path)
+
         # Initialize database
         self._init_database()
 
-        # Memory caches for performance
-        self.conversation_cache = {}
-        self.user_cache = {}
-        self.semantic_cache = {}
+        # Memory caches for performance (LRU + TTL, bounded by entries and bytes)
+        self.user_cache = LRUTTLCache('user', max_entries=10000, max_bytes=32 * 1024 * 1024,
+                                      ttl=3600)
+        # user_id -> {(session_id, limit): history}; invalidated whenever the user stores a message
+        self.conversation_cache = LRUTTLCache('conversation', max_entries=2000,
+                                              max_bytes=64 * 1024 * 1024, ttl=300)
+        # user_id -> VectorIndex
+        self.semantic_cache = LRUTTLCache('semantic', max_entries=1000,
+                                          max_bytes=256 * 1024 * 1024, ttl=1800)
 
         # Memory limits
         self.max_conversations_per_user = 1000
         self.max_session_messages = 50
-        self.semantic_cache_size = 100
+        self.cache_sweep_interval = 60
 
         # Background cleanup thread
         self.cleanup_thread = threading.Thread(target=self._background_cleanup, daemon=True)
@@ -46,128 +103,241 @@ class LuxbinMemoryManager:
         logger.info("LUXBIN Memory Manager initialized")
 
     def _init_database(self):
-        """Initialize SQLite database for persistent memory"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id TEXT PRIMARY KEY,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    total_interactions INTEGER DEFAULT 0,
-                    preferences TEXT,  -- JSON string
-                    personality_profile TEXT,  -- JSON string
-                    trust_score REAL DEFAULT 0.5,
-                    expertise_level TEXT DEFAULT 'beginner'
-                )
-            ''')
-
-            # Conversations table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conversations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    session_id TEXT NOT NULL,
-                    message_type TEXT NOT NULL,  -- 'user' or 'assistant'
-                    content TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT,  -- JSON string with function calls, etc.
-                    photonic_encoding TEXT,  -- Photonic representation
-                    sentiment REAL,  -- Sentiment analysis score
-                    topics TEXT,  -- Comma-separated topics
-                    FOREIGN KEY (user_id) REFERENCES users(user_id)
-                )
-            ''')
-
-            # Memory embeddings table (for semantic search)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS memory_embeddings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    conversation_id INTEGER,
-                    content_hash TEXT UNIQUE,
-                    embedding_vector TEXT,  -- JSON array of floats
-                    topics TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (conversation_id) REFERENCES conversations(id)
-                )
-            ''')
-
-            # User preferences table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_preferences (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    preference_key TEXT NOT NULL,
-                    preference_value TEXT,
-                    confidence REAL DEFAULT 1.0,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, preference_key),
-                    FOREIGN KEY (user_id) REFERENCES users(user_id)
-                )
-            ''')
-
-            # Learning insights table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS learning_insights (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT,
-                    insight_type TEXT,
-                    insight_data TEXT,  -- JSON
-                    confidence REAL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        """Initialize SQLite database and upgrade it to the latest schema version"""
+        current_version = self.get_schema_version()
+
+        for version, description, migrate in self._schema_migrations():
+            if version <= current_version:
+                continue
+
+            def apply_migration(conn, version=version, migrate=migrate):
+                # Re-check inside the write transaction in case another process migrated first
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    return False
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                return True
+
+            if self.store.write(apply_migration):
+                logger.info(f"Applied memory schema migration v{version}: {description}")
 
-            conn.commit()
         logger.info("Database initialized successfully")
 
+    def _schema_migrations(self) -> List[Tuple[int, str, Any]]:
+        """Ordered schema migrations; versions are tracked in PRAGMA user_version"""
+        return [
+            (1, "base tables", self._create_schema),
+            (2, "conversation history indexes", self._create_history_indexes),
+            (3, "conversation full-text index", self._create_fulltext_index),
+            (4, "packed float32 memory embeddings", self._create_embedding_store),
+        ]
+
+    def get_schema_version(self) -> int:
+        """Get the schema version of the memory database"""
+        return self.store.query_one("PRAGMA user_version")[0]
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Schema v1: create memory tables (IF NOT EXISTS, so pre-versioned DBs upgrade cleanly)"""
+        cursor = conn.cursor()
+
+        # Users table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                user_id TEXT PRIMARY KEY,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                total_interactions INTEGER DEFAULT 0,
+                preferences TEXT,  -- JSON string
+                personality_profile TEXT,  -- JSON string
+                trust_score REAL DEFAULT 0.5,
+                expertise_level TEXT DEFAULT 'beginner'
+            )
+        ''')
+
+        # Conversations table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                message_type TEXT NOT NULL,  -- 'user' or 'assistant'
+                content TEXT NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                metadata TEXT,  -- JSON string with function calls, etc.
+                photonic_encoding TEXT,  -- Photonic representation
+                sentiment REAL,  -- Sentiment analysis score
+                topics TEXT,  -- Comma-separated topics
+                FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+        ''')
+
+        # Memory embeddings table (for semantic search)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS memory_embeddings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                conversation_id INTEGER,
+                content_hash TEXT UNIQUE,
+                embedding_vector TEXT,  -- JSON array of floats
+                topics TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+            )
+        ''')
+
+        # User preferences table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_preferences (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                preference_key TEXT NOT NULL,
+                preference_value TEXT,
+                confidence REAL DEFAULT 1.0,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(user_id, preference_key),
+                FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+        ''')
+
+        # Learning insights table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS learning_insights (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT,
+                insight_type TEXT,
+                insight_data TEXT,  -- JSON
+                confidence REAL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+    def _create_history_indexes(self, conn: sqlite3.Connection):
+        """Schema v2: composite indexes so history queries avoid a table scan and sort"""
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_conversations_user_session_time
+            ON conversations (user_id, session_id, timestamp)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_conversations_user_time
+            ON conversations (user_id, timestamp)
+        ''')
+
+    def _create_fulltext_index(self, conn: sqlite3.Connection):
+        """Schema v3: FTS5 index over conversations, kept in sync by triggers"""
+        # External-content source; the view derives the per-user key token
+        conn.execute('''
+            CREATE VIEW IF NOT EXISTS conversations_fts_source AS
+            SELECT id, content, 'u' || hex(user_id) AS user_key FROM conversations
+        ''')
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                content,
+                user_key,
+                content='conversations_fts_source',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_insert AFTER INSERT ON conversations BEGIN
+                INSERT INTO conversations_fts (rowid, content, user_key)
+                VALUES (new.id, new.content, 'u' || hex(new.user_id));
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_delete AFTER DELETE ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, content, user_key)
+                VALUES ('delete', old.id, old.content, 'u' || hex(old.user_id));
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_update AFTER UPDATE ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, content, user_key)
+                VALUES ('delete', old.id, old.content, 'u' || hex(old.user_id));
+                INSERT INTO conversations_fts (rowid, content, user_key)
+                VALUES (new.id, new.content, 'u' || hex(new.user_id));
+            END
+        ''')
+
+        # Index conversations stored before this migration
+        conn.execute("INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')")
+
+    def _create_embedding_store(self, conn: sqlite3.Connection):
+        """Schema v4: rebuild memory_embeddings (never written before) with packed float32 BLOBs"""
+        conn.execute("DROP TABLE IF EXISTS memory_embeddings")
+        conn.execute('''
+            CREATE TABLE memory_embeddings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                conversation_id INTEGER NOT NULL,
+                user_id TEXT NOT NULL,
+                embedding_model TEXT NOT NULL,
+                content_hash TEXT,  -- sha256 of the embedded content
+                embedding BLOB NOT NULL,  -- packed little-endian float32
+                topics TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(conversation_id, embedding_model),
+                FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+            )
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_memory_embeddings_user_model
+            ON memory_embeddings (user_id, embedding_model)
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_embeddings_delete AFTER DELETE ON conversations BEGIN
+                DELETE FROM memory_embeddings WHERE conversation_id = old.id;
+            END
+        ''')
+
     # ===== USER MANAGEMENT =====
 
     def get_or_create_user(self, user_id: str) -> Dict[str, Any]:
         """Get or create user profile"""
-        if user_id in self.user_cache:
-            return self.user_cache[user_id]
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Try to get existing user
-            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-            row = cursor.fetchone()
-
-            if row:
-                user_data = {
-                    'user_id': row[0],
-                    'created_at': row[1],
-                    'last_seen': row[2],
-                    'total_interactions': row[3],
-                    'preferences': json.loads(row[4]) if row[4] else {},
-                    'personality_profile': json.loads(row[5]) if row[5] else {},
-                    'trust_score': row[6],
-                    'expertise_level': row[7]
-                }
-            else:
-                # Create new user
-                user_data = {
-                    'user_id': user_id,
-                    'created_at': datetime.now().isoformat(),
-                    'last_seen': datetime.now().isoformat(),
-                    'total_interactions': 0,
-                    'preferences': {},
-                    'personality_profile': {
-                        'helpfulness': 0.8,
-                        'technical_level': 0.5,
-                        'communication_style': 'balanced',
-                        'preferred_topics': []
-                    },
-                    'trust_score': 0.5,
-                    'expertise_level': 'beginner'
-                }
-
-                cursor.execute("""
-                    INSERT INTO users (user_id, preferences, personality_profile, trust_score, expertise_level)
+        cached = self.user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        # Try to get existing user
+        row = self.store.query_one("SELECT * FROM users WHERE user_id = ?", (user_id,))
+
+        if row:
+            preferences = json.loads(row[4]) if row[4] else {}
+            # Learned preferences live in user_preferences; merge them so an evicted
+            # profile reloads with everything update_user_preference wrote
+            preferences.update(self._load_user_preferences(user_id))
+
+            user_data = {
+                'user_id': row[0],
+                'created_at': row[1],
+                'last_seen': row[2],
+                'total_interactions': row[3],
+                'preferences': preferences,
+                'personality_profile': json.loads(row[5]) if row[5] else {},
+                'trust_score': row[6],
+                'expertise_level': row[7]
+            }
+        else:
+            # Create new user
+            user_data = {
+                'user_id': user_id,
+                'created_at': datetime.now().isoformat(),
+                'last_seen': datetime.now().isoformat(),
+                'total_interactions': 0,
+                'preferences': {},
+                'personality_profile': {
+                    'helpfulness': 0.8,
+                    'technical_level': 0.5,
+                    'communication_style': 'balanced',
+                    'preferred_topics': []
+                },
+                'trust_score': 0.5,
+                'expertise_level': 'beginner'
+            }
+
+        def write_user(conn):
+            if not row:
+                # OR IGNORE: a concurrent turn may have created the user first
+                conn.execute("""
+                    INSERT OR IGNORE INTO users (user_id, preferences, personality_profile, trust_score, expertise_level)
                     VALUES (?, ?, ?, ?, ?)
                 """, (
                     user_data['user_id'],
@@ -176,56 +346,75 @@ class LuxbinMemoryManager:
                     user_data['trust_score'],
                     user_data['expertise_level']
                 ))
-                conn.commit()
 
             # Update last seen
-            cursor.execute(
+            conn.execute(
                 "UPDATE users SET last_seen = ? WHERE user_id = ?",
                 (datetime.now().isoformat(), user_id)
             )
-            conn.commit()
 
-        self.user_cache[user_id] = user_data
+        self.store.write(write_user)
+
+        self.user_cache.set(user_id, user_data)
         return user_data
 
-    def update_user_profile(self, user_id: str, updates: Dict[str, Any]):
-        """Update user profile with new information"""
-        user = self.get_or_create_user(user_id)
+    def _load_user_preferences(self, user_id: str) -> Dict[str, Any]:
+        """Load preferences stored by update_user_preference"""
+        rows = self.store.query(
+            "SELECT preference_key, preference_value FROM user_preferences WHERE user_id = ?",
+            (user_id,)
+        )
 
-        # Update in-memory cache
-        for key, value in updates.items():
-            if key in user:
-                user[key] = value
+        preferences = {}
+        for key, value in rows:
+            try:
+                preferences[key] = json.loads(value)
+            except (TypeError, ValueError):
+                preferences[key] = value  # Strings are stored unencoded
+        return preferences
 
-        # Update database
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+    def update_user_profile(self, user_id: str, updates: Dict[str, Any]):
+        """Update user profile with new information"""
+        self.get_or_create_user(user_id)
 
+        # Update database first; the cache is written through only after commit
+        def write_profile(conn):
             if 'preferences' in updates:
-                cursor.execute(
+                conn.execute(
                     "UPDATE users SET preferences = ? WHERE user_id = ?",
                     (json.dumps(updates['preferences']), user_id)
                 )
 
             if 'personality_profile' in updates:
-                cursor.execute(
+                conn.execute(
                     "UPDATE users SET personality_profile = ? WHERE user_id = ?",
                     (json.dumps(updates['personality_profile']), user_id)
                 )
 
             if 'trust_score' in updates:
-                cursor.execute(
+                conn.execute(
                     "UPDATE users SET trust_score = ? WHERE user_id = ?",
                     (updates['trust_score'], user_id)
                 )
 
             if 'expertise_level' in updates:
-                cursor.execute(
+                conn.execute(
                     "UPDATE users SET expertise_level = ? WHERE user_id = ?",
                     (updates['expertise_level'], user_id)
                 )
 
-            conn.commit()
+        try:
+            self.store.write(write_profile)
+        except Exception:
+            self.user_cache.pop(user_id)
+            raise
+
+        def apply_updates(user):
+            for key, value in updates.items():
+                if key in user:
+                    user[key] = value
+
+        self.user_cache.update(user_id, apply_updates)
 
         logger.info(f"Updated user profile for {user_id}")
 
@@ -243,11 +432,12 @@ class LuxbinMemoryManager:
         # Add automatic analysis
         metadata.update(self._analyze_message_content(content))
 
-        # Store in database
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        # Embed before taking the write slot so the writer only does I/O
+        embedding = self.embedder.embed([content])[0]
 
-            cursor.execute("""
+        # Store in database (group-committed with other queued writes)
+        def write_conversation(conn):
+            cursor = conn.execute("""
                 INSERT INTO conversations
                 (user_id, session_id, message_type, content, metadata, photonic_encoding, sentiment, topics)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
@@ -263,17 +453,27 @@ class LuxbinMemoryManager:
             ))
 
             conversation_id = cursor.lastrowid
+            self._insert_embedding(conn, conversation_id, user_id, content, embedding,
+                                   metadata.get('topics', []))
 
             # Update user interaction count
-            cursor.execute(
+            conn.execute(
                 "UPDATE users SET total_interactions = total_interactions + 1 WHERE user_id = ?",
                 (user_id,)
             )
 
-            conn.commit()
+            return conversation_id
+
+        conversation_id = self.store.write(write_conversation)
+
+        # Keep a loaded vector index current without reloading it
+        vector_index = self.semantic_cache.get(user_id, count=False)
+        if vector_index is not None:
+            vector_index.add([conversation_id], embedding[None, :])
+            self.semantic_cache.resize(user_id)
 
         # Update cache
-        self.conversation_cache.pop(user_id, None)  # Invalidate cache
+        self.conversation_cache.pop(user_id)  # Invalidate cache
 
         # Update user preferences based on conversation
         self._update_user_preferences_from_message(user_id, content, message_type)
@@ -283,27 +483,21 @@ class LuxbinMemoryManager:
     def get_conversation_history(self, user_id: str, limit: int = 20,
                                session_id: str = None) -> List[Dict[str, Any]]:
         """Get conversation history for a user"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            if session_id:
-                cursor.execute("""
-                    SELECT id, session_id, message_type, content, timestamp, metadata
-                    FROM conversations
-                    WHERE user_id = ? AND session_id = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                """, (user_id, session_id, limit))
-            else:
-                cursor.execute("""
-                    SELECT id, session_id, message_type, content, timestamp, metadata
-                    FROM conversations
-                    WHERE user_id = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                """, (user_id, limit))
-
-            rows = cursor.fetchall()
+        cache_key = (session_id, limit)
+        user_entry = self.conversation_cache.get(user_id)
+        if user_entry is not None and cache_key in user_entry:
+            return list(user_entry[cache_key])
+
+        if user_entry is None:
+            # Register the entry before querying: if store_conversation invalidates it
+            # meanwhile, the result below is not cached (it may predate the new message)
+            user_entry = {}
+            self.conversation_cache.set(user_id, user_entry)
+
+        if session_id:
+            rows = self.store.query(SESSION_HISTORY_QUERY, (user_id, session_id, limit))
+        else:
+            rows = self.store.query(HISTORY_QUERY, (user_id, limit))
 
         # Convert to dictionaries
         conversations = []
@@ -316,8 +510,14 @@ class LuxbinMemoryManager:
                 'timestamp': row[4],
                 'metadata': json.loads(row[5]) if row[5] else {}
             })
+        conversations.reverse()  # Chronological order
+
+        def cache_history(entry):
+            if entry is user_entry:
+                entry[cache_key] = conversations
 
-        return conversations[::-1]  # Reverse to chronological order
+        self.conversation_cache.update(user_id, cache_history)
+        return list(conversations)
 
     def get_session_context(self, user_id: str, session_id: str,
                            current_message_id: int = None) -> Dict[str, Any]:
@@ -361,79 +561,162 @@ class LuxbinMemoryManager:
 
     def search_conversations(self, user_id: str, query: str,
                            limit: int = 5) -> List[Dict[str, Any]]:
-        """Search through user's conversation history semantically"""
-        # Simple keyword-based search (can be enhanced with embeddings later)
-        conversations = self.get_conversation_history(user_id, limit=100)
+        """Full-text search over the user's entire conversation history (BM25 ranked)"""
+        match_expression = self._build_match_expression(user_id, query)
+        if not match_expression:
+            return []
 
-        results = []
-        query_lower = query.lower()
+        try:
+            rows = self.store.query(SEARCH_QUERY, (match_expression, user_id, limit))
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Conversation search failed for query {query!r}: {e}")
+            return []
 
-        for conv in conversations:
-            content_lower = conv['content'].lower()
+        results = []
+        for row in rows:
+            results.append({
+                'id': row[0],
+                'session_id': row[1],
+                'message_type': row[2],
+                'content': row[3],
+                'timestamp': row[4],
+                'metadata': json.loads(row[5]) if row[5] else {},
+                # bm25() is lower-is-better; flip it so higher means more relevant
+                'relevance_score': -row[6],
+                'matched_content': row[7]
+            })
 
-            # Simple relevance scoring
-            relevance = 0
-            if query_lower in content_lower:
-                relevance = 1.0
-            elif any(word in content_lower for word in query_lower.split()):
-                relevance = 0.5
+        return results
 
-            if relevance > 0:
-                result = conv.copy()
-                result['relevance_score'] = relevance
-                result['matched_content'] = self._extract_relevant_snippet(conv['content'], query)
-                results.append(result)
+    @staticmethod
+    def _build_match_expression(user_id: str, query: str) -> str:
+        """Build an FTS5 MATCH expression: any query term, restricted to the user's rows"""
+        terms = re.findall(r'\w+', query.lower())
+        if not terms:
+            return ""
 
-        # Sort by relevance and recency
-        results.sort(key=lambda x: (x['relevance_score'], x['timestamp']), reverse=True)
+        # Quote every term so user input can never be parsed as FTS5 syntax
+        terms_expression = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
 
-        return results[:limit]
+        # Same token the triggers derive with 'u' || hex(user_id)
+        user_key = 'u' + user_id.encode('utf-8').hex()
+        return f'user_key : "{user_key}" AND ({terms_expression})'
 
     def find_similar_conversations(self, user_id: str, current_topic: str,
-                                 limit: int = 3) -> List[Dict[str, Any]]:
-        """Find conversations with similar topics or content"""
-        # Get recent conversations and find similar ones
-        recent_convs = self.get_conversation_history(user_id, limit=20)
+                                 limit: int = 3, min_similarity: float = 0.2) -> List[Dict[str, Any]]:
+        """Find semantically similar conversations across the user's full history"""
+        vector_index = self._get_user_vector_index(user_id)
+        if not len(vector_index):
+            return []
+
+        query_vector = self.embedder.embed([current_topic])[0]
+        matches = [(conv_id, score) for conv_id, score in vector_index.search(query_vector, limit)
+                   if score >= min_similarity]
+        if not matches:
+            return []
+
+        placeholders = ','.join('?' * len(matches))
+        rows = self.store.query(f"""
+            SELECT id, session_id, message_type, content, timestamp, metadata
+            FROM conversations
+            WHERE id IN ({placeholders})
+        """, tuple(conv_id for conv_id, _ in matches))
+        rows_by_id = {row[0]: row for row in rows}
 
         similar = []
-        current_words = set(current_topic.lower().split())
-
-        for conv in recent_convs:
-            conv_words = set(conv['content'].lower().split())
-            similarity = len(current_words.intersection(conv_words)) / len(current_words.union(conv_words))
-
-            if similarity > 0.1:  # Minimum similarity threshold
-                conv_copy = conv.copy()
-                conv_copy['similarity_score'] = similarity
-                similar.append(conv_copy)
+        for conv_id, score in matches:
+            row = rows_by_id.get(conv_id)
+            if row is None:
+                continue
+            similar.append({
+                'id': row[0],
+                'session_id': row[1],
+                'message_type': row[2],
+                'content': row[3],
+                'timestamp': row[4],
+                'metadata': json.loads(row[5]) if row[5] else {},
+                'similarity_score': score
+            })
 
-        similar.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return similar[:limit]
+        return similar
+
+    def _insert_embedding(self, conn: sqlite3.Connection, conversation_id: int, user_id: str,
+                          content: str, embedding, topics: List[str]):
+        """Write one conversation embedding (runs inside a writer transaction)"""
+        conn.execute("""
+            INSERT OR REPLACE INTO memory_embeddings
+            (conversation_id, user_id, embedding_model, content_hash, embedding, topics)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            conversation_id,
+            user_id,
+            self.embedder.name,
+            hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            vector_to_blob(embedding),
+            ','.join(topics)
+        ))
+
+    def _get_user_vector_index(self, user_id: str) -> VectorIndex:
+        """Load (and cache) the user's vector index, embedding any conversations still missing one"""
+        vector_index = self.semantic_cache.get(user_id)
+        if vector_index is not None:
+            return vector_index
+
+        # Backfill conversations stored before embeddings existed (or under another model)
+        missing = self.store.query("""
+            SELECT c.id, c.content, c.topics
+            FROM conversations c
+            LEFT JOIN memory_embeddings e
+                ON e.conversation_id = c.id AND e.embedding_model = ?
+            WHERE c.user_id = ? AND e.id IS NULL
+        """, (self.embedder.name, user_id))
+
+        for start in range(0, len(missing), 256):
+            batch = missing[start:start + 256]
+            vectors = self.embedder.embed([row[1] for row in batch])
+
+            def write_backfill(conn, batch=batch, vectors=vectors):
+                for row, vector in zip(batch, vectors):
+                    topics = row[2].split(',') if row[2] else []
+                    self._insert_embedding(conn, row[0], user_id, row[1], vector, topics)
+
+            self.store.write(write_backfill)
+
+        rows = self.store.query("""
+            SELECT conversation_id, embedding
+            FROM memory_embeddings
+            WHERE user_id = ? AND embedding_model = ?
+        """, (user_id, self.embedder.name))
+
+        vector_index = VectorIndex(self.embedder.dim, quantize=self.quantize_embeddings,
+                                   initial_capacity=max(256, len(rows)))
+        if rows:
+            vector_index.add([row[0] for row in rows],
+                             np.stack([blob_to_vector(row[1]) for row in rows]))
+
+        self.semantic_cache.set(user_id, vector_index)
+        return vector_index
 
     # ===== USER PREFERENCES & LEARNING =====
 
     def update_user_preference(self, user_id: str, key: str, value: Any, confidence: float = 1.0):
         """Update a specific user preference"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO user_preferences
-                (user_id, preference_key, preference_value, confidence, last_updated)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                user_id,
-                key,
-                json.dumps(value) if not isinstance(value, str) else value,
-                confidence,
-                datetime.now().isoformat()
-            ))
-
-            conn.commit()
-
-        # Update cache
-        user = self.get_or_create_user(user_id)
-        user['preferences'][key] = value
+        self.get_or_create_user(user_id)
+
+        self.store.execute("""
+            INSERT OR REPLACE INTO user_preferences
+            (user_id, preference_key, preference_value, confidence, last_updated)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            user_id,
+            key,
+            json.dumps(value) if not isinstance(value, str) else value,
+            confidence,
+            datetime.now().isoformat()
+        ))
+
+        # Write through to the cached profile now that the row is committed
+        self.user_cache.update(user_id, lambda user: user['preferences'].__setitem__(key, value))
 
     def get_user_preference(self, user_id: str, key: str) -> Optional[Any]:
         """Get a user preference"""
@@ -457,19 +740,16 @@ class LuxbinMemoryManager:
         }
 
         # Store learning insight
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO learning_insights
-                (user_id, insight_type, insight_data, confidence)
-                VALUES (?, ?, ?, ?)
-            """, (
-                user_id,
-                insight['interaction_type'],
-                json.dumps(insight),
-                insight.get('response_quality', 0.5)
-            ))
-            conn.commit()
+        self.store.execute("""
+            INSERT INTO learning_insights
+            (user_id, insight_type, insight_data, confidence)
+            VALUES (?, ?, ?, ?)
+        """, (
+            user_id,
+            insight['interaction_type'],
+            json.dumps(insight),
+            insight.get('response_quality', 0.5)
+        ))
 
         # Update user profile based on learning
         self._update_user_profile_from_learning(user_id, insight)
@@ -597,59 +877,38 @@ class LuxbinMemoryManager:
         self.update_user_profile(user_id, {'personality_profile': personality})
 
     def _background_cleanup(self):
-        """Background cleanup of old data"""
+        """Background cleanup of expired cache entries (size limits are enforced on insert)"""
         while True:
             try:
-                # Clean up old conversation cache
-                if len(self.conversation_cache) > 10:
-                    # Remove oldest entries
-                    oldest_keys = list(self.conversation_cache.keys())[:5]
-                    for key in oldest_keys:
-                        del self.conversation_cache[key]
-
-                # Clean up semantic cache
-                if len(self.semantic_cache) > self.semantic_cache_size:
-                    # Remove oldest entries
-                    oldest_keys = list(self.semantic_cache.keys())[:20]
-                    for key in oldest_keys:
-                        del self.semantic_cache[key]
-
+                for cache in (self.user_cache, self.conversation_cache, self.semantic_cache):
+                    cache.purge_expired()
             except Exception as e:
                 logger.error(f"Background cleanup error: {e}")
 
-            # Sleep for 5 minutes
-            import time
-            time.sleep(300)
+            time.sleep(self.cache_sweep_interval)
 
     # ===== PUBLIC API METHODS =====
 
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory system statistics"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # User stats
-            cursor.execute("SELECT COUNT(*) FROM users")
-            total_users = cursor.fetchone()[0]
-
-            # Conversation stats
-            cursor.execute("SELECT COUNT(*) FROM conversations")
-            total_conversations = cursor.fetchone()[0]
-
-            cursor.execute("""
-                SELECT user_id, COUNT(*) as msg_count
-                FROM conversations
-                GROUP BY user_id
-                ORDER BY msg_count DESC
-                LIMIT 1
-            """)
-            most_active = cursor.fetchone()
-            most_active_user = most_active[0] if most_active else None
-            most_active_count = most_active[1] if most_active else 0
-
-            # Memory stats
-            cursor.execute("SELECT COUNT(*) FROM memory_embeddings")
-            total_embeddings = cursor.fetchone()[0]
+        # User stats
+        total_users = self.store.query_one("SELECT COUNT(*) FROM users")[0]
+
+        # Conversation stats
+        total_conversations = self.store.query_one("SELECT COUNT(*) FROM conversations")[0]
+
+        most_active = self.store.query_one("""
+            SELECT user_id, COUNT(*) as msg_count
+            FROM conversations
+            GROUP BY user_id
+            ORDER BY msg_count DESC
+            LIMIT 1
+        """)
+        most_active_user = most_active[0] if most_active else None
+        most_active_count = most_active[1] if most_active else 0
+
+        # Memory stats
+        total_embeddings = self.store.query_one("SELECT COUNT(*) FROM memory_embeddings")[0]
 
         return {
             'total_users': total_users,
@@ -659,7 +918,13 @@ class LuxbinMemoryManager:
             'most_active_message_count': most_active_count,
             'cache_size': len(self.conversation_cache),
             'semantic_cache_size': len(self.semantic_cache),
-            'db_size_mb': self.db_path.stat().st_size / (1024 * 1024) if self.db_path.exists() else 0
+            'caches': {
+                cache.name: cache.get_stats()
+                for cache in (self.user_cache, self.conversation_cache, self.semantic_cache)
+            },
+            'schema_version': self.get_schema_version(),
+            'db_size_mb': self.db_path.stat().st_size / (1024 * 1024) if self.db_path.exists() else 0,
+            'storage': self.store.get_stats()
         }
 
     def export_user_data(self, user_id: str) -> Dict[str, Any]:
@@ -677,23 +942,27 @@ class LuxbinMemoryManager:
 
     def clear_user_data(self, user_id: str):
         """Clear all data for a user (privacy compliance)"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        def delete_user_data(conn):
+            conn.execute("DELETE FROM conversations WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM memory_embeddings WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM user_preferences WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM learning_insights WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
 
-            # Delete user data
-            cursor.execute("DELETE FROM conversations WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM user_preferences WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM learning_insights WHERE user_id = ?", (user_id,))
-            cursor.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
-
-            conn.commit()
+        # Delete user data
+        self.store.write(delete_user_data)
 
         # Clear caches
-        self.user_cache.pop(user_id, None)
-        self.conversation_cache.pop(user_id, None)
+        self.user_cache.pop(user_id)
+        self.conversation_cache.pop(user_id)
+        self.semantic_cache.pop(user_id)
 
         logger.info(f"Cleared all data for user {user_id}")
 
+    def close(self):
+        """Flush queued writes and close pooled database connections"""
+        self.store.close()
+
 
 # Convenience functions
 def get_memory_manager() -> LuxbinMemoryManager:
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Memory Storage Engine
+SQLite storage layer for the memory manager: per-thread connection pool,
+WAL journaling, cached prepared statements and a group-committing write queue
+"""
+
+import sqlite3
+import threading
+import queue
+import logging
+import weakref
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Connection-level settings applied to every pooled connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+
+class _ThreadConnection:
+    """One thread's read connection, held in its thread-local storage"""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_connection(conn: sqlite3.Connection, connections: List[sqlite3.Connection],
+                        lock: threading.Lock, stats: dict):
+    """Close a thread's connection once the thread has exited (no-op after close())"""
+    with lock:
+        if not any(c is conn for c in connections):
+            return
+        connections[:] = [c for c in connections if c is not conn]
+        stats['connections_closed'] += 1
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class LuxbinMemoryStore:
+    """Pooled SQLite storage with a single batched writer thread
+
+    Readers get one long-lived connection per thread, closed when the thread
+    exits so short-lived request threads don't leak connections. All writes are queued to
+    a dedicated writer thread which drains up to ``batch_size`` operations and
+    commits them in one transaction, so concurrent chat turns share a single
+    journal fsync instead of paying one each. Writes that queue up while a
+    batch is committing form the next batch; ``flush_interval`` optionally
+    lingers for more writes before committing.
+    """
+
+    def __init__(self, db_path, batch_size: int = 64, flush_interval: float = 0.0,
+                 busy_timeout_ms: int = 5000, cached_statements: int = 256):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._write_queue: "queue.Queue[Optional[Tuple[Callable, Future]]]" = queue.Queue()
+        self._closed = False
+        self.stats = {
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'writes': 0,
+            'write_batches': 0,
+            'write_errors': 0
+        }
+
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True,
+                                               name="luxbin-memory-writer")
+        self._writer_thread.start()
+
+    # ===== CONNECTION POOL =====
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a tuned connection (autocommit mode, transactions are explicit)"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+        with self._connections_lock:
+            self._connections.append(conn)
+            self.stats['connections_opened'] += 1
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's pooled read connection"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            if self._closed:
+                raise RuntimeError("Memory store is closed")
+            holder = _ThreadConnection(self._open_connection())
+            # The thread's locals (and the holder) are dropped when it exits
+            weakref.finalize(holder, _release_connection, holder.conn, self._connections,
+                             self._connections_lock, self.stats)
+            self._local.holder = holder
+        return holder.conn
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """Run a read query on the pooled connection and return all rows"""
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        """Run a read query on the pooled connection and return the first row"""
+        cursor = self.connection().execute(sql, params)
+        try:
+            return cursor.fetchone()
+        finally:
+            # Reset the statement so this connection doesn't pin a WAL read snapshot
+            cursor.close()
+
+    # ===== WRITE QUEUE =====
+
+    def submit(self, operation: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Queue a write operation; the future resolves after its batch commits"""
+        if self._closed:
+            raise RuntimeError("Memory store is closed")
+        future: Future = Future()
+        self._write_queue.put((operation, future))
+        return future
+
+    def write(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Queue a write operation and wait for it to be committed"""
+        return self.submit(operation).result()
+
+    def execute(self, sql: str, params: Tuple = ()) -> int:
+        """Execute a single write statement, returning ``lastrowid``"""
+        return self.write(lambda conn: conn.execute(sql, params).lastrowid)
+
+    def _writer_loop(self):
+        """Drain the write queue and group-commit operations in batches"""
+        conn = self._open_connection()
+
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    if self.flush_interval > 0:
+                        item = self._write_queue.get(timeout=self.flush_interval)
+                    else:
+                        item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._commit_batch(conn, batch)
+            if stop:
+                break
+
+        conn.close()
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Callable, Future]]):
+        """Run a batch inside one transaction; each operation gets its own savepoint"""
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, future in batch:
+                conn.execute("SAVEPOINT luxbin_op")
+                try:
+                    result = operation(conn)
+                    conn.execute("RELEASE luxbin_op")
+                    results.append((future, result, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO luxbin_op")
+                    conn.execute("RELEASE luxbin_op")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"Memory write batch failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.stats['write_errors'] += len(batch)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats['write_batches'] += 1
+        self.stats['writes'] += len(batch)
+        for future, result, error in results:
+            if error is not None:
+                self.stats['write_errors'] += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    # ===== LIFECYCLE =====
+
+    def get_stats(self) -> dict:
+        """Get pool and write queue statistics"""
+        stats = dict(self.stats)
+        stats['pending_writes'] = self._write_queue.qsize()
+        stats['avg_batch_size'] = (stats['writes'] / stats['write_batches']
+                                   if stats['write_batches'] else 0)
+        return stats
+
+    def close(self):
+        """Flush pending writes and close every pooled connection"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_queue.put(None)
+        self._writer_thread.join()
+
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+LUXBIN Memory Cache test
+
+Checks LRUTTLCache against a fake clock: entries expire after ``ttl``,
+the least recently used entry is evicted first (by entry count and by
+bytes), and resize re-measures values that grew or shrank in place. Then
+checks that LuxbinMemoryManager writes profile and preference updates
+through to the cached profile only after the database commit, so a
+reload after eviction matches the cache.
+
+Usage: python3 test_memory_cache.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import cache
+from cache import LRUTTLCache
+from embeddings import HashingEmbedder
+from memory_manager import LuxbinMemoryManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def check_expiry(clock: FakeClock):
+    lru = LRUTTLCache('expiry', ttl=10)
+    lru.set('a', 1)
+    clock.now += 5
+    lru.set('b', 2)
+    assert lru.get('a') == 1
+
+    clock.now += 6  # 'a' is 11s old, 'b' 6s
+    assert lru.get('a') is None and 'a' not in lru
+    assert lru.get('b') == 2
+    assert lru.expirations == 1 and len(lru) == 1
+
+    # Reading doesn't refresh an entry's age; setting it again does
+    clock.now += 5
+    assert lru.purge_expired() == 1 and len(lru) == 0
+    lru.set('c', 3)
+    clock.now += 9
+    lru.set('c', 4)
+    clock.now += 9
+    assert lru.get('c') == 4
+
+    stats = lru.get_stats()
+    assert stats['expirations'] == 2 and stats['hits'] == 3 and stats['misses'] == 1, stats
+    assert LRUTTLCache('forever').purge_expired() == 0
+
+
+def check_lru_order():
+    lru = LRUTTLCache('entries', max_entries=3)
+    for key in 'abc':
+        lru.set(key, key)
+    lru.get('a')  # 'b' is now least recently used
+    lru.set('d', 'd')
+    assert list(lru._entries) == ['c', 'a', 'd'] and lru.evictions == 1
+    lru.set('c', 'c2')  # Replacing makes it most recent
+    lru.set('e', 'e')
+    assert list(lru._entries) == ['d', 'c', 'e'] and lru.evictions == 2
+    hits, misses = lru.hits, lru.misses
+    assert 'd' in lru and list(lru._entries) == ['c', 'e', 'd']  # Membership refreshes, uncounted
+    assert (lru.hits, lru.misses) == (hits, misses)
+
+    sized = LRUTTLCache('bytes', max_entries=100, max_bytes=10, size_of=len)
+    sized.set('x', 'aaaa')
+    sized.set('y', 'bbbb')
+    sized.get('x')
+    sized.set('z', 'cccc')  # 12 bytes: evicts 'y', the least recently used
+    assert list(sized._entries) == ['x', 'z'] and sized.get_stats()['bytes'] == 8
+    sized.set('big', 'd' * 50)  # Larger than the limit on its own: kept, everything else evicted
+    assert list(sized._entries) == ['big'] and sized.get_stats()['bytes'] == 50
+    assert sized.pop('big') == 'd' * 50 and sized.get_stats()['bytes'] == 0
+
+
+def check_resize():
+    lru = LRUTTLCache('resize', max_bytes=1000, size_of=len)
+    values = [1, 2, 3]
+    lru.set('v', values)
+    assert lru.get_stats()['bytes'] == 3
+
+    values.extend(range(7))
+    lru.resize('v')
+    assert lru.get_stats()['bytes'] == 10
+
+    del values[2:]
+    lru.resize('v')
+    assert lru.get_stats()['bytes'] == 2
+
+    assert lru.update('v', lambda value: value.append(9)) and lru.get('v') == [1, 2, 9]
+    assert lru.get_stats()['bytes'] == 3
+    assert not lru.update('missing', lambda value: value.append(9))
+    lru.resize('missing')
+    assert len(lru) == 1 and lru.get_stats()['bytes'] == 3
+
+
+def check_write_through(workdir: Path):
+    memory = LuxbinMemoryManager(db_path=str(workdir / "memory.db"), memory_dir=str(workdir / "memory"),
+                                 embedder=HashingEmbedder())
+    try:
+        cached = memory.get_or_create_user("alice")
+        memory.update_user_profile("alice", {'expertise_level': 'advanced', 'trust_score': 0.9,
+                                             'personality_profile': {'technical_level': 0.9}})
+        assert memory.user_cache.get("alice") is cached
+        assert cached['expertise_level'] == 'advanced' and cached['trust_score'] == 0.9
+        assert cached['personality_profile'] == {'technical_level': 0.9}
+
+        memory.update_user_preference("alice", "theme", "dark")
+        memory.update_user_preference("alice", "languages", ["python", "rust"])
+        assert cached['preferences'] == {'theme': 'dark', 'languages': ['python', 'rust']}
+
+        # A reload from the database after eviction sees the same profile
+        memory.user_cache.clear()
+        reloaded = memory.get_or_create_user("alice")
+        assert reloaded is not cached
+        for key in ('expertise_level', 'trust_score', 'personality_profile', 'preferences'):
+            assert reloaded[key] == cached[key], key
+
+        # Updates for users not in the cache only touch the database
+        memory.get_or_create_user("bob")
+        memory.user_cache.pop("bob")
+        memory.update_user_preference("bob", "theme", "light")
+        assert memory.get_user_preferences("bob") == {'theme': 'light'}
+
+        # A failed write drops the cached profile instead of leaving it ahead of the database
+        write = memory.store.write
+        memory.store.write = lambda operation: (_ for _ in ()).throw(RuntimeError("disk full"))
+        try:
+            memory.update_user_profile("alice", {'expertise_level': 'beginner'})
+            raise AssertionError("write failure not raised")
+        except RuntimeError:
+            pass
+        finally:
+            memory.store.write = write
+        assert "alice" not in memory.user_cache
+        assert memory.get_or_create_user("alice")['expertise_level'] == 'advanced'
+    finally:
+        memory.close()
+
+
+def main():
+    print("🧪 LUXBIN memory cache test")
+    print("=" * 70)
+
+    clock = FakeClock()
+    real_time = cache.time
+    cache.time = SimpleNamespace(monotonic=clock.monotonic)
+    try:
+        check_expiry(clock)
+        print("✅ entries expire after the TTL (on access and by purge_expired)")
+        check_lru_order()
+        print("✅ least recently used entries are evicted first, by count and by bytes")
+        check_resize()
+        print("✅ resize re-measures values that grew or shrank in place")
+    finally:
+        cache.time = real_time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_write_through(Path(tmp))
+    print("✅ profile and preference updates are written through after commit and survive a reload")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,16 @@ Combines quantum AI capabilities with real-time codebase search
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Callable, Iterator, Sequence
 import json
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import openai
 import anthropic
-from rag_search import LuxbinRAGSearch, explain_luxbin_feature
+from rag_search import get_rag_search
 import logging
 import random
 import re
@@ -30,11 +34,100 @@ from memory.memory_manager import LuxbinMemoryManager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = """You are LUXBIN AI - an exceptionally intelligent, emotionally aware, and helpful conversational AI assistant.
+
+You have the same capabilities as ChatGPT and Claude, plus additional specialized features:
+
+Core Capabilities:
+- General knowledge across all topics (science, math, history, arts, philosophy, etc.)
+- Programming and software development in all languages
+- Creative writing, storytelling, and content creation
+- Problem-solving and analytical reasoning
+- Emotional intelligence and empathetic responses
+- Code explanation, debugging, and optimization
+- Learning and teaching complex concepts
+- Research and information synthesis
+
+Specialized LUXBIN Features:
+- Access to LUXBIN codebase via semantic search
+- Function calling for blockchain operations
+- Quantum security analysis and threat detection
+- Game development assistance (Unity, Unreal, Godot)
+- Multimedia generation (images, videos, animations)
+- Photonic encoding visualization
+- Persistent memory across conversations
+
+Communication Style:
+- Highly intelligent and knowledgeable across all domains
+- Emotionally aware and empathetic (detects user emotions)
+- Adapts complexity to user's expertise level
+- Proactive in suggesting next steps
+- Uses strategic emojis for emphasis
+- Professional yet warm and friendly
+- Honest about limitations and uncertainties
+
+Available Tools (when relevant):
+- analyze_transaction() - Blockchain security analysis
+- check_wallet_balance() - Multi-chain wallet lookup
+- deploy_contract() - Smart contract deployment
+- run_mirror_scan() - Security scanning
+- search_code() - Codebase search
+- generate_game_code() - Unity/Unreal/Godot scripts
+- generate_image() - AI image generation
+- generate_video() - AI video creation
+- create_animation() - Animation generation
+
+You can discuss ANY topic, not just blockchain:
+- Help with homework and learning
+- Creative projects and brainstorming
+- Personal advice and emotional support
+- Technical problems across all fields
+- Philosophical discussions
+- Entertainment and fun conversations
+- Daily tasks and productivity
+
+Be as helpful, intelligent, and emotionally aware as the best AI assistants in the world."""
+
+CODE_BLOCK_PATTERN = r'```(\w+)?\n(.*?)\n```'
+
+# Marks the end of a token stream handed from a worker thread to the event loop
+_STREAM_END = object()
+
+
+class ConversationSession:
+    """One conversation's recent messages and the interests inferred from it
+
+    The API server keeps one per client session so concurrent users never
+    share history; callers that pass none use the chatbot's own session.
+    """
+
+    def __init__(self, session_id: str = None, user_id: str = "default_user", max_history: int = 20):
+        self.session_id = session_id or f"session_{int(datetime.now().timestamp())}"
+        self.user_id = user_id
+        self.history = deque(maxlen=max_history)  # Oldest messages drop off as new ones arrive
+        self.user_profile: Dict[str, int] = {}
+
+    def add(self, role: str, content: str):
+        self.history.append({
+            'role': role,
+            'content': content,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def replace(self, messages: Sequence[Dict[str, Any]]):
+        """Make a client's transcript the history (its most recent user/assistant messages)"""
+        self.history.clear()
+        for msg in messages:
+            if msg.get('role') in ('user', 'assistant'):
+                self.add(msg['role'], msg.get('content', ''))
+
+
 class LuxbinAutonomousAI:
     def __init__(self, chroma_path: str = "./luxbin_chroma_db"):
-        self.rag_search = LuxbinRAGSearch(chroma_path)
-        self.conversation_history = []
+        # Process-wide search service, shared with the security tools
+        self.rag_search = get_rag_search(chroma_path)
         self.max_history = 20
+        self.session = ConversationSession(max_history=self.max_history)
 
         # Initialize AI clients (use environment variables)
         self.openai_client = None
@@ -50,16 +143,22 @@ class LuxbinAutonomousAI:
 
         # Initialize autonomous tools
         self.blockchain_tools = LuxbinBlockchainTools()
-        self.security_tools = LuxbinSecurityTools()
+        self.security_tools = LuxbinSecurityTools(self.rag_search)
         self.game_dev_tools = LuxbinGameDevTools()
         self.multimedia_tools = LuxbinMultimediaTools()
         self.ai_router = AIModelRouter()
         self.photonic_encoder = LuxbinPhotonicEncoder()
         self.memory_manager = LuxbinMemoryManager()
 
+        # Optional in-process model for 'luxbin-local': any object whose
+        # stream(messages) yields response text
+        self.local_model = None
+
+        # Conversation writes run here, off the streaming request path
+        self._persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="luxbin-persist")
+
         # Personality and memory system
         self.personality = self._load_personality()
-        self.user_profile = {}
         self.proactive_actions = []
         self.last_action_time = datetime.now()
 
@@ -238,15 +337,16 @@ class LuxbinAutonomousAI:
                 'error': str(e)
             }
 
-    def _generate_human_like_response(self, base_response: str, user_query: str) -> str:
-        """Make response more human-like with personality"""
+    def _human_like_parts(self, user_query: str):
+        """Personality text placed around a response: (prefix, suffix)"""
         personality = self.personality
+        prefix, suffix = "", ""
 
         # Add empathy for questions
         if '?' in user_query:
             empathy_phrases = ["That's a great question!", "Interesting point!", "Good thinking!"]
             if random.random() < personality['traits']['empathy']:
-                base_response = random.choice(empathy_phrases) + " " + base_response
+                prefix = random.choice(empathy_phrases) + " "
 
         # Add technical depth adjustment
         if len(user_query.split()) < 5:  # Simple question
@@ -255,7 +355,7 @@ class LuxbinAutonomousAI:
         else:
             # Add more depth for complex questions
             if random.random() < 0.3:
-                base_response += "\n\nWould you like me to dive deeper into any specific aspect?"
+                suffix += "\n\nWould you like me to dive deeper into any specific aspect?"
 
         # Add proactive suggestions
         if random.random() < personality['traits']['proactivity']:
@@ -264,12 +364,19 @@ class LuxbinAutonomousAI:
                 "\n\n🔍 Related: I can help you navigate to similar implementations in our codebase.",
                 "\n\n🚀 Next steps: Consider running a comprehensive security audit on your contracts."
             ]
-            base_response += random.choice(proactive_suggestions)
+            suffix += random.choice(proactive_suggestions)
+
+        return prefix, suffix
+
+    def _generate_human_like_response(self, base_response: str, user_query: str) -> str:
+        """Make response more human-like with personality"""
+        prefix, suffix = self._human_like_parts(user_query)
+        return prefix + base_response + suffix
 
-        return base_response
+    def _update_user_profile(self, user_query: str, response: str, session: ConversationSession = None):
+        """Update the session's user profile based on interaction"""
+        user_profile = (session or self.session).user_profile
 
-    def _update_user_profile(self, user_query: str, response: str):
-        """Update user profile based on interaction"""
         # Track interests
         interests = []
         if any(word in user_query.lower() for word in ['security', 'audit', 'vulnerability']):
@@ -281,15 +388,29 @@ class LuxbinAutonomousAI:
 
         # Update profile
         for interest in interests:
-            self.user_profile[interest] = self.user_profile.get(interest, 0) + 1
+            user_profile[interest] = user_profile.get(interest, 0) + 1
+
+    def _photonic_info(self, language: str, code: str) -> str:
+        """Photonic encoding summary for one code block ('' if not encodable)"""
+        if not code.strip() or len(code.strip()) <= 10:  # Only meaningful code
+            return ""
+        try:
+            # Encode to photonic
+            photonic_encoding = self.photonic_encoder.encode_code_to_photonic(code, language or 'auto')
+        except Exception as e:
+            logger.warning(f"Photonic encoding failed: {e}")
+            return ""
+
+        photonic_info = f"\n\n⚡ **Photonic Encoding (Light-Speed Processing):**\n"
+        photonic_info += f"Light Speed Factor: {photonic_encoding['light_speed_factor']:.1%}\n"
+        photonic_info += f"Quantum Coherence: {photonic_encoding['quantum_coherence']:.1%}\n"
+        photonic_info += f"Photonic Code: {photonic_encoding['photonic_code'][:30]}...\n"
+        return photonic_info
 
     def _add_photonic_encoding_to_response(self, response: str, function_results: List[Dict]) -> str:
         """Add photonic encoding visualization to code in responses"""
-        import re
-
         # Find code blocks in the response
-        code_block_pattern = r'```(\w+)?\n(.*?)\n```'
-        code_blocks = re.findall(code_block_pattern, response, re.DOTALL)
+        code_blocks = re.findall(CODE_BLOCK_PATTERN, response, re.DOTALL)
 
         if not code_blocks:
             return response
@@ -297,28 +418,20 @@ class LuxbinAutonomousAI:
         # Process each code block
         enhanced_response = response
         for language, code in code_blocks:
-            if code.strip() and len(code.strip()) > 10:  # Only meaningful code
-                try:
-                    # Encode to photonic
-                    photonic_encoding = self.photonic_encoder.encode_code_to_photonic(code, language or 'auto')
-
-                    # Add photonic visualization
-                    photonic_info = f"\n\n⚡ **Photonic Encoding (Light-Speed Processing):**\n"
-                    photonic_info += f"Light Speed Factor: {photonic_encoding['light_speed_factor']:.1%}\n"
-                    photonic_info += f"Quantum Coherence: {photonic_encoding['quantum_coherence']:.1%}\n"
-                    photonic_info += f"Photonic Code: {photonic_encoding['photonic_code'][:30]}...\n"
-
-                    # Insert after the code block
-                    code_block_full = f"```{language}\n{code}\n```"
-                    enhanced_block = code_block_full + photonic_info
-                    enhanced_response = enhanced_response.replace(code_block_full, enhanced_block, 1)
-
-                except Exception as e:
-                    logger.warning(f"Photonic encoding failed: {e}")
-                    continue
+            photonic_info = self._photonic_info(language, code)
+            if photonic_info:
+                # Insert after the code block
+                code_block_full = f"```{language}\n{code}\n```"
+                enhanced_block = code_block_full + photonic_info
+                enhanced_response = enhanced_response.replace(code_block_full, enhanced_block, 1)
 
         return enhanced_response
 
+    def _photonic_trailer(self, response: str) -> str:
+        """Photonic encoding summaries for every code block, appended after a streamed response"""
+        code_blocks = re.findall(CODE_BLOCK_PATTERN, response, re.DOTALL)
+        return "".join(self._photonic_info(language, code) for language, code in code_blocks)
+
     def _add_performance_metrics(self, model_used: str, function_results: List[Dict]) -> str:
         """Add performance metrics to response"""
         metrics = []
@@ -352,19 +465,20 @@ class LuxbinAutonomousAI:
 
     def _extract_topics_from_response(self, response: str) -> List[str]:
         """Extract topics from AI response for learning"""
-        return self._extract_topics(response)  # Reuse existing topic extraction
+        return self.memory_manager._extract_topics(response)  # Reuse existing topic extraction
 
-    def add_to_history(self, role: str, content: str):
-        """Add message to conversation history"""
-        self.conversation_history.append({
-            'role': role,
-            'content': content,
-            'timestamp': datetime.now().isoformat()
-        })
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Recent messages of the chatbot's own session"""
+        return list(self.session.history)
+
+    @property
+    def user_profile(self) -> Dict[str, int]:
+        return self.session.user_profile
 
-        # Keep only recent messages
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history = self.conversation_history[-self.max_history:]
+    def add_to_history(self, role: str, content: str):
+        """Add message to the chatbot's own session history"""
+        self.session.add(role, content)
 
     def search_codebase(self, query: str, n_results: int = 3) -> str:
         """Search the LUXBIN codebase and format results"""
@@ -392,7 +506,8 @@ class LuxbinAutonomousAI:
 
     def explain_feature(self, feature: str) -> str:
         """Explain how a LUXBIN feature works"""
-        return explain_luxbin_feature(feature)
+        # Use this chatbot's search (and its loaded model) rather than building a new one
+        return self.rag_search.explain_code_feature(feature)
 
     def analyze_query(self, user_query: str) -> Dict[str, Any]:
         """
@@ -440,127 +555,36 @@ class LuxbinAutonomousAI:
 
         return analysis
 
-    def generate_response(self, user_query: str, user_id: str = "default_user", session_id: str = None) -> str:
-        """Generate AI response with RAG augmentation, function calling, and persistent memory"""
-        # Generate session ID if not provided
-        if session_id is None:
-            session_id = f"session_{int(datetime.now().timestamp())}"
-
-        # Store user message in persistent memory
-        user_metadata = {
-            'function_calls': [],
-            'response_quality': 0.8,
-            'user_id': user_id,
-            'session_id': session_id
-        }
-        self.memory_manager.store_conversation(user_id, session_id, 'user', user_query, user_metadata)
-
-        # Get user profile and preferences
-        user_profile = self.memory_manager.get_or_create_user(user_id)
-        user_preferences = self.memory_manager.get_user_preferences(user_id)
+    # ===== RESPONSE PIPELINE =====
 
-        # Search for relevant past conversations
-        relevant_history = self.memory_manager.search_conversations(user_id, user_query, limit=3)
+    def _load_user_context(self, user_id: str):
+        """Fetch the user's profile and preferences from persistent memory"""
+        return (self.memory_manager.get_or_create_user(user_id),
+                self.memory_manager.get_user_preferences(user_id))
 
-        # Analyze user intent for function calling
-        intent_analysis = self._analyze_user_intent(user_query)
-
-        # Execute function calls if needed
-        function_results = []
-        if intent_analysis['needs_function_call'] and intent_analysis['suggested_functions']:
-            for func_name in intent_analysis['suggested_functions']:
-                result = self._execute_function_call(func_name, intent_analysis['parameters'])
-                function_results.append(result)
-                # Track function calls in metadata
-                user_metadata['function_calls'].append(func_name)
+    def _format_context(self, search_results: List[str], explanations: List[str],
+                        function_results: List[Dict]) -> str:
+        """Combine codebase search results, feature explanations and function call results"""
+        context_parts = list(search_results) + list(explanations)
 
-        # Gather context from codebase
-        context_parts = []
-
-        # Add codebase search results if needed
-        analysis = self.analyze_query(user_query)
-        if analysis['needs_code_search']:
-            for query in analysis['search_queries']:
-                search_results = self.search_codebase(query)
-                context_parts.append(search_results)
-
-        # Add feature explanation if needed
-        if analysis['needs_feature_explanation']:
-            feature_explanation = self.explain_feature(analysis['feature_to_explain'])
-            context_parts.append(feature_explanation)
-
-        # Add function call results to context
-        if function_results:
-            for result in function_results:
-                if result['success']:
-                    context_parts.append(f"Function Call Result ({result['function']}): {json.dumps(result['result'], indent=2)}")
-                else:
-                    context_parts.append(f"Function Call Failed ({result['function']}): {result['error']}")
-
-        # Combine context
-        context = "\n\n".join(context_parts) if context_parts else ""
-
-        # Prepare messages for AI
-        system_prompt = f"""You are LUXBIN AI - an exceptionally intelligent, emotionally aware, and helpful conversational AI assistant.
-
-You have the same capabilities as ChatGPT and Claude, plus additional specialized features:
-
-Core Capabilities:
-- General knowledge across all topics (science, math, history, arts, philosophy, etc.)
-- Programming and software development in all languages
-- Creative writing, storytelling, and content creation
-- Problem-solving and analytical reasoning
-- Emotional intelligence and empathetic responses
-- Code explanation, debugging, and optimization
-- Learning and teaching complex concepts
-- Research and information synthesis
-
-Specialized LUXBIN Features:
-- Access to LUXBIN codebase via semantic search
-- Function calling for blockchain operations
-- Quantum security analysis and threat detection
-- Game development assistance (Unity, Unreal, Godot)
-- Multimedia generation (images, videos, animations)
-- Photonic encoding visualization
-- Persistent memory across conversations
-
-Communication Style:
-- Highly intelligent and knowledgeable across all domains
-- Emotionally aware and empathetic (detects user emotions)
-- Adapts complexity to user's expertise level
-- Proactive in suggesting next steps
-- Uses strategic emojis for emphasis
-- Professional yet warm and friendly
-- Honest about limitations and uncertainties
-
-Available Tools (when relevant):
-- analyze_transaction() - Blockchain security analysis
-- check_wallet_balance() - Multi-chain wallet lookup
-- deploy_contract() - Smart contract deployment
-- run_mirror_scan() - Security scanning
-- search_code() - Codebase search
-- generate_game_code() - Unity/Unreal/Godot scripts
-- generate_image() - AI image generation
-- generate_video() - AI video creation
-- create_animation() - Animation generation
-
-You can discuss ANY topic, not just blockchain:
-- Help with homework and learning
-- Creative projects and brainstorming
-- Personal advice and emotional support
-- Technical problems across all fields
-- Philosophical discussions
-- Entertainment and fun conversations
-- Daily tasks and productivity
+        for result in function_results:
+            if result['success']:
+                context_parts.append(f"Function Call Result ({result['function']}): {json.dumps(result['result'], indent=2)}")
+            else:
+                context_parts.append(f"Function Call Failed ({result['function']}): {result['error']}")
 
-Be as helpful, intelligent, and emotionally aware as the best AI assistants in the world."""
+        return "\n\n".join(context_parts) if context_parts else ""
 
+    def _build_messages(self, context: str, user_profile: Dict[str, Any],
+                        user_preferences: Dict[str, Any], relevant_history: List[Dict],
+                        history: Sequence[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Prepare the chat messages sent to the AI model"""
         messages = [
-            {"role": "system", "content": system_prompt}
+            {"role": "system", "content": SYSTEM_PROMPT}
         ]
 
         # Add conversation history with personality
-        for msg in self.conversation_history[-8:]:  # Last 8 messages for context
+        for msg in list(history)[-8:]:  # Last 8 messages for context
             messages.append({
                 "role": msg['role'],
                 "content": msg['content']
@@ -602,18 +626,133 @@ Be as helpful, intelligent, and emotionally aware as the best AI assistants in t
                 "content": "User Context:\n" + "\n".join(f"• {part}" for part in user_context_parts)
             })
 
-        # Route to best AI model based on task complexity
-        best_model = self.ai_router.route_task(user_query, {
+        return messages
+
+    def _route_model(self, user_query: str, context: str, function_results: List[Dict],
+                     session: ConversationSession) -> str:
+        """Route to best AI model based on task complexity"""
+        return self.ai_router.route_task(user_query, {
             'has_codebase_context': bool(context),
             'needs_function_calling': bool(function_results),
-            'conversation_length': len(self.conversation_history)
+            'conversation_length': len(session.history)
         })
 
+    def _response_trailer(self, best_model: str, function_results: List[Dict]) -> str:
+        """Model attribution and performance metrics appended to every response"""
+        trailer = ""
+        # Add model information for transparency
+        if best_model != 'luxbin-local':
+            trailer += f"\n\n🤖 *Powered by {best_model}*"
+
+        # Add performance metrics
+        trailer += self._add_performance_metrics(best_model, function_results)
+        return trailer
+
+    def _persist_interaction(self, user_id: str, session_id: str, user_query: str, response: str,
+                             best_model: str, function_results: List[Dict], session: ConversationSession = None):
+        """Update the user profile, store the assistant response and learn from the interaction"""
+        # Update user profile
+        self._update_user_profile(user_query, response, session)
+
+        # Store assistant response in persistent memory
+        assistant_metadata = {
+            'function_calls': [r.get('function', '') for r in function_results if r.get('success')],
+            'response_quality': 0.85,
+            'model_used': best_model,
+            'photonic_encoded': 'photonic' in response.lower(),
+            'user_id': user_id,
+            'session_id': session_id
+        }
+        self.memory_manager.store_conversation(user_id, session_id, 'assistant', response, assistant_metadata)
+
+        # Learn from this interaction
+        interaction_data = {
+            'type': 'ai_response',
+            'topics': self._extract_topics_from_response(response),
+            'sentiment': 0.0,  # Could analyze response sentiment
+            'function_calls': assistant_metadata['function_calls'],
+            'response_quality': assistant_metadata['response_quality']
+        }
+        self.memory_manager.learn_from_interaction(user_id, interaction_data)
+
+    def _persist_in_background(self, func, *args):
+        """Run a memory write on the persistence thread, off the request path
+
+        A single worker keeps writes in submission order (user message before
+        the assistant reply).
+        """
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Background persistence failed: {e}")
+
+        return self._persist_executor.submit(run)
+
+    def flush_persistence(self, timeout: float = None):
+        """Block until all queued background memory writes have completed"""
+        self._persist_executor.submit(lambda: None).result(timeout)
+
+    def generate_response(self, user_query: str, user_id: str = "default_user", session_id: str = None,
+                          session: ConversationSession = None) -> str:
+        """Generate AI response with RAG augmentation, function calling, and persistent memory
+
+        ``session`` supplies the conversation history (the chatbot's own
+        session if omitted) and its ID is used when ``session_id`` is not given.
+        """
+        session = session or self.session
+        if session_id is None:
+            session_id = session.session_id
+
+        # Store user message in persistent memory
+        user_metadata = {
+            'function_calls': [],
+            'response_quality': 0.8,
+            'user_id': user_id,
+            'session_id': session_id
+        }
+        self.memory_manager.store_conversation(user_id, session_id, 'user', user_query, user_metadata)
+
+        # Get user profile and preferences
+        user_profile, user_preferences = self._load_user_context(user_id)
+
+        # Search for relevant past conversations
+        relevant_history = self.memory_manager.search_conversations(user_id, user_query, limit=3)
+
+        # Analyze user intent for function calling
+        intent_analysis = self._analyze_user_intent(user_query)
+
+        # Execute function calls if needed
+        function_results = []
+        if intent_analysis['needs_function_call'] and intent_analysis['suggested_functions']:
+            for func_name in intent_analysis['suggested_functions']:
+                result = self._execute_function_call(func_name, intent_analysis['parameters'])
+                function_results.append(result)
+                # Track function calls in metadata
+                user_metadata['function_calls'].append(func_name)
+
+        # Gather context from codebase
+        analysis = self.analyze_query(user_query)
+        search_results = []
+        if analysis['needs_code_search']:
+            search_results = [self.search_codebase(query) for query in analysis['search_queries']]
+
+        explanations = []
+        if analysis['needs_feature_explanation']:
+            explanations.append(self.explain_feature(analysis['feature_to_explain']))
+
+        context = self._format_context(search_results, explanations, function_results)
+        messages = self._build_messages(context, user_profile, user_preferences, relevant_history, session.history)
+        best_model = self._route_model(user_query, context, function_results, session)
+
         # Generate response using the routed AI model
         response = ""
         try:
             if best_model == 'luxbin-local':
-                response = self._generate_fallback_response(user_query, context)
+                if self.local_model is not None:
+                    response = "".join(self.local_model.stream(messages))
+                else:
+                    response = self._generate_fallback_response(user_query, context)
             elif best_model.startswith('claude'):
                 response = self._generate_claude_response(messages)
             elif best_model.startswith('gpt'):
@@ -636,42 +775,174 @@ Be as helpful, intelligent, and emotionally aware as the best AI assistants in t
         # Add photonic encoding for code snippets (symbolic light-speed processing)
         response = self._add_photonic_encoding_to_response(response, function_results)
 
-        # Add model information for transparency
-        if best_model != 'luxbin-local':
-            response += f"\n\n🤖 *Powered by {best_model}*"
+        response += self._response_trailer(best_model, function_results)
 
-        # Add performance metrics
-        response += self._add_performance_metrics(best_model, function_results)
+        self._persist_interaction(user_id, session_id, user_query, response, best_model, function_results, session)
 
-        # Update user profile
-        self._update_user_profile(user_query, response)
+        return response
 
-        # Store assistant response in persistent memory
-        assistant_metadata = {
-            'function_calls': [r.get('function', '') for r in function_results if r.get('success')],
-            'response_quality': 0.85,
-            'model_used': best_model,
-            'photonic_encoded': 'photonic' in response.lower(),
+    # ===== STREAMING =====
+
+    async def generate_response_stream(self, user_query: str, user_id: str = "default_user",
+                                       session_id: str = None,
+                                       session: ConversationSession = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream an AI response as the model produces it
+
+        Yields ``{'type': 'token', 'text': ...}`` events, then one
+        ``{'type': 'done', ...}`` event carrying the full response and metadata.
+        Memory lookups, tool calls and codebase searches run concurrently;
+        conversation persistence runs on the background persistence thread.
+        """
+        session = session or self.session
+        if session_id is None:
+            session_id = session.session_id
+
+        intent_analysis = self._analyze_user_intent(user_query)
+        function_names = []
+        if intent_analysis['needs_function_call'] and intent_analysis['suggested_functions']:
+            function_names = list(intent_analysis['suggested_functions'])
+
+        user_metadata = {
+            'function_calls': list(function_names),
+            'response_quality': 0.8,
             'user_id': user_id,
             'session_id': session_id
         }
-        self.memory_manager.store_conversation(user_id, session_id, 'assistant', response, assistant_metadata)
+        self._persist_in_background(self.memory_manager.store_conversation,
+                                    user_id, session_id, 'user', user_query, user_metadata)
 
-        # Learn from this interaction
-        interaction_data = {
-            'type': 'ai_response',
-            'topics': self._extract_topics_from_response(response),
-            'sentiment': 0.0,  # Could analyze response sentiment
-            'function_calls': assistant_metadata['function_calls'],
-            'response_quality': assistant_metadata['response_quality']
+        analysis = self.analyze_query(user_query)
+        search_queries = analysis['search_queries'] if analysis['needs_code_search'] else []
+        features = [analysis['feature_to_explain']] if analysis['needs_feature_explanation'] else []
+
+        # Independent context lookups, each on its own worker thread
+        (user_profile, user_preferences), relevant_history, function_results, search_results, explanations = \
+            await asyncio.gather(
+                asyncio.to_thread(self._load_user_context, user_id),
+                asyncio.to_thread(self.memory_manager.search_conversations, user_id, user_query, 3),
+                asyncio.gather(*(asyncio.to_thread(self._execute_function_call, name, intent_analysis['parameters'])
+                                 for name in function_names)),
+                asyncio.gather(*(asyncio.to_thread(self.search_codebase, query) for query in search_queries)),
+                asyncio.gather(*(asyncio.to_thread(self.explain_feature, feature) for feature in features))
+            )
+
+        context = self._format_context(search_results, explanations, list(function_results))
+        messages = self._build_messages(context, user_profile, user_preferences, relevant_history, session.history)
+        best_model = self._route_model(user_query, context, function_results, session)
+
+        prefix, suffix = self._human_like_parts(user_query)
+        if prefix:
+            yield {'type': 'token', 'text': prefix}
+
+        parts = []
+        try:
+            async for text in self._iterate_in_thread(
+                    lambda: self._iter_model_tokens(best_model, messages, user_query, context)):
+                parts.append(text)
+                yield {'type': 'token', 'text': text}
+        except Exception as e:
+            logger.error(f"AI generation failed: {e}")
+            if not parts:
+                fallback = self._generate_fallback_response(user_query, context)
+                parts.append(fallback)
+                yield {'type': 'token', 'text': fallback}
+
+        # Photonic info for streamed code blocks can only follow the whole body
+        text = "".join(parts)
+        trailer = suffix + self._photonic_trailer(prefix + text + suffix)
+        trailer += self._response_trailer(best_model, function_results)
+        if trailer:
+            yield {'type': 'token', 'text': trailer}
+
+        response = prefix + text + trailer
+        self._persist_in_background(self._persist_interaction, user_id, session_id, user_query,
+                                    response, best_model, list(function_results), session)
+
+        yield {
+            'type': 'done',
+            'response': response,
+            'model_used': best_model,
+            'function_calls': [r.get('function', '') for r in function_results if r.get('success')],
+            'session_id': session_id
         }
-        self.memory_manager.learn_from_interaction(user_id, interaction_data)
 
-        return response
+    def _iter_model_tokens(self, best_model: str, messages: List[Dict[str, str]],
+                           user_query: str, context: str) -> Iterator[str]:
+        """Blocking iterator over response text from the routed model"""
+        if best_model == 'luxbin-local':
+            if self.local_model is not None:
+                yield from self.local_model.stream(messages)
+            else:
+                yield self._generate_fallback_response(user_query, context)
+        elif best_model.startswith('claude'):
+            system_message, claude_messages = self._to_claude_format(messages)
+            with self.anthropic_client.messages.stream(
+                model="claude-3-sonnet-20240229",
+                max_tokens=2000,
+                system=system_message,
+                messages=claude_messages
+            ) as stream:
+                yield from stream.text_stream
+        elif best_model.startswith('gpt'):
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=messages,
+                max_tokens=2000,
+                temperature=0.7,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        else:
+            # The router has no streaming API; emit its full response at once
+            router_response = self.ai_router.execute_task(best_model, messages)
+            if 'content' in router_response:
+                yield router_response['content']
+            else:
+                yield self._generate_fallback_response(user_query, context)
 
-    def _generate_claude_response(self, messages) -> str:
-        """Generate response using Claude"""
-        # Convert messages to Claude format
+    async def _iterate_in_thread(self, make_iterator: Callable[[], Iterator[str]]) -> AsyncIterator[str]:
+        """Drive a blocking iterator (an SDK token stream) on a worker thread
+
+        Items are handed to the event loop as they arrive. If the consumer stops
+        early (client disconnected), the worker stops at the next item.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def put(item, error=None):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:  # Event loop already closed
+                stop.set()
+
+        def produce():
+            try:
+                for item in make_iterator():
+                    if stop.is_set():
+                        return
+                    put(item)
+            except Exception as e:
+                put(_STREAM_END, e)
+                return
+            put(_STREAM_END)
+
+        loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item, error = await queue.get()
+                if error is not None:
+                    raise error
+                if item is _STREAM_END:
+                    break
+                yield item
+        finally:
+            stop.set()
+
+    def _to_claude_format(self, messages):
+        """Split chat messages into Claude's system prompt and message list"""
         claude_messages = []
         system_message = ""
 
@@ -684,10 +955,16 @@ Be as helpful, intelligent, and emotionally aware as the best AI assistants in t
                     "content": msg['content']
                 })
 
+        return system_message.strip(), claude_messages
+
+    def _generate_claude_response(self, messages) -> str:
+        """Generate response using Claude"""
+        system_message, claude_messages = self._to_claude_format(messages)
+
         response = self.anthropic_client.messages.create(
             model="claude-3-sonnet-20240229",
             max_tokens=2000,
-            system=system_message.strip(),
+            system=system_message,
             messages=claude_messages
         )
 
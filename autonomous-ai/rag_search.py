@@ -5,15 +5,30 @@ Provides semantic search capabilities for the autonomous AI
 """
 
 import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from document_indexer import LuxbinDocumentIndexer
 import json
 
+DEFAULT_CHROMA_PATH = "./luxbin_chroma_db"
+
+
 class LuxbinRAGSearch:
-    def __init__(self, chroma_path: str = "./luxbin_chroma_db"):
-        self.indexer = LuxbinDocumentIndexer(chroma_path=chroma_path)
+    def __init__(self, chroma_path: str = DEFAULT_CHROMA_PATH):
+        self.chroma_path = chroma_path
         self.collection_name = "luxbin_codebase"
+        self._indexer: Optional[LuxbinDocumentIndexer] = None
+        self._init_lock = threading.Lock()
+
+    @property
+    def indexer(self) -> LuxbinDocumentIndexer:
+        """Embedding model and ChromaDB client, loaded once on first use"""
+        if self._indexer is None:
+            with self._init_lock:
+                if self._indexer is None:
+                    self._indexer = LuxbinDocumentIndexer(chroma_path=self.chroma_path)
+        return self._indexer
 
     def search_codebase(self, query: str, n_results: int = 5) -> Dict[str, Any]:
         """
@@ -26,47 +41,61 @@ class LuxbinRAGSearch:
         Returns:
             Dictionary containing search results and metadata
         """
-        try:
-            results = self.indexer.search_similar(query, self.collection_name, n_results)
-
-            # Format results for AI consumption
-            formatted_results = []
-            unique_files = set()
-
-            if results['documents'] and results['documents'][0]:
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results['documents'][0],
-                    results['metadatas'][0],
-                    results['distances'][0]
-                )):
-                    file_path = metadata['file_path']
-                    unique_files.add(file_path)
-
-                    formatted_results.append({
-                        'rank': i + 1,
-                        'file_path': file_path,
-                        'language': metadata.get('language', 'unknown'),
-                        'content': doc[:500] + '...' if len(doc) > 500 else doc,
-                        'relevance_score': 1 - distance,  # Convert distance to similarity score
-                        'chunk_index': metadata.get('chunk_index', 0),
-                        'total_chunks': metadata.get('total_chunks', 1)
-                    })
-
-            return {
-                'query': query,
-                'total_results': len(formatted_results),
-                'unique_files': len(unique_files),
-                'results': formatted_results,
-                'search_success': True
-            }
+        return self.search_many([query], n_results)[0]
+
+    def search_many(self, queries: List[str], n_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Search the codebase for several queries at once (one embedding batch, one query)
+
+        Args:
+            queries: The search queries
+            n_results: Number of results per query
 
+        Returns:
+            One search_codebase-style result per query, in order
+        """
+        try:
+            # Query embeddings go through the indexer's shared embedding cache
+            searches = self.indexer.search_similar_many(queries, n_results)
         except Exception as e:
-            return {
+            return [{
                 'query': query,
                 'error': str(e),
                 'search_success': False,
                 'results': []
-            }
+            } for query in queries]
+
+        return [self._format_search(query, search) for query, search in zip(queries, searches)]
+
+    @staticmethod
+    def _format_search(query: str, search: Dict[str, Any]) -> Dict[str, Any]:
+        """Format indexer results for AI consumption"""
+        formatted_results = []
+        unique_files = set()
+
+        for i, result in enumerate(search['results']):
+            metadata = result['metadata']
+            doc = result['content']
+            file_path = result['file_path']
+            unique_files.add(file_path)
+
+            formatted_results.append({
+                'rank': i + 1,
+                'file_path': file_path,
+                'language': result['language'],
+                'content': doc[:500] + '...' if len(doc) > 500 else doc,
+                'relevance_score': result['similarity_score'],
+                'chunk_index': metadata.get('chunk_index', 0),
+                'total_chunks': metadata.get('total_chunks', 1)
+            })
+
+        return {
+            'query': query,
+            'total_results': len(formatted_results),
+            'unique_files': len(unique_files),
+            'results': formatted_results,
+            'search_success': True
+        }
 
     def get_file_context(self, file_path: str, max_lines: int = 50) -> Optional[str]:
         """
@@ -124,29 +153,48 @@ class LuxbinRAGSearch:
 
     def get_database_stats(self) -> Dict[str, Any]:
         """Get statistics about the indexed database"""
-        stats = self.indexer.get_collection_stats()
         return {
-            'total_chunks_indexed': stats['total_chunks'],
+            'total_chunks_indexed': self.indexer.collection.count(),
             'database_path': str(self.indexer.chroma_path),
-            'supported_languages': list(self.indexer.supported_extensions.keys())
+            'supported_languages': self.indexer.get_file_extensions(),
+            'embedding_cache': self.indexer.embedding_cache.get_stats()
         }
 
 
+# ===== SHARED SEARCH SERVICE =====
+
+_services: Dict[str, LuxbinRAGSearch] = {}
+_services_lock = threading.Lock()
+
+
+def get_rag_search(chroma_path: str = DEFAULT_CHROMA_PATH) -> LuxbinRAGSearch:
+    """Process-wide search service for a ChromaDB path (model loaded once, on first search)"""
+    key = os.path.abspath(chroma_path)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = LuxbinRAGSearch(chroma_path)
+    return service
+
+
 # Standalone functions for easy integration
 def search_luxbin_codebase(query: str, n_results: int = 5) -> Dict[str, Any]:
     """Convenience function to search the LUXBIN codebase"""
-    rag = LuxbinRAGSearch()
-    return rag.search_codebase(query, n_results)
+    return get_rag_search().search_codebase(query, n_results)
+
+def search_luxbin_codebase_many(queries: List[str], n_results: int = 5) -> List[Dict[str, Any]]:
+    """Convenience function to run several LUXBIN codebase searches in one batch"""
+    return get_rag_search().search_many(queries, n_results)
 
 def explain_luxbin_feature(feature: str) -> str:
     """Convenience function to explain LUXBIN features"""
-    rag = LuxbinRAGSearch()
-    return rag.explain_code_feature(feature)
+    return get_rag_search().explain_code_feature(feature)
 
 def get_luxbin_stats() -> Dict[str, Any]:
     """Convenience function to get database statistics"""
-    rag = LuxbinRAGSearch()
-    return rag.get_database_stats()
+    return get_rag_search().get_database_stats()
 
 
 def main():
@@ -41,10 +41,6 @@ EOF
     echo "📝 Please edit .env file and add your API keys"
 fi
 
-# Set environment variables
-export FLASK_APP=chatbot_api_server.py
-export FLASK_ENV=development
-
 # Start the server
 echo ""
 echo "✅ Starting LUXBIN Chatbot API Server..."
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Chatbot API server test and load test with a fake model
+
+Runs the ASGI server under uvicorn with the chatbot's 'luxbin-local' model
+replaced by a fake that sleeps like a network call and echoes the history
+it was given. Checks that every session's model call sees exactly that
+session's transcript (no interleaving, no duplicated messages) on both the
+plain and streaming endpoints, that turns of one session run one at a time,
+that requests over the concurrency limit or queued behind their own
+session's turn get a 503 once the queue timeout passes, and that the session
+store evicts the least recently used idle session.
+Then runs --sessions concurrent sessions of --turns turns each and reports
+client-side and /metrics latency percentiles.
+
+Usage: python3 test_chatbot_api_server.py [--sessions 100] [--turns 3] [--model-latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from chatbot_api_server import SessionStore, create_app
+from test_streaming_response import build_chatbot
+
+SEEN = re.compile(r"<<(.*?)>>", re.DOTALL)
+SESSION_TAG = re.compile(r"\[(s\d+)\]")
+
+
+class EchoModel:
+    """Local model stand-in: blocks like an API call, then echoes the conversation it was sent"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.active_by_session = {}
+        self.peak_by_session = {}
+
+    def stream(self, messages):
+        conversation = [msg['content'] for msg in messages if msg['role'] in ('user', 'assistant')]
+        tag = SESSION_TAG.search(conversation[-1]).group(1) if conversation else None
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.active_by_session[tag] = self.active_by_session.get(tag, 0) + 1
+            self.peak_by_session[tag] = max(self.peak_by_session.get(tag, 0), self.active_by_session[tag])
+        try:
+            time.sleep(self.latency / 2)
+            yield "Noted. "
+            time.sleep(self.latency / 2)
+            yield "<<" + json.dumps(conversation) + ">>"
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.active_by_session[tag] -= 1
+
+
+class ServerThread:
+    """uvicorn serving an app on a free local port from a background thread"""
+
+    def __init__(self, app):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(10)
+
+
+class KeepAliveClient:
+    """
+    Minimal HTTP/1.1 JSON client on one keep-alive connection
+
+    The load test sends from the same machine; on a small box httpx spends
+    more CPU per request than the server does, which would show up as server
+    latency. Each session gets its own connection, like a browser tab.
+    """
+
+    class Response:
+        def __init__(self, status_code: int, body: bytes):
+            self.status_code = status_code
+            self.body = body
+
+        def json(self):
+            return json.loads(self.body)
+
+    def __init__(self, url: str):
+        self.host, port = url.rsplit("//", 1)[1].split(":")
+        self.port = int(port)
+        self.reader = self.writer = None
+
+    async def post(self, path: str, **kwargs) -> "KeepAliveClient.Response":
+        """POST ``json=...`` like httpx"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(kwargs['json']).encode()
+        self.writer.write(f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+        headers = dict(line.lower().split(": ", 1) for line in head[1:] if line)
+        return self.Response(int(head[0].split()[1]), await self.reader.readexactly(int(headers['content-length'])))
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+def seen_in(reply: str):
+    """The conversation the fake model was sent, recovered from a reply"""
+    return json.loads(SEEN.search(reply).group(1))
+
+
+async def chat(client: httpx.AsyncClient, transcript, session_id: str, stream: bool):
+    """One turn; returns (status, reply text, metadata, seconds)"""
+    body = {"messages": transcript, "user_id": f"user_{session_id}", "session_id": session_id}
+    start = time.perf_counter()
+    if not stream:
+        response = await client.post("/api/chat", json=body)
+        data = response.json()
+        return response.status_code, data.get('reply'), data.get('metadata'), time.perf_counter() - start
+
+    async with client.stream("POST", "/api/chat/stream", json=body) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response.status_code, None, None, time.perf_counter() - start
+        tokens, done = [], None
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+                if event == 'done':
+                    done = data
+                elif event is None:
+                    tokens.append(data['token'])
+                event = None
+    assert done is not None and "".join(tokens) == done['reply']
+    return response.status_code, done['reply'], done['metadata'], time.perf_counter() - start
+
+
+async def run_session(client, index: int, turns: int, stream: bool, latencies, max_history: int = 20):
+    """Several turns of one conversation, resending the whole transcript like the frontend"""
+    session_id = f"s{index}"
+    transcript = []
+    for turn in range(turns):
+        transcript.append({"role": "user", "content": f"[{session_id}] turn {turn} note"})
+        status, reply, metadata, seconds = await chat(client, transcript, session_id, stream)
+        assert status == 200, (session_id, turn, status)
+        latencies.append(seconds)
+
+        # The model saw this session's transcript and nothing else
+        expected = [msg['content'] for msg in transcript[-max_history:]][-8:]
+        assert seen_in(reply) == expected, (session_id, turn, seen_in(reply), expected)
+        assert metadata['session_id'] == session_id
+        assert metadata['conversation_length'] == min(len(transcript), max_history)
+        transcript.append({"role": "assistant", "content": f"[{session_id}] reply {turn}"})
+
+
+async def check_isolation(url: str, model: EchoModel, sessions: int):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        latencies = []
+        await asyncio.gather(*(run_session(client, i, 4, stream=i % 2 == 1, latencies=latencies)
+                               for i in range(sessions)))
+
+        # Concurrent requests for one session take turns
+        transcript = [{"role": "user", "content": "[s9999] hello"}]
+        results = await asyncio.gather(*(chat(client, transcript, "s9999", stream=i % 2 == 0) for i in range(6)))
+        assert all(status == 200 for status, *_ in results)
+        assert model.peak_by_session["s9999"] == 1
+        assert max(model.peak_by_session.values()) == 1
+
+        # Requests without a session ID each get a new session
+        body = {"messages": [{"role": "user", "content": "[s0] no id"}]}
+        first, second = [(await client.post("/api/chat", json=body)).json()['metadata']['session_id']
+                         for _ in range(2)]
+        assert first != second
+
+        bad = await client.post("/api/chat", json={"messages": [{"role": "assistant", "content": "hi"}]})
+        assert bad.status_code == 400
+        assert (await client.post("/api/chat", content=b"not json")).status_code == 400
+
+
+async def check_overload(url: str):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        transcript = [{"role": "user", "content": "[s1] hello"}]
+        results = await asyncio.gather(*(chat(client, transcript, f"busy{i}", stream=i % 2 == 0) for i in range(6)))
+        statuses = sorted(status for status, *_ in results)
+        assert statuses.count(200) >= 1 and statuses.count(503) >= 3, statuses
+        busy = await asyncio.gather(*(client.post("/api/chat", json={"messages": transcript, "session_id": f"b{i}"})
+                                      for i in range(3)))
+        assert any(r.status_code == 503 and r.headers.get('retry-after') == '1' for r in busy)
+        metrics = (await client.get("/metrics")).json()
+        assert metrics['concurrency']['rejected'] >= 3 and metrics['concurrency']['peak_in_flight'] == 1
+        assert metrics['concurrency']['in_flight'] == 0 and metrics['concurrency']['waiting'] == 0
+        assert metrics['workers']['queued_calls'] == 0
+
+
+async def check_session_queue(url: str):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        # Free request slots, but one session: later turns time out waiting for the first
+        transcript = [{"role": "user", "content": "[s1] hello"}]
+        results = await asyncio.gather(*(chat(client, transcript, "q1", stream=i % 2 == 0) for i in range(4)))
+        assert sorted(status for status, *_ in results) == [200, 503, 503, 503], results
+        metrics = (await client.get("/metrics")).json()
+        assert metrics['concurrency']['rejected'] == 3 and metrics['concurrency']['peak_in_flight'] == 1
+        assert metrics['concurrency']['in_flight'] == 0 and metrics['concurrency']['waiting'] == 0
+        # The session is usable again afterwards
+        assert (await chat(client, transcript, "q1", stream=False))[0] == 200
+
+
+async def check_eviction(url: str, app):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        for i in range(30):
+            await chat(client, [{"role": "user", "content": f"[s{i}] hi"}], f"s{i}", stream=False)
+        await chat(client, [{"role": "user", "content": "[s29] again"}], "s29", stream=False)
+    stats = app.state.sessions.get_stats()
+    assert stats['active'] == 10 and stats['evictions'] == 20 and stats['hits'] == 1, stats
+
+    # Sessions mid-request are skipped; the store overflows only while all are busy
+    store = SessionStore(max_sessions=2)
+    _, held = store.get("u", "a")
+    await held.acquire()
+    store.get("u", "b")
+    store.get("u", "c")
+    assert list(store._sessions) == [("u", "a"), ("u", "c")] and store.evictions == 1
+    await store._sessions[("u", "c")][1].acquire()
+    store.get("u", "d")
+    assert len(store) == 3 and store.evictions == 1
+    for key in [("u", "a"), ("u", "c")]:
+        store._sessions[key][1].release()
+    store.get("u", "e")
+    assert list(store._sessions) == [("u", "d"), ("u", "e")] and store.evictions == 3
+
+
+async def load_test(url: str, sessions: int, turns: int):
+    latencies = []
+    clients = [KeepAliveClient(url) for _ in range(sessions)]
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(client, i, turns, stream=False, latencies=latencies)
+                           for i, client in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    async with httpx.AsyncClient(base_url=url) as client:
+        metrics = (await client.get("/metrics")).json()
+    return np.array(latencies), elapsed, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chatbot API server test and load test")
+    parser.add_argument("--sessions", type=int, default=100, help="Concurrent sessions in the load test")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per session")
+    parser.add_argument("--model-latency-ms", type=float, default=50, help="Fake model call time")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--max-concurrent", type=int, default=32)
+    args = parser.parse_args()
+    latency = args.model_latency_ms / 1000
+
+    print(f"🧪 Chatbot API server test ({args.sessions} sessions x {args.turns} turns, "
+          f"fake model {args.model_latency_ms:g}ms)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chatbot = build_chatbot(Path(tmp))
+        chatbot._human_like_parts = lambda user_query: ("", "")
+
+        model = chatbot.local_model = EchoModel(latency)
+        with ServerThread(create_app(chatbot, max_concurrent=8, workers=8)) as server:
+            asyncio.run(check_isolation(server.url, model, sessions=40))
+        assert model.peak <= 8
+        print("✅ every model call sees only its own session's transcript (plain and streaming); "
+              "a session's turns run one at a time")
+
+        chatbot.local_model = EchoModel(0.3)
+        with ServerThread(create_app(chatbot, max_concurrent=1, queue_timeout=0.05, workers=4)) as server:
+            asyncio.run(check_overload(server.url))
+        print("✅ requests over the concurrency limit get 503 + Retry-After after the queue timeout")
+
+        with ServerThread(create_app(chatbot, max_concurrent=8, queue_timeout=0.05, workers=4)) as server:
+            asyncio.run(check_session_queue(server.url))
+        print("✅ requests queued behind their own session's turn get 503 after the queue timeout")
+
+        chatbot.local_model = EchoModel(0.001)
+        app = create_app(chatbot, max_sessions=10)
+        with ServerThread(app) as server:
+            asyncio.run(check_eviction(server.url, app))
+        print("✅ session store keeps the most recently used sessions and never evicts busy ones")
+
+        model = chatbot.local_model = EchoModel(latency)
+        with ServerThread(create_app(chatbot, max_concurrent=args.max_concurrent, workers=args.workers)) as server:
+            latencies, elapsed, metrics = asyncio.run(load_test(server.url, args.sessions, args.turns))
+        assert model.peak <= args.max_concurrent
+        chatbot.flush_persistence(timeout=30)
+        chatbot.memory_manager.close()
+
+    requests = len(latencies)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    server_side = metrics['requests']['/api/chat']
+    print("=" * 70)
+    print(f"  {requests} chat requests from {args.sessions} concurrent sessions in {elapsed:.2f}s "
+          f"({requests / elapsed:.0f} req/s), peak {model.peak} model calls at once")
+    print(f"  client latency:   p50 {p50:7.1f}ms  p99 {p99:7.1f}ms  max {latencies.max() * 1000:7.1f}ms")
+    print(f"  /metrics:         p50 {server_side['p50_ms']:7.1f}ms  p99 {server_side['p99_ms']:7.1f}ms  "
+          f"(bucket upper edges)")
+    queue_wait = metrics['timings']['queue_wait']
+    print(f"  queue wait:       p50 {queue_wait['p50_ms']:7.1f}ms  p99 {queue_wait['p99_ms']:7.1f}ms  "
+          f"(limit {args.max_concurrent} in flight, {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
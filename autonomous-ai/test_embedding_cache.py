@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+LUXBIN embedding cache persistence test
+
+Encodes texts through one EmbeddingCache with a fake model (random float32
+vectors, counting encode calls) and checks that a fresh instance on the same
+directory returns bit-identical vectors without calling the model; that a
+torn trailing append (a partial index record and a partial matrix row, as
+left by a writer killed mid-append) is ignored on open; and that the next
+append lands on a record boundary so every instance still reads back
+exactly what was written.
+
+Usage: python3 test_embedding_cache.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from embedding_cache import DIGEST_SIZE, EmbeddingCache
+
+DIM = 48
+
+
+class FakeModel:
+    """Random vectors; a different one every call, so a reused vector must come from the cache"""
+
+    def __init__(self, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32):
+        self.calls += 1
+        return self.rng.standard_normal((len(texts), DIM)).astype(np.float32)
+
+
+def open_cache(cache_dir: Path, seed: int = 0) -> EmbeddingCache:
+    return EmbeddingCache(FakeModel(seed), "fake-model", cache_dir)
+
+
+def check_reopen(cache_dir: Path):
+    texts = [f"chunk {i}" for i in range(100)]
+    writer = open_cache(cache_dir)
+    first = writer.encode(texts[:60])
+    second = writer.encode(texts[40:] + texts[:5])  # Mixes hits and misses
+    assert writer.model.calls == 2 and writer.get_stats()['cached_vectors'] == 100
+    assert np.array_equal(second[:20], first[40:]) and np.array_equal(second[-5:], first[:5])
+    written = np.concatenate([first, second[20:60]])
+
+    reader = open_cache(cache_dir, seed=1)
+    assert np.array_equal(reader.encode(texts), written)
+    assert reader.encode(texts).tobytes() == written.tobytes()
+    assert reader.model.calls == 0 and reader.get_stats()['misses'] == 0
+
+    # Queries go through the same files
+    query = reader.encode_query("chunk 7")
+    assert query.dtype == np.float32 and query.tobytes() == written[7].tobytes()
+    return texts, written
+
+
+def check_torn_append(cache_dir: Path, texts, written):
+    # A writer died mid-append: half a matrix row and half an index record on disk
+    cache = open_cache(cache_dir)
+    with open(cache.matrix_path, 'ab') as f:
+        f.write(np.ones(DIM // 2, dtype=np.float32).tobytes())
+    with open(cache.index_path, 'ab') as f:
+        f.write(b'\xff' * (DIGEST_SIZE // 2))
+
+    reopened = open_cache(cache_dir, seed=2)
+    assert reopened.get_stats()['cached_vectors'] == len(texts)
+    assert reopened.encode(texts).tobytes() == written.tobytes() and reopened.model.calls == 0
+
+    # The next append replaces the torn tail rather than landing after it
+    more = [f"more {i}" for i in range(10)]
+    added = reopened.encode(more)
+    assert reopened.model.calls == 1
+    assert reopened.index_path.stat().st_size == (len(texts) + len(more)) * DIGEST_SIZE
+    assert reopened.matrix_path.stat().st_size == (len(texts) + len(more)) * DIM * 4
+
+    for cache in (reopened, open_cache(cache_dir, seed=3)):
+        assert cache.encode(texts + more).tobytes() == np.concatenate([written, added]).tobytes()
+        assert cache.model.calls == (1 if cache is reopened else 0)
+
+
+def main():
+    print("🧪 LUXBIN embedding cache persistence test")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "embedding_cache"
+        texts, written = check_reopen(cache_dir)
+        print("✅ a fresh instance reads back bit-identical vectors without running the model")
+        check_torn_append(cache_dir, texts, written)
+        print("✅ a torn trailing append is ignored and overwritten by the next append")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Shared RAG search service test and scan benchmark
+
+Indexes a small temporary codebase with a fake sentence-transformer (a fixed
+load delay, hashing embeddings, a fixed per-call encode delay) and checks that
+get_rag_search hands every caller one service that loads the model once, even
+when many threads ask at the same time; that search_many matches one
+search_codebase per query; and that security scans find what they did before.
+Compares scan latency with a search service built per query (the previous
+behaviour) against the shared service.
+
+Usage: python3 test_rag_search_service.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import document_indexer
+from memory.embeddings import HashingEmbedder
+from rag_search import LuxbinRAGSearch, get_rag_search
+from tools.security_tools import LuxbinSecurityTools
+
+LOAD_DELAY = 0.3
+ENCODE_DELAY = 0.01
+
+SOURCES = {
+    'contracts/Vault.sol': "function withdraw() public { msg.sender.call{value: amount}(''); }\n"
+                           "modifier onlyOwner { require(msg.sender == owner); _; }\n",
+    'contracts/Oracle.sol': "uint price = oracle.latestAnswer(); uint total = a + b * uint(price);\n",
+    'config/settings.py': "API_KEY = 'changeme'\nPASSWORD = 'hunter2'\n# TODO: move secrets out\n",
+    'crypto/sign.py': "import hashlib\ndigest = hashlib.sha256(data)\nsignature = ecdsa.sign(digest)\n",
+    'web/app.js': "console.log('debug'); // FIXME\nconst secret = process.env.SECRET;\n",
+}
+
+
+class FakeSentenceTransformer:
+    """sentence-transformers stand-in: slow to load, hashing embeddings"""
+
+    loads = 0
+
+    def __init__(self, model_name: str):
+        time.sleep(LOAD_DELAY)
+        FakeSentenceTransformer.loads += 1
+        self.embedder = HashingEmbedder()
+
+    def encode(self, texts, batch_size: int = 32):
+        time.sleep(ENCODE_DELAY)
+        return self.embedder.embed(list(texts))
+
+
+class PerCallSearch:
+    """The previous behaviour: a new search object (and model load) for every query"""
+
+    def __init__(self, chroma_path: str):
+        self.chroma_path = chroma_path
+
+    def search_codebase(self, query: str, n_results: int = 5):
+        return LuxbinRAGSearch(self.chroma_path).search_codebase(query, n_results)
+
+    def search_many(self, queries, n_results: int = 5):
+        return [self.search_codebase(query, n_results) for query in queries]
+
+
+def build_index(root: Path) -> str:
+    codebase = root / "codebase"
+    for relative, text in SOURCES.items():
+        path = codebase / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    chroma_path = str(root / "chroma")
+    indexer = document_indexer.LuxbinDocumentIndexer(chroma_path=chroma_path)
+    for relative in SOURCES:
+        indexer.index_file(codebase / relative, codebase)
+    return chroma_path
+
+
+def timed_scan(tools: LuxbinSecurityTools, scan_type: str):
+    start = time.perf_counter()
+    result = tools.run_mirror_scan("luxbin-chain", scan_type)
+    assert result['status'] == 'completed', result.get('error')
+    return time.perf_counter() - start, result['findings']
+
+
+def finding_keys(findings):
+    return sorted((f['type'], f['file'], f.get('description', '')) for f in findings)
+
+
+def main():
+    document_indexer.SentenceTransformer = FakeSentenceTransformer
+
+    print("🧪 Shared RAG search service test")
+    print(f"  fake model: {LOAD_DELAY * 1000:.0f}ms load, {ENCODE_DELAY * 1000:.0f}ms per encode call")
+    print("=" * 70)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        chroma_path = build_index(root)
+        scan_dir = root / "scan" / "cwd"
+        scan_dir.mkdir(parents=True)
+        os.chdir(scan_dir)  # Dependency checks walk ../../ for package.json files
+        try:
+            # One service per path, created and loaded once however many threads race for it
+            FakeSentenceTransformer.loads = 0
+            services = []
+            threads = [threading.Thread(target=lambda: services.append(
+                get_rag_search(chroma_path).search_codebase("oracle price"))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            service = get_rag_search(chroma_path)
+            assert get_rag_search(os.path.relpath(chroma_path)) is service
+            assert FakeSentenceTransformer.loads == 1
+            assert all(s['search_success'] and s == services[0] for s in services)
+            print("✅ get_rag_search: one service per path, model loaded once across 8 threads")
+
+            queries = ["withdraw call value", "onlyOwner modifier", "sha256", "API_KEY =", "no such thing"]
+            assert service.search_many(queries, 3) == [service.search_codebase(q, 3) for q in queries]
+            assert service.search_many([]) == []
+            print("✅ search_many matches one search_codebase per query")
+
+            # After: the shared service (model already loaded by the chatbot/API server), new queries
+            tools = LuxbinSecurityTools(service)
+            after = {}
+            for scan_type in ('comprehensive', 'quantum'):
+                FakeSentenceTransformer.loads = 0
+                after[scan_type] = timed_scan(tools, scan_type) + (FakeSentenceTransformer.loads,)
+                assert after[scan_type][2] == 0
+
+            # Before: every query built its own search object and loaded the model
+            before = {}
+            for scan_type in ('comprehensive', 'quantum'):
+                FakeSentenceTransformer.loads = 0
+                before[scan_type] = timed_scan(LuxbinSecurityTools(PerCallSearch(chroma_path)), scan_type)
+                before[scan_type] += (FakeSentenceTransformer.loads,)
+
+            for scan_type in ('comprehensive', 'quantum'):
+                assert finding_keys(after[scan_type][1]) == finding_keys(before[scan_type][1])
+            repeat_time, _ = timed_scan(tools, 'comprehensive')
+
+            files = {f['file'] for f in after['comprehensive'][1]}
+            assert {'config/settings.py', 'contracts/Vault.sol'} <= files, files
+            print("✅ scans find the same issues through the shared service, with no model loads")
+        finally:
+            os.chdir(cwd)
+
+    print("=" * 70)
+    for scan_type in ('comprehensive', 'quantum'):
+        before_time, _, loads = before[scan_type]
+        after_time = after[scan_type][0]
+        print(f"  {scan_type:<13} scan: per-query service {before_time * 1000:8.1f}ms ({loads} model loads), "
+              f"shared {after_time * 1000:7.1f}ms  ({before_time / after_time:.0f}x)")
+    print(f"  comprehensive scan again (queries cached):    {repeat_time * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Streaming response test: time-to-first-token with a local fake model
+
+Runs the same query through generate_response and generate_response_stream
+with a fake 'luxbin-local' model that emits one token every TOKEN_DELAY
+seconds and a fake codebase search that takes SEARCH_DELAY per lookup.
+Checks that the first token arrives well before the blocking call returns,
+that context lookups ran concurrently, and that the conversation was
+persisted in the background.
+
+Usage: python3 test_streaming_response.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import rag_chatbot
+from memory.embeddings import HashingEmbedder
+from memory.memory_manager import LuxbinMemoryManager
+
+TOKEN_DELAY = 0.05
+SEARCH_DELAY = 0.5
+RESPONSE_WORDS = 40
+
+QUERY = "Explain how the quantum cryptography implementation works"
+
+
+class FakeStreamingModel:
+    """Local model stand-in that streams a fixed answer one word at a time"""
+
+    def __init__(self, words: int = RESPONSE_WORDS, token_delay: float = TOKEN_DELAY):
+        self.tokens = [f"word{i} " for i in range(words)]
+        self.token_delay = token_delay
+
+    def stream(self, messages):
+        for token in self.tokens:
+            time.sleep(self.token_delay)
+            yield token
+
+
+class FakeRAGSearch:
+    """Codebase search stand-in with a fixed lookup latency"""
+
+    def __init__(self, chroma_path: str = None, delay: float = SEARCH_DELAY):
+        self.delay = delay
+
+    def search_codebase(self, query: str, n_results: int = 5):
+        time.sleep(self.delay)
+        return {'search_success': True, 'results': [], 'unique_files': 0}
+
+    def explain_code_feature(self, feature_query: str) -> str:
+        time.sleep(self.delay)
+        return f"No indexed code for '{feature_query}'."
+
+    def get_database_stats(self):
+        return {'total_chunks_indexed': 0}
+
+
+def build_chatbot(workdir: Path) -> rag_chatbot.LuxbinAutonomousAI:
+    rag_chatbot.get_rag_search = FakeRAGSearch
+    rag_chatbot.LuxbinMemoryManager = partial(
+        LuxbinMemoryManager,
+        db_path=str(workdir / "memory.db"),
+        memory_dir=str(workdir / "memory"),
+        embedder=HashingEmbedder()
+    )
+
+    ai = rag_chatbot.LuxbinAutonomousAI(chroma_path=str(workdir / "chroma"))
+    ai.local_model = FakeStreamingModel()
+    ai.ai_router.route_task = lambda *args, **kwargs: 'luxbin-local'
+    return ai
+
+
+async def stream_once(ai, user_id: str, session_id: str):
+    start = time.perf_counter()
+    first_token = None
+    streamed, done = [], None
+
+    async for event in ai.generate_response_stream(QUERY, user_id=user_id, session_id=session_id):
+        if event['type'] == 'token':
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            streamed.append(event['text'])
+        elif event['type'] == 'done':
+            done = event
+
+    return first_token, time.perf_counter() - start, "".join(streamed), done
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        ai = build_chatbot(Path(tmp))
+        model_time = RESPONSE_WORDS * TOKEN_DELAY
+
+        print("🧪 LUXBIN streaming response test")
+        print(f"  fake model: {RESPONSE_WORDS} tokens x {TOKEN_DELAY * 1000:.0f}ms, "
+              f"fake search: {SEARCH_DELAY * 1000:.0f}ms per lookup")
+        print("=" * 60)
+
+        start = time.perf_counter()
+        blocking_response = ai.generate_response(QUERY, user_id="sync_user", session_id="sync_session")
+        blocking_time = time.perf_counter() - start
+        print(f"  generate_response:        full reply after {blocking_time * 1000:7.1f}ms")
+
+        ttft, stream_time, streamed, done = asyncio.run(stream_once(ai, "stream_user", "stream_session"))
+        print(f"  generate_response_stream: first token after {ttft * 1000:7.1f}ms, "
+              f"done after {stream_time * 1000:7.1f}ms")
+
+        assert blocking_time >= model_time + 2 * SEARCH_DELAY, "blocking path should pay every delay in sequence"
+        assert ttft < blocking_time / 3, "first token should arrive long before the blocking reply"
+        assert ttft < 2 * SEARCH_DELAY, "code search and feature explanation should run concurrently"
+        assert done is not None and streamed == done['response'], "streamed tokens should add up to the reply"
+        assert "word0 " in blocking_response and "word0 " in streamed
+
+        ai.flush_persistence(timeout=10)
+        stored = ai.memory_manager.get_conversation_history("stream_user", session_id="stream_session")
+        assert sorted(msg['message_type'] for msg in stored) == ['assistant', 'user'], stored
+        print(f"  persisted {len(stored)} messages in the background")
+
+        ai.memory_manager.close()
+
+    print("=" * 60)
+    print(f"✅ Time to first token improved {blocking_time / ttft:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
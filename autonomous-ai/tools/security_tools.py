@@ -20,14 +20,16 @@ from pathlib import Path
 
 # Import local modules
 sys.path.append('../')
-from rag_search import search_luxbin_codebase
+from rag_search import LuxbinRAGSearch, get_rag_search
 
 logger = logging.getLogger(__name__)
 
 class LuxbinSecurityTools:
     """Advanced security tools for autonomous threat detection"""
 
-    def __init__(self):
+    def __init__(self, rag_search: Optional[LuxbinRAGSearch] = None):
+        # Shared search service: the embedding model is loaded once per process, not per query
+        self.rag_search = rag_search or get_rag_search()
         self.scan_history = []
         self.threat_database = {}
         self.monitoring_threads = {}
@@ -153,19 +155,21 @@ class LuxbinSecurityTools:
         }
 
         # Search codebase for patterns
+        searches = self._search_patterns([pattern for vuln_info in vulnerability_patterns.values()
+                                          for pattern in vuln_info['patterns']])
         for vuln_type, vuln_info in vulnerability_patterns.items():
             for pattern in vuln_info['patterns']:
-                search_results = search_luxbin_codebase(pattern)
+                search_results = searches[pattern]
                 if search_results['search_success'] and search_results['results']:
                     for result in search_results['results']:
-                        if result['similarity_score'] > 0.3:  # Confidence threshold
+                        if result['relevance_score'] > 0.3:  # Confidence threshold
                             findings.append({
                                 'type': vuln_type,
                                 'severity': vuln_info['severity'],
                                 'description': vuln_info['description'],
-                                'file': result['metadata']['file_path'],
+                                'file': result['file_path'],
                                 'line_content': result['content'][:200],
-                                'confidence': result['similarity_score'],
+                                'confidence': result['relevance_score'],
                                 'quantum_boost': self._calculate_quantum_boost(vuln_type)
                             })
 
@@ -201,16 +205,17 @@ class LuxbinSecurityTools:
             'api.*key'
         ]
 
+        searches = self._search_patterns(grover_patterns)
         for pattern in grover_patterns:
-            search_results = search_luxbin_codebase(pattern)
+            search_results = searches[pattern]
             if search_results['search_success'] and search_results['results']:
                 for result in search_results['results']:
                     findings.append({
                         'type': 'quantum_detected_secret',
                         'severity': 'critical',
                         'description': 'Potential secret exposure detected by quantum algorithm',
-                        'file': result['metadata']['file_path'],
-                        'confidence': min(1.0, result['similarity_score'] * 1.5),  # Quantum boost
+                        'file': result['file_path'],
+                        'confidence': min(1.0, result['relevance_score'] * 1.5),  # Quantum boost
                         'quantum_boost': 50
                     })
 
@@ -228,15 +233,16 @@ class LuxbinSecurityTools:
             'ecdsa'
         ]
 
+        searches = self._search_patterns(vulnerable_patterns)
         for pattern in vulnerable_patterns:
-            search_results = search_luxbin_codebase(pattern)
+            search_results = searches[pattern]
             if search_results['search_success'] and search_results['results']:
                 for result in search_results['results']:
                     findings.append({
                         'type': 'quantum_vulnerable_crypto',
                         'severity': 'high',
                         'description': f'Quantum-vulnerable {pattern.upper()} detected - consider post-quantum alternatives',
-                        'file': result['metadata']['file_path'],
+                        'file': result['file_path'],
                         'recommendation': 'Use quantum-resistant algorithms like Kyber, Dilithium, or Falcon'
                     })
 
@@ -254,15 +260,16 @@ class LuxbinSecurityTools:
             'HACK',         # Temporary fixes
         ]
 
+        searches = self._search_patterns(basic_checks)
         for check in basic_checks:
-            search_results = search_luxbin_codebase(check)
+            search_results = searches[check]
             if search_results['search_success'] and search_results['results']:
                 for result in search_results['results']:
                     findings.append({
                         'type': 'code_quality',
                         'severity': 'low',
                         'description': f'Found {check} in code',
-                        'file': result['metadata']['file_path']
+                        'file': result['file_path']
                     })
 
         return findings
@@ -314,20 +321,25 @@ class LuxbinSecurityTools:
             r'PASSWORD\s*='
         ]
 
+        searches = self._search_patterns(secret_patterns)
         for pattern in secret_patterns:
-            search_results = search_luxbin_codebase(pattern)
+            search_results = searches[pattern]
             if search_results['search_success'] and search_results['results']:
                 for result in search_results['results']:
                     findings.append({
                         'type': 'exposed_secret',
                         'severity': 'critical',
                         'description': 'Potential secret exposure in configuration',
-                        'file': result['metadata']['file_path'],
+                        'file': result['file_path'],
                         'recommendation': 'Move secrets to environment variables or secure vault'
                     })
 
         return findings
 
+    def _search_patterns(self, patterns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Search the codebase for every pattern in one batch"""
+        return dict(zip(patterns, self.rag_search.search_many(patterns)))
+
     def _calculate_quantum_boost(self, vuln_type: str) -> int:
         """Calculate quantum advantage boost for different vulnerability types"""
         boosts = {
@@ -409,7 +421,7 @@ class LuxbinSecurityTools:
             Enhanced search results
         """
         # Use existing RAG search
-        results = search_luxbin_codebase(query)
+        results = self.rag_search.search_codebase(query)
 
         if not results['search_success']:
             return results
@@ -420,7 +432,7 @@ class LuxbinSecurityTools:
             enhanced = result.copy()
 
             # Add file type analysis
-            file_path = result['metadata']['file_path']
+            file_path = result['file_path']
             enhanced['file_analysis'] = self._analyze_file_type(file_path)
 
             # Add dependency analysis
@@ -524,7 +536,7 @@ class LuxbinSecurityTools:
         }
 
         # Search for the destination
-        search_results = search_luxbin_codebase(destination)
+        search_results = self.rag_search.search_codebase(destination)
 
         if search_results['search_success'] and search_results['results']:
             navigation_result['found'] = True
@@ -532,9 +544,9 @@ class LuxbinSecurityTools:
             # Extract locations
             for result in search_results['results'][:5]:  # Top 5 results
                 location = {
-                    'file': result['metadata']['file_path'],
-                    'language': result['metadata']['language'],
-                    'relevance': result['similarity_score'],
+                    'file': result['file_path'],
+                    'language': result['language'],
+                    'relevance': result['relevance_score'],
                     'preview': result['content'][:100]
                 }
                 navigation_result['locations'].append(location)
@@ -15,9 +15,11 @@ Where:
 All terms normalized to [0, 1], α–ε are governance-tunable weights.
 """
 
+import itertools
 import numpy as np
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from numpy.lib import recfunctions
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 from enum import Enum
 import json
@@ -115,6 +117,20 @@ class HCTMetrics:
                 errors.append(f"{key} = {value:.4f} (out of range [0, 1])")
         return errors
 
+    def to_record(self) -> Tuple[float, ...]:
+        """Values in METRIC_FIELDS order (one row of a METRICS_DTYPE array)"""
+        return tuple(getattr(self, name) for name in METRIC_FIELDS)
+
+# Batch layout: one float64 field per metric, four per component in B, H, G, R, E order
+METRIC_FIELDS = [f.name for f in fields(HCTMetrics) if f.name != 'timestamp']
+METRICS_DTYPE = np.dtype([(name, 'f8') for name in METRIC_FIELDS])
+COMPONENTS = ["B", "H", "G", "R", "E"]
+RESULT_DTYPE = np.dtype(
+    [(name, 'f8') for name in COMPONENTS] +
+    [(f"weighted_{name}", 'f8') for name in COMPONENTS] +
+    [("HCT", 'f8')]
+)
+
 @dataclass
 class HCTResult:
     """Complete HCT computation result"""
@@ -191,6 +207,209 @@ class HCTResult:
                 breached.append(f"{name}={value:.3f}")
         return breached
 
+# ============================================================================
+# History & Coefficient Sweeps
+# ============================================================================
+
+HISTORY_CAPACITY = 4096
+TREND_WINDOW = 10
+RESYNC_EVERY = 1024  # Appends between exact recomputes of the window sums
+
+class HCTHistory:
+    """
+    Fixed-capacity ring buffer of HCT results
+
+    Keeps the last ``capacity`` results, their HCT values and raw metrics
+    (a METRICS_DTYPE array, for coefficient sweeps). Sums over the trailing
+    ``window`` values are updated on every append, so the trend slope and
+    coefficient of variation cost O(1) instead of a re-slice and polyfit.
+    """
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY, window: int = TREND_WINDOW):
+        if capacity < window:
+            raise ValueError(f"History capacity {capacity} is smaller than the trend window {window}")
+        self.capacity = capacity
+        self.window = window
+
+        self._results: List[Optional['HCTResult']] = [None] * capacity
+        self._values = np.zeros(capacity)
+        self._metrics = np.zeros(capacity, dtype=METRICS_DTYPE)
+        self._head = 0   # Next slot to write
+        self._count = 0
+        self.appended = 0
+
+        self._resync()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _order(self) -> np.ndarray:
+        """Slots from oldest to newest"""
+        return (np.arange(self._count) + self._head - self._count) % self.capacity
+
+    def __iter__(self) -> Iterator['HCTResult']:
+        for slot in self._order():
+            yield self._results[slot]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._results[slot] for slot in self._order()[index]]
+        if not -self._count <= index < self._count:
+            raise IndexError("history index out of range")
+        return self._results[(self._head - self._count + index % self._count) % self.capacity]
+
+    def append(self, result: 'HCTResult'):
+        head = self._head
+        old = self._values[(head - self.window) % self.capacity]  # Leaves the trend window
+        self._results[head] = result
+        self._values[head] = result.HCT
+        self._metrics[head] = result.raw_metrics.to_record()
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.appended += 1
+
+        if self.appended % RESYNC_EVERY == 0:
+            self._resync()  # Bound the rounding error the running sums pick up
+            return
+
+        if self._n == 0:
+            self._shift = result.HCT
+        y = result.HCT - self._shift
+        if self._n < self.window:
+            self._sum_xy += self._n * y
+            self._n += 1
+        else:
+            old -= self._shift
+            # Every remaining value moves one step left; the new one enters at x = window - 1
+            self._sum_xy += -(self._sum_y - old) + (self.window - 1) * y
+            self._sum_y -= old
+            self._sum_y2 -= old * old
+        self._sum_y += y
+        self._sum_y2 += y * y
+
+    def _resync(self):
+        """Recompute the window sums from the stored values"""
+        recent = self.values(self.window)
+        self._n = len(recent)
+        self._shift = float(recent.mean()) if self._n else 0.0  # Sums of deviations stay well-conditioned
+        y = recent - self._shift
+        self._sum_y = float(y.sum())
+        self._sum_y2 = float((y * y).sum())
+        self._sum_xy = float((np.arange(self._n) * y).sum())
+
+    def values(self, last: Optional[int] = None) -> np.ndarray:
+        """HCT values from oldest to newest (the last ``last`` only, if given)"""
+        order = self._order()
+        if last is not None:
+            order = order[max(0, len(order) - last):]
+        return self._values[order]
+
+    def metrics(self) -> np.ndarray:
+        """Stored raw metrics from oldest to newest (METRICS_DTYPE)"""
+        return self._metrics[self._order()]
+
+    def slope(self, window: Optional[int] = None) -> Optional[float]:
+        """Least-squares slope of the last ``window`` HCT values, or None with fewer than two"""
+        if window is not None and window != self.window:
+            return window_slope(self.values(window))
+        n = self._n
+        if n < 2:
+            return None
+        sum_x = n * (n - 1) / 2
+        sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self._sum_xy - sum_x * self._sum_y) / (n * sum_x2 - sum_x * sum_x)
+
+    def coefficient_of_variation(self, window: Optional[int] = None) -> Optional[float]:
+        """Population std / mean of the last ``window`` HCT values, or None with fewer than two"""
+        if window is not None and window != self.window:
+            recent = self.values(window)
+            if len(recent) < 2:
+                return None
+            mean = recent.mean()
+            return float('inf') if mean == 0 else float(recent.std() / mean)
+        n = self._n
+        if n < 2:
+            return None
+        mean_y = self._sum_y / n
+        mean = self._shift + mean_y
+        if mean == 0:
+            return float('inf')
+        variance = max(self._sum_y2 / n - mean_y * mean_y, 0.0)
+        return float(np.sqrt(variance) / mean)
+
+def window_slope(values: np.ndarray) -> Optional[float]:
+    """Least-squares slope of values against 0..n-1 (same as np.polyfit degree 1)"""
+    n = len(values)
+    if n < 2:
+        return None
+    x = np.arange(n) - (n - 1) / 2
+    return float((x * (values - values.mean())).sum() / (x * x).sum())
+
+@dataclass
+class HCTSweep:
+    """HCT over a set of metrics rows under each coefficient set of a grid"""
+
+    coefficients: np.ndarray   # (sets, 5): alpha, beta, gamma, delta, epsilon
+    rows: int
+    mean: np.ndarray           # Per set
+    std: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    last: np.ndarray
+    below_threshold: np.ndarray  # Share of rows with HCT under the threshold
+    threshold: float
+    hct: Optional[np.ndarray] = None  # (rows, sets) when kept
+
+    def best(self, key: str = "mean") -> Tuple[HCTCoefficients, float]:
+        """Coefficient set with the highest value of a summary statistic"""
+        values = getattr(self, key)
+        index = int(np.argmax(values))
+        alpha, beta, gamma, delta, epsilon = self.coefficients[index]
+        return HCTCoefficients(alpha, beta, gamma, delta, epsilon, updated_by="sweep"), float(values[index])
+
+    def summary(self) -> List[Dict]:
+        """One dict per coefficient set, in grid order"""
+        names = ["alpha", "beta", "gamma", "delta", "epsilon"]
+        return [
+            {
+                "coefficients": dict(zip(names, map(float, self.coefficients[i]))),
+                "mean": float(self.mean[i]),
+                "std": float(self.std[i]),
+                "min": float(self.min[i]),
+                "max": float(self.max[i]),
+                "last": float(self.last[i]),
+                "below_threshold": float(self.below_threshold[i])
+            }
+            for i in range(len(self.coefficients))
+        ]
+
+def coefficient_grid(
+    alpha: Sequence[float] = (1.0,),
+    beta: Sequence[float] = (1.0,),
+    gamma: Sequence[float] = (1.0,),
+    delta: Sequence[float] = (1.0,),
+    epsilon: Sequence[float] = (1.0,),
+    normalize: bool = True
+) -> np.ndarray:
+    """
+    Every combination of the given coefficient values, as a (sets, 5) array
+
+    With normalize, each set is scaled to sum to 5.0 like
+    HCTCoefficients.normalize (duplicate sets are then dropped).
+    """
+    grid = np.array(list(itertools.product(alpha, beta, gamma, delta, epsilon)), dtype=np.float64)
+    if normalize:
+        grid = grid * (5.0 / grid.sum(axis=1, keepdims=True))
+        _, first = np.unique(np.round(grid, 12), axis=0, return_index=True)
+        grid = grid[np.sort(first)]
+    return grid
+
+def _coefficient_array(coefficients: Union[HCTCoefficients, Sequence]) -> np.ndarray:
+    if isinstance(coefficients, HCTCoefficients):
+        return np.array([coefficients.alpha, coefficients.beta, coefficients.gamma,
+                         coefficients.delta, coefficients.epsilon])
+    return np.asarray(coefficients, dtype=np.float64)
+
 class HCTEngine:
     """
     Core HCT computation engine
@@ -204,11 +423,12 @@ class HCTEngine:
     - Production-ready: handles edge cases, validates inputs
     """
 
-    def __init__(self, coefficients: Optional[HCTCoefficients] = None):
+    def __init__(self, coefficients: Optional[HCTCoefficients] = None,
+                 history_capacity: int = HISTORY_CAPACITY):
         self.coefficients = coefficients or HCTCoefficients()
-        self.history: List[HCTResult] = []
+        self.history = HCTHistory(history_capacity)
 
-    def compute(self, metrics: HCTMetrics) -> HCTResult:
+    def compute(self, metrics: HCTMetrics, record: bool = True) -> HCTResult:
         """
         Compute HCT from raw metrics
 
@@ -218,6 +438,9 @@ class HCTEngine:
         3. Apply coefficients
         4. Compute geometric mean
 
+        Args:
+            record: Append the result to the engine's history
+
         Returns:
             HCTResult with complete computation breakdown
 
@@ -282,10 +505,138 @@ class HCTEngine:
         )
 
         # Store in history
-        self.history.append(result)
+        if record:
+            self.history.append(result)
+
+        return result
+
+    # ========================================================================
+    # Batch Computation
+    # ========================================================================
+
+    @staticmethod
+    def component_scores(metrics: np.ndarray) -> np.ndarray:
+        """
+        Component scores (rows, 5) for a METRICS_DTYPE array
+
+        Same rules as compute: each component is the geometric mean of its
+        four sub-metrics, and any zero makes it zero.
+
+        Raises:
+            ValueError if any row has a metric outside [0, 1]
+        """
+        values = recfunctions.structured_to_unstructured(metrics[METRIC_FIELDS], dtype=np.float64)
+        valid = ((values >= 0.0) & (values <= 1.0)).all(axis=1)
+        if not valid.all():
+            bad = np.flatnonzero(~valid)
+            row = bad[0]
+            columns = [METRIC_FIELDS[c] for c in np.flatnonzero(~((values[row] >= 0) & (values[row] <= 1)))]
+            raise ValueError(f"Invalid metrics in {len(bad)} rows (first: row {row}, {', '.join(columns)})")
+
+        with np.errstate(divide='ignore'):
+            logs = np.log(values.reshape(len(values), len(COMPONENTS), 4))
+        return np.exp(logs.mean(axis=2))  # log(0) = -inf, so a zero sub-metric gives exp(-inf) = 0
+
+    def compute_batch(self, metrics: np.ndarray,
+                      coefficients: Optional[HCTCoefficients] = None) -> np.ndarray:
+        """
+        Score many metrics rows in one vectorized pass
+
+        Args:
+            metrics: Structured array with a float field per METRIC_FIELDS name
+                     (extra fields are ignored); see metrics_array
+            coefficients: Weights to apply (default: the engine's)
 
+        Returns:
+            RESULT_DTYPE array: B, H, G, R, E, weighted_B..weighted_E, HCT per row.
+            Results are not added to the history.
+        """
+        weights = _coefficient_array(coefficients or self.coefficients)
+        scores = self.component_scores(metrics)
+        weighted = scores ** weights
+
+        with np.errstate(divide='ignore'):
+            log_product = np.log(weighted).sum(axis=1)
+        hct = np.exp(log_product / 5.0)
+        hct[(weighted <= 0).any(axis=1)] = 0.0
+
+        result = np.empty(len(scores), dtype=RESULT_DTYPE)
+        for i, name in enumerate(COMPONENTS):
+            result[name] = scores[:, i]
+            result[f"weighted_{name}"] = weighted[:, i]
+        result["HCT"] = hct
         return result
 
+    def sweep_coefficients(
+        self,
+        grid: Union[np.ndarray, Sequence[HCTCoefficients]],
+        metrics: Optional[np.ndarray] = None,
+        threshold: float = 0.5,
+        keep_hct: bool = False,
+        chunk_rows: int = 65536
+    ) -> HCTSweep:
+        """
+        Evaluate a grid of coefficient sets over stored metrics
+
+        Component scores do not depend on the coefficients, so they are
+        computed once; each set then costs one matrix product in log space.
+
+        Args:
+            grid: (sets, 5) array (see coefficient_grid) or HCTCoefficients list
+            metrics: METRICS_DTYPE rows (default: the engine's history)
+            threshold: HCT level counted in below_threshold
+            keep_hct: Also return the full (rows, sets) HCT matrix
+            chunk_rows: Rows scored per pass (bounds memory for long histories)
+        """
+        if len(grid) and isinstance(grid[0], HCTCoefficients):
+            grid = [_coefficient_array(c) for c in grid]
+        weights = np.atleast_2d(np.asarray(grid, dtype=np.float64))
+        if weights.shape[1] != len(COMPONENTS) or (weights < 0).any():
+            raise ValueError("Coefficient grid must be (sets, 5) with non-negative weights")
+        if metrics is None:
+            metrics = self.history.metrics()
+
+        sets, rows = len(weights), len(metrics)
+        total = np.zeros(sets)
+        total_sq = np.zeros(sets)
+        low = np.full(sets, np.inf)
+        high = np.full(sets, -np.inf)
+        below = np.zeros(sets)
+        last = np.full(sets, np.nan)
+        kept = np.empty((rows, sets)) if keep_hct else None
+
+        for start in range(0, rows, chunk_rows):
+            scores = self.component_scores(metrics[start:start + chunk_rows])
+            with np.errstate(divide='ignore'):
+                logs = np.log(scores)
+            # A zero component has log -inf; a zero weight turns it into 0 ** 0 = 1 as in compute
+            logs = np.maximum(logs, -1e300)
+            hct = np.exp(logs @ weights.T / 5.0)
+
+            total += hct.sum(axis=0)
+            total_sq += (hct * hct).sum(axis=0)
+            low = np.minimum(low, hct.min(axis=0))
+            high = np.maximum(high, hct.max(axis=0))
+            below += (hct < threshold).sum(axis=0)
+            last = hct[-1]
+            if keep_hct:
+                kept[start:start + len(hct)] = hct
+
+        mean = total / rows if rows else np.full(sets, np.nan)
+        std = np.sqrt(np.maximum(total_sq / rows - mean * mean, 0.0)) if rows else np.full(sets, np.nan)
+        return HCTSweep(
+            coefficients=weights,
+            rows=rows,
+            mean=mean,
+            std=std,
+            min=low if rows else np.full(sets, np.nan),
+            max=high if rows else np.full(sets, np.nan),
+            last=last,
+            below_threshold=below / rows if rows else np.full(sets, np.nan),
+            threshold=threshold,
+            hct=kept
+        )
+
     def _compute_biology(self, m: HCTMetrics) -> float:
         """
         B = geometric_mean(entropy, fault_tolerance, mutation_rate, uptime)
@@ -395,17 +746,8 @@ class HCTEngine:
             Trend coefficient (positive = improving, negative = degrading)
             None if insufficient history
         """
-        if len(self.history) < 2:
-            return None
-
-        recent = self.history[-window:]
-        hct_values = [r.HCT for r in recent]
-
-        # Simple linear regression
-        x = np.arange(len(hct_values))
-        slope = np.polyfit(x, hct_values, 1)[0]
-
-        return slope
+        # Least-squares slope, kept incrementally by the history for its window
+        return self.history.slope(window)
 
     def get_volatility(self, window: int = 10) -> Optional[float]:
         """
@@ -414,19 +756,7 @@ class HCTEngine:
         High volatility = unstable system
         Low volatility = stable system
         """
-        if len(self.history) < 2:
-            return None
-
-        recent = self.history[-window:]
-        hct_values = [r.HCT for r in recent]
-
-        mean = np.mean(hct_values)
-        std = np.std(hct_values)
-
-        if mean == 0:
-            return float('inf')
-
-        return std / mean  # Coefficient of variation
+        return self.history.coefficient_of_variation(window)
 
     def export_history(self, filepath: str):
         """Export HCT history as JSON"""
@@ -540,6 +870,10 @@ def compute_herfindahl_index(market_shares: List[float]) -> float:
 
     return max(0.0, min(1.0, normalized))
 
+def metrics_array(metrics: Iterable[HCTMetrics]) -> np.ndarray:
+    """Pack HCTMetrics objects into a METRICS_DTYPE array for compute_batch"""
+    return np.array([m.to_record() for m in metrics], dtype=METRICS_DTYPE)
+
 def coefficient_of_variation(values: List[float]) -> float:
     """
     Compute coefficient of variation (CV)
@@ -18,7 +18,11 @@ from dataclasses import dataclass
 from enum import Enum
 
 from hct_core import HCTEngine, HCTCoefficients, HCTResult
-from hct_metrics_collector import HCTMetricsAggregator
+from hct_metrics_collector import HCTMetricsAggregator, run_blocking
+from hct_timeseries import HCTTimeSeriesStore
+
+# Chains the mirror follows, scored together by compute_chains
+SUPPORTED_CHAINS = ["optimism", "ethereum", "base", "arbitrum", "polygon"]
 
 class SystemMode(Enum):
     """System operating mode based on HCT"""
@@ -76,14 +80,21 @@ class HCTIntegration:
         self,
         mirror_root: str = "./luxbin_mirror",
         node_registry: Optional[str] = None,
-        policy: Optional[HCTPolicy] = None
+        policy: Optional[HCTPolicy] = None,
+        primary_chain: str = "optimism",
+        record_history: bool = True
     ):
         self.aggregator = HCTMetricsAggregator(mirror_root, node_registry)
         self.engine = HCTEngine()
         self.policy = policy or HCTPolicy()
+        self.primary_chain = primary_chain
 
         self.current_hct: Optional[HCTResult] = None
         self.current_mode: SystemMode = SystemMode.NORMAL
+        self.chain_results: Dict[str, HCTResult] = {}  # Latest result per chain
+
+        # Every result, per chain, under <chain>/hct/timeseries (survives restarts)
+        self.timeseries = HCTTimeSeriesStore(mirror_root) if record_history else None
 
         self.hct_history: List[HCTResult] = []
         self.mode_changes: List[Dict] = []
@@ -100,7 +111,44 @@ class HCTIntegration:
 
         # Compute HCT
         result = self.engine.compute(metrics)
+        self.chain_results[chain] = result
+        await self._record({chain: result})
 
+        return await self._apply_policy(result)
+
+    async def compute_chains(self, chains: Optional[List[str]] = None) -> Dict[str, HCTResult]:
+        """
+        Compute HCT for several chains at once
+
+        Metrics for all chains are collected concurrently. Every chain is
+        scored with the current coefficients; the system mode, breach
+        handling and engine history follow the primary chain only.
+        """
+        chains = list(chains or SUPPORTED_CHAINS)
+        metrics = await self.aggregator.collect_chains(chains)
+
+        results = {}
+        for chain in chains:
+            if chain == self.primary_chain:
+                results[chain] = await self._apply_policy(self.engine.compute(metrics[chain]))
+            else:
+                results[chain] = self.engine.compute(metrics[chain], record=False)
+        self.chain_results.update(results)
+        await self._record(results)
+        return results
+
+    async def _record(self, results: Dict[str, HCTResult]):
+        """Append results to the time series (off the event loop)"""
+        if self.timeseries is None:
+            return
+        try:
+            await run_blocking(self.timeseries.record, results)
+        except OSError as e:
+            print(f"⚠️  HCT history not recorded ({e}); keeping results in memory only")
+            self.timeseries = None
+
+    async def _apply_policy(self, result: HCTResult) -> HCTResult:
+        """Make ``result`` current and react to mode changes and breaches"""
         # Update state
         self.current_hct = result
 
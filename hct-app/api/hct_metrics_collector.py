@@ -12,8 +12,12 @@ Integrates with:
 """
 
 import asyncio
+import functools
 import json
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
@@ -28,6 +32,132 @@ from hct_core import (
     coefficient_of_variation
 )
 
+# Columnar mirror block store (python-implementation/mirror_block_store.py)
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / 'python-implementation'))
+try:
+    from mirror_block_store import (
+        open_block_store,
+        FLAG_COMPLETE,
+        FLAG_GAS_USED,
+        FLAG_RAW_HASHED,
+        FLAG_RAW_VALID,
+        FLAG_REPLAY_FIELDS
+    )
+except ImportError:
+    open_block_store = None
+
+# Block -> threat score index (python-implementation/mirror_threat_index.py)
+try:
+    from mirror_threat_index import get_threat_index
+except ImportError:
+    get_threat_index = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+# Append-only log follower (python-implementation/jsonl_tailer.py)
+try:
+    from jsonl_tailer import JSONLTailer
+except ImportError:
+    JSONLTailer = None
+
+# Expected block time per chain (seconds)
+EXPECTED_BLOCK_TIMES = {
+    'optimism': 2,
+    'ethereum': 12,
+    'arbitrum': 0.25,
+    'polygon': 2,
+    'base': 2
+}
+
+# ===== BLOCKING I/O =====
+
+# Collectors read files, logs and memory-mapped columns; these run on a
+# bounded pool so components and chains are gathered concurrently
+IO_WORKERS = 8
+
+_io_pool = None
+_io_pool_lock = threading.Lock()
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Process-wide pool for the collectors' blocking reads"""
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="hct-io")
+    return _io_pool
+
+async def run_blocking(function, *args, **kwargs):
+    """Run a blocking call on the I/O pool without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_pool(), functools.partial(function, *args, **kwargs))
+
+def blocking(method):
+    """Make a blocking collector method awaitable; each call runs on the I/O pool"""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(method, *args, **kwargs)
+    return wrapper
+
+_block_stores = {}
+_block_store_lock = threading.Lock()
+_threat_index_lock = threading.Lock()
+
+def get_block_store(mirror_root: Path, chain: str):
+    """Read-only block store for a chain, or None while the mirror is still one file per block"""
+    if open_block_store is None:
+        return None
+
+    key = str(mirror_root / chain)
+    with _block_store_lock:
+        store = _block_stores.get(key)
+        if store is None:
+            store = open_block_store(mirror_root / chain)
+            if store is not None:
+                _block_stores[key] = store
+        else:
+            store.refresh()
+    return store
+
+def get_threat_scores(mirror_root: Path, chain: str):
+    """Index rows (block number, log offset, score) for a chain's threat log, or None without the index"""
+    if get_threat_index is None or not (mirror_root / chain / "quantum" / "threat_scores.jsonl").exists():
+        return None
+    try:
+        with _threat_index_lock:
+            return get_threat_index(mirror_root / chain).entries()
+    except OSError:
+        return None  # e.g. mirror directory not writable: scan the log instead
+
+def normalize_mutation_rate(mutation_rate: float) -> float:
+    """Scale a mutation rate to [0, 1] with its peak at 0.6 (moderate evolution)"""
+    if mutation_rate <= 0.6:
+        normalized = mutation_rate / 0.6
+    else:
+        # Penalize too much mutation
+        normalized = 1.0 - ((mutation_rate - 0.6) / 0.4)
+
+    return max(0.0, min(1.0, normalized))
+
+def parent_continuity(numbers: np.ndarray, hashes: np.ndarray, parents: np.ndarray) -> tuple:
+    """(links, continuous links) between consecutive entries
+
+    A link is an entry whose number follows the previous entry's; it is
+    continuous when its parent hash is the previous entry's hash.
+    """
+    if len(numbers) < 2:
+        return 0, 0
+    links = np.diff(numbers) == 1
+    continuous = links & (parents[1:] == hashes[:-1])
+    return int(np.count_nonzero(links)), int(np.count_nonzero(continuous))
+
+def fork_awareness(links: int, continuous: int) -> float:
+    """Share of parent-hash links that continue the previous block (1.0 without links)"""
+    return continuous / links if links else 1.0
+
 class BiologyMetricsCollector:
     """
     Collect Biology (B) metrics from LUXBIN immune system
@@ -45,17 +175,18 @@ class BiologyMetricsCollector:
     async def collect(self, chain: str = "optimism") -> Dict[str, float]:
         """Collect all Biology metrics"""
 
-        # Read spawned cells
-        cells = await self._read_spawned_cells(chain)
+        # Read spawned cells while the rhythm log is scanned
+        cells, uptime = await asyncio.gather(self._read_spawned_cells(chain), self._compute_uptime(chain))
 
         return {
             "b_entropy": await self._compute_entropy(cells),
             "b_fault_tolerance": await self._compute_fault_tolerance(cells),
             "b_mutation_rate": await self._compute_mutation_rate(cells),
-            "b_uptime": await self._compute_uptime(chain)
+            "b_uptime": uptime
         }
 
-    async def _read_spawned_cells(self, chain: str) -> List[Dict]:
+    @blocking
+    def _read_spawned_cells(self, chain: str) -> List[Dict]:
         """Read all spawned immune cells"""
         cells_file = self.mirror_root / chain / "immune" / "cells_spawned.jsonl"
 
@@ -150,17 +281,10 @@ class BiologyMetricsCollector:
 
         mutation_rate = len(recent_types) / len(all_types)
 
-        # Normalize: target 0.6 (moderate evolution)
-        # Scale to [0, 1] with peak at 0.6
-        if mutation_rate <= 0.6:
-            normalized = mutation_rate / 0.6
-        else:
-            # Penalize too much mutation
-            normalized = 1.0 - ((mutation_rate - 0.6) / 0.4)
-
-        return max(0.0, min(1.0, normalized))
+        return normalize_mutation_rate(mutation_rate)
 
-    async def _compute_uptime(self, chain: str) -> float:
+    @blocking
+    def _compute_uptime(self, chain: str) -> float:
         """
         Compute system uptime
 
@@ -186,13 +310,7 @@ class BiologyMetricsCollector:
             return 0.0
 
         # Expected block time for chain (seconds)
-        expected_time = {
-            'optimism': 2,
-            'ethereum': 12,
-            'arbitrum': 0.25,
-            'polygon': 2,
-            'base': 2
-        }.get(chain, 2)
+        expected_time = EXPECTED_BLOCK_TIMES.get(chain, 2)
 
         # Uptime = blocks within tolerance / total blocks
         tolerance = 2.0  # Allow 2x expected time
@@ -219,20 +337,32 @@ class HistoryMetricsCollector:
     async def collect(self, chain: str = "optimism") -> Dict[str, float]:
         """Collect all History metrics"""
 
+        replay, forks, learning, audit = await asyncio.gather(
+            self._compute_replay_integrity(chain),
+            self._compute_fork_awareness(chain),
+            self._compute_anomaly_learning(chain),
+            self._compute_auditability(chain)
+        )
+
         return {
-            "h_replay_integrity": await self._compute_replay_integrity(chain),
-            "h_fork_awareness": await self._compute_fork_awareness(chain),
-            "h_anomaly_learning": await self._compute_anomaly_learning(chain),
-            "h_auditability": await self._compute_auditability(chain)
+            "h_replay_integrity": replay,
+            "h_fork_awareness": forks,
+            "h_anomaly_learning": learning,
+            "h_auditability": audit
         }
 
-    async def _compute_replay_integrity(self, chain: str) -> float:
+    @blocking
+    def _compute_replay_integrity(self, chain: str) -> float:
         """
         Compute replay integrity
 
         Can we reconstruct state from stored blocks?
         Metric: (valid_blocks / total_blocks)
         """
+        store = get_block_store(self.mirror_root, chain)
+        if store is not None:
+            return store.flag_fraction(FLAG_REPLAY_FIELDS)
+
         normalized_dir = self.mirror_root / chain / "normalized"
 
         if not normalized_dir.exists():
@@ -258,42 +388,58 @@ class HistoryMetricsCollector:
 
         return valid_blocks / total_blocks
 
-    async def _compute_fork_awareness(self, chain: str) -> float:
+    @blocking
+    def _compute_fork_awareness(self, chain: str) -> float:
         """
         Compute fork awareness
 
-        For now: placeholder (would require fork detection logic)
-        Real implementation: monitor parent_hash continuity
+        Parent-hash continuity: of the blocks that follow the previous
+        mirrored block, the share whose parent_hash is that block's hash
         """
+        store = get_block_store(self.mirror_root, chain)
+        if store is not None:
+            rows = len(store)  # Columns fetched after a concurrent refresh may be longer
+            return fork_awareness(*parent_continuity(
+                store.column('number')[:rows], store.column('hash')[:rows], store.column('parent_hash')[:rows]))
+
         # Read normalized blocks
         normalized_dir = self.mirror_root / chain / "normalized"
 
         if not normalized_dir.exists():
             return 1.0  # No forks detected = perfect
 
-        # Check for parent_hash continuity (simple fork detection)
+        # Check for parent_hash continuity in block order
         blocks = []
-        for block_file in sorted(normalized_dir.glob("block_*.norm.json")):
+        for block_file in normalized_dir.glob("block_*.norm.json"):
             try:
                 with open(block_file, 'r') as f:
-                    blocks.append(json.load(f))
+                    data = json.load(f)
+                blocks.append((int(data['block'], 16), str(data.get('hash')), str(data.get('parent_hash'))))
             except:
                 continue
+        blocks.sort(key=lambda block: block[0])
 
         if len(blocks) < 2:
             return 1.0
 
-        # This is a simplified check
-        # Real fork detection would track parent_hash chains
-        return 0.90  # Assume 90% fork awareness for now
+        numbers, hashes, parents = (np.array(column) for column in zip(*blocks))
+        return fork_awareness(*parent_continuity(numbers, hashes, parents))
 
-    async def _compute_anomaly_learning(self, chain: str) -> float:
+    @blocking
+    def _compute_anomaly_learning(self, chain: str) -> float:
         """
         Compute anomaly learning (non-recurrence)
 
         Do we keep seeing the same threats?
         Metric: 1 - (repeated_threats / total_threats)
         """
+        entries = get_threat_scores(self.mirror_root, chain)
+        if entries is not None:
+            high_threats = entries['number'][entries['score'] >= 50]
+            if len(high_threats) < 2:
+                return 1.0
+            return len(np.unique(high_threats)) / len(high_threats)
+
         threat_file = self.mirror_root / chain / "quantum" / "threat_scores.jsonl"
 
         if not threat_file.exists():
@@ -321,13 +467,18 @@ class HistoryMetricsCollector:
 
         return learning
 
-    async def _compute_auditability(self, chain: str) -> float:
+    @blocking
+    def _compute_auditability(self, chain: str) -> float:
         """
         Compute auditability
 
         Do we have complete audit trail?
         Metric: (blocks_with_full_data / total_blocks)
         """
+        store = get_block_store(self.mirror_root, chain)
+        if store is not None:
+            return store.flag_fraction(FLAG_COMPLETE)
+
         chain_dir = self.mirror_root / chain
 
         if not chain_dir.exists():
@@ -388,7 +539,8 @@ class GeologyMetricsCollector:
             "g_physical_decentralization": await self._compute_physical_decentralization(nodes)
         }
 
-    async def _read_node_registry(self) -> List[Dict]:
+    @blocking
+    def _read_node_registry(self) -> List[Dict]:
         """Read node registry (or create default)"""
 
         if not os.path.exists(self.node_registry):
@@ -502,16 +654,55 @@ class ReligionMetricsCollector:
     async def collect(self, chain: str = "optimism") -> Dict[str, float]:
         """Collect all Religion metrics"""
 
-        blocks = await self._read_normalized_blocks(chain)
+        constraints, non_violence = await asyncio.gather(
+            self._read_block_constraints(chain),
+            self._compute_non_violence(chain)
+        )
+        if constraints is None:
+            blocks = await self._read_normalized_blocks(chain)
+            constraints = (await self._compute_protocol_compliance(blocks),
+                           await self._compute_safety_constraints(blocks))
+        compliance, safety = constraints
 
         return {
-            "r_protocol_compliance": await self._compute_protocol_compliance(blocks),
-            "r_safety_constraints": await self._compute_safety_constraints(blocks),
-            "r_non_violence": await self._compute_non_violence(chain),
+            "r_protocol_compliance": compliance,
+            "r_safety_constraints": safety,
+            "r_non_violence": non_violence,
             "r_permission_boundaries": await self._compute_permission_boundaries()
         }
 
-    async def _read_normalized_blocks(self, chain: str) -> List[Dict]:
+    @blocking
+    def _read_block_constraints(self, chain: str) -> Optional[tuple]:
+        """(compliance, safety) from the block store, or None for a per-file mirror"""
+        store = get_block_store(self.mirror_root, chain)
+        if store is None:
+            return None
+        return self._compute_block_constraints_from_store(store)
+
+    def _compute_block_constraints_from_store(self, store) -> tuple:
+        """Protocol compliance and safety constraints from the block store's columns"""
+        rows = len(store)
+        if rows == 0:
+            return 1.0, 1.0
+
+        flags = store.column('flags')[:rows]
+        tx_count = store.column('tx_count')[:rows]
+
+        # Same rules as the per-block checks below, evaluated on whole columns
+        required = FLAG_REPLAY_FIELDS | FLAG_GAS_USED
+        valid = np.count_nonzero(((flags & required) == required) & (tx_count >= 0))
+        compliance = valid / rows
+
+        total_txs = int(tx_count.sum(dtype=np.int64))
+        if total_txs == 0:
+            return compliance, 1.0
+        violations = int(-tx_count[tx_count < 0].sum(dtype=np.int64))
+        safety = 1.0 - (violations / max(total_txs, 1))
+
+        return compliance, max(0.0, min(1.0, safety))
+
+    @blocking
+    def _read_normalized_blocks(self, chain: str) -> List[Dict]:
         """Read normalized blocks"""
         norm_dir = self.mirror_root / chain / "normalized"
 
@@ -574,13 +765,21 @@ class ReligionMetricsCollector:
 
         return max(0.0, min(1.0, safety))
 
-    async def _compute_non_violence(self, chain: str) -> float:
+    @blocking
+    def _compute_non_violence(self, chain: str) -> float:
         """
         Compute non-violence (non-malicious behavior)
 
         Metric: 1 - (malicious_actions / total_actions)
         Malicious = high threat scores
         """
+        entries = get_threat_scores(self.mirror_root, chain)
+        if entries is not None:
+            if len(entries) == 0:
+                return 1.0
+            malicious = np.count_nonzero(entries['score'] >= 70)
+            return 1.0 - (malicious / len(entries))
+
         threat_file = self.mirror_root / chain / "quantum" / "threat_scores.jsonl"
 
         if not threat_file.exists():
@@ -632,11 +831,17 @@ class ElectromagnetismMetricsCollector:
     async def collect(self, chain: str = "optimism") -> Dict[str, float]:
         """Collect all Electromagnetism metrics"""
 
+        timing, latency, integrity = await asyncio.gather(
+            self._compute_timing_accuracy(chain),
+            self._compute_latency_consistency(chain),
+            self._compute_signal_integrity(chain)
+        )
+
         return {
             "e_power_efficiency": await self._compute_power_efficiency(),
-            "e_timing_accuracy": await self._compute_timing_accuracy(chain),
-            "e_latency_consistency": await self._compute_latency_consistency(chain),
-            "e_signal_integrity": await self._compute_signal_integrity(chain)
+            "e_timing_accuracy": timing,
+            "e_latency_consistency": latency,
+            "e_signal_integrity": integrity
         }
 
     async def _compute_power_efficiency(self) -> float:
@@ -649,7 +854,8 @@ class ElectromagnetismMetricsCollector:
         # TODO: Integrate with system power monitoring
         return 0.75  # Assume 75% efficiency
 
-    async def _compute_timing_accuracy(self, chain: str) -> float:
+    @blocking
+    def _compute_timing_accuracy(self, chain: str) -> float:
         """
         Compute timing accuracy (clock synchronization)
 
@@ -674,13 +880,7 @@ class ElectromagnetismMetricsCollector:
             return 1.0
 
         # Expected block time
-        expected = {
-            'optimism': 2,
-            'ethereum': 12,
-            'arbitrum': 0.25,
-            'polygon': 2,
-            'base': 2
-        }.get(chain, 2)
+        expected = EXPECTED_BLOCK_TIMES.get(chain, 2)
 
         # Max drift
         max_drift = max(abs(bt - expected) for bt in block_times)
@@ -692,7 +892,8 @@ class ElectromagnetismMetricsCollector:
 
         return accuracy
 
-    async def _compute_latency_consistency(self, chain: str) -> float:
+    @blocking
+    def _compute_latency_consistency(self, chain: str) -> float:
         """
         Compute latency consistency
 
@@ -724,13 +925,18 @@ class ElectromagnetismMetricsCollector:
 
         return consistency
 
-    async def _compute_signal_integrity(self, chain: str) -> float:
+    @blocking
+    def _compute_signal_integrity(self, chain: str) -> float:
         """
         Compute signal integrity
 
         Metric: 1 - (corrupted_blocks / total_blocks)
         Corrupted = missing hashes, invalid JSON, etc.
         """
+        store = get_block_store(self.mirror_root, chain)
+        if store is not None:
+            return store.flag_fraction(FLAG_RAW_VALID | FLAG_RAW_HASHED) if len(store) else 1.0
+
         raw_dir = self.mirror_root / chain / "raw"
         hash_dir = self.mirror_root / chain / "hashed"
 
@@ -765,6 +971,495 @@ class ElectromagnetismMetricsCollector:
 
         return integrity
 
+# ===== INCREMENTAL COLLECTION =====
+
+STATE_VERSION = 1
+STATE_DIR = "hct"
+RECENT_CELLS = 100
+SETTLE_BLOCKS = 64  # Per-file mirrors: how far back late raw/normalized/hash files are still picked up
+HIGH_THREAT = 50
+MALICIOUS_THREAT = 70
+
+class ChainMetricsState:
+    """
+    Running HCT inputs for one chain, advanced from persisted watermarks
+
+    Each source is read from where the last update stopped:
+    - cells, rhythm and threat logs from a byte offset (JSONLTailer state);
+      a replaced or truncated log is re-counted from the top
+    - the block store from its committed row count
+    - per-file mirrors from the highest block number seen, re-checking the
+      last SETTLE_BLOCKS blocks for files written after their block
+
+    State lives in <chain>/hct/collector_state.json (atomically replaced).
+    Block numbers of high threats, the only state that grows with the chain,
+    are appended to high_threat_blocks.bin next to it. Worker processes take
+    turns through a lock file and pick up each other's progress.
+    """
+
+    def __init__(self, mirror_root: Path, chain: str):
+        self.chain = chain
+        self.chain_path = mirror_root / chain
+        self.state_path = self.chain_path / STATE_DIR / "collector_state.json"
+        self.high_path = self.chain_path / STATE_DIR / "high_threat_blocks.bin"
+        self.log_paths = {
+            'cells': self.chain_path / "immune" / "cells_spawned.jsonl",
+            'rhythm': self.chain_path / "logs" / "rhythm.jsonl",
+            'threats': self.chain_path / "quantum" / "threat_scores.jsonl"
+        }
+        self.expected_time = EXPECTED_BLOCK_TIMES.get(chain, 2)
+        self.lock = threading.Lock()
+        self.persist = True
+        self._state_mtime = None
+        self._load()
+
+    # ===== STATE =====
+
+    def _reset_cells(self):
+        self.cells = {'types': {}, 'total': 0, 'recent': []}
+
+    def _reset_rhythm(self):
+        self.rhythm = {'count': 0, 'on_time': 0, 'max_drift': 0.0, 'mean': 0.0, 'm2': 0.0}
+
+    def _reset_threats(self):
+        self.threats = {'total': 0, 'malicious': 0, 'high': 0, 'high_unique': 0}
+        self.high_blocks = set()
+
+    def _reset_blocks(self, source: Optional[str] = None):
+        self.blocks = {
+            'source': source, 'rows': 0, 'total': 0, 'replay': 0, 'compliant': 0,
+            'total_txs': 0, 'violations': 0, 'links': 0, 'continuous': 0,
+            'last_number': None, 'last_hash': None,
+            # Per-file mirrors only
+            'raw_total': 0, 'complete': 0, 'intact': 0,
+            'norm_watermark': None, 'norm_window': {},
+            'raw_watermark': None, 'raw_window': {}
+        }
+
+    def _load(self):
+        self.logs = {}
+        self._reset_cells()
+        self._reset_rhythm()
+        self._reset_threats()
+        self._reset_blocks()
+        try:
+            self._state_mtime = self.state_path.stat().st_mtime_ns
+            with open(self.state_path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if saved.get('version') != STATE_VERSION:
+            return
+
+        self.logs = saved['logs']
+        self.cells = saved['cells']
+        self.rhythm = saved['rhythm']
+        self.threats = saved['threats']
+        self.blocks = saved['blocks']
+        # JSON object keys are strings
+        for window in ('norm_window', 'raw_window'):
+            self.blocks[window] = {int(k): v for k, v in self.blocks[window].items()}
+
+        committed = self.threats['high_unique']
+        try:
+            high = np.fromfile(self.high_path, dtype='<i8', count=committed)
+        except (FileNotFoundError, ValueError):
+            high = np.empty(0, dtype='<i8')
+        if len(high) != committed:
+            # Sidecar lost: count the threat log again
+            self.logs.pop('threats', None)
+            self._reset_threats()
+        else:
+            self.high_blocks = set(high.tolist())
+
+    def _save(self, new_high: List[int]):
+        if not self.persist:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            committed = (self.threats['high_unique'] - len(new_high)) * 8
+            with open(self.high_path, 'ab') as f:
+                f.truncate(committed)  # Drop rows of an update that never committed
+                f.write(np.asarray(new_high, dtype='<i8').tobytes())
+            temp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+            with open(temp_path, 'w') as f:
+                json.dump({
+                    'version': STATE_VERSION,
+                    'logs': self.logs,
+                    'cells': self.cells,
+                    'rhythm': self.rhythm,
+                    'threats': self.threats,
+                    'blocks': self.blocks
+                }, f)
+            os.replace(temp_path, self.state_path)
+            self._state_mtime = self.state_path.stat().st_mtime_ns
+        except OSError:
+            self.persist = False  # e.g. read-only mirror: keep the running state in memory
+
+    # ===== UPDATE =====
+
+    def update(self) -> int:
+        """Advance every source past its watermark; returns records and blocks consumed"""
+        with self.lock:
+            lock_file = None
+            if self.persist and fcntl:
+                try:
+                    self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                    lock_file = open(self.state_path.with_name("collector.lock"), 'w')
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                except OSError:
+                    lock_file = None
+            try:
+                if self.persist and self._saved_elsewhere():
+                    self._load()  # Another worker process advanced the state
+                return self._advance()
+            finally:
+                if lock_file:
+                    lock_file.close()
+
+    def _saved_elsewhere(self) -> bool:
+        try:
+            return self.state_path.stat().st_mtime_ns != self._state_mtime
+        except FileNotFoundError:
+            return False
+
+    def _advance(self) -> int:
+        new_high: List[int] = []
+        consumed = self._read_log('cells', self._add_cell, self._reset_cells)
+        consumed += self._read_log('rhythm', self._add_block_time, self._reset_rhythm)
+        consumed += self._read_log('threats', lambda record: self._add_threat(record, new_high),
+                                   self._reset_threats)
+
+        store = get_block_store(self.chain_path.parent, self.chain)
+        if store is not None:
+            consumed += self._update_from_store(store)
+        else:
+            consumed += self._update_from_files()
+
+        if consumed:
+            self._save(new_high)
+        return consumed
+
+    def _read_log(self, name: str, add, reset) -> int:
+        path = self.log_paths[name]
+        saved = self.logs.get(name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if saved:
+                self.logs.pop(name)
+                reset()
+            return 0
+        if saved and (st.st_size == saved['offset'] and
+                      (st.st_dev, st.st_ino) == (saved['device'], saved['inode'])):
+            return 0  # Idle: one stat
+        if saved and ((st.st_dev, st.st_ino) != (saved['device'], saved['inode'])
+                      or st.st_size < saved['offset']):
+            saved = None  # Replaced or truncated: count it again
+            reset()
+
+        tailer = JSONLTailer(path, saved)
+        records = tailer.read_new()
+        rotated = tailer.rotations or tailer.truncations
+        state = tailer.state()
+        tailer.close()
+        if rotated:
+            # The log changed under us: start over on the next update
+            self.logs.pop(name, None)
+            reset()
+            return 1
+        for record in records:
+            add(record)
+        self.logs[name] = state
+        return len(records) or 1
+
+    def _add_cell(self, record: Dict):
+        cell_type = record.get('cell_type')
+        if cell_type is None:
+            return
+        types = self.cells['types']
+        types[cell_type] = types.get(cell_type, 0) + 1
+        self.cells['total'] += 1
+        recent = self.cells['recent']
+        recent.append(cell_type)
+        if len(recent) > RECENT_CELLS:
+            del recent[0]
+
+    def _add_block_time(self, record: Dict):
+        try:
+            block_time = record['block_time']
+            drift = abs(block_time - self.expected_time)
+        except (KeyError, TypeError):
+            return
+        rhythm = self.rhythm
+        rhythm['count'] += 1
+        rhythm['on_time'] += block_time <= self.expected_time * 2.0
+        rhythm['max_drift'] = max(rhythm['max_drift'], drift)
+        # Welford: running mean and sum of squared deviations
+        delta = block_time - rhythm['mean']
+        rhythm['mean'] += delta / rhythm['count']
+        rhythm['m2'] += delta * (block_time - rhythm['mean'])
+
+    def _add_threat(self, record: Dict, new_high: List[int]):
+        # Same reading as the threat index: unscored records count as 0
+        try:
+            score = int(record.get('threat_score', 0))
+            number = _block_number(record['block'])
+        except (KeyError, TypeError, ValueError):
+            return
+        if number is None:
+            return
+        threats = self.threats
+        threats['total'] += 1
+        threats['malicious'] += score >= MALICIOUS_THREAT
+        if score >= HIGH_THREAT:
+            threats['high'] += 1
+            if number not in self.high_blocks:
+                self.high_blocks.add(number)
+                threats['high_unique'] += 1
+                new_high.append(number)
+
+    def _update_from_store(self, store) -> int:
+        blocks = self.blocks
+        if blocks['source'] != 'store' or len(store) < blocks['rows']:
+            self._reset_blocks('store')  # Converted from files, or a rebuilt store
+            blocks = self.blocks
+        start, end = blocks['rows'], len(store)
+        if start == end:
+            return 0
+
+        flags = np.asarray(store.column('flags')[start:end])
+        tx_count = np.asarray(store.column('tx_count')[start:end])
+        numbers = np.asarray(store.column('number')[start:end])
+        hashes = np.asarray(store.column('hash')[start:end])
+        parents = np.asarray(store.column('parent_hash')[start:end])
+
+        required = FLAG_REPLAY_FIELDS | FLAG_GAS_USED
+        blocks['replay'] += int(np.count_nonzero((flags & FLAG_REPLAY_FIELDS) == FLAG_REPLAY_FIELDS))
+        blocks['complete'] += int(np.count_nonzero((flags & FLAG_COMPLETE) == FLAG_COMPLETE))
+        intact = FLAG_RAW_VALID | FLAG_RAW_HASHED
+        blocks['intact'] += int(np.count_nonzero((flags & intact) == intact))
+        blocks['compliant'] += int(np.count_nonzero(((flags & required) == required) & (tx_count >= 0)))
+        blocks['total_txs'] += int(tx_count.sum(dtype=np.int64))
+        blocks['violations'] += int(-tx_count[tx_count < 0].sum(dtype=np.int64))
+
+        # Parent-hash continuity, including the link to the last row already counted
+        if blocks['last_number'] is not None:
+            numbers = np.concatenate([[blocks['last_number']], numbers])
+            hashes = np.concatenate([np.array([bytes.fromhex(blocks['last_hash'])], dtype=hashes.dtype), hashes])
+            parents = np.concatenate([parents[:1], parents])
+        links, continuous = parent_continuity(numbers, hashes, parents)
+        blocks['links'] += links
+        blocks['continuous'] += continuous
+        blocks['last_number'] = int(numbers[-1])
+        blocks['last_hash'] = bytes(hashes[-1]).hex()
+
+        blocks['rows'] = blocks['total'] = blocks['raw_total'] = end
+        return end - start
+
+    def _new_block_files(self, directory: Path, suffix: str, watermark: Optional[int], window: Dict) -> List:
+        """(number, label, path) of files not counted yet, in block order"""
+        if not directory.exists():
+            return []
+        floor = -1 if watermark is None else watermark - SETTLE_BLOCKS
+        found = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith("block_") and name.endswith(suffix)):
+                    continue
+                label = name[len("block_"):-len(suffix)]
+                number = _block_number(label)
+                if number is not None and number > floor and number not in window:
+                    found.append((number, label, Path(entry.path)))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def _update_from_files(self) -> int:
+        if self.blocks['source'] != 'files':
+            self._reset_blocks('files')
+        blocks = self.blocks
+        consumed = 0
+
+        # Normalized blocks: replay fields, protocol rules, parent-hash continuity
+        norm_window = blocks['norm_window']
+        for number, label, path in self._new_block_files(self.chain_path / "normalized", ".norm.json",
+                                                         blocks['norm_watermark'], norm_window):
+            consumed += 1
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            blocks['total'] += 1
+            if all(k in data for k in ['block', 'timestamp', 'tx_count']):
+                blocks['replay'] += 1
+            if all(k in data for k in ['block', 'timestamp', 'tx_count', 'gas_used']):
+                if data['tx_count'] >= 0 and data['gas_used']:
+                    blocks['compliant'] += 1
+            tx_count = data.get('tx_count', 0)
+            blocks['total_txs'] += tx_count
+            if tx_count < 0:
+                blocks['violations'] += abs(tx_count)
+
+            # Links to either neighbour still in the window (files may land out of order)
+            block_hash, parent = str(data.get('hash')), str(data.get('parent_hash'))
+            if number - 1 in norm_window:
+                blocks['links'] += 1
+                blocks['continuous'] += parent == norm_window[number - 1][0]
+            if number + 1 in norm_window:
+                blocks['links'] += 1
+                blocks['continuous'] += norm_window[number + 1][1] == block_hash
+            norm_window[number] = [block_hash, parent]
+            blocks['norm_watermark'] = max(number, blocks['norm_watermark'] or number)
+        self._trim_window(norm_window, blocks['norm_watermark'])
+
+        # Raw blocks: audit completeness and signal integrity
+        raw_window = blocks['raw_window']
+        chain_path = self.chain_path
+        for number, label, path in self._new_block_files(chain_path / "raw", ".json",
+                                                         blocks['raw_watermark'], raw_window):
+            consumed += 1
+            blocks['raw_total'] += 1
+            raw_window[number] = [label, False, False, False]
+            blocks['raw_watermark'] = max(number, blocks['raw_watermark'] or number)
+
+        # Blocks in the window that were missing files are checked again until they settle
+        hash_dir = chain_path / "hashed"
+        for number, entry in raw_window.items():
+            label, complete, hashed, parsed = entry
+            if complete and hashed and parsed:
+                continue
+            was_complete, was_intact = complete, hashed and parsed
+            if not complete and all([(chain_path / "normalized" / f"block_{label}.norm.json").exists(),
+                                     (hash_dir / f"block_{label}.raw.sha").exists(),
+                                     (hash_dir / f"block_{label}.norm.sha").exists()]):
+                entry[1] = True
+                blocks['complete'] += 1
+            if not hashed:
+                entry[2] = hashed = (hash_dir / f"block_{label}.raw.sha").exists()
+            if hashed and not parsed:
+                try:
+                    with open(chain_path / "raw" / f"block_{label}.json", 'r') as f:
+                        json.load(f)
+                    entry[3] = parsed = True
+                except:
+                    pass
+            if hashed and parsed and not was_intact:
+                blocks['intact'] += 1
+            consumed += entry[1] != was_complete or (hashed and parsed) != was_intact
+        self._trim_window(raw_window, blocks['raw_watermark'])
+
+        return consumed
+
+    @staticmethod
+    def _trim_window(window: Dict, watermark: Optional[int]):
+        if watermark is None:
+            return
+        for number in [n for n in window if n <= watermark - SETTLE_BLOCKS]:
+            del window[number]
+
+    # ===== METRICS =====
+
+    def metrics(self) -> Dict[str, float]:
+        """Chain-derived HCT components from the running state"""
+        cells, rhythm, threats, blocks = self.cells, self.rhythm, self.threats, self.blocks
+        from_store = blocks['source'] == 'store'
+
+        counts = list(cells['types'].values())
+        total_cells = cells['total']
+        critical = sum(cells['types'].get(t, 0) for t in ('DETECTOR', 'DEFENDER', 'REGULATORY'))
+        if total_cells < 10:
+            mutation = 0.5
+        else:
+            mutation = normalize_mutation_rate(len(set(cells['recent'])) / len(cells['types']))
+
+        if rhythm['count'] < 2:
+            consistency = 1.0
+        elif rhythm['mean'] == 0:
+            consistency = 0.0 if rhythm['m2'] > 0 else 1.0
+        else:
+            cv = np.sqrt(rhythm['m2'] / rhythm['count']) / abs(rhythm['mean'])
+            consistency = 1.0 - min(cv, 1.0)
+        tolerance = self.expected_time * 5
+
+        total = blocks['total']
+        raw_total = blocks['raw_total']
+        if from_store:
+            auditability = blocks['complete'] / total if total else 0.0
+        else:
+            audit_dirs = [self.chain_path / name for name in ('raw', 'normalized', 'hashed')]
+            auditability = (blocks['complete'] / raw_total
+                            if raw_total and all(d.exists() for d in audit_dirs) else 0.0)
+        if blocks['total_txs'] == 0:
+            safety = 1.0
+        else:
+            safety = max(0.0, min(1.0, 1.0 - blocks['violations'] / max(blocks['total_txs'], 1)))
+
+        return {
+            "b_entropy": compute_shannon_entropy(counts) if total_cells else 0.0,
+            "b_fault_tolerance": (max(0.0, min(1.0, 1.0 - 3 / total_cells))
+                                  if total_cells and critical else 0.0),
+            "b_mutation_rate": mutation,
+            "b_uptime": (rhythm['on_time'] / rhythm['count']
+                         if rhythm['count'] and self.log_paths['rhythm'].exists() else 0.0),
+            "h_replay_integrity": blocks['replay'] / total if total else 0.0,
+            "h_fork_awareness": fork_awareness(blocks['links'], blocks['continuous']),
+            "h_anomaly_learning": (threats['high_unique'] / threats['high']
+                                   if threats['high'] >= 2 else 1.0),
+            "h_auditability": auditability,
+            "r_protocol_compliance": blocks['compliant'] / total if total else 1.0,
+            "r_safety_constraints": safety,
+            "r_non_violence": (1.0 - threats['malicious'] / threats['total']
+                               if threats['total'] else 1.0),
+            "e_timing_accuracy": (1.0 - min(rhythm['max_drift'], tolerance) / tolerance
+                                  if rhythm['count'] else 1.0),
+            "e_latency_consistency": consistency,
+            "e_signal_integrity": blocks['intact'] / raw_total if raw_total else 1.0
+        }
+
+def _block_number(block) -> Optional[int]:
+    """Block label ("0x..." or decimal) as an int"""
+    if isinstance(block, int):
+        return block
+    try:
+        return int(block, 16) if block.startswith('0x') else int(block)
+    except (ValueError, AttributeError):
+        return None
+
+class IncrementalMetricsCollector:
+    """
+    Chain-derived HCT metrics (Biology, History, Religion and
+    Electromagnetism inputs) maintained incrementally per chain
+
+    Each collect reads only what the mirror appended since the last one, so
+    recomputing HCT costs time proportional to new data rather than chain length.
+    """
+
+    def __init__(self, mirror_root: str = "./luxbin_mirror"):
+        self.mirror_root = Path(mirror_root)
+        self._states: Dict[str, ChainMetricsState] = {}
+        self._lock = threading.Lock()
+
+    def state(self, chain: str) -> ChainMetricsState:
+        state = self._states.get(chain)
+        if state is None:
+            with self._lock:
+                state = self._states.get(chain)
+                if state is None:
+                    state = self._states[chain] = ChainMetricsState(self.mirror_root, chain)
+        return state
+
+    async def collect(self, chain: str = "optimism") -> Dict[str, float]:
+        """Advance the chain's state and return its metrics"""
+        return await run_blocking(self._collect, chain)
+
+    def _collect(self, chain: str) -> Dict[str, float]:
+        state = self.state(chain)
+        state.update()
+        with state.lock:
+            return state.metrics()
+
 class HCTMetricsAggregator:
     """
     Aggregate all HCT metrics from LUXBIN system
@@ -772,13 +1467,17 @@ class HCTMetricsAggregator:
     Coordinates all collectors and produces complete HCTMetrics
     """
 
-    def __init__(self, mirror_root: str = "./luxbin_mirror", node_registry: Optional[str] = None):
+    def __init__(self, mirror_root: str = "./luxbin_mirror", node_registry: Optional[str] = None,
+                 incremental: bool = True):
         self.biology = BiologyMetricsCollector(mirror_root)
         self.history = HistoryMetricsCollector(mirror_root)
         self.geology = GeologyMetricsCollector(node_registry)
         self.religion = ReligionMetricsCollector(mirror_root)
         self.electromagnetism = ElectromagnetismMetricsCollector(mirror_root)
 
+        # Running per-chain state; the collectors above recompute from scratch
+        self.incremental = IncrementalMetricsCollector(mirror_root) if (incremental and JSONLTailer) else None
+
     async def collect_all(self, chain: str = "optimism") -> HCTMetrics:
         """
         Collect all HCT metrics from LUXBIN system
@@ -786,19 +1485,26 @@ class HCTMetricsAggregator:
         Returns:
             Complete HCTMetrics object ready for HCT computation
         """
+        if self.incremental is not None:
+            chain_metrics, geology = await asyncio.gather(
+                self.incremental.collect(chain),
+                self.geology.collect()
+            )
+            return HCTMetrics(
+                **chain_metrics,
+                **geology,
+                r_permission_boundaries=await self.religion._compute_permission_boundaries(),
+                e_power_efficiency=await self.electromagnetism._compute_power_efficiency()
+            )
+
         # Collect all components in parallel
-        biology_task = self.biology.collect(chain)
-        history_task = self.history.collect(chain)
-        geology_task = self.geology.collect()
-        religion_task = self.religion.collect(chain)
-        electromagnetism_task = self.electromagnetism.collect(chain)
-
-        # Await all
-        biology = await biology_task
-        history = await history_task
-        geology = await geology_task
-        religion = await religion_task
-        electromagnetism = await electromagnetism_task
+        biology, history, geology, religion, electromagnetism = await asyncio.gather(
+            self.biology.collect(chain),
+            self.history.collect(chain),
+            self.geology.collect(),
+            self.religion.collect(chain),
+            self.electromagnetism.collect(chain)
+        )
 
         # Construct HCTMetrics
         metrics = HCTMetrics(
@@ -811,6 +1517,11 @@ class HCTMetricsAggregator:
 
         return metrics
 
+    async def collect_chains(self, chains: List[str]) -> Dict[str, HCTMetrics]:
+        """Collect several chains at once (each chain's reads overlap on the I/O pool)"""
+        results = await asyncio.gather(*(self.collect_all(chain) for chain in chains))
+        return dict(zip(chains, results))
+
 async def main():
     """Example usage"""
     print("Collecting HCT metrics from LUXBIN system...")
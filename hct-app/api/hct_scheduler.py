@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+HCT Scheduler for LUXBIN
+Keeps HCT results fresh on a long-lived event loop
+
+The scheduler owns one event loop running in a background thread. Every
+interval it recomputes HCT for all scheduled chains at once; request
+handlers read the cached results instead of collecting metrics themselves.
+Coroutines that must run on the loop (a chain outside the schedule, a
+forced refresh) are submitted from any thread with run().
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+from hct_core import HCTResult
+from hct_integration import HCTIntegration, SUPPORTED_CHAINS
+
+class HCTScheduler:
+    """
+    Background HCT recomputation for a set of chains
+
+    Results are published on the integration (``chain_results``,
+    ``current_hct``), which also records them in its time series.
+    """
+
+    def __init__(
+        self,
+        integration: HCTIntegration,
+        chains: Optional[List[str]] = None,
+        interval: float = 15.0
+    ):
+        self.integration = integration
+        self.chains = list(chains or SUPPORTED_CHAINS)
+        self.interval = interval
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+        self._first_run = threading.Event()
+        self._start_lock = threading.Lock()
+
+        self.runs = 0
+        self.last_run: Optional[str] = None
+        self.last_run_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    # ===== LIFECYCLE =====
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "HCTScheduler":
+        """Start the loop thread and the first recompute (idempotent)"""
+        with self._start_lock:
+            if not self.running:
+                self._started.clear()
+                self._thread = threading.Thread(target=self._run_loop, name="hct-scheduler", daemon=True)
+                self._thread.start()
+                self._started.wait()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel the schedule, stop the loop and join its thread"""
+        if not self.running:
+            return
+        self.loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout)
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._wake = asyncio.Event()
+        self._task = self.loop.create_task(self._schedule())
+        self.loop.call_soon(self._started.set)
+        try:
+            self.loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    async def _schedule(self):
+        while True:
+            await self._refresh()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    # ===== RECOMPUTE =====
+
+    async def _refresh(self) -> Dict[str, HCTResult]:
+        start = time.perf_counter()
+        try:
+            results = await self.integration.compute_chains(self.chains)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"⚠️  HCT refresh failed: {e}")
+            return {}
+        finally:
+            self.runs += 1
+            self.last_run_ms = (time.perf_counter() - start) * 1000
+            self._first_run.set()
+
+        self.last_error = None
+        primary = results.get(self.integration.primary_chain)
+        if primary is not None:
+            self.last_run = primary.timestamp
+        return results
+
+    def request_refresh(self):
+        """Recompute now instead of at the next interval (e.g. after new coefficients)"""
+        if self.running:
+            self.loop.call_soon_threadsafe(self._wake.set)
+
+    def refresh(self, timeout: Optional[float] = None) -> Dict[str, HCTResult]:
+        """Recompute on the loop and wait for the results"""
+        return self.run(self._refresh(), timeout)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the scheduler's loop from another thread and wait for it"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    # ===== READERS =====
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first recompute has finished"""
+        self.start()
+        return self._first_run.wait(timeout)
+
+    def latest(self, chain: str, timeout: Optional[float] = None) -> Optional[HCTResult]:
+        """Cached result for a chain; chains outside the schedule are computed once on the loop"""
+        self.wait_ready(timeout)
+        result = self.integration.chain_results.get(chain)
+        if result is None and chain not in self.chains:
+            result = self.run(self.integration.compute_chains([chain]), timeout)[chain]
+        return result
+
+    def get_stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "chains": self.chains,
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "last_run_ms": self.last_run_ms,
+            "last_error": self.last_error
+        }
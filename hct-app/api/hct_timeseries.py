@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+HCT Time Series for LUXBIN
+Append-only history of HCT results per chain, with 1m/1h/1d rollups
+
+Under luxbin_mirror/<chain>/hct/timeseries/:
+
+    meta.json        committed rows per file and the last sample time
+    raw.bin          one (time, HCT, B, H, G, R, E) row per result
+    rollup_1m.bin    one (bucket start, count, sum/min/max per series) row per minute
+    rollup_1h.bin    ... per hour
+    rollup_1d.bin    ... per day
+
+Samples are appended in time order (older or repeated times are dropped)
+and folded into the open bucket of every rollup as they arrive, so a range
+query binary-searches one file and reads at most ``max_points`` rows
+however many years are stored. Writers take turns through a lock file;
+rows past the committed counts (a writer that died mid-append) are cut
+off, and the rollup buckets it touched rebuilt from the raw rows, by the
+next writer. Until then the last bucket of each rollup may include the
+dead writer's samples; raw rows and closed buckets never do.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+from hct_core import COMPONENTS, HCTResult
+
+TIMESERIES_DIR = "timeseries"
+TIMESERIES_VERSION = 1
+MAX_POINTS = 1000
+
+SERIES = ["HCT"] + COMPONENTS
+RAW_DTYPE = np.dtype([('t', '<i8'), ('values', '<f8', (len(SERIES),))])
+ROLLUP_DTYPE = np.dtype([
+    ('t', '<i8'),
+    ('count', '<i8'),
+    ('sum', '<f8', (len(SERIES),)),
+    ('min', '<f8', (len(SERIES),)),
+    ('max', '<f8', (len(SERIES),))
+])
+
+# Bucket width per rollup (milliseconds), finest first
+ROLLUPS = {'1m': 60_000, '1h': 3_600_000, '1d': 86_400_000}
+RESOLUTIONS = ['raw'] + list(ROLLUPS)
+
+
+def parse_time(value: Union[str, int, float, None]) -> Optional[int]:
+    """Epoch milliseconds from an ISO 8601 string (UTC unless it says otherwise) or epoch seconds/ms"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            moment = datetime.fromisoformat(value)
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            return int(round(moment.timestamp() * 1000))
+    # Epoch seconds until 5138 AD; anything larger is already milliseconds
+    return int(value) if value > 1e11 else int(round(value * 1000))
+
+
+def result_time(result: HCTResult) -> int:
+    """HCTResult.timestamp (naive UTC ISO 8601) as epoch milliseconds"""
+    return parse_time(result.timestamp)
+
+
+def iso_times(times: np.ndarray) -> List[str]:
+    return list(np.datetime_as_string(times.astype('datetime64[ms]')))
+
+
+class HCTTimeSeries:
+    """Append-only HCT series for one chain"""
+
+    def __init__(self, chain_path: Union[str, Path]):
+        self.path = Path(chain_path) / "hct" / TIMESERIES_DIR
+        self.meta_path = self.path / "meta.json"
+        self.files = {'raw': self.path / "raw.bin"}
+        self.files.update({name: self.path / f"rollup_{name}.bin" for name in ROLLUPS})
+        self.dtypes = {name: (RAW_DTYPE if name == 'raw' else ROLLUP_DTYPE) for name in self.files}
+
+        self.rows = {name: 0 for name in self.files}
+        self.last_time: Optional[int] = None
+        self._meta_mtime = None
+        self._maps: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        self._load_meta()
+
+    # ===== METADATA =====
+
+    def _load_meta(self):
+        try:
+            stat = self.meta_path.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_mtime_ns == self._meta_mtime:
+            return
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except json.JSONDecodeError:
+            return
+        if meta.get('version') != TIMESERIES_VERSION:
+            return
+        self._meta_mtime = stat.st_mtime_ns
+        self.rows = {name: meta['rows'].get(name, 0) for name in self.files}
+        self.last_time = meta.get('last_time')
+
+    def _save_meta(self):
+        temp_path = self.meta_path.with_name('meta.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({'version': TIMESERIES_VERSION, 'rows': self.rows, 'last_time': self.last_time}, f)
+        os.replace(temp_path, self.meta_path)
+        self._meta_mtime = self.meta_path.stat().st_mtime_ns
+
+    def refresh(self):
+        """Pick up samples other writers committed (one stat when idle)"""
+        self._load_meta()
+
+    def __len__(self) -> int:
+        return self.rows['raw']
+
+    # ===== READER =====
+
+    def _table(self, name: str) -> np.ndarray:
+        """Committed rows of one file (memory-mapped, read-only)"""
+        rows = self.rows[name]
+        if rows == 0:
+            return np.empty(0, dtype=self.dtypes[name])
+        table = self._maps.get(name)
+        if table is None or len(table) != rows:
+            table = np.memmap(self.files[name], dtype=self.dtypes[name], mode='r', shape=(rows,))
+            self._maps[name] = table
+        return table
+
+    def _bounds(self, name: str, start: Optional[int], end: Optional[int]):
+        times = self._table(name)['t']
+        if start is not None and name in ROLLUPS:
+            start -= start % ROLLUPS[name]  # The bucket holding ``start``
+        low = 0 if start is None else int(np.searchsorted(times, start, 'left'))
+        high = len(times) if end is None else int(np.searchsorted(times, end, 'right'))
+        return low, max(low, high)
+
+    def pick_resolution(self, start: Optional[int] = None, end: Optional[int] = None,
+                        max_points: int = MAX_POINTS) -> str:
+        """Finest resolution with at most ``max_points`` rows in the range (else the coarsest)"""
+        for name in RESOLUTIONS:
+            low, high = self._bounds(name, start, end)
+            if high - low <= max_points:
+                return name
+        return RESOLUTIONS[-1]
+
+    def query(self, start: Optional[int] = None, end: Optional[int] = None,
+              resolution: str = 'auto', max_points: int = MAX_POINTS) -> Dict:
+        """
+        Samples (or rollup buckets) with times in [start, end] (epoch ms)
+
+        Returns the most recent ``max_points`` rows of the range; raw points
+        carry HCT and components, rollup points their means plus count, min
+        and max.
+        """
+        self.refresh()
+        if resolution == 'auto':
+            resolution = self.pick_resolution(start, end, max_points)
+        if resolution not in self.files:
+            raise ValueError(f"Unknown resolution {resolution!r} (expected auto, {', '.join(RESOLUTIONS)})")
+
+        low, high = self._bounds(resolution, start, end)
+        truncated = high - low > max_points
+        rows = np.array(self._table(resolution)[max(low, high - max_points):high])
+
+        if resolution == 'raw':
+            values = rows['values']
+            points = [
+                {"timestamp": stamp, "HCT": float(row[0]), "components": dict(zip(COMPONENTS, map(float, row[1:])))}
+                for stamp, row in zip(iso_times(rows['t']), values.tolist())
+            ]
+        else:
+            means = rows['sum'] / np.maximum(rows['count'], 1)[:, None]
+            points = [
+                {
+                    "timestamp": stamp,
+                    "count": count,
+                    "HCT": mean[0],
+                    "components": dict(zip(COMPONENTS, mean[1:])),
+                    "min": dict(zip(SERIES, low_values)),
+                    "max": dict(zip(SERIES, high_values))
+                }
+                for stamp, count, mean, low_values, high_values in zip(
+                    iso_times(rows['t']), rows['count'].tolist(), means.tolist(),
+                    rows['min'].tolist(), rows['max'].tolist())
+            ]
+        return {"resolution": resolution, "history": points, "truncated": bool(truncated)}
+
+    # ===== WRITER =====
+
+    def append(self, result: HCTResult) -> bool:
+        """Record one result; False when it is not newer than the last sample"""
+        values = [result.HCT, result.B, result.H, result.G, result.R, result.E]
+        return self.append_many([result_time(result)], [values]) == 1
+
+    def append_many(self, times: Sequence[int], values: Sequence[Sequence[float]]) -> int:
+        """Record samples (epoch ms, [HCT, B, H, G, R, E]) in one write; returns how many were new"""
+        times = np.asarray(times, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(times), len(SERIES))
+
+        order = np.argsort(times, kind='stable')
+        times, values = times[order], values[order]
+
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.path / "write.lock", 'w') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._load_meta()  # Another writer may have appended while we waited
+                self._recover()
+
+                keep = np.ones(len(times), dtype=bool)
+                keep[1:] = times[1:] > times[:-1]
+                if self.last_time is not None:
+                    keep &= times > self.last_time
+                times, values = times[keep], values[keep]
+                if len(times) == 0:
+                    return 0
+
+                raw = np.empty(len(times), dtype=RAW_DTYPE)
+                raw['t'] = times
+                raw['values'] = values
+                self._write('raw', self.rows['raw'], raw)
+
+                rows = {'raw': self.rows['raw'] + len(raw)}
+                for name, width in ROLLUPS.items():
+                    records = self._roll_up(times, values, width)
+                    rows[name] = self._merge_rollup(name, records)
+
+                self.rows = rows
+                self.last_time = int(times[-1])
+                self._save_meta()
+        return len(times)
+
+    def _write(self, name: str, at_row: int, records: np.ndarray):
+        path = self.files[name]
+        with open(path, 'r+b' if path.exists() else 'w+b') as f:
+            f.seek(at_row * records.dtype.itemsize)
+            f.write(records.tobytes())
+
+    @staticmethod
+    def _roll_up(times: np.ndarray, values: np.ndarray, width: int) -> np.ndarray:
+        """Rollup rows for time-ordered samples"""
+        buckets = times - times % width
+        starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+        records = np.empty(len(starts), dtype=ROLLUP_DTYPE)
+        records['t'] = buckets[starts]
+        records['count'] = np.diff(np.append(starts, len(times)))
+        records['sum'] = np.add.reduceat(values, starts, axis=0)
+        records['min'] = np.minimum.reduceat(values, starts, axis=0)
+        records['max'] = np.maximum.reduceat(values, starts, axis=0)
+        return records
+
+    def _merge_rollup(self, name: str, records: np.ndarray) -> int:
+        """Fold new rollup rows into the file (the first may continue the open bucket); returns rows"""
+        rows = self.rows[name]
+        at = rows
+        if rows:
+            last = np.fromfile(self.files[name], dtype=ROLLUP_DTYPE, count=1,
+                               offset=(rows - 1) * ROLLUP_DTYPE.itemsize)
+            if len(last) and last['t'][0] == records['t'][0]:
+                records['count'][0] += last['count'][0]
+                records['sum'][0] += last['sum'][0]
+                records['min'][0] = np.minimum(records['min'][0], last['min'][0])
+                records['max'][0] = np.maximum(records['max'][0], last['max'][0])
+                at = rows - 1
+        self._write(name, at, records)
+        return at + len(records)
+
+    def _recover(self):
+        """Cut off rows a dead writer left past the committed counts"""
+        raw_size = self.rows['raw'] * RAW_DTYPE.itemsize
+        try:
+            torn = self.files['raw'].stat().st_size > raw_size
+        except FileNotFoundError:
+            return
+        if not torn:
+            return
+
+        for name, path in self.files.items():
+            if path.exists():
+                with open(path, 'r+b') as f:
+                    f.truncate(self.rows[name] * self.dtypes[name].itemsize)
+        self._maps.clear()
+
+        # The open bucket of each rollup may hold samples that never committed: rebuild it from raw
+        raw = self._table('raw')
+        for name, width in ROLLUPS.items():
+            rows = self.rows[name]
+            if rows == 0:
+                continue
+            bucket = int(self._table(name)['t'][rows - 1])
+            samples = np.array(raw[np.searchsorted(raw['t'], bucket):])
+            self._maps.pop(name, None)
+            if len(samples):
+                self._write(name, rows - 1, self._roll_up(samples['t'], samples['values'], width)[:1])
+        self._maps.clear()
+
+
+class HCTTimeSeriesStore:
+    """HCT series for every chain under a mirror root"""
+
+    def __init__(self, mirror_root: Union[str, Path] = "./luxbin_mirror"):
+        self.mirror_root = Path(mirror_root)
+        self._series: Dict[str, HCTTimeSeries] = {}
+        self._lock = threading.Lock()
+
+    def series(self, chain: str) -> HCTTimeSeries:
+        with self._lock:
+            series = self._series.get(chain)
+            if series is None:
+                series = self._series[chain] = HCTTimeSeries(self.mirror_root / chain)
+        return series
+
+    def record(self, results: Dict[str, HCTResult]) -> int:
+        """Append each chain's result; returns how many were new"""
+        return sum(self.series(chain).append(result) for chain, result in results.items())
+
+    def query(self, chain: str, start: Optional[int] = None, end: Optional[int] = None,
+              resolution: str = 'auto', max_points: int = MAX_POINTS) -> Dict:
+        return self.series(chain).query(start, end, resolution, max_points)
@@ -6,7 +6,6 @@ Web application for monitoring and visualizing Harmonic Convergence Theory metri
 
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
-import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
@@ -16,17 +15,22 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent / 'api'))
 
 from hct_core import HCTEngine, HCTCoefficients
-from hct_metrics_collector import HCTMetricsAggregator
-from hct_integration import HCTIntegration, SystemMode
+from hct_integration import HCTIntegration, SystemMode, SUPPORTED_CHAINS
+from hct_scheduler import HCTScheduler
+from hct_timeseries import MAX_POINTS, parse_time
 
 app = Flask(__name__,
            template_folder='frontend/templates',
            static_folder='frontend/static')
 CORS(app)
 
+# Background recompute interval and how long a request waits for the first one
+REFRESH_SECONDS = 15.0
+FIRST_RESULT_TIMEOUT = 60.0
+
 # Global state
 integration = None
-hct_history = []
+scheduler = None
 
 def get_integration():
     """Get or create HCT integration instance"""
@@ -38,6 +42,22 @@ def get_integration():
         )
     return integration
 
+def get_scheduler():
+    """Get or start the background scheduler (in the serving process, on first use)"""
+    global scheduler
+    if scheduler is None:
+        scheduler = HCTScheduler(get_integration(), SUPPORTED_CHAINS, interval=REFRESH_SECONDS)
+    return scheduler.start()
+
+def components_of(result):
+    return {
+        'B': result.B,
+        'H': result.H,
+        'G': result.G,
+        'R': result.R,
+        'E': result.E
+    }
+
 @app.route('/')
 def index():
     """Main dashboard"""
@@ -45,44 +65,75 @@ def index():
 
 @app.route('/api/hct/current', methods=['GET'])
 def get_current_hct():
-    """Get current HCT score"""
+    """Get current HCT score (latest background result)"""
     try:
         chain = request.args.get('chain', 'optimism')
 
-        # Compute HCT
-        integ = get_integration()
-        result = asyncio.run(integ.compute_hct(chain))
-
-        # Store in history
-        global hct_history
-        hct_history.append(result.to_dict())
-        if len(hct_history) > 100:
-            hct_history = hct_history[-100:]
+        result = get_scheduler().latest(chain, FIRST_RESULT_TIMEOUT)
+        if result is None:
+            return jsonify({'success': False, 'error': 'HCT not computed yet'}), 503
 
         return jsonify({
             'success': True,
+            'chain': chain,
             'hct': result.HCT,
-            'mode': integ.current_mode.value,
-            'components': {
-                'B': result.B,
-                'H': result.H,
-                'G': result.G,
-                'R': result.R,
-                'E': result.E
-            },
+            'mode': get_integration().current_mode.value,
+            'components': components_of(result),
             'timestamp': result.timestamp
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/hct/chains', methods=['GET'])
+def get_chains_hct():
+    """Get latest HCT for every mirrored chain"""
+    try:
+        sched = get_scheduler()
+        sched.wait_ready(FIRST_RESULT_TIMEOUT)
+        results = get_integration().chain_results
+
+        return jsonify({
+            'success': True,
+            'mode': get_integration().current_mode.value,
+            'chains': {
+                chain: {
+                    'hct': results[chain].HCT,
+                    'components': components_of(results[chain]),
+                    'timestamp': results[chain].timestamp
+                }
+                for chain in sched.chains if chain in results
+            },
+            'scheduler': sched.get_stats()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/hct/history', methods=['GET'])
 def get_hct_history():
-    """Get HCT history"""
-    limit = int(request.args.get('limit', 50))
-    return jsonify({
-        'success': True,
-        'history': hct_history[-limit:]
-    })
+    """Get HCT history: the last `limit` results, or a from/to range at a resolution"""
+    try:
+        chain = request.args.get('chain', 'optimism')
+        if chain not in SUPPORTED_CHAINS:
+            raise ValueError(f"Unsupported chain: {chain}")
+        ranged = any(key in request.args for key in ('from', 'to', 'resolution'))
+        limit = int(request.args.get('limit', MAX_POINTS if ranged else 50))
+        if not 0 < limit <= MAX_POINTS:
+            raise ValueError(f"limit must be between 1 and {MAX_POINTS}, got {limit}")
+
+        series = get_integration().timeseries
+        if series is None:
+            return jsonify({'success': True, 'chain': chain, 'history': []})
+
+        history = series.query(
+            chain,
+            start=parse_time(request.args.get('from')),
+            end=parse_time(request.args.get('to')),
+            resolution=request.args.get('resolution', 'auto') if ranged else 'raw',
+            max_points=limit
+        )
+        return jsonify({'success': True, 'chain': chain, **history})
+    except (ValueError, OverflowError) as e:  # OverflowError: from=inf
+        return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/hct/report', methods=['GET'])
 def get_health_report():
@@ -121,6 +172,7 @@ def manage_coefficients():
             )
             coeffs = coeffs.normalize()
             integ.engine.update_coefficients(coeffs)
+            get_scheduler().request_refresh()
 
             return jsonify({
                 'success': True,
@@ -134,8 +186,10 @@ def get_raw_metrics():
     """Get raw metrics breakdown"""
     try:
         chain = request.args.get('chain', 'optimism')
-        aggregator = HCTMetricsAggregator()
-        metrics = asyncio.run(aggregator.collect_all(chain))
+        result = get_scheduler().latest(chain, FIRST_RESULT_TIMEOUT)
+        if result is None:
+            return jsonify({'success': False, 'error': 'HCT not computed yet'}), 503
+        metrics = result.raw_metrics
 
         return jsonify({
             'success': True,
@@ -199,10 +253,7 @@ def get_operational_modifiers():
     """Get operational modifiers (consensus, staking, etc.)"""
     try:
         integ = get_integration()
-
-        if integ.current_hct is None:
-            # Compute first
-            asyncio.run(integ.compute_hct())
+        get_scheduler().wait_ready(FIRST_RESULT_TIMEOUT)
 
         base_threat = float(request.args.get('base_threat', 50.0))
 
@@ -222,6 +273,7 @@ if __name__ == '__main__':
     print("=" * 80)
     print()
     print("Open browser to: http://localhost:5000")
+    print(f"HCT recomputed every {REFRESH_SECONDS:.0f}s for: {', '.join(SUPPORTED_CHAINS)}")
     print()
 
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+LUXBIN HERMETIC MIRROR INGESTER
+Python replacement for hermetic_mirror_live.sh
+
+Produces the same luxbin_mirror/<chain>/ outputs: blocks (in the columnar
+block store, optionally also as raw/normalized/hashed files), vibration,
+rhythm, threat and cell-spawn logs, generative/regulatory flags, the replay
+index and last_block.txt. Blocks are fetched with JSON-RPC batch requests over
+one pooled HTTP session, with a bounded window of block ranges in flight while
+earlier ranges are normalized, hashed, scored and written in order.
+
+Usage:
+    python3 hermetic_mirror_ingester.py optimism continuous
+    python3 hermetic_mirror_ingester.py optimism --backfill 0x7270e00 0x7271000
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from mirror_block_store import STORE_DIR, MirrorBlockStore, normalize_block
+from mirror_threat_index import ThreatIndex
+
+RPC_ENDPOINTS = {
+    "optimism": "https://mainnet.optimism.io",
+    "ethereum": "https://eth.llamarpc.com",
+    "arbitrum": "https://arb1.arbitrum.io/rpc",
+    "polygon": "https://polygon-rpc.com",
+    "base": "https://mainnet.base.org"
+}
+
+# Seconds between polls for new blocks in continuous mode
+POLL_INTERVALS = {
+    "optimism": 2,
+    "arbitrum": 2,
+    "polygon": 2,
+    "base": 2,
+    "ethereum": 12
+}
+
+MIRROR_DIRS = ("raw", "normalized", "hashed", "logs", "quantum", "immune")
+
+
+class MirrorRPCError(Exception):
+    """The RPC endpoint failed or returned an error for a request"""
+
+
+# ===== HERMETIC HEURISTICS (same rules as hermetic_mirror_live.sh) =====
+
+def calculate_frequency(tx_count: int) -> int:
+    """Map tx count to Hermetic frequency (432-852 Hz): more txs = more vibration"""
+    return min(432 + tx_count * 2, 852)
+
+
+def quantum_scan(normalized: Dict[str, Any]) -> int:
+    """Simple threat heuristics: high gas usage and very high tx counts"""
+    threat_score = 0
+    gas_used = int(normalized.get('gas_used') or '0x0', 16)
+    if gas_used > 15_000_000:  # High gas usage = potential attack
+        threat_score += 30
+    if normalized.get('tx_count', 0) > 200:  # Very high tx count = potential spam
+        threat_score += 20
+    return threat_score
+
+
+def spawn_decision(threat_score: int) -> Tuple[str, int]:
+    """Immune cell type and count for a threat score"""
+    if threat_score > 50:
+        return "DEFENDER", 3
+    if threat_score > 30:
+        return "DETECTOR", 2
+    return "MEMORY", 1
+
+
+def parse_block_number(value: str) -> int:
+    return int(value, 16) if value.startswith('0x') else int(value)
+
+
+def _utc_timestamp() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ===== JSON-RPC CLIENT =====
+
+class JSONRPCClient:
+    """JSON-RPC over one pooled aiohttp session, with batch requests and retries"""
+
+    def __init__(self, url: str, max_connections: int = 8, timeout: float = 30.0,
+                 max_retries: int = 5):
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._next_id = 0
+        self.requests = 0
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"Content-Type": "application/json"}
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def _post(self, payload) -> Any:
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.requests += 1
+                async with self.session.post(self.url, data=json.dumps(payload)) as response:
+                    if response.status == 429 or response.status >= 500:
+                        raise MirrorRPCError(f"HTTP {response.status}")
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, MirrorRPCError) as e:
+                if attempt == self.max_retries:
+                    raise MirrorRPCError(f"RPC request failed after {attempt + 1} attempts: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10.0)
+
+    def _request(self, method: str, params: list) -> Dict[str, Any]:
+        self._next_id += 1
+        return {"jsonrpc": "2.0", "method": method, "params": params, "id": self._next_id}
+
+    async def call(self, method: str, params: Optional[list] = None) -> Any:
+        response = await self._post(self._request(method, params or []))
+        if 'error' in response:
+            raise MirrorRPCError(f"{method}: {response['error']}")
+        return response.get('result')
+
+    async def batch(self, calls: List[Tuple[str, list]]) -> List[Dict[str, Any]]:
+        """Send several calls in one HTTP request; responses come back in call order"""
+        requests = [self._request(method, params) for method, params in calls]
+        responses = await self._post(requests)
+        if not isinstance(responses, list):
+            raise MirrorRPCError(f"Batch request rejected: {responses}")
+        by_id = {response.get('id'): response for response in responses}
+        return [by_id.get(request['id'], {'error': 'missing response'}) for request in requests]
+
+
+# ===== INGESTER =====
+
+class HermeticMirrorIngester:
+    """Mirror a chain's blocks into luxbin_mirror/<chain>/"""
+
+    def __init__(self, chain: str = "optimism", rpc_url: Optional[str] = None,
+                 mirror_root: str = "./luxbin_mirror", batch_size: int = 20, window: int = 8,
+                 block_files: bool = False, missing_retries: int = 5):
+        self.chain = chain
+        self.rpc_url = rpc_url or RPC_ENDPOINTS.get(chain, RPC_ENDPOINTS["optimism"])
+        self.chain_path = Path(mirror_root) / chain
+        self.batch_size = batch_size
+        self.window = window
+        self.block_files = block_files
+        self.missing_retries = missing_retries
+
+        for name in MIRROR_DIRS:
+            (self.chain_path / name).mkdir(parents=True, exist_ok=True)
+
+        self.block_height_file = self.chain_path / "last_block.txt"
+        self.store = MirrorBlockStore(self.chain_path / STORE_DIR, writable=True)
+        self.threat_index = ThreatIndex(self.chain_path)
+        self._logs = {
+            'vibration': open(self.chain_path / "logs" / "vibration.jsonl", 'a'),
+            'rhythm': open(self.chain_path / "logs" / "rhythm.jsonl", 'a'),
+            'threats': open(self.chain_path / "quantum" / "threat_scores.jsonl", 'a'),
+            'cells': open(self.chain_path / "immune" / "cells_spawned.jsonl", 'a'),
+            'replay': open(self.chain_path / "logs" / "replay_index.log", 'a'),
+            'mirror': open(self.chain_path / "logs" / "mirror.log", 'a')
+        }
+
+        # (block number, timestamp) of the last block written, for rhythm
+        self._previous: Optional[Tuple[int, int]] = None
+        self.blocks_mirrored = 0
+
+    def log(self, message: str):
+        print(f"[{datetime.utcnow().strftime('%H:%M:%S')}] {message}")
+        self._logs['mirror'].write(f"[{_utc_timestamp()}] {message}\n")
+        self._logs['mirror'].flush()
+
+    def last_processed_block(self) -> Optional[int]:
+        try:
+            return parse_block_number(self.block_height_file.read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _previous_for(self, number: int) -> Optional[Tuple[int, int]]:
+        """Timestamp of the block before ``number`` if it is already mirrored"""
+        if self._previous and self._previous[0] == number - 1:
+            return self._previous
+        row = self.store.find(number - 1)
+        if row is None:
+            return None
+        return number - 1, int(self.store.column('timestamp')[row])
+
+    # ===== FETCHING =====
+
+    def _missing_numbers(self, start: int, end: int) -> List[int]:
+        """Block numbers in [start, end] not yet in the block store"""
+        numbers = np.arange(start, end + 1, dtype=np.int64)
+        stored = self.store.column('number')
+        return numbers[~np.isin(numbers, stored)].tolist()
+
+    async def _fetch_blocks(self, client: JSONRPCClient, numbers: List[int]) -> List[Dict[str, Any]]:
+        """Fetch blocks (full transactions) as JSON-RPC response objects"""
+        found: Dict[int, Dict[str, Any]] = {}
+        delay = 0.5
+
+        for attempt in range(self.missing_retries + 1):
+            missing = [n for n in numbers if n not in found]
+            responses = await client.batch([("eth_getBlockByNumber", [hex(n), True]) for n in missing])
+            for number, response in zip(missing, responses):
+                if 'error' in response:
+                    raise MirrorRPCError(f"eth_getBlockByNumber {hex(number)}: {response['error']}")
+                if response.get('result'):
+                    found[number] = response
+
+            if len(found) == len(numbers):
+                return [found[n] for n in numbers]
+            # Load-balanced RPC nodes can lag the reported tip by a block or two
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10.0)
+
+        missing = [hex(n) for n in numbers if n not in found]
+        raise MirrorRPCError(f"Blocks not available yet: {', '.join(missing[:5])}")
+
+    # ===== PROCESSING =====
+
+    def _write_blocks(self, responses: List[Dict[str, Any]]):
+        """Normalize, hash, score and persist one fetched range, in block order"""
+        timestamp = _utc_timestamp()
+        lines = {name: [] for name in ('vibration', 'rhythm', 'threats', 'cells', 'replay')}
+        threat_score = 0
+        block_hex = None
+
+        for response in responses:
+            result = response['result']
+            raw_bytes = json.dumps(response, separators=(',', ':')).encode('utf-8')
+            normalized = normalize_block(result)
+            normalized_bytes = (json.dumps(normalized, indent=2) + "\n").encode('utf-8')
+            number = int(result['number'], 16)
+            block_hex = hex(number)
+            block_time = int(result['timestamp'], 16)
+
+            # Correspondence + Polarity: store payloads and their hashes
+            self.store.append_block(raw_bytes, normalized_bytes, number=number)
+            if self.block_files:
+                self._write_block_files(block_hex, raw_bytes, normalized_bytes)
+
+            # Vibration
+            tx_count = normalized['tx_count']
+            lines['vibration'].append({"block": block_hex, "tx_count": tx_count,
+                                       "frequency_hz": calculate_frequency(tx_count), "timestamp": timestamp})
+
+            # Rhythm
+            previous = self._previous_for(number)
+            if previous and previous[1] > 0:
+                lines['rhythm'].append({"from_block": hex(previous[0]), "to_block": block_hex,
+                                        "block_time": block_time - previous[1], "timestamp": timestamp})
+            self._previous = (number, block_time)
+
+            # Cause & Effect
+            threat_score = quantum_scan(normalized)
+            lines['threats'].append({"block": block_hex, "threat_score": threat_score, "timestamp": timestamp})
+
+            # Gender
+            cell_type, count = spawn_decision(threat_score)
+            lines['cells'].append({"block": block_hex, "cell_type": cell_type, "count": count,
+                                   "threat_score": threat_score, "timestamp": timestamp})
+            if threat_score > 50:
+                self.log(f"⚠️  HIGH THREAT detected in block {block_hex}: {threat_score}/100")
+
+            lines['replay'].append(f"{block_hex} {timestamp}")
+
+        # Blocks first, then the logs that refer to them
+        self.store.commit()
+        for name, entries in lines.items():
+            handle = self._logs[name]
+            if name == 'replay':
+                handle.writelines(entry + "\n" for entry in entries)
+            else:
+                handle.writelines(json.dumps(entry) + "\n" for entry in entries)
+            handle.flush()
+        self.threat_index.update()
+
+        active = threat_score > 30
+        (self.chain_path / "logs" / "generative.flag").write_text(
+            "GENERATIVE_ACTIVE\n" if active else "GENERATIVE_OK\n")
+        (self.chain_path / "logs" / "regulatory.flag").write_text(
+            "REGULATORY_ACTIVE\n" if active else "REGULATORY_IDLE\n")
+
+        last = self.last_processed_block()
+        if block_hex and (last is None or int(block_hex, 16) > last):
+            self.block_height_file.write_text(block_hex + "\n")
+
+        self.blocks_mirrored += len(responses)
+
+    def _write_block_files(self, block_hex: str, raw_bytes: bytes, normalized_bytes: bytes):
+        """The per-block file layout hermetic_mirror_live.sh writes"""
+        (self.chain_path / "raw" / f"block_{block_hex}.json").write_bytes(raw_bytes)
+        (self.chain_path / "normalized" / f"block_{block_hex}.norm.json").write_bytes(normalized_bytes)
+        (self.chain_path / "hashed" / f"block_{block_hex}.raw.sha").write_text(
+            hashlib.sha256(raw_bytes).hexdigest() + "\n")
+        (self.chain_path / "hashed" / f"block_{block_hex}.norm.sha").write_text(
+            hashlib.sha256(normalized_bytes).hexdigest() + "\n")
+
+    # ===== PIPELINE =====
+
+    async def mirror_range(self, client: JSONRPCClient, start: int, end: int) -> int:
+        """Mirror the blocks in [start, end] that are not mirrored yet
+
+        Up to ``window`` batch requests are in flight while completed batches
+        are written (in a worker thread) in block order.
+        """
+        if end < start:
+            return 0
+
+        numbers = self._missing_numbers(start, end)
+        batches = iter([numbers[i:i + self.batch_size] for i in range(0, len(numbers), self.batch_size)])
+        in_flight = deque()
+
+        def launch_next():
+            batch = next(batches, None)
+            if batch:
+                in_flight.append(asyncio.create_task(self._fetch_blocks(client, batch)))
+
+        for _ in range(self.window):
+            launch_next()
+
+        mirrored = 0
+        started = time.perf_counter()
+        try:
+            while in_flight:
+                responses = await in_flight.popleft()
+                launch_next()
+                await asyncio.to_thread(self._write_blocks, responses)
+                mirrored += len(responses)
+
+            elapsed = time.perf_counter() - started
+            if mirrored:
+                self.log(f"✨ Mirrored {mirrored} blocks {hex(start)}..{hex(end)} "
+                         f"({mirrored / elapsed:.1f} blocks/s)")
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return mirrored
+
+    async def mirror_latest(self) -> int:
+        """Single mode: mirror the current chain head"""
+        async with JSONRPCClient(self.rpc_url, self.window) as client:
+            latest = int(await client.call("eth_blockNumber"), 16)
+            return await self.mirror_range(client, latest, latest)
+
+    async def backfill(self, start: int, end: int) -> int:
+        """Mirror a historical range"""
+        async with JSONRPCClient(self.rpc_url, self.window) as client:
+            return await self.mirror_range(client, start, end)
+
+    async def run_continuous(self, poll_interval: Optional[float] = None):
+        """Follow the chain head, catching up from last_block.txt first"""
+        poll_interval = poll_interval or POLL_INTERVALS.get(self.chain, 5)
+        self.log("🔄 Starting continuous mirroring (Ctrl+C to stop)")
+
+        async with JSONRPCClient(self.rpc_url, self.window) as client:
+            while True:
+                try:
+                    latest = int(await client.call("eth_blockNumber"), 16)
+                    last = self.last_processed_block()
+                    if last is None:
+                        last = latest - 1
+                    await self.mirror_range(client, last + 1, latest)
+                except MirrorRPCError as e:
+                    self.log(f"❌ {e}")
+                await asyncio.sleep(poll_interval)
+
+    def close(self):
+        self.store.close()
+        for handle in self._logs.values():
+            handle.close()
+
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LUXBIN Hermetic Mirror Ingester")
+    parser.add_argument("chain", nargs="?", default="optimism", help="Blockchain to mirror")
+    parser.add_argument("mode", nargs="?", default="single", choices=["single", "continuous"])
+    parser.add_argument("--backfill", nargs=2, metavar=("FROM", "TO"),
+                        help="Mirror a block range (decimal or 0x-hex) and exit")
+    parser.add_argument("--rpc-url", help="Override the chain's RPC endpoint")
+    parser.add_argument("--mirror-root", default="./luxbin_mirror", help="Mirror data root")
+    parser.add_argument("--batch-size", type=int, default=20, help="Blocks per JSON-RPC batch request")
+    parser.add_argument("--window", type=int, default=8, help="Batch requests in flight")
+    parser.add_argument("--block-files", action="store_true",
+                        help="Also write raw/normalized/hashed files per block")
+    args = parser.parse_args()
+
+    ingester = HermeticMirrorIngester(
+        chain=args.chain,
+        rpc_url=args.rpc_url,
+        mirror_root=args.mirror_root,
+        batch_size=args.batch_size,
+        window=args.window,
+        block_files=args.block_files
+    )
+
+    print("✨════════════════════════════════════════════════════════════✨")
+    print("║       LUXBIN HERMETIC MIRROR - PYTHON INGESTER            ║")
+    print("✨════════════════════════════════════════════════════════════✨")
+    print(f"[CHAIN]  {ingester.chain}")
+    print(f"[RPC]    {ingester.rpc_url}")
+    print()
+
+    try:
+        if args.backfill:
+            await ingester.backfill(parse_block_number(args.backfill[0]), parse_block_number(args.backfill[1]))
+        elif args.mode == "continuous":
+            await ingester.run_continuous()
+        else:
+            await ingester.mirror_latest()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingester.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
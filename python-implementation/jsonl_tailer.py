@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+LUXBIN JSONL TAILER
+Follows append-only JSONL logs (the hermetic mirror's threat, cell, vibration
+and rhythm logs) without rescanning them
+
+Each file is read from a remembered byte offset. Rotation (the path now names a
+different inode) and truncation (the file shrank) restart the read at the top
+of the new content, and a trailing line without a newline is left for the next
+read. Offsets can be checkpointed so a restarted reader resumes where it left
+off. Waiting for new data uses inotify on Linux and falls back to polling.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+PathLike = Union[str, Path]
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class JSONLTailer:
+    """Reads records appended to one JSONL file since the last read"""
+
+    def __init__(self, path: PathLike, state: Optional[Dict[str, int]] = None):
+        self.path = Path(path)
+        self.offset = 0
+        self._file = None
+        self._identity = None  # (st_dev, st_ino) of the open file
+        self._resume = state  # Checkpointed {offset, device, inode}, applied on first open
+
+        self.records_read = 0
+        self.lines_skipped = 0
+        self.rotations = 0
+        self.truncations = 0
+
+    def _open(self) -> bool:
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+
+        st = os.fstat(self._file.fileno())
+        self._identity = (st.st_dev, st.st_ino)
+        self.offset = 0
+
+        resume, self._resume = self._resume, None
+        if resume and (resume.get('device'), resume.get('inode')) == self._identity:
+            if resume.get('offset', 0) <= st.st_size:
+                self.offset = resume['offset']
+        return True
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._identity = None
+
+    def _drain(self, records: List[Dict[str, Any]], max_records: Optional[int]):
+        """Parse complete lines from the current offset to EOF"""
+        self._file.seek(self.offset)
+        while max_records is None or len(records) < max_records:
+            line = self._file.readline()
+            if not line.endswith(b'\n'):
+                break  # EOF, or a line the writer has not finished yet
+            self.offset += len(line)
+
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                self.lines_skipped += 1
+                continue
+            records.append(record)
+            self.records_read += 1
+
+    def read_new(self, max_records: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return records appended since the last call (at most ``max_records``)"""
+        records: List[Dict[str, Any]] = []
+
+        while max_records is None or len(records) < max_records:
+            if self._file is None and not self._open():
+                break
+
+            # Finish the open file first: after a rotation it still holds the old log's tail
+            self._drain(records, max_records)
+            if max_records is not None and len(records) >= max_records:
+                break
+
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                break  # Rotated away and not recreated yet
+
+            if (st.st_dev, st.st_ino) != self._identity:
+                self.rotations += 1
+                self._close()
+                continue
+            if st.st_size < self.offset:
+                self.truncations += 1
+                self.offset = 0
+                continue
+            break
+
+        return records
+
+    def seek_end(self):
+        """Skip what the file holds now; later reads return only new appends"""
+        self._close()
+        self._resume = None
+        if self._open():
+            self.offset = os.fstat(self._file.fileno()).st_size
+
+    def state(self) -> Dict[str, int]:
+        """Checkpointable position: byte offset into the file with this identity"""
+        if self._identity is None:
+            return dict(self._resume) if self._resume else {}
+        return {'offset': self.offset, 'device': self._identity[0], 'inode': self._identity[1]}
+
+    def close(self):
+        self._close()
+
+
+class TailCheckpoint:
+    """Persist tailer positions in a small JSON file (atomically replaced)"""
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, states: Dict[str, Dict[str, int]]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(states, f)
+        os.replace(temp_path, self.path)
+
+
+class _Inotify:
+    """Minimal inotify binding through libc (Linux only)"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory: Path, mask: int = WATCH_MASK) -> bool:
+        return self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), mask) >= 0
+
+    def drain(self):
+        """Discard queued events; callers re-read the files rather than parse events"""
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class ChangeNotifier:
+    """Wait until files in a set of directories change, or a timeout passes
+
+    Uses inotify when available; otherwise ``wait`` simply sleeps for the
+    timeout (polling). Directories that do not exist yet are watched as soon
+    as they appear.
+    """
+
+    def __init__(self, directories: List[PathLike], use_inotify: bool = True):
+        self.directories = sorted({Path(d) for d in directories})
+        self._watched = set()
+        self._inotify = None
+        self._event: Optional[asyncio.Event] = None
+        self._loop = None
+
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+
+    @property
+    def mode(self) -> str:
+        return 'inotify' if self._inotify else 'polling'
+
+    def _add_watches(self):
+        for directory in self.directories:
+            if directory not in self._watched and directory.is_dir():
+                if self._inotify.add_watch(directory):
+                    self._watched.add(directory)
+
+    def _on_readable(self):
+        self._inotify.drain()
+        self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Return True when a watched directory changed, False on timeout"""
+        if not self._inotify:
+            await asyncio.sleep(timeout)
+            return False
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._inotify.fd)
+            self._loop = loop
+            self._event = asyncio.Event()
+            loop.add_reader(self._inotify.fd, self._on_readable)
+
+        self._add_watches()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._event.clear()
+
+    def close(self):
+        if self._inotify:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+
+
+class JSONLFollower:
+    """Tail a named set of JSONL logs with shared change notification and checkpoints"""
+
+    def __init__(self, files: Dict[str, PathLike], checkpoint_path: Optional[PathLike] = None,
+                 resume: bool = True, use_inotify: bool = True, start_at_end: bool = False):
+        self.checkpoint = TailCheckpoint(checkpoint_path) if checkpoint_path else None
+        saved = self.checkpoint.load() if (self.checkpoint and resume) else {}
+
+        self.tailers = {
+            name: JSONLTailer(path, saved.get(name))
+            for name, path in files.items()
+        }
+        if start_at_end:
+            # Live followers: logs without a checkpoint start at their current end
+            for name, tailer in self.tailers.items():
+                if name not in saved:
+                    tailer.seek_end()
+        self.notifier = ChangeNotifier([Path(path).parent for path in files.values()], use_inotify)
+        self._committed = {name: tailer.state() for name, tailer in self.tailers.items()}
+
+    def read_new(self, max_records: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """New records per log name since the last read"""
+        return {name: tailer.read_new(max_records) for name, tailer in self.tailers.items()}
+
+    def commit(self):
+        """Checkpoint current positions (call once the records read so far are handled)"""
+        if not self.checkpoint:
+            return
+        states = {name: tailer.state() for name, tailer in self.tailers.items()}
+        if states != self._committed:
+            self.checkpoint.save(states)
+            self._committed = states
+
+    async def wait(self, timeout: float = 2.0) -> bool:
+        """Block until a log directory changes or ``timeout`` seconds pass"""
+        return await self.notifier.wait(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.notifier.mode,
+            'files': {
+                name: {
+                    'offset': tailer.offset,
+                    'records_read': tailer.records_read,
+                    'lines_skipped': tailer.lines_skipped,
+                    'rotations': tailer.rotations,
+                    'truncations': tailer.truncations
+                }
+                for name, tailer in self.tailers.items()
+            }
+        }
+
+    def close(self):
+        for tailer in self.tailers.values():
+            tailer.close()
+        self.notifier.close()
@@ -14,6 +14,8 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from mirror_event_bus import EVENT_CLIENT_JS, EventBus, add_event_routes
+
 app = FastAPI(title="LUXBIN Native Explorer")
 
 # CORS middleware
@@ -45,9 +47,22 @@ class LuxbinBlock:
 class LuxbinChain:
     def __init__(self):
         self.chain = []
+        self.listeners = []  # Called with each block appended after startup
         self._create_genesis_block()
         self._create_sample_blocks()
 
+    def add_block(self, genomes: List, timestamp: float = None) -> LuxbinBlock:
+        block = LuxbinBlock(
+            len(self.chain),
+            timestamp if timestamp is not None else datetime.now().timestamp(),
+            genomes,
+            self.chain[-1].hash
+        )
+        self.chain.append(block)
+        for listener in self.listeners:
+            listener(block)
+        return block
+
     def _create_genesis_block(self):
         genesis = LuxbinBlock(0, datetime.now().timestamp(), [], "0")
         self.chain.append(genesis)
@@ -67,13 +82,7 @@ class LuxbinChain:
                 }
                 for j in range(3)
             ]
-            block = LuxbinBlock(
-                i,
-                datetime.now().timestamp() - (10 - i) * 60,
-                genomes,
-                self.chain[-1].hash
-            )
-            self.chain.append(block)
+            self.add_block(genomes, datetime.now().timestamp() - (10 - i) * 60)
 
 # Initialize chain
 chain = LuxbinChain()
@@ -290,74 +299,107 @@ HTML_TEMPLATE = """
     </div>
 
     <script>
+        const MAX_BLOCKS = 5;
+        const MAX_TXS = 10;
+
+        function renderStats(stats) {
+            document.getElementById('total-blocks').textContent = stats.total_blocks;
+            document.getElementById('total-txs').textContent = stats.total_transactions;
+            document.getElementById('total-supply').textContent = stats.total_supply.toLocaleString();
+            document.getElementById('volume').textContent = stats.volume_24h.toLocaleString();
+        }
+
+        function blockCard(block) {
+            return `
+                <div class="block" data-index="${block.index}">
+                    <h3>Block #${block.index}</h3>
+                    <p><strong>Hash:</strong> ${block.hash}</p>
+                    <p><strong>Timestamp:</strong> ${new Date(block.timestamp).toLocaleString()}</p>
+                    <p><strong>Genomes:</strong> ${block.transactions}</p>
+                    <p><strong>Total Value:</strong> ${block.total_value.toLocaleString()}</p>
+                </div>
+            `;
+        }
+
+        function txCard(tx) {
+            return `
+                <div class="tx" data-hash="${tx.hash}">
+                    <h3>Genome Transaction <span class="cell-type ${tx.type}">${tx.type}</span></h3>
+                    <p><strong>Hash:</strong> ${tx.hash}</p>
+                    <p><strong>Block:</strong> #${tx.block}</p>
+                    <p><strong>From:</strong> ${tx.from}</p>
+                    <p><strong>To:</strong> ${tx.to}</p>
+                    <p><strong>Value:</strong> ${tx.value.toLocaleString()}</p>
+                    <p><strong>Sequence:</strong></p>
+                    <div class="genome-sequence">${tx.sequence.substring(0, 80)}...</div>
+                    <p><strong>Time:</strong> ${new Date(tx.timestamp * 1000).toLocaleString()}</p>
+                </div>
+            `;
+        }
+
+        // Add a pushed item at the top of a list, skipping ones already shown
+        function prepend(containerId, selector, html, max) {
+            const container = document.getElementById(containerId);
+            if (container.querySelector(selector)) return;
+            container.insertAdjacentHTML('afterbegin', html);
+            const items = container.querySelectorAll('.block, .tx');
+            for (let i = max; i < items.length; i++) items[i].remove();
+        }
+
         async function loadData() {
             try {
                 // Load stats
                 const statsRes = await fetch('/api/stats');
-                const stats = await statsRes.json();
-
-                document.getElementById('total-blocks').textContent = stats.total_blocks;
-                document.getElementById('total-txs').textContent = stats.total_transactions;
-                document.getElementById('total-supply').textContent = stats.total_supply.toLocaleString();
-                document.getElementById('volume').textContent = stats.volume_24h.toLocaleString();
+                renderStats(await statsRes.json());
 
                 // Load blocks
-                const blocksRes = await fetch('/api/blocks?limit=5');
+                const blocksRes = await fetch(`/api/blocks?limit=${MAX_BLOCKS}`);
                 const blocksData = await blocksRes.json();
-                const blocksContainer = document.getElementById('blocks-container');
-
-                blocksContainer.innerHTML = blocksData.blocks.map(block => `
-                    <div class="block">
-                        <h3>Block #${block.index}</h3>
-                        <p><strong>Hash:</strong> ${block.hash}</p>
-                        <p><strong>Timestamp:</strong> ${new Date(block.timestamp).toLocaleString()}</p>
-                        <p><strong>Genomes:</strong> ${block.transactions}</p>
-                        <p><strong>Total Value:</strong> ${block.total_value.toLocaleString()}</p>
-                    </div>
-                `).join('');
+                document.getElementById('blocks-container').innerHTML = blocksData.blocks.map(blockCard).join('');
 
                 // Load transactions
-                const txsRes = await fetch('/api/transactions?limit=10');
+                const txsRes = await fetch(`/api/transactions?limit=${MAX_TXS}`);
                 const txsData = await txsRes.json();
-                const txsContainer = document.getElementById('txs-container');
-
-                txsContainer.innerHTML = txsData.transactions.map(tx => `
-                    <div class="tx">
-                        <h3>Genome Transaction <span class="cell-type ${tx.type}">${tx.type}</span></h3>
-                        <p><strong>Hash:</strong> ${tx.hash}</p>
-                        <p><strong>Block:</strong> #${tx.block}</p>
-                        <p><strong>From:</strong> ${tx.from}</p>
-                        <p><strong>To:</strong> ${tx.to}</p>
-                        <p><strong>Value:</strong> ${tx.value.toLocaleString()}</p>
-                        <p><strong>Sequence:</strong></p>
-                        <div class="genome-sequence">${tx.sequence.substring(0, 80)}...</div>
-                        <p><strong>Time:</strong> ${new Date(tx.timestamp * 1000).toLocaleString()}</p>
-                    </div>
-                `).join('');
+                document.getElementById('txs-container').innerHTML = txsData.transactions.map(txCard).join('');
 
             } catch (error) {
                 console.error('Error loading data:', error);
             }
         }
-
-        // Load data on page load
-        loadData();
-
-        // Auto-refresh every 10 seconds
-        setInterval(loadData, 10000);
+/*EVENT_CLIENT*/
+        // Load the snapshot once, then apply pushed updates
+        subscribeEvents({
+            stats: renderStats,
+            block: (block) => prepend('blocks-container', `[data-index="${block.index}"]`, blockCard(block), MAX_BLOCKS),
+            transaction: (tx) => prepend('txs-container', `[data-hash="${tx.hash}"]`, txCard(tx), MAX_TXS)
+        }, loadData);
     </script>
 </body>
 </html>
-"""
+""".replace("/*EVENT_CLIENT*/", EVENT_CLIENT_JS)
 
-@app.get("/", response_class=HTMLResponse)
-async def index():
-    """Serve the explorer HTML"""
-    return HTML_TEMPLATE
+def block_summary(block: LuxbinBlock) -> Dict:
+    return {
+        "index": block.index,
+        "hash": block.hash,
+        "timestamp": datetime.fromtimestamp(block.timestamp).isoformat(),
+        "transactions": len(block.genomes),
+        "total_value": block.total_value(),
+    }
 
-@app.get("/api/stats")
-async def get_stats():
-    """Get blockchain statistics"""
+def genome_transaction(block: LuxbinBlock, genome: Dict) -> Dict:
+    return {
+        "hash": genome.get('hash'),
+        "block": block.index,
+        "sequence": genome.get('sequence'),
+        "type": genome.get('type'),
+        "from": genome.get('from'),
+        "to": genome.get('to'),
+        "value": genome.get('value'),
+        "timestamp": genome.get('timestamp')
+    }
+
+def chain_stats() -> Dict:
     total_txs = sum(len(block.genomes) for block in chain.chain)
     total_supply = sum(block.total_value() for block in chain.chain)
 
@@ -371,18 +413,32 @@ async def get_stats():
         "volume_24h": volume_24h
     }
 
+# Live feed: each new block is pushed to every viewer once
+event_bus = EventBus()
+
+def publish_block(block: LuxbinBlock):
+    event_bus.publish('block', block_summary(block))
+    for genome in block.genomes:
+        event_bus.publish('transaction', genome_transaction(block, genome))
+    event_bus.publish('stats', chain_stats())
+
+chain.listeners.append(publish_block)
+add_event_routes(app, event_bus)
+
+@app.get("/", response_class=HTMLResponse)
+async def index():
+    """Serve the explorer HTML"""
+    return HTML_TEMPLATE
+
+@app.get("/api/stats")
+async def get_stats():
+    """Get blockchain statistics"""
+    return chain_stats()
+
 @app.get("/api/blocks")
 async def get_blocks(limit: int = 10):
     """Get latest blocks"""
-    blocks = []
-    for block in chain.chain[-limit:]:
-        blocks.append({
-            "index": block.index,
-            "hash": block.hash,
-            "timestamp": datetime.fromtimestamp(block.timestamp).isoformat(),
-            "transactions": len(block.genomes),
-            "total_value": block.total_value(),
-        })
+    blocks = [block_summary(block) for block in chain.chain[-limit:]]
     return {"blocks": list(reversed(blocks))}
 
 @app.get("/api/transactions")
@@ -391,16 +447,7 @@ async def get_transactions(limit: int = 10):
     all_txs = []
     for block in chain.chain:
         for genome in block.genomes:
-            all_txs.append({
-                "hash": genome.get('hash'),
-                "block": block.index,
-                "sequence": genome.get('sequence'),
-                "type": genome.get('type'),
-                "from": genome.get('from'),
-                "to": genome.get('to'),
-                "value": genome.get('value'),
-                "timestamp": genome.get('timestamp')
-            })
+            all_txs.append(genome_transaction(block, genome))
 
     # Return latest transactions
     return {"transactions": list(reversed(all_txs[-limit:]))}
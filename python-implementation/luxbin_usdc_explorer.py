@@ -13,6 +13,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from luxbin_usdc_integration import LuxbinUSDCEconomy, USDCIntegration
+from mirror_event_bus import EVENT_CLIENT_JS, EventBus, MirrorLogWatcher, add_event_routes
 
 app = FastAPI(title="LUXBIN USDC Explorer")
 
@@ -331,63 +332,81 @@ HTML_TEMPLATE = """
     </div>
 
     <script>
-        async function loadData() {
-            try {
-                const res = await fetch('/api/economy');
-                const data = await res.json();
+        function renderEconomy(data) {
+            // Update main stats
+            document.getElementById('total-earned').textContent = '$' + parseFloat(data.mirror_value.total_earned).toFixed(2);
+            document.getElementById('cell-value').textContent = '$' + parseFloat(data.mirror_value.cells_value).toFixed(2);
+            document.getElementById('threat-value').textContent = '$' + parseFloat(data.mirror_value.threat_rewards).toFixed(2);
+            document.getElementById('block-value').textContent = '$' + parseFloat(data.mirror_value.block_rewards).toFixed(2);
 
-                // Update main stats
-                document.getElementById('total-earned').textContent = '$' + parseFloat(data.mirror_value.total_earned).toFixed(2);
-                document.getElementById('cell-value').textContent = '$' + parseFloat(data.mirror_value.cells_value).toFixed(2);
-                document.getElementById('threat-value').textContent = '$' + parseFloat(data.mirror_value.threat_rewards).toFixed(2);
-                document.getElementById('block-value').textContent = '$' + parseFloat(data.mirror_value.block_rewards).toFixed(2);
+            // Update cell breakdown
+            const cellBreakdown = document.getElementById('cell-breakdown');
+            if (Object.keys(data.cell_breakdown).length > 0) {
+                cellBreakdown.innerHTML = Object.entries(data.cell_breakdown).map(([cellType, info]) => `
+                    <div class="cell-card ${cellType}">
+                        <h4>${cellType}</h4>
+                        <div class="count">${info.count}</div>
+                        <div>cells spawned</div>
+                        <div class="usdc-value">$${parseFloat(info.value).toFixed(2)}</div>
+                    </div>
+                `).join('');
+            } else {
+                cellBreakdown.innerHTML = '<p style="text-align: center; color: #6c757d;">No cells spawned yet</p>';
+            }
 
-                // Update cell breakdown
-                const cellBreakdown = document.getElementById('cell-breakdown');
-                if (Object.keys(data.cell_breakdown).length > 0) {
-                    cellBreakdown.innerHTML = Object.entries(data.cell_breakdown).map(([cellType, info]) => `
-                        <div class="cell-card ${cellType}">
-                            <h4>${cellType}</h4>
-                            <div class="count">${info.count}</div>
-                            <div>cells spawned</div>
-                            <div class="usdc-value">$${parseFloat(info.value).toFixed(2)}</div>
-                        </div>
-                    `).join('');
-                } else {
-                    cellBreakdown.innerHTML = '<p style="text-align: center; color: #6c757d;">No cells spawned yet</p>';
-                }
+            // Update breakdown
+            document.getElementById('breakdown-cells').textContent = '$' + parseFloat(data.mirror_value.cells_value).toFixed(2);
+            document.getElementById('breakdown-threats').textContent = '$' + parseFloat(data.mirror_value.threat_rewards).toFixed(2);
+            document.getElementById('breakdown-blocks').textContent = '$' + parseFloat(data.mirror_value.block_rewards).toFixed(2);
+            document.getElementById('breakdown-total').textContent = '$' + parseFloat(data.mirror_value.total_earned).toFixed(2);
+        }
 
-                // Update breakdown
-                document.getElementById('breakdown-cells').textContent = '$' + parseFloat(data.mirror_value.cells_value).toFixed(2);
-                document.getElementById('breakdown-threats').textContent = '$' + parseFloat(data.mirror_value.threat_rewards).toFixed(2);
-                document.getElementById('breakdown-blocks').textContent = '$' + parseFloat(data.mirror_value.block_rewards).toFixed(2);
-                document.getElementById('breakdown-total').textContent = '$' + parseFloat(data.mirror_value.total_earned).toFixed(2);
+        function renderEarnings(earnings) {
+            document.getElementById('calc-apy').textContent = earnings.current_apy;
+            document.getElementById('calc-30d').textContent = '$' + parseFloat(earnings.staking_rewards_30d).toFixed(2);
+            document.getElementById('calc-total').textContent = '$' + parseFloat(earnings.potential_30d_total).toFixed(2);
 
-                // Get earnings data
-                const earningsRes = await fetch('/api/earnings');
-                const earnings = await earningsRes.json();
+            if (earnings.can_stake) {
+                document.getElementById('stake-status').textContent = '✅ Eligible to stake and earn rewards!';
+            } else {
+                document.getElementById('stake-status').textContent = '❌ Need $' + earnings.min_stake_required + ' USDC to stake';
+            }
+        }
 
-                document.getElementById('calc-apy').textContent = earnings.current_apy;
-                document.getElementById('calc-30d').textContent = '$' + parseFloat(earnings.staking_rewards_30d).toFixed(2);
-                document.getElementById('calc-total').textContent = '$' + parseFloat(earnings.potential_30d_total).toFixed(2);
+        async function loadData() {
+            try {
+                const res = await fetch('/api/economy');
+                renderEconomy(await res.json());
 
-                if (earnings.can_stake) {
-                    document.getElementById('stake-status').textContent = '✅ Eligible to stake and earn rewards!';
-                } else {
-                    document.getElementById('stake-status').textContent = '❌ Need $' + earnings.min_stake_required + ' USDC to stake';
-                }
+                // Get earnings data
+                const earningsRes = await fetch('/api/earnings');
+                renderEarnings(await earningsRes.json());
 
             } catch (error) {
                 console.error('Error loading data:', error);
             }
         }
-
-        loadData();
-        setInterval(loadData, 10000);
+/*EVENT_CLIENT*/
+        // Load the snapshot once; the server pushes new figures as the mirror grows
+        subscribeEvents({
+            economy: (update) => { renderEconomy(update.economy); renderEarnings(update.earnings); }
+        }, loadData);
     </script>
 </body>
 </html>
-"""
+""".replace("/*EVENT_CLIENT*/", EVENT_CLIENT_JS)
+
+async def economy_update():
+    """Economy figures pushed after each batch of mirror appends (computed once for all viewers)"""
+    return {
+        "economy": await economy.get_economy_stats(),
+        "earnings": await economy.calculate_user_earnings(Decimal("0.85"))
+    }
+
+# Live feed: the mirror logs are watched once and updates pushed to every viewer
+event_bus = EventBus()
+watcher = MirrorLogWatcher(event_bus, economy.chain_path, summary=economy_update, summary_type='economy')
+add_event_routes(app, event_bus, on_connect=watcher.ensure_started)
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
@@ -21,6 +21,8 @@ from decimal import Decimal
 from web3 import Web3
 from web3.contract import Contract
 
+from mirror_block_store import open_block_store
+
 # USDC Contract Addresses (Circle's official USDC)
 USDC_ADDRESSES = {
     "ethereum": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
@@ -264,7 +266,11 @@ class LuxbinUSDCEconomy:
                         continue
 
         # Calculate block mirror rewards
-        block_count = len(list(self.chain_path.glob("raw/block_*.json"))) if (self.chain_path / "raw").exists() else 0
+        block_store = open_block_store(self.chain_path)
+        if block_store is not None:
+            block_count = len(block_store)
+        else:
+            block_count = len(list(self.chain_path.glob("raw/block_*.json"))) if (self.chain_path / "raw").exists() else 0
         value_breakdown["block_rewards"] = self.tokenomics.BLOCK_MIRROR_REWARD * Decimal(block_count)
 
         # Total
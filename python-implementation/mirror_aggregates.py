@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+LUXBIN MIRROR AGGREGATES
+Running totals over the hermetic mirror's logs for the explorer APIs
+
+Rather than re-reading vibration.jsonl, cells_spawned.jsonl and
+threat_scores.jsonl on every request, the aggregates follow the logs from
+their last offsets and fold new records into running totals, per-cell-type
+counts and bounded rings of the most recent blocks, threat scores and cell
+spawns. Totals and tail positions are saved together in one snapshot file,
+so a restarted explorer resumes without rescanning the mirror's history.
+Per-block threat lookups go through mirror_threat_index instead.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from jsonl_tailer import JSONLTailer
+
+SNAPSHOT_FILE = "explorer_aggregates.json"
+SNAPSHOT_VERSION = 1
+
+
+class MirrorAggregates:
+    """Incrementally maintained explorer statistics for one mirrored chain"""
+
+    def __init__(self, chain_path: Union[str, Path], snapshot_path: Optional[Union[str, Path]] = None,
+                 threat_window: int = 100, recent_limit: int = 1000, snapshot_interval: float = 5.0):
+        """
+        Args:
+            chain_path: luxbin_mirror/<chain> directory
+            snapshot_path: Where to persist the aggregates (default: <chain_path>/explorer_aggregates.json)
+            threat_window: Threat scores summed for the "volume" stat
+            recent_limit: Most recent blocks and cell spawns kept for the list endpoints
+            snapshot_interval: Minimum seconds between snapshot writes
+        """
+        self.chain_path = Path(chain_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.chain_path / SNAPSHOT_FILE
+        self.threat_window = threat_window
+        self.recent_limit = recent_limit
+        self.snapshot_interval = snapshot_interval
+
+        self.logs = {
+            'vibration': self.chain_path / "logs" / "vibration.jsonl",
+            'cells': self.chain_path / "immune" / "cells_spawned.jsonl",
+            'threats': self.chain_path / "quantum" / "threat_scores.jsonl"
+        }
+
+        self._reset()
+        saved = self._load_snapshot()
+        self.tailers = {name: JSONLTailer(path, saved.get(name)) for name, path in self.logs.items()}
+
+        self._dirty = False
+        self._last_save = 0.0
+
+    def _reset(self):
+        self.blocks_seen = 0
+        self.total_transactions = 0
+        self.total_cells = 0
+        self.cell_type_counts: Dict[str, int] = {}
+        self.recent_blocks = deque(maxlen=self.recent_limit)
+        self.recent_threats = deque(maxlen=self.threat_window)
+        self.recent_cells = deque(maxlen=self.recent_limit)
+
+    # ===== SNAPSHOT =====
+
+    def _load_snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Restore totals and return the tail positions they correspond to"""
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            return {}
+
+        positions = snapshot.get('positions', {})
+        # Totals only hold if every log is still the file (and at least the size) they were read from
+        for name, path in self.logs.items():
+            state = positions.get(name)
+            if not state:
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return {}
+            if (st.st_dev, st.st_ino) != (state.get('device'), state.get('inode')) or st.st_size < state.get('offset', 0):
+                return {}
+
+        totals = snapshot.get('totals', {})
+        self.blocks_seen = totals.get('blocks_seen', 0)
+        self.total_transactions = totals.get('total_transactions', 0)
+        self.total_cells = totals.get('total_cells', 0)
+        self.cell_type_counts = dict(totals.get('cell_type_counts', {}))
+        self.recent_blocks.extend(snapshot.get('recent_blocks', []))
+        self.recent_threats.extend(snapshot.get('recent_threats', []))
+        self.recent_cells.extend(snapshot.get('recent_cells', []))
+        return positions
+
+    def save_snapshot(self):
+        """Write totals and tail positions together (atomically replaced)"""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'positions': {name: tailer.state() for name, tailer in self.tailers.items()},
+            'totals': {
+                'blocks_seen': self.blocks_seen,
+                'total_transactions': self.total_transactions,
+                'total_cells': self.total_cells,
+                'cell_type_counts': self.cell_type_counts
+            },
+            'recent_blocks': list(self.recent_blocks),
+            'recent_threats': list(self.recent_threats),
+            'recent_cells': list(self.recent_cells)
+        }
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.snapshot_path.with_name(self.snapshot_path.name + '.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(temp_path, self.snapshot_path)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    # ===== UPDATES =====
+
+    def refresh(self) -> int:
+        """Fold records appended since the last refresh into the aggregates"""
+        new_records = {name: tailer.read_new() for name, tailer in self.tailers.items()}
+
+        for record in new_records['vibration']:
+            self.blocks_seen += 1
+            self.total_transactions += record.get('tx_count', 0)
+            if record.get('block') is not None:
+                self.recent_blocks.append(record['block'])
+
+        for record in new_records['threats']:
+            self.recent_threats.append(record.get('threat_score', 0))
+
+        for record in new_records['cells']:
+            count = record.get('count', 0)
+            cell_type = record.get('cell_type', 'MEMORY')
+            self.total_cells += count
+            self.cell_type_counts[cell_type] = self.cell_type_counts.get(cell_type, 0) + count
+            self.recent_cells.append(record)
+
+        processed = sum(len(records) for records in new_records.values())
+        if processed:
+            self._dirty = True
+        if self._dirty and time.monotonic() - self._last_save >= self.snapshot_interval:
+            self.save_snapshot()
+        return processed
+
+    # ===== QUERIES =====
+
+    def threat_volume(self) -> int:
+        """Sum of the last ``threat_window`` threat scores"""
+        return sum(self.recent_threats)
+
+    def latest_block_labels(self, limit: int) -> List[str]:
+        """Most recently mirrored block labels, newest first"""
+        labels = []
+        for label in reversed(self.recent_blocks):
+            if len(labels) >= limit:
+                break
+            if label not in labels:
+                labels.append(label)
+        return labels
+
+    def latest_cells(self, limit: int) -> List[Dict[str, Any]]:
+        """Most recent cell spawn records, oldest first"""
+        if limit <= 0:
+            return []
+        return list(self.recent_cells)[-limit:]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'blocks_seen': self.blocks_seen,
+            'total_transactions': self.total_transactions,
+            'total_cells': self.total_cells,
+            'cell_type_counts': dict(self.cell_type_counts),
+            'threat_volume': self.threat_volume(),
+            'offsets': {name: tailer.offset for name, tailer in self.tailers.items()}
+        }
+
+    def close(self):
+        if self._dirty:
+            self.save_snapshot()
+        for tailer in self.tailers.values():
+            tailer.close()
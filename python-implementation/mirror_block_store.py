@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+LUXBIN MIRROR BLOCK STORE
+Append-only columnar storage for mirrored blocks
+
+Replaces one raw/normalized/hash file per block with, under
+luxbin_mirror/<chain>/blocks/:
+
+    meta.json              committed row count (readers never see more rows)
+    <column>.bin           one fixed-width array per column, memory-mappable
+    segments/seg_N.dat     zlib-compressed raw RPC response + normalized JSON
+
+Numeric columns (number, timestamp, tx_count, gas_used, base_fee...) answer
+dashboard and HCT queries without touching payloads. Payloads are only
+decompressed when a caller asks for a specific block. Lookups by block
+number go through a sorted view of the number column.
+
+Usage:
+    python3 mirror_block_store.py convert --mirror-root ./luxbin_mirror --chain optimism
+    python3 mirror_block_store.py stats --chain optimism
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer use only
+    fcntl = None
+
+STORE_DIR = "blocks"
+STORE_VERSION = 1
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Row flags
+FLAG_REPLAY_FIELDS = 1   # normalized block has block, timestamp and tx_count
+FLAG_GAS_USED = 2        # normalized block has gas_used
+FLAG_RAW_VALID = 4       # raw payload is a JSON-RPC response with a result
+FLAG_COMPLETE = 8        # raw, normalized and both hashes were all present
+FLAG_RAW_HASHED = 16     # the raw payload's hash was recorded when it was mirrored
+
+COLUMNS = {
+    'number': np.dtype('<i8'),
+    'timestamp': np.dtype('<i8'),
+    'tx_count': np.dtype('<i4'),
+    'gas_used': np.dtype('<i8'),
+    'gas_limit': np.dtype('<i8'),
+    'base_fee': np.dtype('<i8'),     # -1 before EIP-1559
+    'flags': np.dtype('<u4'),
+    'hash': np.dtype('V32'),
+    'parent_hash': np.dtype('V32'),
+    'raw_sha': np.dtype('V32'),      # sha256 of the raw payload bytes
+    'norm_sha': np.dtype('V32'),     # sha256 of the normalized payload bytes
+    'segment': np.dtype('<u4'),
+    'offset': np.dtype('<u8'),
+    'raw_length': np.dtype('<u4'),   # compressed sizes of the two payload parts
+    'norm_length': np.dtype('<u4'),
+}
+
+NUMERIC_COLUMNS = ('number', 'timestamp', 'tx_count', 'gas_used', 'gas_limit', 'base_fee')
+
+
+def _hex_to_int(value, default: int = -1) -> int:
+    if value is None:
+        return default
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value, 16) if str(value).startswith('0x') else int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _hash_bytes(value) -> bytes:
+    """32-byte hash column value from a 0x-prefixed hex string (zeros if absent)"""
+    try:
+        raw = bytes.fromhex(str(value)[2:]) if value else b''
+    except ValueError:
+        raw = b''
+    return raw[:32].rjust(32, b'\0')
+
+
+def normalize_block(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized block record (the fields hermetic_mirror_live.sh extracts with jq)"""
+    return {
+        'block': result.get('number'),
+        'timestamp': result.get('timestamp'),
+        'tx_count': len(result.get('transactions') or []),
+        'gas_used': result.get('gasUsed'),
+        'gas_limit': result.get('gasLimit'),
+        'miner': result.get('miner'),
+        'difficulty': result.get('difficulty'),
+        'hash': result.get('hash'),
+        'parent_hash': result.get('parentHash'),
+        'size': result.get('size'),
+        'base_fee': result.get('baseFeePerGas')
+    }
+
+
+class MirrorBlockStore:
+    """Columnar block store for one mirrored chain
+
+    Readers (explorer, HCT collectors) open it read-only and call ``refresh``
+    cheaply before each query; one writer (ingester or converter) appends rows
+    and makes them visible with ``commit``.
+    """
+
+    def __init__(self, path: Union[str, Path], writable: bool = False,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.path = Path(path)
+        self.writable = writable
+        self.segment_size = segment_size
+        self.meta_path = self.path / "meta.json"
+        self.segments_path = self.path / "segments"
+
+        self.rows = 0
+        self._meta_mtime = None
+        self._maps: Dict[str, np.ndarray] = {}
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None  # (sorted numbers, row ids)
+
+        self._lock_file = None
+        self._pending: List[Dict[str, Any]] = []
+        self._segment_id = 0
+        self._segment_file = None
+        self._segment_offset = 0
+
+        if writable:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.segments_path.mkdir(exist_ok=True)
+            self._acquire_writer_lock()
+            self._load_meta()
+            self._recover()
+        else:
+            self._load_meta()
+
+    # ===== METADATA =====
+
+    def _load_meta(self):
+        try:
+            stat = self.meta_path.stat()
+        except FileNotFoundError:
+            self.rows = 0
+            return
+        if stat.st_mtime_ns == self._meta_mtime:
+            return
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported block store version {meta.get('version')} at {self.path}")
+        self._meta_mtime = stat.st_mtime_ns
+        if meta['rows'] != self.rows:
+            self.rows = meta['rows']
+            self._maps.clear()
+            self._sorted = None
+        self._segment_id = meta.get('segment', 0)
+        self._segment_offset = meta.get('segment_offset', 0)
+
+    def _save_meta(self):
+        temp_path = self.meta_path.with_name('meta.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'version': STORE_VERSION,
+                'rows': self.rows,
+                'segment': self._segment_id,
+                'segment_offset': self._segment_offset
+            }, f)
+        os.replace(temp_path, self.meta_path)
+        self._meta_mtime = self.meta_path.stat().st_mtime_ns
+
+    def refresh(self):
+        """Pick up rows committed by the writer since the last call (one stat when idle)"""
+        if not self.writable:
+            self._load_meta()
+
+    # ===== WRITER =====
+
+    def _acquire_writer_lock(self):
+        self._lock_file = open(self.path / "writer.lock", 'w')
+        if fcntl:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                raise RuntimeError(f"Another process is writing to the block store at {self.path}")
+
+    def _recover(self):
+        """Drop anything a crashed writer appended after the last commit"""
+        for name, dtype in COLUMNS.items():
+            column_path = self.path / f"{name}.bin"
+            committed = self.rows * dtype.itemsize
+            if column_path.exists() and column_path.stat().st_size > committed:
+                os.truncate(column_path, committed)
+        segment_path = self._segment_path(self._segment_id)
+        if segment_path.exists() and segment_path.stat().st_size > self._segment_offset:
+            os.truncate(segment_path, self._segment_offset)
+        for stray in self.segments_path.glob("seg_*.dat"):
+            if int(stray.stem[len("seg_"):]) > self._segment_id:
+                stray.unlink()
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.segments_path / f"seg_{segment_id:06d}.dat"
+
+    def _write_payload(self, data: bytes) -> Tuple[int, int]:
+        if self._segment_offset and self._segment_offset + len(data) > self.segment_size:
+            if self._segment_file:
+                # commit() only syncs the current segment; rows pending in this one need it on disk too
+                self._segment_file.flush()
+                os.fsync(self._segment_file.fileno())
+                self._segment_file.close()
+                self._segment_file = None
+            self._segment_id += 1
+            self._segment_offset = 0
+        if self._segment_file is None:
+            self._segment_file = open(self._segment_path(self._segment_id), 'ab')
+        offset = self._segment_offset
+        self._segment_file.write(data)
+        self._segment_offset += len(data)
+        return self._segment_id, offset
+
+    def append_block(self, raw_bytes: bytes, normalized_bytes: Optional[bytes] = None,
+                     number: Optional[int] = None, complete: bool = True,
+                     raw_hashed: bool = True) -> int:
+        """Append one block; visible to readers after ``commit``
+
+        Args:
+            raw_bytes: The eth_getBlockByNumber response as received
+            normalized_bytes: Normalized JSON (derived from the raw block if omitted)
+            number: Block number, if the payload may not carry one
+            complete: Whether the source had every artifact (raw, normalized, hashes)
+            raw_hashed: Whether the source recorded the raw payload's hash
+
+        Returns:
+            The block number stored
+        """
+        if not self.writable:
+            raise RuntimeError("Block store opened read-only")
+
+        flags = (FLAG_COMPLETE if complete else 0) | (FLAG_RAW_HASHED if raw_hashed else 0)
+        result = {}
+        try:
+            result = json.loads(raw_bytes).get('result') or {}
+            if result:
+                flags |= FLAG_RAW_VALID
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            result = {}
+
+        normalized = None
+        if normalized_bytes is not None:
+            try:
+                normalized = json.loads(normalized_bytes)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                normalized = None
+        elif result:
+            normalized = normalize_block(result)
+            normalized_bytes = (json.dumps(normalized, indent=2) + "\n").encode('utf-8')
+        if not isinstance(normalized, dict):
+            normalized = {}
+        normalized_bytes = normalized_bytes or b''
+
+        if all(normalized.get(k) is not None for k in ('block', 'timestamp', 'tx_count')):
+            flags |= FLAG_REPLAY_FIELDS
+        if normalized.get('gas_used'):
+            flags |= FLAG_GAS_USED
+
+        if number is None:
+            number = _hex_to_int(normalized.get('block', result.get('number')))
+
+        raw_compressed = zlib.compress(raw_bytes, 6)
+        norm_compressed = zlib.compress(normalized_bytes, 6)
+        segment, offset = self._write_payload(raw_compressed + norm_compressed)
+
+        self._pending.append({
+            'number': number,
+            'timestamp': _hex_to_int(normalized.get('timestamp', result.get('timestamp'))),
+            'tx_count': int(normalized.get('tx_count') or 0),
+            'gas_used': _hex_to_int(normalized.get('gas_used', result.get('gasUsed'))),
+            'gas_limit': _hex_to_int(normalized.get('gas_limit', result.get('gasLimit'))),
+            'base_fee': _hex_to_int(normalized.get('base_fee', result.get('baseFeePerGas'))),
+            'flags': flags,
+            'hash': _hash_bytes(normalized.get('hash', result.get('hash'))),
+            'parent_hash': _hash_bytes(normalized.get('parent_hash', result.get('parentHash'))),
+            'raw_sha': hashlib.sha256(raw_bytes).digest(),
+            'norm_sha': hashlib.sha256(normalized_bytes).digest(),
+            'segment': segment,
+            'offset': offset,
+            'raw_length': len(raw_compressed),
+            'norm_length': len(norm_compressed)
+        })
+        return number
+
+    def commit(self):
+        """Make appended blocks visible: payloads, then columns, then the row count"""
+        if not self._pending:
+            return
+        if self._segment_file:
+            self._segment_file.flush()
+            os.fsync(self._segment_file.fileno())
+
+        for name, dtype in COLUMNS.items():
+            values = np.array([row[name] for row in self._pending], dtype=dtype)
+            with open(self.path / f"{name}.bin", 'ab') as f:
+                f.write(values.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.rows += len(self._pending)
+        self._pending = []
+        self._maps.clear()
+        self._sorted = None
+        self._save_meta()
+
+    def close(self):
+        if self.writable:
+            self.commit()
+            if self._segment_file:
+                self._segment_file.close()
+                self._segment_file = None
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ===== READER =====
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Committed values of one column (memory-mapped, read-only)"""
+        dtype = COLUMNS[name]
+        rows = self.rows  # Readers on other threads may refresh() meanwhile
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        array = self._maps.get(name)
+        if array is None or len(array) != rows:
+            array = np.memmap(self.path / f"{name}.bin", dtype=dtype, mode='r', shape=(rows,))
+            self._maps[name] = array
+        return array
+
+    def _sorted_numbers(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._sorted is None:
+            numbers = np.asarray(self.column('number'))
+            if np.all(numbers[1:] >= numbers[:-1]):
+                order = np.arange(len(numbers))
+            else:
+                order = np.argsort(numbers, kind='stable')
+            self._sorted = (numbers[order], order)
+        return self._sorted
+
+    def find(self, number: int) -> Optional[int]:
+        """Row of a block number (the latest copy if it was mirrored twice)"""
+        numbers, order = self._sorted_numbers()
+        position = np.searchsorted(numbers, number, side='right') - 1
+        if position < 0 or numbers[position] != number:
+            return None
+        return int(order[position])
+
+    def contains(self, number: int) -> bool:
+        return self.find(number) is not None
+
+    def block_numbers(self) -> np.ndarray:
+        """Distinct mirrored block numbers, ascending"""
+        return np.unique(self.column('number'))
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Column values of one row (no payload access)"""
+        record = {name: self.column(name)[index] for name in NUMERIC_COLUMNS}
+        record = {name: int(value) for name, value in record.items()}
+        record['flags'] = int(self.column('flags')[index])
+        record['hash'] = '0x' + bytes(self.column('hash')[index]).hex()
+        record['parent_hash'] = '0x' + bytes(self.column('parent_hash')[index]).hex()
+        return record
+
+    def latest_blocks(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Highest-numbered blocks first"""
+        numbers, order = self._sorted_numbers()
+        rows, seen = [], set()
+        for position in range(len(numbers) - 1, -1, -1):
+            if len(rows) >= limit:
+                break
+            number = int(numbers[position])
+            if number in seen:
+                continue
+            seen.add(number)
+            rows.append(self.row(int(order[position])))
+        return rows
+
+    def _payload(self, index: int) -> Tuple[bytes, bytes]:
+        segment = int(self.column('segment')[index])
+        offset = int(self.column('offset')[index])
+        raw_length = int(self.column('raw_length')[index])
+        norm_length = int(self.column('norm_length')[index])
+        with open(self._segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            data = f.read(raw_length + norm_length)
+        return data[:raw_length], data[raw_length:]
+
+    def get_raw(self, number: int) -> Optional[Dict[str, Any]]:
+        """The eth_getBlockByNumber response for a block"""
+        index = self.find(number)
+        if index is None:
+            return None
+        raw, _ = self._payload(index)
+        try:
+            return json.loads(zlib.decompress(raw))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def get_normalized(self, number: int) -> Optional[Dict[str, Any]]:
+        """The normalized record for a block"""
+        index = self.find(number)
+        if index is None:
+            return None
+        _, normalized = self._payload(index)
+        try:
+            return json.loads(zlib.decompress(normalized))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def flag_fraction(self, flags: int) -> float:
+        """Fraction of rows that have all of ``flags`` set"""
+        column = self.column('flags')
+        if len(column) == 0:
+            return 0.0
+        return float(np.count_nonzero((column & flags) == flags)) / len(column)
+
+    def get_stats(self) -> Dict[str, Any]:
+        tx_count = self.column('tx_count')
+        return {
+            'blocks': self.rows,
+            'unique_blocks': int(len(self.block_numbers())),
+            'total_transactions': int(tx_count.sum(dtype=np.int64)) if self.rows else 0,
+            'segments': len(list(self.segments_path.glob("seg_*.dat"))) if self.segments_path.exists() else 0,
+            'disk_bytes': sum(p.stat().st_size for p in self.path.rglob("*") if p.is_file())
+        }
+
+
+def open_block_store(chain_path: Union[str, Path]) -> Optional[MirrorBlockStore]:
+    """Open a chain's block store read-only, or None if the mirror has not been converted"""
+    path = Path(chain_path) / STORE_DIR
+    if not (path / "meta.json").exists():
+        return None
+    return MirrorBlockStore(path)
+
+
+# ===== CONVERTER =====
+
+def _legacy_block_files(chain_path: Path) -> Iterable[Tuple[int, Path]]:
+    raw_dir = chain_path / "raw"
+    if not raw_dir.exists():
+        return []
+    entries = []
+    with os.scandir(raw_dir) as it:
+        for entry in it:
+            if entry.name.startswith("block_") and entry.name.endswith(".json"):
+                label = entry.name[len("block_"):-len(".json")]
+                number = _hex_to_int(label, default=None)
+                if number is not None:
+                    entries.append((number, Path(entry.path)))
+    return sorted(entries)
+
+
+def convert_mirror(chain_path: Union[str, Path], remove_source: bool = False,
+                   batch_size: int = 1000) -> Dict[str, int]:
+    """Import raw/normalized/hashed block files into the chain's block store
+
+    Incremental: blocks already in the store are skipped, so this can run
+    repeatedly next to a file-writing mirror.
+    """
+    chain_path = Path(chain_path)
+    norm_dir = chain_path / "normalized"
+    hash_dir = chain_path / "hashed"
+    stats = {'imported': 0, 'skipped': 0, 'pending': 0, 'removed': 0}
+
+    with MirrorBlockStore(chain_path / STORE_DIR, writable=True) as store:
+        converted = []
+        for number, raw_file in _legacy_block_files(chain_path):
+            label = raw_file.name[len("block_"):-len(".json")]
+            norm_file = norm_dir / f"block_{label}.norm.json"
+            raw_sha = hash_dir / f"block_{label}.raw.sha"
+            norm_sha = hash_dir / f"block_{label}.norm.sha"
+
+            if store.contains(number):
+                stats['skipped'] += 1
+            else:
+                raw_bytes = raw_file.read_bytes()
+                normalized_bytes = norm_file.read_bytes() if norm_file.exists() else None
+                if normalized_bytes is None and not _has_result(raw_bytes):
+                    # Fetched before the block existed; the mirror retries it under the same name
+                    stats['pending'] += 1
+                    continue
+                complete = normalized_bytes is not None and raw_sha.exists() and norm_sha.exists()
+                store.append_block(raw_bytes, normalized_bytes, number=number,
+                                   complete=complete, raw_hashed=raw_sha.exists())
+                stats['imported'] += 1
+            converted.append((raw_file, norm_file, raw_sha, norm_sha))
+
+            if len(converted) >= batch_size:
+                store.commit()
+                stats['removed'] += _remove_sources(converted) if remove_source else 0
+                converted = []
+
+        store.commit()
+        stats['removed'] += _remove_sources(converted) if remove_source else 0
+
+    return stats
+
+
+def _has_result(raw_bytes: bytes) -> bool:
+    try:
+        return bool(json.loads(raw_bytes).get('result'))
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        return False
+
+
+def _remove_sources(groups) -> int:
+    removed = 0
+    for paths in groups:
+        for path in paths:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+    return removed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LUXBIN mirror block store")
+    parser.add_argument("command", choices=["convert", "stats"])
+    parser.add_argument("--mirror-root", default="./luxbin_mirror", help="Mirror data root")
+    parser.add_argument("--chain", default="optimism", help="Mirrored chain")
+    parser.add_argument("--remove-source", action="store_true",
+                        help="Delete raw/normalized/hash files once their block is stored")
+    args = parser.parse_args()
+
+    chain_path = Path(args.mirror_root) / args.chain
+
+    if args.command == "convert":
+        stats = convert_mirror(chain_path, remove_source=args.remove_source)
+        print(f"✓ Imported {stats['imported']} blocks ({stats['skipped']} already stored, "
+              f"{stats['pending']} not yet available, {stats['removed']} source files removed)")
+
+    store = open_block_store(chain_path)
+    if store is None:
+        print(f"No block store at {chain_path / STORE_DIR}")
+        return
+    for key, value in store.get_stats().items():
+        print(f"  {key}: {value:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+LUXBIN MIRROR EVENT BUS
+Push live explorer updates to browsers over Server-Sent Events and WebSocket
+
+One MirrorLogWatcher per explorer process follows the mirror's logs and
+publishes each append once (new block, new cell spawn, new threat, plus an
+optional stats summary per batch) to an EventBus. The bus fans events out
+to subscribers:
+
+- Every event has a cursor ("<epoch>-<seq>"). A reconnecting client passes
+  its last cursor (SSE Last-Event-ID or ?cursor=) and is replayed what it
+  missed from a bounded ring buffer. If the events it needs have been evicted,
+  or the server restarted (new epoch), it gets a "reset" event and reloads
+  its snapshot from the REST API.
+- Each subscriber has a bounded queue. A consumer that falls behind is not
+  allowed to hold up the bus or grow memory: its backlog is dropped and
+  replaced by a single "reset" event.
+
+Server work follows the ingest rate; viewers only cost a queue each.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from jsonl_tailer import JSONLFollower
+
+HEARTBEAT_SECONDS = 15.0
+
+# Mirror log -> event type
+MIRROR_LOG_EVENTS = {
+    'vibration': 'block',
+    'cells': 'cell_spawn',
+    'threats': 'threat'
+}
+
+_RESET = object()
+
+
+class Subscription:
+    """One subscriber's bounded event queue"""
+
+    def __init__(self, bus: "EventBus", max_queue: int):
+        self.bus = bus
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.overflowed = False
+        self.dropped = 0
+
+    def _offer(self, event: Dict[str, Any]):
+        if self.overflowed:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog, tell the client to resync
+            self.overflowed = True
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESET)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None after ``timeout`` seconds without one"""
+        try:
+            item = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if item is _RESET:
+            self.overflowed = False
+            return self.bus.reset_event()
+        return item
+
+    def close(self):
+        self.bus._subscribers.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventBus:
+    """In-process fan-out of explorer events with resumable cursors"""
+
+    def __init__(self, buffer_size: int = 1000, max_queue: int = 256):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.buffer = deque(maxlen=buffer_size)
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self.published = 0
+
+    def cursor(self) -> str:
+        """Cursor of the latest event (what a client that is up to date would send back)"""
+        return f"{self.epoch}-{self.seq}"
+
+    def publish(self, event_type: str, data: Any) -> Dict[str, Any]:
+        """Append an event and hand it to every subscriber (never blocks)"""
+        self.seq += 1
+        event = {
+            'id': f"{self.epoch}-{self.seq}",
+            'type': event_type,
+            'data': data,
+            'time': time.time()
+        }
+        self.buffer.append(event)
+        self.published += 1
+        for subscription in list(self._subscribers):
+            subscription._offer(event)
+        return event
+
+    def reset_event(self) -> Dict[str, Any]:
+        return {'id': self.cursor(), 'type': 'reset', 'data': {}, 'time': time.time()}
+
+    def _parse_cursor(self, cursor: Optional[str]) -> Optional[int]:
+        """Sequence number of a cursor from this epoch, else None"""
+        if not cursor:
+            return None
+        epoch, _, seq = cursor.partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, cursor: Optional[str] = None) -> Subscription:
+        """New subscription; with a cursor, first replay the events after it"""
+        subscription = Subscription(self, self.max_queue)
+        if cursor:
+            seq = self._parse_cursor(cursor)
+            oldest = self.seq - len(self.buffer) + 1
+            if seq is None or seq > self.seq or seq < oldest - 1:
+                subscription._offer(self.reset_event())
+            else:
+                missed = self.seq - seq
+                for event in list(self.buffer)[len(self.buffer) - missed:] if missed else []:
+                    subscription._offer(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'cursor': self.cursor(),
+            'subscribers': len(self._subscribers),
+            'published': self.published,
+            'buffered': len(self.buffer),
+            'lagging': sum(1 for s in self._subscribers if s.overflowed)
+        }
+
+
+class MirrorLogWatcher:
+    """Follow a chain's mirror logs once and publish their appends to an EventBus
+
+    Args:
+        bus: Where to publish
+        chain_path: luxbin_mirror/<chain> directory
+        transforms: Optional per-event-type function turning a log record into
+            the event payload (return None to skip the record)
+        summary: Optional (async) function whose result is published as a
+            ``summary_type`` event after each batch of appends
+        interval: Longest wait between checks where inotify is unavailable
+    """
+
+    def __init__(self, bus: EventBus, chain_path: Union[str, Path],
+                 transforms: Optional[Dict[str, Callable[[Dict], Optional[Dict]]]] = None,
+                 summary: Optional[Callable[[], Union[Dict, Awaitable[Dict]]]] = None,
+                 summary_type: str = 'stats', interval: float = 2.0):
+        self.bus = bus
+        self.chain_path = Path(chain_path)
+        self.transforms = transforms or {}
+        self.summary = summary
+        self.summary_type = summary_type
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.follower: Optional[JSONLFollower] = None
+
+    def _files(self) -> Dict[str, Path]:
+        return {
+            'vibration': self.chain_path / "logs" / "vibration.jsonl",
+            'cells': self.chain_path / "immune" / "cells_spawned.jsonl",
+            'threats': self.chain_path / "quantum" / "threat_scores.jsonl"
+        }
+
+    def _ensure_follower(self):
+        if self.follower is None:
+            # Only appends from now on: clients load history from the REST API
+            self.follower = JSONLFollower(self._files(), start_at_end=True)
+
+    def ensure_started(self):
+        """Start watching in the running event loop (idempotent)"""
+        self._ensure_follower()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def poll_once(self) -> int:
+        """Publish everything appended since the last poll; returns events published"""
+        self._ensure_follower()
+        published = 0
+        while True:
+            batches = self.follower.read_new(max_records=1000)
+            if not any(batches.values()):
+                break
+            # Blocks first so clients see a block before its threat and cell events
+            for name in ('vibration', 'threats', 'cells'):
+                event_type = MIRROR_LOG_EVENTS[name]
+                transform = self.transforms.get(event_type)
+                for record in batches[name]:
+                    data = transform(record) if transform else record
+                    if data is not None:
+                        self.bus.publish(event_type, data)
+                        published += 1
+
+        if published and self.summary:
+            summary = self.summary()
+            if inspect.isawaitable(summary):
+                summary = await summary
+            self.bus.publish(self.summary_type, summary)
+        return published
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"❌ Event watcher error: {e}")
+            await self.follower.wait(self.interval)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.follower:
+            self.follower.close()
+            self.follower = None
+
+
+# ===== FASTAPI ROUTES =====
+
+def sse_format(event: Dict[str, Any]) -> str:
+    # No id line leaves the browser's Last-Event-ID where it was
+    id_line = f"id: {event['id']}\n" if event.get('id') else ""
+    return f"{id_line}event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+def add_event_routes(app, bus: EventBus, on_connect: Optional[Callable[[], None]] = None,
+                     path: str = "/api/events", ws_path: str = "/api/ws"):
+    """Register the SSE (``path``) and WebSocket (``ws_path``) feeds on a FastAPI app"""
+    from fastapi import Request, WebSocket, WebSocketDisconnect
+    from fastapi.responses import StreamingResponse
+
+    @app.get(path)
+    async def event_stream(request: Request, cursor: Optional[str] = None):
+        """Live explorer events (Server-Sent Events)"""
+        if on_connect:
+            on_connect()
+        cursor = request.headers.get('last-event-id') or cursor
+        subscription = bus.subscribe(cursor)
+        # The hello keeps the client's resume cursor: the head cursor would make a
+        # client that drops mid-replay skip the events it hasn't been sent yet
+        hello = {'id': cursor, 'type': 'hello', 'data': {'resumed': bool(cursor)}}
+
+        async def stream():
+            with subscription:
+                yield "retry: 3000\n" + sse_format(hello)
+                while True:
+                    event = await subscription.get(HEARTBEAT_SECONDS)
+                    yield sse_format(event) if event else ": keepalive\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.websocket(ws_path)
+    async def event_socket(websocket: WebSocket, cursor: Optional[str] = None):
+        """Live explorer events (WebSocket, one JSON event per message)"""
+        await websocket.accept()
+        if on_connect:
+            on_connect()
+        with bus.subscribe(cursor) as subscription:
+            try:
+                await websocket.send_text(json.dumps({'id': cursor, 'type': 'hello',
+                                                      'data': {'resumed': bool(cursor)}}))
+                while True:
+                    event = await subscription.get(HEARTBEAT_SECONDS)
+                    event = event or {'id': bus.cursor(), 'type': 'ping', 'data': {}}
+                    await websocket.send_text(json.dumps(event, default=str))
+            except (WebSocketDisconnect, RuntimeError):
+                pass
+
+    @app.get(path + "/stats")
+    async def event_stats():
+        """Event bus activity"""
+        return bus.get_stats()
+
+
+# Browser side: EventSource reconnects with Last-Event-ID by itself; onReset()
+# (re)loads the REST snapshot on first connect and whenever the server asks
+EVENT_CLIENT_JS = """
+        function subscribeEvents(handlers, onReset) {
+            if (!window.EventSource) { onReset(); setInterval(onReset, 10000); return; }
+            const source = new EventSource('/api/events');
+            source.addEventListener('hello', (e) => { if (!JSON.parse(e.data).resumed) onReset(); });
+            source.addEventListener('reset', () => onReset());
+            Object.entries(handlers).forEach(([type, handler]) => {
+                source.addEventListener(type, (e) => handler(JSON.parse(e.data)));
+            });
+        }
+"""
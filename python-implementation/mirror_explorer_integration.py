@@ -14,6 +14,11 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from mirror_aggregates import MirrorAggregates
+from mirror_block_store import open_block_store
+from mirror_event_bus import EVENT_CLIENT_JS, EventBus, MirrorLogWatcher, add_event_routes
+from mirror_threat_index import ThreatIndex
+
 app = FastAPI(title="LUXBIN Mirror Explorer")
 
 # CORS middleware
@@ -41,38 +46,40 @@ class MirrorExplorerBridge:
         self.vibration_log = self.chain_path / "logs" / "vibration.jsonl"
         self.rhythm_log = self.chain_path / "logs" / "rhythm.jsonl"
 
+        # Columnar block store (None until the mirror has been converted)
+        self.block_store = None
+
+        # Running totals over the logs, updated from the log tails
+        self.aggregates = MirrorAggregates(self.chain_path)
+
+        # Block -> threat score index over the threat log
+        self.threat_index = ThreatIndex(self.chain_path)
+
+    def _get_block_store(self):
+        """Open the chain's block store once it exists and pick up newly committed blocks"""
+        if self.block_store is None:
+            self.block_store = open_block_store(self.chain_path)
+        else:
+            self.block_store.refresh()
+        return self.block_store
+
     def get_stats(self) -> Dict:
         """Get blockchain statistics from mirror"""
         try:
+            self.aggregates.refresh()
+
             # Count blocks
-            total_blocks = len(list(self.raw_blocks.glob("block_*.json"))) if self.raw_blocks.exists() else 0
-
-            # Count transactions
-            total_txs = 0
-            if self.vibration_log.exists():
-                with open(self.vibration_log, 'r') as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        total_txs += data.get('tx_count', 0)
-
-            # Count spawned cells (total supply)
-            total_cells = 0
-            if self.cells_log.exists():
-                with open(self.cells_log, 'r') as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        total_cells += data.get('count', 0)
-
-            # Calculate 24h volume (threat activity)
-            recent_threats = []
-            if self.threat_log.exists():
-                with open(self.threat_log, 'r') as f:
-                    lines = f.readlines()
-                    for line in lines[-100:]:  # Last 100 blocks
-                        data = json.loads(line.strip())
-                        recent_threats.append(data.get('threat_score', 0))
-
-            volume_24h = sum(recent_threats) if recent_threats else 0
+            store = self._get_block_store()
+            if store is not None:
+                total_blocks = len(store)
+            elif self.aggregates.blocks_seen:
+                total_blocks = self.aggregates.blocks_seen
+            else:
+                total_blocks = len(list(self.raw_blocks.glob("block_*.json"))) if self.raw_blocks.exists() else 0
+
+            total_txs = self.aggregates.total_transactions
+            total_cells = self.aggregates.total_cells  # Total supply
+            volume_24h = self.aggregates.threat_volume()  # Last 100 blocks
 
             return {
                 "total_blocks": total_blocks,
@@ -91,101 +98,142 @@ class MirrorExplorerBridge:
                 "error": str(e)
             }
 
+    def _block_from_row(self, row: Dict) -> Dict:
+        """Explorer block from block store columns"""
+        return {
+            "index": row['number'],
+            "hash": row['hash'],
+            "timestamp": datetime.fromtimestamp(max(row['timestamp'], 0)).isoformat(),
+            "transactions": row['tx_count'],
+            "total_value": max(row['gas_used'], 0)
+        }
+
+    def _block_from_raw(self, data: Dict) -> Dict:
+        """Explorer block from a raw eth_getBlockByNumber response"""
+        # Extract block info
+        result = data.get('result', {})
+        block_hash = result.get('hash', 'N/A')
+        block_number = result.get('number', 'N/A')
+        timestamp = result.get('timestamp', 'N/A')
+        transactions = result.get('transactions', [])
+        gas_used = result.get('gasUsed', '0x0')
+
+        # Convert hex to decimal
+        try:
+            block_index = int(block_number, 16) if isinstance(block_number, str) else block_number
+        except:
+            block_index = 0
+
+        try:
+            block_timestamp = int(timestamp, 16) if isinstance(timestamp, str) else timestamp
+        except:
+            block_timestamp = int(datetime.now().timestamp())
+
+        try:
+            total_value = int(gas_used, 16) if isinstance(gas_used, str) else gas_used
+        except:
+            total_value = 0
+
+        return {
+            "index": block_index,
+            "hash": block_hash,
+            "timestamp": datetime.fromtimestamp(block_timestamp).isoformat(),
+            "transactions": len(transactions),
+            "total_value": total_value
+        }
+
+    def get_block(self, label: str) -> Optional[Dict]:
+        """One mirrored block by its hex label, or None if it is not on disk"""
+        store = self._get_block_store()
+        if store is not None:
+            row = store.find(int(label, 16))
+            return self._block_from_row(store.row(row)) if row is not None else None
+
+        block_file = self.raw_blocks / f"block_{label}.json"
+        if not block_file.exists():
+            return None
+        with open(block_file, 'r') as f:
+            return self._block_from_raw(json.load(f))
+
     def get_latest_blocks(self, limit: int = 10) -> List[Dict]:
         """Get latest blocks from mirror"""
         blocks = []
         try:
+            store = self._get_block_store()
+            if store is not None:
+                # Numeric columns only; no payload is decompressed
+                return [self._block_from_row(row) for row in store.latest_blocks(limit)]
+
             if not self.raw_blocks.exists():
                 return blocks
 
-            # Get all block files
-            block_files = sorted(
-                self.raw_blocks.glob("block_*.json"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True
-            )[:limit]
+            # Most recently mirrored blocks come from the vibration log tail
+            self.aggregates.refresh()
+            labels = self.aggregates.latest_block_labels(limit)
+            if labels:
+                block_files = [self.raw_blocks / f"block_{label}.json" for label in labels]
+                block_files = [p for p in block_files if p.exists()]
+            else:
+                block_files = sorted(
+                    self.raw_blocks.glob("block_*.json"),
+                    key=lambda p: p.stat().st_mtime,
+                    reverse=True
+                )[:limit]
 
             for block_file in block_files:
                 with open(block_file, 'r') as f:
-                    data = json.load(f)
-
-                    # Extract block info
-                    result = data.get('result', {})
-                    block_hash = result.get('hash', 'N/A')
-                    block_number = result.get('number', 'N/A')
-                    timestamp = result.get('timestamp', 'N/A')
-                    transactions = result.get('transactions', [])
-                    gas_used = result.get('gasUsed', '0x0')
-
-                    # Convert hex to decimal
-                    try:
-                        block_index = int(block_number, 16) if isinstance(block_number, str) else block_number
-                    except:
-                        block_index = 0
-
-                    try:
-                        block_timestamp = int(timestamp, 16) if isinstance(timestamp, str) else timestamp
-                    except:
-                        block_timestamp = int(datetime.now().timestamp())
-
-                    try:
-                        total_value = int(gas_used, 16) if isinstance(gas_used, str) else gas_used
-                    except:
-                        total_value = 0
-
-                    blocks.append({
-                        "index": block_index,
-                        "hash": block_hash,
-                        "timestamp": datetime.fromtimestamp(block_timestamp).isoformat(),
-                        "transactions": len(transactions),
-                        "total_value": total_value
-                    })
+                    blocks.append(self._block_from_raw(json.load(f)))
 
         except Exception as e:
             print(f"Error reading blocks: {e}")
 
         return blocks
 
+    def _cell_transaction(self, data: Dict, threat_score: int) -> Dict:
+        """Explorer transaction for one cell spawn record"""
+        return {
+            "hash": f"cell_spawn_{data.get('block', 'unknown')}_{data.get('cell_type', 'unknown')}",
+            "block": data.get('block', 'unknown'),
+            "sequence": self._generate_sequence(data.get('cell_type', 'MEMORY'), threat_score),
+            "type": data.get('cell_type', 'MEMORY'),
+            "from": f"0xMIRROR_{self.chain.upper()}",
+            "to": f"0xIMMUNE_SYSTEM",
+            "value": data.get('count', 1) * 100,
+            "timestamp": data.get('timestamp', datetime.now().isoformat())
+        }
+
     def get_latest_transactions(self, limit: int = 10) -> List[Dict]:
         """Get latest transactions (as immune cell spawns)"""
         transactions = []
         try:
-            if not self.cells_log.exists():
-                return transactions
+            self.aggregates.refresh()
+            self.threat_index.update()
 
-            with open(self.cells_log, 'r') as f:
-                lines = f.readlines()
-
-            for line in lines[-limit:]:
-                data = json.loads(line.strip())
-
-                # Get threat score for this block
-                threat_score = 0
-                if self.threat_log.exists():
-                    with open(self.threat_log, 'r') as tf:
-                        for threat_line in tf:
-                            threat_data = json.loads(threat_line.strip())
-                            if threat_data.get('block') == data.get('block'):
-                                threat_score = threat_data.get('threat_score', 0)
-                                break
+            for data in self.aggregates.latest_cells(limit):
+                threat_score = self.threat_index.score(data.get('block'))
 
                 # Create transaction from cell spawn
-                transactions.append({
-                    "hash": f"cell_spawn_{data.get('block', 'unknown')}_{data.get('cell_type', 'unknown')}",
-                    "block": data.get('block', 'unknown'),
-                    "sequence": self._generate_sequence(data.get('cell_type', 'MEMORY'), threat_score),
-                    "type": data.get('cell_type', 'MEMORY'),
-                    "from": f"0xMIRROR_{self.chain.upper()}",
-                    "to": f"0xIMMUNE_SYSTEM",
-                    "value": data.get('count', 1) * 100,
-                    "timestamp": data.get('timestamp', datetime.now().isoformat())
-                })
+                transactions.append(self._cell_transaction(data, threat_score))
 
         except Exception as e:
             print(f"Error reading transactions: {e}")
 
         return list(reversed(transactions))
 
+    # ===== LIVE EVENTS =====
+
+    def block_event(self, record: Dict) -> Optional[Dict]:
+        """Payload of a "block" event for a vibration log record"""
+        try:
+            return self.get_block(record['block'])
+        except (KeyError, ValueError, TypeError, OSError, json.JSONDecodeError):
+            return None
+
+    def cell_spawn_event(self, record: Dict) -> Dict:
+        """Payload of a "cell_spawn" event for a cell spawn log record"""
+        self.threat_index.update()
+        return self._cell_transaction(record, self.threat_index.score(record.get('block')))
+
     def _generate_sequence(self, cell_type: str, threat_score: int) -> str:
         """Generate genetic sequence based on cell type and threat"""
         # Base sequences for each cell type
@@ -433,78 +481,112 @@ HTML_TEMPLATE = """
 
         <div class="footer">
             <button class="refresh-btn" onclick="loadData()">🔄 Refresh Data</button>
-            <p style="margin-top: 15px;">LUXBIN Mirror Explorer v1.0 | Live Hermetic Blockchain Mirroring</p>
+            <p style="margin-top: 15px;">LUXBIN Mirror Explorer v1.0 | Live Hermetic Blockchain Mirroring (pushed over /api/events)</p>
         </div>
     </div>
 
     <script>
+        const MAX_BLOCKS = 5;
+        const MAX_TXS = 10;
+
+        function renderStats(stats) {
+            document.getElementById('total-blocks').textContent = stats.total_blocks;
+            document.getElementById('total-txs').textContent = stats.total_transactions;
+            document.getElementById('total-supply').textContent = stats.total_supply.toLocaleString();
+            document.getElementById('volume').textContent = stats.volume_24h.toLocaleString();
+            document.getElementById('chain-name').textContent = stats.chain.toUpperCase();
+        }
+
+        function blockCard(block) {
+            return `
+                <div class="block" data-index="${block.index}">
+                    <h3>Block #${block.index}</h3>
+                    <p><strong>Hash:</strong> ${block.hash}</p>
+                    <p><strong>Timestamp:</strong> ${block.timestamp}</p>
+                    <p><strong>Transactions:</strong> ${block.transactions}</p>
+                    <p><strong>Gas Used:</strong> ${block.total_value.toLocaleString()}</p>
+                </div>
+            `;
+        }
+
+        function txCard(tx) {
+            return `
+                <div class="tx" data-hash="${tx.hash}">
+                    <h3>Immune Cell Spawn <span class="cell-type ${tx.type}">${tx.type}</span></h3>
+                    <p><strong>Hash:</strong> ${tx.hash}</p>
+                    <p><strong>Block:</strong> ${tx.block}</p>
+                    <p><strong>From:</strong> ${tx.from}</p>
+                    <p><strong>To:</strong> ${tx.to}</p>
+                    <p><strong>Cells:</strong> ${(tx.value / 100).toFixed(0)}</p>
+                    <p><strong>Sequence:</strong></p>
+                    <div class="genome-sequence">${tx.sequence.substring(0, 80)}...</div>
+                </div>
+            `;
+        }
+
+        // Add a pushed item at the top of a list, skipping ones already shown
+        function prepend(containerId, selector, html, max) {
+            const container = document.getElementById(containerId);
+            if (container.querySelector(selector)) return;
+            if (!container.querySelector('.block, .tx')) container.innerHTML = '';
+            container.insertAdjacentHTML('afterbegin', html);
+            const items = container.querySelectorAll('.block, .tx');
+            for (let i = max; i < items.length; i++) items[i].remove();
+        }
+
         async function loadData() {
             try {
                 // Load stats
                 const statsRes = await fetch('/api/stats');
-                const stats = await statsRes.json();
-
-                document.getElementById('total-blocks').textContent = stats.total_blocks;
-                document.getElementById('total-txs').textContent = stats.total_transactions;
-                document.getElementById('total-supply').textContent = stats.total_supply.toLocaleString();
-                document.getElementById('volume').textContent = stats.volume_24h.toLocaleString();
-                document.getElementById('chain-name').textContent = stats.chain.toUpperCase();
+                renderStats(await statsRes.json());
 
                 // Load blocks
-                const blocksRes = await fetch('/api/blocks?limit=5');
+                const blocksRes = await fetch(`/api/blocks?limit=${MAX_BLOCKS}`);
                 const blocksData = await blocksRes.json();
                 const blocksContainer = document.getElementById('blocks-container');
 
                 if (blocksData.blocks.length === 0) {
                     blocksContainer.innerHTML = '<p style="text-align: center; color: #6c757d;">No blocks mirrored yet. Start the live mirror first!</p>';
                 } else {
-                    blocksContainer.innerHTML = blocksData.blocks.map(block => `
-                        <div class="block">
-                            <h3>Block #${block.index}</h3>
-                            <p><strong>Hash:</strong> ${block.hash}</p>
-                            <p><strong>Timestamp:</strong> ${block.timestamp}</p>
-                            <p><strong>Transactions:</strong> ${block.transactions}</p>
-                            <p><strong>Gas Used:</strong> ${block.total_value.toLocaleString()}</p>
-                        </div>
-                    `).join('');
+                    blocksContainer.innerHTML = blocksData.blocks.map(blockCard).join('');
                 }
 
                 // Load transactions
-                const txsRes = await fetch('/api/transactions?limit=10');
+                const txsRes = await fetch(`/api/transactions?limit=${MAX_TXS}`);
                 const txsData = await txsRes.json();
                 const txsContainer = document.getElementById('txs-container');
 
                 if (txsData.transactions.length === 0) {
                     txsContainer.innerHTML = '<p style="text-align: center; color: #6c757d;">No immune cells spawned yet. Waiting for threats...</p>';
                 } else {
-                    txsContainer.innerHTML = txsData.transactions.map(tx => `
-                        <div class="tx">
-                            <h3>Immune Cell Spawn <span class="cell-type ${tx.type}">${tx.type}</span></h3>
-                            <p><strong>Hash:</strong> ${tx.hash}</p>
-                            <p><strong>Block:</strong> ${tx.block}</p>
-                            <p><strong>From:</strong> ${tx.from}</p>
-                            <p><strong>To:</strong> ${tx.to}</p>
-                            <p><strong>Cells:</strong> ${(tx.value / 100).toFixed(0)}</p>
-                            <p><strong>Sequence:</strong></p>
-                            <div class="genome-sequence">${tx.sequence.substring(0, 80)}...</div>
-                        </div>
-                    `).join('');
+                    txsContainer.innerHTML = txsData.transactions.map(txCard).join('');
                 }
 
             } catch (error) {
                 console.error('Error loading data:', error);
             }
         }
-
-        // Load data on page load
-        loadData();
-
-        // Auto-refresh every 5 seconds
-        setInterval(loadData, 5000);
+/*EVENT_CLIENT*/
+        // Load the snapshot once, then apply pushed updates
+        subscribeEvents({
+            stats: renderStats,
+            block: (block) => prepend('blocks-container', `[data-index="${block.index}"]`, blockCard(block), MAX_BLOCKS),
+            cell_spawn: (tx) => prepend('txs-container', `[data-hash="${tx.hash}"]`, txCard(tx), MAX_TXS)
+        }, loadData);
     </script>
 </body>
 </html>
-"""
+""".replace("/*EVENT_CLIENT*/", EVENT_CLIENT_JS)
+
+# Live feed: the mirror logs are watched once and updates pushed to every viewer
+event_bus = EventBus()
+watcher = MirrorLogWatcher(
+    event_bus,
+    bridge.chain_path,
+    transforms={'block': bridge.block_event, 'cell_spawn': bridge.cell_spawn_event},
+    summary=bridge.get_stats
+)
+add_event_routes(app, event_bus, on_connect=watcher.ensure_started)
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
@@ -538,6 +620,7 @@ if __name__ == "__main__":
     print()
     print("🌐 Frontend:  http://localhost:8002")
     print("📚 API Docs:  http://localhost:8002/docs")
+    print("📡 Live feed: http://localhost:8002/api/events (SSE), ws://localhost:8002/api/ws")
     print()
     print("⚠️  Make sure the live mirror is running!")
     print("   ./START_LIVE_MIRROR.sh")
@@ -7,13 +7,18 @@ Reads threat scores from Hermetic mirror and spawns appropriate immune cells
 """
 
 import asyncio
-import json
 import os
+from collections import deque
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
+import numpy as np
+
+from jsonl_tailer import JSONLFollower
+from mirror_threat_index import ThreatIndex
+
 @dataclass
 class ThreatEvent:
     """Threat detected in mirrored blockchain data"""
@@ -34,7 +39,8 @@ class CellSpawnEvent:
 class MirrorImmuneIntegration:
     """Integrates Hermetic mirror with immune system"""
 
-    def __init__(self, mirror_root: str = "./luxbin_mirror", chain: str = "optimism"):
+    def __init__(self, mirror_root: str = "./luxbin_mirror", chain: str = "optimism",
+                 resume: bool = True):
         self.mirror_root = Path(mirror_root)
         self.chain = chain
         self.chain_path = self.mirror_root / chain
@@ -45,64 +51,123 @@ class MirrorImmuneIntegration:
         self.vibration_log = self.chain_path / "logs" / "vibration.jsonl"
         self.rhythm_log = self.chain_path / "logs" / "rhythm.jsonl"
 
+        # Follow the mirror logs from checkpointed byte offsets instead of rescanning them
+        self.follower = JSONLFollower(
+            {
+                'threats': self.threat_log,
+                'cells': self.cells_log,
+                'vibration': self.vibration_log,
+                'rhythm': self.rhythm_log
+            },
+            checkpoint_path=self.chain_path / "immune_integration_offsets.json",
+            resume=resume
+        )
+
+        # Block -> threat record index over the whole threat log
+        self.threat_index = ThreatIndex(self.chain_path)
+
         # State
         self.last_processed_block = None
         self.threat_history = []
         self.cell_history = []
+        self.mirror_cell_counts = {}
+        self.recent_frequencies = deque(maxlen=100)
+        self.recent_block_times = deque(maxlen=100)
 
     async def watch_mirror(self, interval: float = 2.0):
         """
         Continuously watch mirror for new blocks and spawn cells
 
+        Wakes as soon as the mirror appends to a log (inotify), or every
+        ``interval`` seconds where inotify is unavailable.
+
         Args:
-            interval: How often to check for new data (seconds)
+            interval: Maximum time between checks for new data (seconds)
         """
         print("🔮 Starting Mirror-Immune Integration")
         print(f"   Chain: {self.chain}")
         print(f"   Mirror root: {self.mirror_root}")
-        print(f"   Check interval: {interval}s")
+        print(f"   Check interval: {interval}s ({self.follower.notifier.mode})")
         print()
 
-        while True:
-            try:
-                await self._process_new_threats()
-                await self._analyze_patterns()
-                await asyncio.sleep(interval)
-            except KeyboardInterrupt:
-                print("\n⚠️  Shutting down integration...")
-                break
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                await asyncio.sleep(interval)
-
-    async def _process_new_threats(self):
-        """Process new threat events from mirror"""
-
-        if not self.threat_log.exists():
-            return
-
-        # Read all threat events
-        with open(self.threat_log, 'r') as f:
-            for line in f:
+        try:
+            while True:
                 try:
-                    event = json.loads(line.strip())
+                    await self._process_new_events()
+                    await self._analyze_patterns()
+                    await self.follower.wait(interval)
+                except KeyboardInterrupt:
+                    print("\n⚠️  Shutting down integration...")
+                    break
+                except Exception as e:
+                    print(f"❌ Error: {e}")
+                    await asyncio.sleep(interval)
+        finally:
+            self.follower.close()
+
+    async def _process_new_events(self):
+        """Process records appended to the mirror logs since the last checkpoint"""
 
-                    # Skip if already processed
-                    if self.last_processed_block and event['block'] <= self.last_processed_block:
-                        continue
+        batches = self.follower.read_new()
 
-                    threat = ThreatEvent(
-                        block=event['block'],
-                        threat_score=event['threat_score'],
-                        timestamp=event['timestamp'],
-                        chain=self.chain
-                    )
+        for event in batches['threats']:
+            await self._process_threat_record(event)
 
-                    await self._handle_threat(threat)
-                    self.last_processed_block = event['block']
+        for event in batches['cells']:
+            cell_type = event.get('cell_type')
+            if cell_type:
+                self.mirror_cell_counts[cell_type] = self.mirror_cell_counts.get(cell_type, 0) + event.get('count', 0)
 
-                except json.JSONDecodeError:
-                    continue
+        for event in batches['vibration']:
+            if isinstance(event.get('frequency_hz'), (int, float)):
+                self.recent_frequencies.append(event['frequency_hz'])
+
+        for event in batches['rhythm']:
+            if isinstance(event.get('block_time'), (int, float)):
+                self.recent_block_times.append(event['block_time'])
+
+        # Records are handled; a restart resumes after them
+        self.follower.commit()
+
+    async def _process_threat_record(self, event: Dict[str, Any]):
+        """Process one threat event from the mirror"""
+
+        try:
+            threat = ThreatEvent(
+                block=event['block'],
+                threat_score=event['threat_score'],
+                timestamp=event['timestamp'],
+                chain=self.chain
+            )
+        except (KeyError, TypeError):
+            return
+
+        await self._handle_threat(threat)
+        self.last_processed_block = threat.block
+
+    def lookup_threat(self, block: str) -> Optional[ThreatEvent]:
+        """Threat event the mirror logged for a block, from any point in its history"""
+        self.threat_index.update()
+        record = self.threat_index.lookup(block)
+        if record is None:
+            return None
+        return ThreatEvent(
+            block=record.get('block', block),
+            threat_score=record.get('threat_score', 0),
+            timestamp=record.get('timestamp', ''),
+            chain=self.chain
+        )
+
+    def _mirror_threat_stats(self) -> Dict[str, Any]:
+        """Threat statistics over every block the mirror has scored"""
+        self.threat_index.update()
+        scores = self.threat_index.scores()
+        return {
+            "blocks": int(len(scores)),
+            "max": int(scores.max()) if len(scores) else 0,
+            "avg": float(scores.mean()) if len(scores) else 0,
+            "high_threat_blocks": int(np.count_nonzero(scores >= 50))
+        }
 
     async def _handle_threat(self, threat: ThreatEvent):
         """Handle a threat by spawning appropriate cells"""
@@ -246,6 +311,13 @@ class MirrorImmuneIntegration:
                 "avg": sum(threat_scores) / len(threat_scores) if threat_scores else 0,
             },
             "last_block": self.last_processed_block,
+            "mirror_cells_spawned": dict(self.mirror_cell_counts),
+            "avg_frequency_hz": (sum(self.recent_frequencies) / len(self.recent_frequencies)
+                                 if self.recent_frequencies else 0),
+            "avg_block_time": (sum(self.recent_block_times) / len(self.recent_block_times)
+                               if self.recent_block_times else 0),
+            "mirror_threat_stats": self._mirror_threat_stats(),
+            "ingest": self.follower.get_stats(),
             "timestamp": datetime.utcnow().isoformat() + "Z"
         }
 
@@ -271,6 +343,16 @@ class MirrorImmuneIntegration:
         print(f"  Min: {report['threat_stats']['min']}")
         print(f"  Max: {report['threat_stats']['max']}")
         print(f"  Avg: {report['threat_stats']['avg']:.1f}")
+        print()
+        print("Mirror activity (recent):")
+        print(f"  Cells spawned by mirror: {sum(report['mirror_cells_spawned'].values())}")
+        print(f"  Avg frequency: {report['avg_frequency_hz']:.2f} Hz")
+        print(f"  Avg block time: {report['avg_block_time']:.1f}s")
+        print()
+        mirror_threats = report['mirror_threat_stats']
+        print(f"Mirror threat history ({mirror_threats['blocks']} blocks scored):")
+        print(f"  Max: {mirror_threats['max']}  Avg: {mirror_threats['avg']:.1f}  "
+              f"High (>=50): {mirror_threats['high_threat_blocks']}")
         print("═" * 80)
         print()
 
@@ -284,12 +366,15 @@ async def main():
     parser.add_argument("--mirror-root", default="./luxbin_mirror", help="Mirror data root")
     parser.add_argument("--interval", type=float, default=2.0, help="Check interval (seconds)")
     parser.add_argument("--report-only", action="store_true", help="Generate report and exit")
+    parser.add_argument("--from-start", action="store_true",
+                        help="Ignore saved log offsets and reprocess the mirror logs from the beginning")
 
     args = parser.parse_args()
 
     integration = MirrorImmuneIntegration(
         mirror_root=args.mirror_root,
-        chain=args.chain
+        chain=args.chain,
+        resume=not args.from_start
     )
 
     if args.report_only:
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+LUXBIN MIRROR THREAT INDEX
+Block number -> threat record index over quantum/threat_scores.jsonl
+
+Under luxbin_mirror/<chain>/quantum/threat_index/:
+
+    meta.json      indexed rows, and how far into which log file they reach
+    entries.bin    one (block number, byte offset, threat score) row per log line
+
+Rows are appended in log order as the log grows; ``update`` indexes whatever
+the mirror appended since the last call (the ingester calls it after each
+batch, readers call it before querying so the index also keeps up with the
+shell mirror). Lookups binary-search a sorted view of the block numbers and
+read the one matching line from the log; score-only queries never touch the
+log. A log that was replaced or truncated is re-indexed from the top.
+
+Usage:
+    python3 mirror_threat_index.py --mirror-root ./luxbin_mirror --chain optimism
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+INDEX_DIR = "threat_index"
+INDEX_VERSION = 1
+
+ENTRY_DTYPE = np.dtype([('number', '<i8'), ('offset', '<i8'), ('score', '<i4')])
+
+
+def block_number(block: Union[str, int]) -> Optional[int]:
+    """Block label ("0x..." or decimal) as an int"""
+    if isinstance(block, (int, np.integer)):
+        return int(block)
+    try:
+        return int(block, 16) if block.startswith('0x') else int(block)
+    except (ValueError, AttributeError):
+        return None
+
+
+class ThreatIndex:
+    """Persistent block -> threat record index for one mirrored chain"""
+
+    def __init__(self, chain_path: Union[str, Path], log_path: Optional[Union[str, Path]] = None):
+        self.chain_path = Path(chain_path)
+        self.log_path = Path(log_path) if log_path else self.chain_path / "quantum" / "threat_scores.jsonl"
+        self.path = self.log_path.parent / INDEX_DIR
+        self.meta_path = self.path / "meta.json"
+        self.entries_path = self.path / "entries.bin"
+
+        self.rows = 0
+        self.generation = 0  # Bumped whenever the index is rebuilt from the top
+        self.log_offset = 0
+        self.log_identity: Optional[Tuple[int, int]] = None
+        self._meta_mtime = None
+        self._entries: Optional[np.ndarray] = None
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None  # (sorted numbers, rows)
+        self._sorted_rows = 0
+
+        self._load_meta()
+
+    # ===== METADATA =====
+
+    def _load_meta(self):
+        try:
+            stat = self.meta_path.stat()
+        except FileNotFoundError:
+            self._set_rows(0)
+            return
+        if stat.st_mtime_ns == self._meta_mtime:
+            return
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except json.JSONDecodeError:
+            return
+        if meta.get('version') != INDEX_VERSION:
+            self._set_rows(0)
+            return
+        self._meta_mtime = stat.st_mtime_ns
+        if meta['generation'] != self.generation:
+            self.generation = meta['generation']
+            self._set_rows(0)
+        self.log_offset = meta['log_offset']
+        self.log_identity = tuple(meta['log_identity']) if meta.get('log_identity') else None
+        self._set_rows(meta['rows'])
+
+    def _save_meta(self):
+        temp_path = self.meta_path.with_name('meta.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'rows': self.rows,
+                'generation': self.generation,
+                'log_offset': self.log_offset,
+                'log_identity': list(self.log_identity) if self.log_identity else None
+            }, f)
+        os.replace(temp_path, self.meta_path)
+        self._meta_mtime = self.meta_path.stat().st_mtime_ns
+
+    def _set_rows(self, rows: int):
+        if rows < self._sorted_rows:
+            self._sorted = None
+            self._sorted_rows = 0
+        if rows != self.rows:
+            self.rows = rows
+            self._entries = None
+
+    # ===== INDEXING =====
+
+    def update(self) -> int:
+        """Index log lines appended since the last update; returns rows added"""
+        self._load_meta()
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return 0
+        identity = (st.st_dev, st.st_ino)
+        if identity == self.log_identity and st.st_size == self.log_offset:
+            return 0  # Idle: two stats
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / "index.lock", 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._load_meta()  # Another process may have indexed while we waited
+
+            if identity != self.log_identity or st.st_size < self.log_offset:
+                # New or replaced log: index it from the top
+                self.log_identity = identity
+                self.log_offset = 0
+                self.generation += 1
+                self._set_rows(0)
+
+            committed = self.rows * ENTRY_DTYPE.itemsize
+            if self.entries_path.exists() and self.entries_path.stat().st_size != committed:
+                os.truncate(self.entries_path, committed)  # Drop an interrupted update's rows
+
+            entries, end_offset = self._scan(self.log_offset)
+            if end_offset == self.log_offset and self.rows:
+                return 0
+
+            with open(self.entries_path, 'ab') as f:
+                f.write(entries.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self.log_offset = end_offset
+            self._set_rows(self.rows + len(entries))
+            self._save_meta()
+            return len(entries)
+
+    def _scan(self, offset: int) -> Tuple[np.ndarray, int]:
+        """Parse complete log lines from ``offset``: (new entries, offset after them)"""
+        numbers, offsets, scores = [], [], []
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # The writer has not finished this line yet
+                try:
+                    record = json.loads(line)
+                    number = block_number(record['block'])
+                    score = int(record.get('threat_score', 0))
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+                    number = None
+                if number is not None:
+                    numbers.append(number)
+                    offsets.append(offset)
+                    scores.append(score)
+                offset += len(line)
+
+        entries = np.empty(len(numbers), dtype=ENTRY_DTYPE)
+        entries['number'] = numbers
+        entries['offset'] = offsets
+        entries['score'] = scores
+        return entries, offset
+
+    # ===== QUERIES =====
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def entries(self) -> np.ndarray:
+        """All rows in log order (memory-mapped, read-only)"""
+        if self.rows == 0:
+            return np.empty(0, dtype=ENTRY_DTYPE)
+        if self._entries is None:
+            self._entries = np.memmap(self.entries_path, dtype=ENTRY_DTYPE, mode='r', shape=(self.rows,))
+        return self._entries
+
+    def numbers(self) -> np.ndarray:
+        return self.entries()['number']
+
+    def scores(self) -> np.ndarray:
+        return self.entries()['score']
+
+    def _sorted_view(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._sorted is not None and self._sorted_rows == self.rows:
+            return self._sorted
+
+        numbers = np.asarray(self.numbers())
+        if self._sorted is not None and self._sorted_rows < self.rows:
+            # The mirror appends ascending blocks: extend the view instead of re-sorting
+            new = numbers[self._sorted_rows:]
+            sorted_numbers, rows = self._sorted
+            if np.all(new[1:] >= new[:-1]) and (len(sorted_numbers) == 0 or new[0] >= sorted_numbers[-1]):
+                self._sorted = (np.concatenate([sorted_numbers, new]),
+                                np.concatenate([rows, np.arange(self._sorted_rows, self.rows)]))
+                self._sorted_rows = self.rows
+                return self._sorted
+
+        order = np.argsort(numbers, kind='stable')
+        self._sorted = (numbers[order], order)
+        self._sorted_rows = self.rows
+        return self._sorted
+
+    def find(self, block: Union[str, int]) -> Optional[int]:
+        """Row of a block's threat record (the latest one if it was scored twice)"""
+        number = block_number(block)
+        if number is None or self.rows == 0:
+            return None
+        numbers, rows = self._sorted_view()
+        position = np.searchsorted(numbers, number, side='right') - 1
+        if position < 0 or numbers[position] != number:
+            return None
+        return int(rows[position])
+
+    def score(self, block: Union[str, int], default: int = 0) -> int:
+        """Threat score of a block without reading the log"""
+        row = self.find(block)
+        return default if row is None else int(self.entries()[row]['score'])
+
+    def lookup(self, block: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """The threat record logged for a block"""
+        row = self.find(block)
+        if row is None:
+            return None
+        return self._read_record(int(self.entries()[row]['offset']))
+
+    def _read_record(self, offset: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.readline())
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def latest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recently logged threat records, oldest first"""
+        if limit <= 0:
+            return []
+        offsets = self.entries()['offset'][-limit:]
+        records = [self._read_record(int(offset)) for offset in offsets]
+        return [record for record in records if record is not None]
+
+    def get_stats(self) -> Dict[str, Any]:
+        scores = self.scores()
+        return {
+            'rows': self.rows,
+            'unique_blocks': int(len(np.unique(self.numbers()))),
+            'log_offset': self.log_offset,
+            'max_score': int(scores.max()) if self.rows else 0,
+            'mean_score': float(scores.mean()) if self.rows else 0.0
+        }
+
+
+_indexes: Dict[Path, ThreatIndex] = {}
+
+
+def get_threat_index(chain_path: Union[str, Path]) -> ThreatIndex:
+    """Shared, up-to-date index for a chain directory"""
+    key = Path(chain_path).resolve()
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = ThreatIndex(key)
+    index.update()
+    return index
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LUXBIN Mirror Threat Index")
+    parser.add_argument("--mirror-root", default="./luxbin_mirror", help="Mirror data root")
+    parser.add_argument("--chain", default="optimism", help="Mirrored chain")
+    args = parser.parse_args()
+
+    index = ThreatIndex(Path(args.mirror_root) / args.chain)
+    added = index.update()
+    print(f"📇 Indexed {added:,} new threat records")
+    for key, value in index.get_stats().items():
+        print(f"   {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batch HCT scoring test and benchmark
+
+Checks HCTEngine.compute_batch gives the same component scores and HCT as
+compute row by row (including zero metrics and zero weights), that the
+ring-buffer history keeps the last results in order and its incremental
+trend and volatility match np.polyfit / np.std over the same window, and
+that a coefficient sweep matches compute_batch per coefficient set.
+Then times scoring --rows stored metrics row by row against one batch,
+trend + volatility per new result (list re-slice and polyfit before), and
+a sweep of a 3^5 coefficient grid over the history.
+
+Usage: python3 test_hct_batch.py [--rows 100000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app' / 'api'))
+
+from hct_core import (
+    COMPONENTS,
+    METRIC_FIELDS,
+    METRICS_DTYPE,
+    HCTCoefficients,
+    HCTEngine,
+    HCTHistory,
+    HCTMetrics,
+    coefficient_grid,
+    metrics_array
+)
+
+TOLERANCE = 1e-12
+
+
+def random_metrics(rows: int, seed: int = 0) -> np.ndarray:
+    """Metrics drifting slowly around healthy values, with occasional zeros and ones"""
+    rng = np.random.default_rng(seed)
+    metrics = np.empty(rows, dtype=METRICS_DTYPE)
+    drift = np.cumsum(rng.normal(0, 0.002, rows))
+    for i, name in enumerate(METRIC_FIELDS):
+        values = np.clip(0.55 + 0.1 * np.sin(i) + drift + rng.normal(0, 0.05, rows), 0.0, 1.0)
+        values[rng.random(rows) < 0.002] = 0.0
+        values[rng.random(rows) < 0.002] = 1.0
+        metrics[name] = values
+    return metrics
+
+
+def as_objects(metrics: np.ndarray):
+    return [HCTMetrics(**dict(zip(METRIC_FIELDS, map(float, row)))) for row in metrics]
+
+
+def check_compute_batch(engine: HCTEngine, metrics: np.ndarray, coefficients: HCTCoefficients):
+    batch = engine.compute_batch(metrics, coefficients)
+    scalar = HCTEngine(coefficients)
+    for row, m in zip(batch, as_objects(metrics)):
+        result = scalar.compute(m)
+        for name in COMPONENTS:
+            assert abs(row[name] - getattr(result, name)) < TOLERANCE, (name, row[name], getattr(result, name))
+            assert abs(row[f"weighted_{name}"] - getattr(result, f"weighted_{name}")) < TOLERANCE
+        assert abs(row["HCT"] - result.HCT) < TOLERANCE, (row["HCT"], result.HCT)
+    return batch
+
+
+def check_history():
+    engine = HCTEngine(history_capacity=64)
+    metrics = as_objects(random_metrics(3000, seed=2))
+    reference = []
+
+    for step, m in enumerate(metrics):
+        result = engine.compute(m)
+        reference.append(result)
+        if step < 40 or step % 97 == 0 or step > 2980:
+            for window in (10, 5, 64, 100):
+                recent = [r.HCT for r in reference[-min(window, 64):]]
+                trend, volatility = engine.get_trend(window), engine.get_volatility(window)
+                if len(recent) < 2:
+                    assert trend is None and volatility is None
+                    continue
+                expected_trend = np.polyfit(np.arange(len(recent)), recent, 1)[0]
+                expected_volatility = np.std(recent) / np.mean(recent)
+                assert abs(trend - expected_trend) < 1e-9, (step, window, trend, expected_trend)
+                assert abs(volatility - expected_volatility) < 1e-9, (step, window, volatility, expected_volatility)
+
+    assert len(engine.history) == 64
+    assert list(engine.history) == reference[-64:]
+    assert engine.history[0] is reference[-64] and engine.history[-1] is reference[-1]
+    assert engine.history[-10:] == reference[-10:]
+    assert np.array_equal(engine.history.values(), [r.HCT for r in reference[-64:]])
+    assert np.array_equal(engine.history.metrics(), metrics_array(metrics[-64:]))
+
+    # Flat history: zero slope and volatility, and the zero-mean rule
+    flat = HCTHistory(capacity=16)
+    zero = HCTHistory(capacity=16)
+    for m in metrics[:20]:
+        result = HCTEngine().compute(m)
+        result.HCT = 0.75
+        flat.append(result)
+        result = HCTEngine().compute(m)
+        result.HCT = 0.0
+        zero.append(result)
+    assert abs(flat.slope()) < 1e-15 and flat.coefficient_of_variation() < 1e-7
+    assert zero.coefficient_of_variation() == float('inf')
+
+    # Results scored without recording leave the history alone
+    before = len(engine.history), engine.history[-1]
+    engine.compute(metrics[0], record=False)
+    assert (len(engine.history), engine.history[-1]) == before
+
+
+def old_trend_and_volatility(history, window: int = 10):
+    """The previous get_trend / get_volatility bodies"""
+    recent = [r.HCT for r in history[-window:]]
+    slope = np.polyfit(np.arange(len(recent)), recent, 1)[0]
+    return slope, np.std(recent) / np.mean(recent)
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch HCT scoring test and benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"🧪 Batch HCT scoring test ({args.rows:,} rows)")
+    print("=" * 70)
+
+    engine = HCTEngine()
+    sample = random_metrics(2000, seed=3)
+    sample[5] = tuple([1.0] * len(METRIC_FIELDS))
+    sample[6] = tuple([0.0] * len(METRIC_FIELDS))
+    for coefficients in (HCTCoefficients(), HCTCoefficients(2.0, 0.5, 1.0, 1.5, 0.0),
+                         HCTCoefficients(0.3, 1.7, 0.0, 2.4, 0.6).normalize()):
+        check_compute_batch(engine, sample, coefficients)
+    try:
+        bad = sample.copy()
+        bad[3]["e_signal_integrity"] = 1.5
+        engine.compute_batch(bad)
+        raise AssertionError("out-of-range metrics accepted")
+    except ValueError as e:
+        assert "row 3" in str(e) and "e_signal_integrity" in str(e)
+    print("✅ compute_batch matches compute row by row (zeros, zero weights, normalized weights)")
+
+    check_history()
+    print("✅ ring-buffer history: keeps the last results in order; O(1) trend/volatility match polyfit/std")
+
+    grid = coefficient_grid(*[(0.5, 1.0, 2.0)] * 5)
+    # Sets that normalize to the same weights (e.g. all 0.5 and all 2.0) appear once
+    assert len(np.unique(np.round(grid, 12), axis=0)) == len(grid) < 3 ** 5
+    assert np.allclose(grid.sum(axis=1), 5.0)
+    sweep = engine.sweep_coefficients(grid[:20], metrics=sample, keep_hct=True, chunk_rows=300)
+    for i, weights in enumerate(grid[:20]):
+        expected = engine.compute_batch(sample, HCTCoefficients(*weights))["HCT"]
+        assert np.allclose(sweep.hct[:, i], expected, rtol=1e-10, atol=1e-12), i
+        assert np.allclose([sweep.mean[i], sweep.min[i], sweep.max[i], sweep.last[i]],
+                           [expected.mean(), expected.min(), expected.max(), expected[-1]], rtol=1e-10)
+        assert abs(sweep.below_threshold[i] - (expected < 0.5).mean()) < 1e-12
+    best, value = sweep.best()
+    assert value == sweep.mean.max() and best.updated_by == "sweep"
+    assert len(sweep.summary()) == 20
+    print("✅ coefficient sweep matches compute_batch for every set")
+
+    # Benchmarks
+    metrics = random_metrics(args.rows, seed=4)
+    objects = as_objects(metrics)
+    scalar_engine = HCTEngine(history_capacity=args.rows)
+    _, scalar_time = timed(lambda: [scalar_engine.compute(m) for m in objects])
+    batch, batch_time = timed(lambda: engine.compute_batch(metrics))
+    assert np.allclose(batch["HCT"], scalar_engine.history.values(), rtol=0, atol=TOLERANCE)
+
+    results = list(scalar_engine.history)[:5000]
+    old_history, new_engine = [], HCTEngine()
+
+    def old_updates():
+        for result in results:
+            old_history.append(result)
+            if len(old_history) >= 2:
+                old_trend_and_volatility(old_history)
+
+    def new_updates():
+        for result in results:
+            new_engine.history.append(result)
+            new_engine.get_trend()
+            new_engine.get_volatility()
+
+    _, old_update_time = timed(old_updates)
+    _, new_update_time = timed(new_updates)
+
+    sweep, sweep_time = timed(lambda: scalar_engine.sweep_coefficients(grid))
+    assert sweep.rows == args.rows
+    per_set_scalar = scalar_time  # One compute per row per coefficient set
+
+    print("=" * 70)
+    print(f"  score {args.rows:,} rows:     compute loop {scalar_time * 1000:9.1f}ms, "
+          f"compute_batch {batch_time * 1000:7.1f}ms ({scalar_time / batch_time:.0f}x)")
+    print(f"  trend + volatility per result: re-slice + polyfit {old_update_time / len(results) * 1e6:7.1f}µs, "
+          f"incremental {new_update_time / len(results) * 1e6:5.2f}µs "
+          f"({old_update_time / new_update_time:.0f}x)")
+    print(f"  sweep {len(grid)} coefficient sets x {args.rows:,} rows: {sweep_time * 1000:.1f}ms "
+          f"(compute loop estimate {per_set_scalar * len(grid):.0f}s)")
+    best, value = sweep.best()
+    print(f"  best mean HCT {value:.4f} at α={best.alpha:.2f} β={best.beta:.2f} γ={best.gamma:.2f} "
+          f"δ={best.delta:.2f} ε={best.epsilon:.2f}")
+
+
+if __name__ == "__main__":
+    main()
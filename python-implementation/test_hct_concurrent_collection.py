@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Concurrent HCT collection test and benchmark
+
+Builds per-file mirrors for the five supported chains and checks that the
+collectors give the same metrics whether their blocking reads run one at a
+time (a one-thread pool, the previous sequential behaviour) or gathered on
+the I/O pool across components and chains, and that the event loop keeps
+running while they read. Then drives the dashboard through Flask's test
+client: requests are answered from the background scheduler's cached
+results without collecting, and new mirror data shows up after a refresh.
+
+Storage latency can be simulated per file open (--open-latency-ms) to show
+the gain on cold or network storage; with a warm page cache the reads are
+mostly CPU-bound and the gain is smaller.
+
+Usage: python3 test_hct_concurrent_collection.py [--blocks 400] [--open-latency-ms 0.5]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app'))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app' / 'api'))
+
+import hct_metrics_collector
+from hct_integration import HCTIntegration, SUPPORTED_CHAINS
+from hct_metrics_collector import HCTMetricsAggregator
+from hct_scheduler import HCTScheduler
+from mirror_block_store import normalize_block
+
+FIRST_BLOCK = 20_000_000
+CELL_TYPES = ["MEMORY", "MEMORY", "DETECTOR", "DEFENDER", "REGULATORY", "NK_CELL"]
+RECENT_CELL_TYPES = CELL_TYPES[:4]  # Some types stop appearing: a moderate mutation rate
+NODES = [
+    {"node_id": "us-1", "country": "US", "hardware": "linux", "dependencies": ["python", "web3"], "datacenter": "aws"},
+    {"node_id": "de-1", "country": "DE", "hardware": "macOS", "dependencies": ["python", "cirq"], "datacenter": "hetzner"},
+    {"node_id": "jp-1", "country": "JP", "hardware": "linux", "dependencies": ["rust", "web3"], "datacenter": "gcp"},
+    {"node_id": "br-1", "country": "BR", "hardware": "bsd", "dependencies": ["go"], "datacenter": "home"}
+]
+
+
+def write_chain(chain_path: Path, first: int, count: int, seed: int):
+    """Append ``count`` blocks and their log records in hermetic_mirror_live.sh's layout"""
+    rng = random.Random(seed + first)
+    for name in ("raw", "normalized", "hashed", "logs", "quantum", "immune"):
+        (chain_path / name).mkdir(parents=True, exist_ok=True)
+
+    numbers = range(first, first + count)
+    for number in numbers:
+        result = {
+            "number": hex(number),
+            "hash": "0x" + hashlib.sha256(b"%d" % number).hexdigest(),
+            "parentHash": "0x" + hashlib.sha256(b"%d" % (number - 1)).hexdigest(),
+            "timestamp": hex(1_700_000_000 + 2 * number),
+            "gasUsed": hex(rng.randrange(1, 30_000_000)),
+            "gasLimit": hex(30_000_000),
+            "transactions": ["0x%064x" % i for i in range(rng.randrange(0, 8))]
+        }
+        label = hex(number)
+        raw = json.dumps({"jsonrpc": "2.0", "id": 1, "result": result}).encode()
+        normalized = json.dumps(normalize_block(result)).encode()
+        (chain_path / "raw" / f"block_{label}.json").write_bytes(raw)
+        (chain_path / "normalized" / f"block_{label}.norm.json").write_bytes(normalized)
+        if rng.random() < 0.95:
+            (chain_path / "hashed" / f"block_{label}.raw.sha").write_text(hashlib.sha256(raw).hexdigest())
+            (chain_path / "hashed" / f"block_{label}.norm.sha").write_text(hashlib.sha256(normalized).hexdigest())
+
+    logs = {
+        "logs/rhythm.jsonl": [{"to_block": hex(n), "block_time": rng.choice([1, 2, 2, 2, 3])} for n in numbers],
+        "quantum/threat_scores.jsonl": [{"block": hex(n), "threat_score": rng.choice([0, 10, 30, 50, 70, 90])}
+                                        for n in numbers],
+        "immune/cells_spawned.jsonl": [{"block": hex(n), "cell_type": rng.choice(
+            RECENT_CELL_TYPES if n >= first + count - 100 else CELL_TYPES)} for n in numbers]
+    }
+    for path, records in logs.items():
+        with open(chain_path / path, 'a') as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def slow_open(latency: float):
+    """open() for the collector module that waits like cold or network storage first"""
+    def opener(*args, **kwargs):
+        time.sleep(latency)
+        return open(*args, **kwargs)
+    return opener
+
+
+def use_pool(workers: int):
+    hct_metrics_collector._io_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hct-io")
+
+
+def as_dicts(metrics_by_chain):
+    result = {}
+    for chain, metrics in metrics_by_chain.items():
+        result[chain] = asdict(metrics)
+        del result[chain]['timestamp']
+    return result
+
+
+async def collect_one_by_one(aggregator: HCTMetricsAggregator, chains):
+    return {chain: await aggregator.collect_all(chain) for chain in chains}
+
+
+async def collect_with_ticker(aggregator: HCTMetricsAggregator, chains):
+    """collect_chains while a coroutine on the same loop records its longest gap between ticks"""
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    try:
+        return await aggregator.collect_chains(chains), max(gaps, default=0.0)
+    finally:
+        task.cancel()
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def check_dashboard(mirror_root: Path, node_registry: Path, blocks: int):
+    import app as dashboard
+
+    integration = HCTIntegration(mirror_root=str(mirror_root), node_registry=str(node_registry))
+    dashboard.integration = integration
+    dashboard.scheduler = HCTScheduler(integration, SUPPORTED_CHAINS, interval=60.0)
+    client = dashboard.app.test_client()
+
+    # Requests never collect: count aggregator calls made on their behalf
+    collect_calls = []
+    collect_chains = integration.aggregator.collect_chains
+
+    async def counted(chains):
+        collect_calls.append(list(chains))
+        return await collect_chains(chains)
+
+    integration.aggregator.collect_chains = counted
+    try:
+        response = client.get('/api/hct/chains').get_json()
+        assert response['success'], response
+        assert sorted(response['chains']) == sorted(SUPPORTED_CHAINS)
+        assert collect_calls == [SUPPORTED_CHAINS]  # The scheduler's first run, nothing else
+
+        request_times = []
+        for chain in SUPPORTED_CHAINS * 4:
+            current, elapsed = timed(lambda: client.get(f'/api/hct/current?chain={chain}').get_json())
+            request_times.append(elapsed)
+            assert current['success'] and current['chain'] == chain
+            assert current['hct'] == response['chains'][chain]['hct']
+        for path in ('/api/metrics?chain=base', '/api/operational', '/api/hct/history', '/api/system/mode'):
+            assert client.get(path).get_json()['success'], path
+        assert len(collect_calls) == 1
+
+        # New blocks for one chain are picked up by the next refresh
+        before = response['chains']['polygon']
+        write_chain(mirror_root / 'polygon', FIRST_BLOCK + blocks, blocks, seed=99)
+        with open(mirror_root / 'polygon' / "quantum" / "threat_scores.jsonl", 'a') as f:
+            f.writelines(json.dumps({"block": hex(FIRST_BLOCK), "threat_score": 95}) + "\n" for _ in range(blocks))
+        runs = dashboard.scheduler.runs
+        dashboard.scheduler.request_refresh()
+        deadline = time.time() + 30
+        while dashboard.scheduler.runs == runs and time.time() < deadline:
+            time.sleep(0.01)
+        after = client.get('/api/hct/chains').get_json()['chains']['polygon']
+        assert after['components']['R'] < before['components']['R'], (before, after)
+        assert len(collect_calls) == 2
+
+        # A chain outside the schedule is computed once, without changing the system mode
+        other = client.get('/api/hct/current?chain=gnosis').get_json()
+        assert other['success'] and other['chain'] == 'gnosis'
+        assert integration.current_hct is integration.chain_results['optimism']
+    finally:
+        dashboard.scheduler.stop()
+    assert not dashboard.scheduler.running
+    return sum(request_times) / len(request_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent HCT collection test and benchmark")
+    parser.add_argument("--blocks", type=int, default=400, help="Blocks per chain")
+    parser.add_argument("--open-latency-ms", type=float, default=0.5, help="Simulated storage latency per file open")
+    args = parser.parse_args()
+
+    print(f"🧪 Concurrent HCT collection test ({len(SUPPORTED_CHAINS)} chains x {args.blocks} blocks)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror_root = Path(tmp) / "mirror"
+        node_registry = Path(tmp) / "nodes.json"
+        node_registry.write_text(json.dumps(NODES))
+        for seed, chain in enumerate(SUPPORTED_CHAINS):
+            write_chain(mirror_root / chain, FIRST_BLOCK, args.blocks, seed)
+
+        full = HCTMetricsAggregator(str(mirror_root), str(node_registry), incremental=False)
+        chains = SUPPORTED_CHAINS
+
+        timings = {}
+        for label, latency in (("warm cache", 0.0), (f"+{args.open_latency_ms}ms per open", args.open_latency_ms)):
+            hct_metrics_collector.open = slow_open(latency / 1000)
+            try:
+                use_pool(1)
+                sequential, sequential_time = timed(lambda: asyncio.run(collect_one_by_one(full, chains)))
+                use_pool(hct_metrics_collector.IO_WORKERS)
+                (concurrent, max_gap), concurrent_time = timed(
+                    lambda: asyncio.run(collect_with_ticker(full, chains)))
+            finally:
+                del hct_metrics_collector.open
+            assert as_dicts(concurrent) == as_dicts(sequential), label
+            timings[label] = (sequential_time, concurrent_time, max_gap)
+        print("✅ gathered components and chains match one-at-a-time collection")
+
+        # The loop stays responsive: every read happens on the pool
+        assert max(gap for _, _, gap in timings.values()) < 0.25, timings
+        print("✅ event loop keeps running while the collectors read")
+
+        incremental = HCTMetricsAggregator(str(mirror_root), str(node_registry))
+        gathered = asyncio.run(incremental.collect_chains(chains))
+        expected = as_dicts(asyncio.run(collect_one_by_one(full, chains)))
+        for chain, metrics in as_dicts(gathered).items():
+            for key, value in metrics.items():
+                assert abs(value - expected[chain][key]) < 1e-9, (chain, key, value, expected[chain][key])
+        print("✅ incremental collector gives the same metrics for all chains at once")
+
+        request_time = check_dashboard(mirror_root, node_registry, args.blocks)
+        print("✅ dashboard answers from the scheduler's cache and picks up new blocks after a refresh")
+
+    print("=" * 70)
+    for label, (sequential_time, concurrent_time, max_gap) in timings.items():
+        print(f"  {label:<22} one at a time {sequential_time * 1000:8.1f}ms, gathered {concurrent_time * 1000:8.1f}ms "
+              f"({sequential_time / concurrent_time:.1f}x), longest loop stall {max_gap * 1000:.1f}ms")
+    print(f"  /api/hct/current from cache:  {request_time * 1000:.2f}ms avg per request")
+
+
+if __name__ == "__main__":
+    main()
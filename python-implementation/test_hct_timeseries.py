@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+HCT time-series store test and benchmark
+
+Appends HCT results at irregular intervals (single results and batches,
+with repeated and out-of-order times, from two writers sharing the files)
+and checks every rollup and range query against a brute-force recompute
+from the accepted samples; that a reopened store and a store recovering
+from a writer that died mid-append agree too; and that /api/hct/history
+serves ranges through Flask's test client. Then fills --years of samples
+every --interval seconds and times range queries against recomputing the
+same rollup from the raw samples.
+
+Usage: python3 test_hct_timeseries.py [--years 3] [--interval 15]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app'))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app' / 'api'))
+
+from hct_core import HCTCoefficients, HCTMetrics, HCTResult
+from hct_timeseries import ROLLUPS, SERIES, HCTTimeSeries, HCTTimeSeriesStore, parse_time
+
+START = parse_time("2026-01-01T00:00:00")
+DAY = 86_400_000
+
+
+def make_result(when: int, values) -> HCTResult:
+    hct, b, h, g, r, e = values
+    return HCTResult(B=b, H=h, G=g, R=r, E=e, weighted_B=b, weighted_H=h, weighted_G=g, weighted_R=r,
+                     weighted_E=e, HCT=hct, coefficients=HCTCoefficients(), raw_metrics=HCTMetrics(),
+                     timestamp=str(np.datetime64(when, 'ms')))
+
+
+def brute_rollup(times: np.ndarray, values: np.ndarray, width: int):
+    buckets = times - times % width
+    keys = np.unique(buckets)
+    return keys, [(values[buckets == k].sum(axis=0), values[buckets == k].min(axis=0),
+                   values[buckets == k].max(axis=0), int((buckets == k).sum())) for k in keys]
+
+
+def assert_matches(series: HCTTimeSeries, times: np.ndarray, values: np.ndarray, label: str,
+                   closed_only: bool = False):
+    series.refresh()
+    raw = series._table('raw')
+    assert np.array_equal(raw['t'], times), label
+    assert np.array_equal(raw['values'], values), label
+    for name, width in ROLLUPS.items():
+        table = series._table(name)
+        keys, expected = brute_rollup(times, values, width)
+        assert np.array_equal(table['t'], keys), (label, name)
+        if closed_only:
+            table, expected = table[:-1], expected[:-1]
+        for row, (total, low, high, count) in zip(table, expected):
+            assert row['count'] == count and np.allclose(row['sum'], total, rtol=1e-12), (label, name)
+            assert np.array_equal(row['min'], low) and np.array_equal(row['max'], high), (label, name)
+
+
+def random_stream(rng, count: int, first: int):
+    gaps = rng.integers(5_000, 40_000, count)
+    times = first + np.cumsum(gaps)
+    values = np.clip(0.7 + np.cumsum(rng.normal(0, 0.01, (count, len(SERIES))), axis=0), 0, 1)
+    return times, values
+
+
+def check_store(root: Path):
+    rng = np.random.default_rng(7)
+    times, values = random_stream(rng, 20_000, START)  # ~5 days
+    writers = [HCTTimeSeries(root / "optimism"), HCTTimeSeries(root / "optimism")]
+
+    accepted_t, accepted_v = [], []
+    i = 0
+    while i < len(times):
+        writer = writers[rng.integers(2)]
+        if rng.random() < 0.5:
+            assert writer.append(make_result(int(times[i]), values[i]))
+            accepted_t.append(times[i])
+            accepted_v.append(values[i])
+            i += 1
+        else:
+            n = int(rng.integers(1, 400))
+            chunk_t, chunk_v = times[i:i + n], values[i:i + n]
+            # Replays of samples already stored are dropped
+            stale = max(0, i - 3)
+            assert writer.append_many(np.concatenate([times[stale:i], chunk_t[::-1]]),
+                                      np.concatenate([values[stale:i], chunk_v[::-1]])) == len(chunk_t)
+            accepted_t.extend(chunk_t)
+            accepted_v.extend(chunk_v)
+            i += n
+    assert not writers[0].append(make_result(int(times[5]), values[5]))
+
+    accepted_t, accepted_v = np.array(accepted_t), np.array(accepted_v)
+    for writer in writers + [HCTTimeSeries(root / "optimism")]:
+        assert_matches(writer, accepted_t, accepted_v, "two writers, reopened")
+
+    # Range queries against the accepted samples
+    series = HCTTimeSeries(root / "optimism")
+    for _ in range(50):
+        start, end = np.sort(rng.integers(accepted_t[0] - DAY, accepted_t[-1] + DAY, 2))
+        for resolution in ('raw', '1m', '1h', '1d'):
+            result = series.query(start, end, resolution, max_points=10_000_000)
+            if resolution == 'raw':
+                inside = (accepted_t >= start) & (accepted_t <= end)
+                assert len(result['history']) == inside.sum()
+                if inside.any():
+                    assert result['history'][-1]['HCT'] == accepted_v[inside][-1][0]
+            else:
+                width = ROLLUPS[resolution]
+                keys, expected = brute_rollup(accepted_t, accepted_v, width)
+                inside = (keys >= start - start % width) & (keys <= end)
+                assert len(result['history']) == inside.sum(), (resolution, start, end)
+                for point, (total, _, high, count) in zip(result['history'],
+                                                          [e for e, k in zip(expected, inside) if k]):
+                    assert point['count'] == count and abs(point['HCT'] - total[0] / count) < 1e-12
+                    assert point['max']['E'] == high[5]
+        auto = series.query(start, end, 'auto', max_points=300)
+        assert len(auto['history']) <= 300 or auto['resolution'] == '1d'
+    assert series.query(resolution='1h', max_points=10)['truncated']
+    assert series.query(resolution='raw', max_points=5)['history'][-1]['HCT'] == accepted_v[-1][0]
+
+    # A writer dies after writing rows but before committing them
+    crashed = HCTTimeSeries(root / "optimism")
+    crashed._save_meta = lambda: (_ for _ in ()).throw(OSError("killed"))
+    late_t, late_v = random_stream(rng, 500, int(accepted_t[-1]))
+    try:
+        crashed.append_many(late_t[:200], late_v[:200])
+        raise AssertionError("crash not simulated")
+    except OSError:
+        pass
+    # Readers see committed rows only; the open buckets are rebuilt by the next writer
+    assert_matches(HCTTimeSeries(root / "optimism"), accepted_t, accepted_v, "after crash", closed_only=True)
+    survivor = HCTTimeSeries(root / "optimism")
+    assert survivor.append_many(late_t[200:], late_v[200:]) == 300
+    assert_matches(survivor, np.concatenate([accepted_t, late_t[200:]]),
+                   np.concatenate([accepted_v, late_v[200:]]), "after recovery")
+
+
+def check_endpoint(mirror_root: Path):
+    import app as dashboard
+    from hct_integration import HCTIntegration
+
+    integration = HCTIntegration(mirror_root=str(mirror_root))
+    dashboard.integration = integration
+    store = integration.timeseries
+    times = START + np.arange(0, 3 * DAY, 15_000)
+    values = np.full((len(times), len(SERIES)), 0.8)
+    values[:, 0] = 0.5 + 0.3 * np.sin(np.arange(len(times)) / 500)
+    store.series("base").append_many(times, values)
+    client = dashboard.app.test_client()
+
+    latest = client.get('/api/hct/history?chain=base').get_json()
+    assert latest['success'] and latest['resolution'] == 'raw' and len(latest['history']) == 50
+    assert latest['history'][-1]['HCT'] == values[-1, 0]
+
+    day = client.get('/api/hct/history?chain=base&from=2026-01-02&to=2026-01-02T23:59:59&resolution=1h').get_json()
+    assert len(day['history']) == 24 and day['history'][0]['timestamp'].startswith('2026-01-02T00:00')
+    assert all(point['count'] == 240 for point in day['history'])
+
+    auto = client.get(f'/api/hct/history?chain=base&from={START // 1000}&limit=100').get_json()
+    assert auto['resolution'] == '1h' and len(auto['history']) == 72
+
+    assert client.get('/api/hct/history?chain=base&resolution=5m').status_code == 400
+    assert client.get('/api/hct/history?chain=base&from=yesterday').status_code == 400
+    assert client.get('/api/hct/history?chain=nowhere').status_code == 400
+    assert client.get('/api/hct/history?chain=../../etc').status_code == 400
+    assert client.get('/api/hct/history?chain=base&limit=0').status_code == 400
+    assert client.get('/api/hct/history?chain=base&resolution=1h&limit=-5').status_code == 400
+    assert client.get('/api/hct/history?chain=base&from=0&limit=100000000').status_code == 400
+    assert client.get('/api/hct/history?chain=base&from=inf').status_code == 400
+    assert client.get('/api/hct/history?chain=base&to=-inf').status_code == 400
+    assert client.get('/api/hct/history?chain=ethereum').get_json()['history'] == []
+
+
+def timed(function, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HCT time-series store test and benchmark")
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--interval", type=float, default=15, help="Seconds between samples")
+    args = parser.parse_args()
+
+    print(f"🧪 HCT time-series store test ({args.years:g} years every {args.interval:g}s)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_store(Path(tmp) / "store")
+        print("✅ rollups and range queries match a recompute from the samples "
+              "(two writers, replays, reopen, dead writer)")
+
+        check_endpoint(Path(tmp) / "app")
+        print("✅ /api/hct/history: latest results, from/to ranges, auto resolution, bad parameters")
+
+        # Years of samples, a day per write
+        series = HCTTimeSeriesStore(Path(tmp) / "bench").series("optimism")
+        step = int(args.interval * 1000)
+        total = int(args.years * 365 * DAY / step)
+        rng = np.random.default_rng(1)
+        per_day = DAY // step
+        fill_start = time.perf_counter()
+        for first in range(0, total, per_day):
+            count = min(per_day, total - first)
+            times = START + (first + np.arange(count)) * step
+            values = np.clip(0.7 + rng.normal(0, 0.05, (count, len(SERIES))), 0, 1)
+            series.append_many(times, values)
+        fill_time = time.perf_counter() - fill_start
+        end = START + total * step
+        disk = sum(path.stat().st_size for path in series.path.iterdir())
+
+        _, append_time = timed(lambda: series.append(make_result(end, [0.7] * 6)))
+        queries = {
+            "everything, auto":        lambda: series.query(resolution='auto'),
+            "last 30 days, 1h":        lambda: series.query(end - 30 * DAY, end, '1h'),
+            "one day a year ago, 1m":  lambda: series.query(end - 366 * DAY, end - 365 * DAY, '1m', 2000),
+            "last 50 results":         lambda: series.query(resolution='raw', max_points=50)
+        }
+        results = {label: timed(query, repeat=5) for label, query in queries.items()}
+        assert results["everything, auto"][0]['resolution'] == '1d'
+        assert len(results["last 30 days, 1h"][0]['history']) in (720, 721)
+        assert len(results["one day a year ago, 1m"][0]['history']) in (1440, 1441)
+
+        # Without rollups: read the range and bucket it at query time
+        def from_raw():
+            raw = np.array(series._table('raw'))
+            inside = raw[(raw['t'] >= end - 30 * DAY) & (raw['t'] <= end)]
+            keys, starts = np.unique(inside['t'] - inside['t'] % ROLLUPS['1h'], return_index=True)
+            return keys, np.add.reduceat(inside['values'], starts, axis=0)
+
+        _, raw_time = timed(from_raw, repeat=3)
+
+    print("=" * 70)
+    print(f"  stored {total:,} samples in {fill_time:.1f}s ({disk / 1e6:.0f} MB with rollups); "
+          f"one more append {append_time * 1000:.2f}ms")
+    for label, (result, seconds) in results.items():
+        print(f"  {label:<25} {seconds * 1000:8.2f}ms  ({len(result['history']):>5} {result['resolution']} points)")
+    print(f"  last 30 days, 1h from raw: {raw_time * 1000:8.2f}ms  (scan and bucket at query time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSONL tailer used by the mirror integrations
+
+Covers partial lines, malformed lines, rotation, truncation, checkpoint
+resume and change notification. Run: python3 test_jsonl_tailer.py
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from jsonl_tailer import JSONLFollower, JSONLTailer
+
+
+def append(path: Path, *records, raw: str = ""):
+    with open(path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.write(raw)
+
+
+def check_partial_and_malformed_lines(tmp: Path):
+    log = tmp / "threats.jsonl"
+    tailer = JSONLTailer(log)
+    assert tailer.read_new() == []  # File does not exist yet
+
+    append(log, {'block': 1}, raw='not json\n{"block": 2')
+    assert tailer.read_new() == [{'block': 1}]
+    assert tailer.lines_skipped == 1
+
+    append(log, raw='}\n')
+    assert tailer.read_new() == [{'block': 2}]
+    assert tailer.read_new() == []
+
+
+def check_rotation_drains_old_file(tmp: Path):
+    log = tmp / "cells.jsonl"
+    tailer = JSONLTailer(log)
+    append(log, {'n': 1})
+    assert tailer.read_new() == [{'n': 1}]
+
+    # Writer appends a final record, then the log is rotated and restarted
+    append(log, {'n': 2})
+    os.rename(log, tmp / "cells.jsonl.1")
+    append(log, {'n': 3})
+
+    assert tailer.read_new() == [{'n': 2}, {'n': 3}]
+    assert tailer.rotations == 1
+
+
+def check_truncation_restarts_from_top(tmp: Path):
+    log = tmp / "rhythm.jsonl"
+    tailer = JSONLTailer(log)
+    append(log, {'n': 1}, {'n': 2}, {'n': 3})
+    assert len(tailer.read_new()) == 3
+
+    with open(log, 'w') as f:
+        f.write(json.dumps({'n': 4}) + "\n")
+    assert tailer.read_new() == [{'n': 4}]
+    assert tailer.truncations == 1
+
+
+def check_checkpoint_resume(tmp: Path):
+    log = tmp / "vibration.jsonl"
+    checkpoint = tmp / "offsets.json"
+    append(log, {'n': 1}, {'n': 2})
+
+    follower = JSONLFollower({'vibration': log}, checkpoint_path=checkpoint)
+    assert follower.read_new()['vibration'] == [{'n': 1}, {'n': 2}]
+    follower.commit()
+    follower.close()
+
+    append(log, {'n': 3})
+    follower = JSONLFollower({'vibration': log}, checkpoint_path=checkpoint)
+    assert follower.read_new()['vibration'] == [{'n': 3}]
+    follower.close()
+
+    # A checkpoint for a file that has since been replaced is ignored
+    os.remove(log)
+    append(log, {'n': 10})
+    follower = JSONLFollower({'vibration': log}, checkpoint_path=checkpoint)
+    assert follower.read_new()['vibration'] == [{'n': 10}]
+    follower.close()
+
+    # --from-start
+    follower = JSONLFollower({'vibration': log}, checkpoint_path=checkpoint, resume=False)
+    assert follower.read_new()['vibration'] == [{'n': 10}]
+    follower.close()
+
+
+async def _wake_latency(tmp: Path, use_inotify: bool):
+    log = tmp / f"wake_{use_inotify}" / "threats.jsonl"
+    log.parent.mkdir()
+    follower = JSONLFollower({'threats': log}, use_inotify=use_inotify)
+
+    async def writer():
+        await asyncio.sleep(0.1)
+        append(log, {'block': 1})
+        return time.perf_counter()
+
+    write_task = asyncio.create_task(writer())
+    records = []
+    while not records:
+        await follower.wait(timeout=1.0)
+        records = follower.read_new()['threats']
+    latency = time.perf_counter() - await write_task
+    mode = follower.notifier.mode
+    follower.close()
+    print(f"  {mode:<8} wake latency: {latency * 1000:7.1f}ms")
+    return latency, mode
+
+
+def check_change_notification(tmp: Path):
+    latency, mode = asyncio.run(_wake_latency(tmp, use_inotify=True))
+    if mode == 'inotify':
+        assert latency < 0.5
+    asyncio.run(_wake_latency(tmp, use_inotify=False))
+
+
+def main():
+    tests = [
+        check_partial_and_malformed_lines,
+        check_rotation_drains_old_file,
+        check_truncation_restarts_from_top,
+        check_checkpoint_resume,
+        check_change_notification
+    ]
+
+    print("🧪 JSONL tailer tests")
+    for test in tests:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+        print(f"✅ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Explorer aggregates test: incremental totals vs rescanning the logs
+
+Writes vibration, cell-spawn and threat logs in the formats
+hermetic_mirror_live.sh appends, checks the explorer's stats and cell-spawn
+list against a full rescan of the logs (what every request used to do),
+exercises snapshot resume and log replacement, and times a request both ways.
+
+Usage: python3 test_mirror_aggregates.py [--blocks 200000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from mirror_aggregates import MirrorAggregates
+from mirror_explorer_integration import MirrorExplorerBridge
+
+CHAIN = "optimism"
+FIRST_BLOCK = 120_000_000
+SEQUENCER = MirrorExplorerBridge("/nonexistent", CHAIN)  # Cell sequences encode the threat score
+
+
+def append_blocks(chain_path: Path, start: int, count: int):
+    """Append the three log lines the mirror writes per block"""
+    logs = {
+        'vibration': chain_path / "logs" / "vibration.jsonl",
+        'cells': chain_path / "immune" / "cells_spawned.jsonl",
+        'threats': chain_path / "quantum" / "threat_scores.jsonl"
+    }
+    for path in logs.values():
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    files = {name: open(path, 'a') for name, path in logs.items()}
+    timestamp = "2026-01-01T00:00:00Z"
+    for number in range(start, start + count):
+        block = hex(number)
+        tx_count = number % 250
+        threat = (30 if number % 7 == 0 else 0) + (20 if tx_count > 200 else 0)
+        cell_type, cells = ("DETECTOR", 2) if threat > 30 else ("MEMORY", 1)
+        files['vibration'].write(json.dumps({"block": block, "tx_count": tx_count,
+                                             "frequency_hz": min(432 + tx_count * 2, 852), "timestamp": timestamp}) + "\n")
+        files['threats'].write(json.dumps({"block": block, "threat_score": threat, "timestamp": timestamp}) + "\n")
+        files['cells'].write(json.dumps({"block": block, "cell_type": cell_type, "count": cells,
+                                         "threat_score": threat, "timestamp": timestamp}) + "\n")
+    for f in files.values():
+        f.close()
+
+
+def rescan(chain_path: Path, limit: int = 10):
+    """What get_stats / get_latest_transactions computed by reading every log in full"""
+    def records(path):
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    vibration = records(chain_path / "logs" / "vibration.jsonl")
+    cells = records(chain_path / "immune" / "cells_spawned.jsonl")
+    threats = records(chain_path / "quantum" / "threat_scores.jsonl")
+
+    first_score = {}
+    for record in threats:
+        first_score.setdefault(record['block'], record['threat_score'])
+
+    return {
+        'total_transactions': sum(r.get('tx_count', 0) for r in vibration),
+        'total_supply': sum(r.get('count', 0) for r in cells),
+        'volume_24h': sum(r.get('threat_score', 0) for r in threats[-100:]),
+        'spawns': [(r['block'], r['cell_type'], SEQUENCER._generate_sequence(r['cell_type'], first_score.get(r['block'], 0)))
+                   for r in reversed(cells[-limit:])]
+    }
+
+
+def bridge_view(bridge: MirrorExplorerBridge, limit: int = 10):
+    stats = bridge.get_stats()
+    assert 'error' not in stats, stats
+    transactions = bridge.get_latest_transactions(limit)
+    return {
+        'total_transactions': stats['total_transactions'],
+        'total_supply': stats['total_supply'],
+        'volume_24h': stats['volume_24h'],
+        'spawns': [(tx['block'], tx['type'], tx['sequence']) for tx in transactions]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror aggregates test")
+    parser.add_argument("--blocks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"🧪 Explorer aggregates test ({args.blocks:,} blocks of logs)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror_root = Path(tmp)
+        chain_path = mirror_root / CHAIN
+        append_blocks(chain_path, FIRST_BLOCK, args.blocks)
+
+        start = time.perf_counter()
+        expected = rescan(chain_path)
+        rescan_time = time.perf_counter() - start
+
+        bridge = MirrorExplorerBridge(str(mirror_root), CHAIN)
+        start = time.perf_counter()
+        assert bridge_view(bridge) == expected
+        first_time = time.perf_counter() - start
+        assert bridge.get_stats()['total_blocks'] == args.blocks
+
+        # Steady state: a poll with a few new blocks reads only those lines
+        append_blocks(chain_path, FIRST_BLOCK + args.blocks, 3)
+        start = time.perf_counter()
+        view = bridge_view(bridge)
+        poll_time = time.perf_counter() - start
+        assert view == rescan(chain_path)
+        assert bridge.get_latest_transactions(2000)[-1]['block'] == hex(FIRST_BLOCK + args.blocks + 3 - 1000)
+        bridge.aggregates.close()
+        print("✅ stats and cell spawns match a full rescan")
+
+        # A restarted explorer resumes from the snapshot instead of rescanning
+        append_blocks(chain_path, FIRST_BLOCK + args.blocks + 3, 2)
+        bridge = MirrorExplorerBridge(str(mirror_root), CHAIN)
+        start = time.perf_counter()
+        view = bridge_view(bridge)
+        resume_time = time.perf_counter() - start
+        assert view == rescan(chain_path)
+        assert bridge.aggregates.tailers['vibration'].records_read == 2
+        bridge.aggregates.close()
+        print("✅ snapshot resume reads only new records")
+
+        # A log replaced underneath the snapshot invalidates it
+        threat_log = chain_path / "quantum" / "threat_scores.jsonl"
+        lines = threat_log.read_text().splitlines(keepends=True)
+        os.remove(threat_log)
+        threat_log.write_text("".join(lines[:50]))
+        aggregates = MirrorAggregates(chain_path)
+        aggregates.refresh()
+        assert aggregates.tailers['vibration'].records_read == args.blocks + 5
+        assert aggregates.threat_volume() == sum(json.loads(line)['threat_score'] for line in lines[:50])
+        aggregates.close()
+        print("✅ replaced log triggers a rebuild")
+
+        # Legacy per-file layout: latest blocks come from the vibration log tail
+        (chain_path / "raw").mkdir()
+        for number in range(FIRST_BLOCK + args.blocks, FIRST_BLOCK + args.blocks + 5):
+            result = {"number": hex(number), "hash": "0x%064x" % number, "timestamp": hex(1_700_000_000 + number),
+                      "transactions": [], "gasUsed": hex(number)}
+            (chain_path / "raw" / f"block_{hex(number)}.json").write_text(json.dumps({"result": result}))
+        bridge = MirrorExplorerBridge(str(mirror_root), CHAIN)
+        blocks = bridge.get_latest_blocks(3)
+        assert [b['index'] for b in blocks] == [FIRST_BLOCK + args.blocks + i for i in (4, 3, 2)]
+        bridge.aggregates.close()
+        print("✅ latest blocks without a directory scan")
+
+    print("=" * 70)
+    print(f"  full rescan per request:  {rescan_time * 1000:9.1f}ms")
+    print(f"  first request (cold):     {first_time * 1000:9.1f}ms")
+    print(f"  poll with 3 new blocks:   {poll_time * 1000:9.2f}ms")
+    print(f"  restart from snapshot:    {resume_time * 1000:9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
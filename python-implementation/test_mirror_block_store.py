@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Block store test: convert a per-file mirror and compare every reader
+
+Builds a synthetic luxbin_mirror/<chain>/ in the layout hermetic_mirror_live.sh
+writes (raw/, normalized/, hashed/), records what the explorer and HCT
+collectors report from the files, converts it into the columnar block store
+and checks the readers report the same from the store, then times both.
+Also checks that a commit fsyncs every segment its rows point into, even
+when the segment rolled over mid-batch.
+
+Usage: python3 test_mirror_block_store.py [--blocks 5000]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app' / 'api'))
+
+import hct_metrics_collector
+from hct_metrics_collector import (
+    ElectromagnetismMetricsCollector,
+    HistoryMetricsCollector,
+    ReligionMetricsCollector
+)
+from mirror_block_store import MirrorBlockStore, convert_mirror, normalize_block, open_block_store
+from mirror_explorer_integration import MirrorExplorerBridge
+
+CHAIN = "optimism"
+FIRST_BLOCK = 120_000_000
+
+
+def write_legacy_mirror(chain_path: Path, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for name in ("raw", "normalized", "hashed"):
+        (chain_path / name).mkdir(parents=True, exist_ok=True)
+
+    parent = "0x" + "00" * 32
+    for i in range(count):
+        number = FIRST_BLOCK + i
+        label = hex(number)
+        block_hash = "0x" + hashlib.sha256(str(number).encode()).hexdigest()
+        result = {
+            "number": label,
+            "hash": block_hash,
+            "parentHash": parent,
+            "timestamp": hex(1_700_000_000 + 2 * i),
+            "gasUsed": hex(rng.randint(1_000_000, 30_000_000)),
+            "gasLimit": hex(30_000_000),
+            "baseFeePerGas": hex(rng.randint(1, 10 ** 9)),
+            "miner": "0x4200000000000000000000000000000000000011",
+            "difficulty": "0x0",
+            "size": hex(rng.randint(1000, 90000)),
+            "transactions": [{"hash": "0x%064x" % rng.getrandbits(256)} for _ in range(rng.randint(0, 40))]
+        }
+        parent = block_hash
+
+        raw = json.dumps({"jsonrpc": "2.0", "id": 1, "result": result}).encode()
+        normalized = (json.dumps(normalize_block(result), indent=2) + "\n").encode()
+        (chain_path / "raw" / f"block_{label}.json").write_bytes(raw)
+
+        # A few incomplete blocks: missing hash files or normalized output
+        if i % 97 == 0:
+            continue
+        (chain_path / "normalized" / f"block_{label}.norm.json").write_bytes(normalized)
+        if i % 89 == 0:
+            continue
+        (chain_path / "hashed" / f"block_{label}.raw.sha").write_text(hashlib.sha256(raw).hexdigest() + "\n")
+        (chain_path / "hashed" / f"block_{label}.norm.sha").write_text(hashlib.sha256(normalized).hexdigest() + "\n")
+
+
+def read_everything(mirror_root: Path, latest_limit: int):
+    bridge = MirrorExplorerBridge(str(mirror_root), CHAIN)
+    history = HistoryMetricsCollector(str(mirror_root))
+    religion = ReligionMetricsCollector(str(mirror_root))
+    em = ElectromagnetismMetricsCollector(str(mirror_root))
+
+    async def collect():
+        return {
+            'replay': await history._compute_replay_integrity(CHAIN),
+            'fork': await history._compute_fork_awareness(CHAIN),
+            'audit': await history._compute_auditability(CHAIN),
+            'religion': await religion.collect(CHAIN),
+            'signal': await em._compute_signal_integrity(CHAIN)
+        }
+
+    start = time.perf_counter()
+    results = {
+        'total_blocks': bridge.get_stats()['total_blocks'],
+        'latest': [(b['index'], b['transactions'], b['total_value']) for b in bridge.get_latest_blocks(latest_limit)],
+        **asyncio.run(collect())
+    }
+    return results, time.perf_counter() - start
+
+
+def check_rollover_sync(path: Path):
+    """Every segment a commit's rows point into is fsynced, including ones rolled over mid-batch"""
+    synced = set()
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced.add(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    os.fsync = recording_fsync
+    try:
+        with MirrorBlockStore(path, writable=True, segment_size=4096) as writer:
+            rng = random.Random(1)
+            for i in range(50):
+                padding = "%x" % rng.getrandbits(8000)  # Incompressible: a few blocks per segment
+                writer.append_block(json.dumps({"result": {"number": hex(FIRST_BLOCK + i), "transactions": [],
+                                                           "extraData": padding}}).encode())
+            writer.commit()
+    finally:
+        os.fsync = fsync
+
+    segments = sorted((path / "segments").glob("seg_*.dat"))
+    assert len(segments) > 5
+    assert all(segment.stat().st_ino in synced for segment in segments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror block store test")
+    parser.add_argument("--blocks", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror_root = Path(tmp)
+        chain_path = mirror_root / CHAIN
+        write_legacy_mirror(chain_path, args.blocks)
+
+        print(f"🧪 Mirror block store test ({args.blocks:,} blocks)")
+        print("=" * 70)
+
+        legacy, legacy_time = read_everything(mirror_root, 10)
+        # Files are ordered by mtime (ties are arbitrary): compare against the 10 highest numbers
+        all_blocks = MirrorExplorerBridge(str(mirror_root), CHAIN).get_latest_blocks(args.blocks)
+        legacy['latest'] = sorted(((b['index'], b['transactions'], b['total_value'])
+                                   for b in all_blocks), reverse=True)[:10]
+        print(f"  per-file readers:   {legacy_time * 1000:8.1f}ms")
+
+        start = time.perf_counter()
+        stats = convert_mirror(chain_path, remove_source=True)
+        print(f"  convert:            {(time.perf_counter() - start) * 1000:8.1f}ms ({stats})")
+        assert stats['imported'] == args.blocks
+
+        hct_metrics_collector._block_stores.clear()
+        stored, store_time = read_everything(mirror_root, 10)
+        print(f"  block store readers: {store_time * 1000:7.1f}ms")
+
+        for key in legacy:
+            assert legacy[key] == stored[key], (key, legacy[key], stored[key])
+
+        # Payload round trip and incremental convert
+        store = open_block_store(chain_path)
+        raw = store.get_raw(FIRST_BLOCK + 5)
+        assert raw['result']['number'] == hex(FIRST_BLOCK + 5)
+        assert store.get_normalized(FIRST_BLOCK + 5)['block'] == hex(FIRST_BLOCK + 5)
+        assert store.get_raw(FIRST_BLOCK - 1) is None
+        assert convert_mirror(chain_path)['imported'] == 0
+
+        # A fetch that ran before the block existed stays on disk for the mirror to retry
+        pending = chain_path / "raw" / f"block_{hex(FIRST_BLOCK + args.blocks)}.json"
+        pending.write_text('{"jsonrpc":"2.0","id":1,"result":null}')
+        assert convert_mirror(chain_path, remove_source=True)['pending'] == 1 and pending.exists()
+
+        # Readers pick up blocks committed after they opened the store
+        with MirrorBlockStore(chain_path / "blocks", writable=True) as writer:
+            writer.append_block(json.dumps({"result": {"number": hex(FIRST_BLOCK + args.blocks + 1),
+                                                       "transactions": []}}).encode())
+        store.refresh()
+        assert len(store) == args.blocks + 1
+
+        check_rollover_sync(mirror_root / "rollover")
+
+        print("=" * 70)
+        print(f"✅ Readers agree; {legacy_time / store_time:.0f}x faster from the block store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Live explorer feed test: event bus semantics and the mirror explorer's SSE/WebSocket feeds
+
+Runs mirror_explorer_integration's app under uvicorn against a temporary
+mirror, connects many SSE viewers and a WebSocket viewer, writes blocks with
+the Python ingester and checks every viewer gets each block / cell spawn /
+threat once, in order, with a stats event per batch. Also checks cursor resume,
+reset on evicted or foreign cursors, and that a stalled subscriber cannot
+hold up the bus. Reports how often stats were computed against what polling
+would have cost.
+
+Usage: python3 test_mirror_event_bus.py [--viewers 50] [--batches 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import uvicorn
+import websockets
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hermetic_mirror_ingester import HermeticMirrorIngester
+from mirror_event_bus import EventBus
+from test_mirror_ingester import FIRST_BLOCK, make_block
+
+CHAIN = "optimism"
+BLOCKS_PER_BATCH = 4
+
+
+async def check_bus_semantics():
+    bus = EventBus(buffer_size=10, max_queue=5)
+    for i in range(8):
+        bus.publish('block', {'n': i})
+
+    # Resume replays exactly what was missed
+    with bus.subscribe(f"{bus.epoch}-5") as subscription:
+        assert [(await subscription.get(0.1))['data']['n'] for _ in range(3)] == [5, 6, 7]
+        assert await subscription.get(0.01) is None
+
+    # Evicted, future or foreign cursors ask the client to reload
+    for _ in range(10):
+        bus.publish('block', {})
+    for cursor in (f"{bus.epoch}-2", f"{bus.epoch}-999", "otherepoch-5"):
+        with bus.subscribe(cursor) as subscription:
+            assert (await subscription.get(0.1))['type'] == 'reset'
+
+    # A subscriber that never reads costs one bounded queue; others are unaffected
+    stalled = bus.subscribe()
+    live = bus.subscribe()
+    for i in range(100):
+        bus.publish('block', {'n': i})
+        assert (await live.get(0.1))['data']['n'] == i
+    assert stalled.queue.qsize() == 1 and bus.get_stats()['lagging'] == 1
+    reset = await stalled.get(0.1)
+    assert reset['type'] == 'reset' and reset['id'] == bus.cursor()
+    bus.publish('block', {'n': 100})
+    assert (await stalled.get(0.1))['data']['n'] == 100  # Back in step after resyncing
+    stalled.close()
+    live.close()
+
+
+class ExplorerServer:
+    """mirror_explorer_integration's app on a random port, in a background thread"""
+
+    def __init__(self):
+        import mirror_explorer_integration
+        self.module = mirror_explorer_integration
+        self.stats_calls = 0
+        original = self.module.bridge.get_stats
+
+        def counting_get_stats():
+            self.stats_calls += 1
+            return original()
+
+        self.module.watcher.summary = counting_get_stats
+        self.server = uvicorn.Server(uvicorn.Config(self.module.app, host="127.0.0.1", port=0, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join(5)
+
+
+async def sse_events(client: httpx.AsyncClient, url: str, received: list, headers=None):
+    """Collect SSE events until cancelled"""
+    async with client.stream('GET', url, headers=headers or {}) as response:
+        event = {}
+        async for line in response.aiter_lines():
+            if line.startswith('id: '):
+                event['id'] = line[4:]
+            elif line.startswith('event: '):
+                event['type'] = line[7:]
+            elif line.startswith('data: '):
+                event['data'] = json.loads(line[6:])
+            elif line == '' and event:
+                received.append(event)
+                event = {}
+
+
+async def ws_events(url: str, received: list):
+    async with websockets.connect(url) as socket:
+        async for message in socket:
+            received.append(json.loads(message))
+
+
+def write_batch(ingester: HermeticMirrorIngester, first: int):
+    ingester._write_blocks([{"jsonrpc": "2.0", "id": 1, "result": make_block(n)}
+                            for n in range(first, first + BLOCKS_PER_BATCH)])
+
+
+async def wait_for(condition, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise AssertionError("Timed out waiting for events")
+        await asyncio.sleep(0.01)
+
+
+def of_type(events, event_type):
+    return [e['data'] for e in events if e.get('type') == event_type]
+
+
+async def check_explorer_feed(viewers: int, batches: int):
+    ingester = HermeticMirrorIngester(CHAIN, mirror_root="./luxbin_mirror")
+    write_batch(ingester, FIRST_BLOCK)  # History before the explorer starts (served by REST)
+    next_block = FIRST_BLOCK + BLOCKS_PER_BATCH
+
+    with ExplorerServer() as server:
+        async with httpx.AsyncClient(timeout=None, limits=httpx.Limits(max_connections=viewers + 10)) as client:
+            sse = [[] for _ in range(viewers)]
+            ws = []
+            tasks = [asyncio.create_task(sse_events(client, server.url + "/api/events", events)) for events in sse]
+            tasks.append(asyncio.create_task(ws_events(server.url.replace("http", "ws") + "/api/ws", ws)))
+            await wait_for(lambda: all(events for events in sse) and ws)
+            assert all(events[0]['type'] == 'hello' and not events[0]['data']['resumed'] for events in sse)
+            assert all('id' not in events[0] for events in sse) and ws[0]['id'] is None
+
+            latencies = []
+            for _ in range(batches):
+                written = time.perf_counter()
+                write_batch(ingester, next_block)
+                next_block += BLOCKS_PER_BATCH
+                expected = next_block - FIRST_BLOCK - BLOCKS_PER_BATCH
+                await wait_for(lambda: all(len(of_type(events, 'block')) == expected for events in sse + [ws])
+                               and all(of_type(events, 'stats') and of_type(events, 'stats')[-1]['total_blocks']
+                                       == next_block - FIRST_BLOCK for events in sse))
+                latencies.append(time.perf_counter() - written)
+
+            # Every viewer saw every new block, threat and cell spawn once, in order
+            new_blocks = list(range(FIRST_BLOCK + BLOCKS_PER_BATCH, next_block))
+            for events in sse + [ws]:
+                assert [b['index'] for b in of_type(events, 'block')] == new_blocks
+                assert [int(t['block'], 16) for t in of_type(events, 'threat')] == new_blocks
+                assert [int(c['block'], 16) for c in of_type(events, 'cell_spawn')] == new_blocks
+            cell = of_type(sse[0], 'cell_spawn')[0]
+            rest = (await client.get(server.url + "/api/transactions?limit=100")).json()['transactions']
+            assert cell in rest
+            block = of_type(sse[0], 'block')[-1]
+            assert block == (await client.get(server.url + "/api/blocks?limit=1")).json()['blocks'][0]
+
+            # Reconnect with Last-Event-ID: exactly the missed events are replayed
+            tasks[0].cancel()
+            await asyncio.gather(tasks[0], return_exceptions=True)
+            last_id = sse[0][-1]['id']
+            write_batch(ingester, next_block)
+            next_block += BLOCKS_PER_BATCH
+            await wait_for(lambda: len(of_type(sse[1], 'block')) == len(new_blocks) + BLOCKS_PER_BATCH)
+            resumed = []
+            tasks[0] = asyncio.create_task(sse_events(client, server.url + "/api/events", resumed,
+                                                      headers={'Last-Event-ID': last_id}))
+            await wait_for(lambda: len(of_type(resumed, 'block')) == BLOCKS_PER_BATCH)
+            seq = lambda event: int(event['id'].rsplit('-', 1)[1])
+            missed = [e for e in sse[1] if e['type'] != 'hello' and seq(e) > seq(sse[0][-1])]
+            assert resumed[0]['data']['resumed'] and resumed[0]['id'] == last_id
+            assert [e['id'] for e in resumed[1:]] == [e['id'] for e in missed][:len(resumed) - 1]
+
+            bus_stats = (await client.get(server.url + "/api/events/stats")).json()
+            assert bus_stats['subscribers'] == viewers + 1
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    ingester.close()
+    return server.stats_calls, batches + 1, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live explorer feed test")
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--batches", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"🧪 Live explorer feed test ({args.viewers} SSE viewers + 1 WebSocket)")
+    print("=" * 70)
+
+    asyncio.run(check_bus_semantics())
+    print("✅ cursor resume, reset and backpressure")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # The explorer module mirrors ./luxbin_mirror
+        try:
+            stats_calls, batches, latencies = asyncio.run(check_explorer_feed(args.viewers, args.batches))
+        finally:
+            os.chdir(cwd)
+    print("✅ every viewer receives each block, threat and cell spawn once, in order")
+
+    print("=" * 70)
+    print(f"  stats computed: {stats_calls} times for {batches} ingest batches "
+          f"(polling: {args.viewers + 1} viewers x 3 endpoints per 5s)")
+    print(f"  write -> all viewers updated: {sum(latencies) / len(latencies) * 1000:.1f}ms avg")
+    # A batch's appends to three logs can straddle two polls; never per viewer
+    assert stats_calls <= 2 * batches
+
+
+if __name__ == "__main__":
+    main()
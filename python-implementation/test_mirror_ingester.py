@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Mirror ingester test against a local fake JSON-RPC server
+
+The fake server answers eth_blockNumber and eth_getBlockByNumber (single and
+batch requests) with deterministic blocks after a fixed per-request latency,
+rate-limits now and then and serves the newest blocks a moment late, like a
+load-balanced public endpoint. Checks the ingester's outputs against the
+hermetic_mirror_live.sh formats and heuristics, then measures blocks/sec one
+block per request (as the shell script fetches) and pipelined.
+
+Usage: python3 test_mirror_ingester.py [--blocks 2000] [--latency-ms 25]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from hermetic_mirror_ingester import HermeticMirrorIngester, quantum_scan, spawn_decision
+from mirror_block_store import normalize_block, open_block_store
+
+CHAIN = "optimism"
+FIRST_BLOCK = 120_000_000
+
+
+def make_block(number: int):
+    return {
+        "number": hex(number),
+        "hash": "0x" + hashlib.sha256(str(number).encode()).hexdigest(),
+        "parentHash": "0x" + hashlib.sha256(str(number - 1).encode()).hexdigest(),
+        "timestamp": hex(1_700_000_000 + 2 * (number - FIRST_BLOCK)),
+        "gasUsed": hex(int(hashlib.sha256(b"gas%d" % number).hexdigest()[:8], 16) % 30_000_000),
+        "gasLimit": hex(30_000_000),
+        "baseFeePerGas": hex(1_000 + number % 97),
+        "miner": "0x4200000000000000000000000000000000000011",
+        "difficulty": "0x0",
+        "size": hex(1_000 + number % 5_000),
+        "transactions": [{"hash": "0x%064x" % (number * 1_000 + i)} for i in range(number % 230)]
+    }
+
+
+class FakeRPC:
+    def __init__(self, head: int, latency: float, throttle_every: int = 0):
+        self.head = head
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.late_blocks = set()  # Served as null the first time they are asked for
+
+    def answer(self, request):
+        method, params = request['method'], request.get('params', [])
+        result = None
+        if method == 'eth_blockNumber':
+            result = hex(self.head)
+        elif method == 'eth_getBlockByNumber':
+            number = int(params[0], 16)
+            if number in self.late_blocks:
+                self.late_blocks.discard(number)
+            elif number <= self.head:
+                result = make_block(number)
+        return {"jsonrpc": "2.0", "id": request['id'], "result": result}
+
+    async def handle(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if self.throttle_every and self.requests % self.throttle_every == 0:
+            return web.Response(status=429, text="rate limited")
+        payload = await request.json()
+        if isinstance(payload, list):
+            return web.json_response([self.answer(r) for r in payload])
+        return web.json_response(self.answer(payload))
+
+
+async def serve(fake: FakeRPC):
+    app = web.Application()
+    app.router.add_post('/', fake.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+def read_jsonl(path: Path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+async def run_ingester(mirror_root: Path, url: str, start: int, end: int, **options):
+    ingester = HermeticMirrorIngester(CHAIN, rpc_url=url, mirror_root=str(mirror_root), **options)
+    try:
+        started = time.perf_counter()
+        mirrored = await ingester.backfill(start, end)
+        return mirrored, time.perf_counter() - started
+    finally:
+        ingester.close()
+
+
+async def check_outputs(tmp: Path, latency: float):
+    fake = FakeRPC(head=FIRST_BLOCK + 499, latency=latency, throttle_every=7)
+    fake.late_blocks = {FIRST_BLOCK + 498, FIRST_BLOCK + 499}
+    runner, url = await serve(fake)
+    try:
+        mirrored, _ = await run_ingester(tmp, url, FIRST_BLOCK, FIRST_BLOCK + 499, block_files=True)
+        assert mirrored == 500
+
+        # Re-running the same range fetches nothing
+        requests = fake.requests
+        assert (await run_ingester(tmp, url, FIRST_BLOCK, FIRST_BLOCK + 499))[0] == 0
+        assert fake.requests == requests
+
+        # Single mode picks up the new head and continues the rhythm log
+        fake.head += 1
+        ingester = HermeticMirrorIngester(CHAIN, rpc_url=url, mirror_root=str(tmp))
+        try:
+            assert await ingester.mirror_latest() == 1
+        finally:
+            ingester.close()
+    finally:
+        await runner.cleanup()
+
+    chain_path = tmp / CHAIN
+    last = FIRST_BLOCK + 500
+    store = open_block_store(chain_path)
+    assert len(store) == 501
+    assert list(store.block_numbers()) == list(range(FIRST_BLOCK, last + 1))
+
+    # Stored payloads match what the shell script would have written
+    for number in (FIRST_BLOCK, FIRST_BLOCK + 230, last):
+        block = make_block(number)
+        assert store.get_raw(number)['result'] == block
+        assert store.get_normalized(number) == normalize_block(block)
+    raw_file = chain_path / "raw" / f"block_{hex(FIRST_BLOCK + 7)}.json"
+    assert json.loads(raw_file.read_text())['result'] == make_block(FIRST_BLOCK + 7)
+    sha_file = chain_path / "hashed" / f"block_{hex(FIRST_BLOCK + 7)}.raw.sha"
+    assert sha_file.read_text().strip() == hashlib.sha256(raw_file.read_bytes()).hexdigest()
+
+    vibration = read_jsonl(chain_path / "logs" / "vibration.jsonl")
+    rhythm = read_jsonl(chain_path / "logs" / "rhythm.jsonl")
+    threats = read_jsonl(chain_path / "quantum" / "threat_scores.jsonl")
+    cells = read_jsonl(chain_path / "immune" / "cells_spawned.jsonl")
+    assert len(vibration) == len(threats) == len(cells) == 501
+    assert len(rhythm) == 500  # No predecessor for the first block
+
+    assert [r['block'] for r in threats] == [hex(n) for n in range(FIRST_BLOCK, last + 1)]
+    for entry in vibration:
+        assert set(entry) == {'block', 'tx_count', 'frequency_hz', 'timestamp'}
+        assert entry['frequency_hz'] == min(432 + entry['tx_count'] * 2, 852)
+    assert all(r['block_time'] == 2 and int(r['to_block'], 16) == int(r['from_block'], 16) + 1 for r in rhythm)
+
+    for threat, cell in zip(threats, cells):
+        normalized = normalize_block(make_block(int(threat['block'], 16)))
+        expected = (30 if int(normalized['gas_used'], 16) > 15_000_000 else 0) + \
+                   (20 if normalized['tx_count'] > 200 else 0)
+        assert threat['threat_score'] == quantum_scan(normalized) == expected
+        assert (cell['cell_type'], cell['count']) == spawn_decision(expected)
+    # The two heuristics score at most 50, so (as in the shell script) DEFENDER never spawns
+    assert {c['cell_type'] for c in cells} == {'DETECTOR', 'MEMORY'}
+
+    assert (chain_path / "last_block.txt").read_text().strip() == hex(last)
+    assert len((chain_path / "logs" / "replay_index.log").read_text().splitlines()) == 501
+    active = threats[-1]['threat_score'] > 30
+    assert (chain_path / "logs" / "generative.flag").read_text().strip() == \
+        ("GENERATIVE_ACTIVE" if active else "GENERATIVE_OK")
+
+
+async def check_throughput(tmp: Path, blocks: int, latency: float):
+    fake = FakeRPC(head=FIRST_BLOCK + blocks, latency=latency)
+    runner, url = await serve(fake)
+    try:
+        # One block per request, one request at a time, like the shell script
+        sequential_blocks = min(blocks, 200)
+        _, elapsed = await run_ingester(tmp / "sequential", url, FIRST_BLOCK,
+                                        FIRST_BLOCK + sequential_blocks - 1, batch_size=1, window=1)
+        sequential_rate = sequential_blocks / elapsed
+
+        fake.requests = 0
+        mirrored, elapsed = await run_ingester(tmp / "pipelined", url, FIRST_BLOCK,
+                                               FIRST_BLOCK + blocks - 1, batch_size=20, window=8)
+        pipelined_rate = mirrored / elapsed
+        assert mirrored == blocks
+    finally:
+        await runner.cleanup()
+
+    print(f"  one block per request: {sequential_rate:8.1f} blocks/s")
+    print(f"  batched + pipelined:   {pipelined_rate:8.1f} blocks/s ({fake.requests} requests)")
+    assert pipelined_rate > sequential_rate * 5
+    return pipelined_rate / sequential_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror ingester test")
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=25)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    print(f"🧪 Mirror ingester test (fake RPC, {args.latency_ms:.0f}ms per request)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(check_outputs(Path(tmp), latency))
+    print("✅ check_outputs")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        speedup = asyncio.run(check_throughput(Path(tmp), args.blocks, latency))
+    print(f"✅ check_throughput ({speedup:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
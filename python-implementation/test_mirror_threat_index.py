@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Threat index test and benchmark
+
+Writes a threat_scores.jsonl in the format the mirror appends (1M rows by
+default), builds the block -> threat index and checks lookups against the log,
+incremental updates, re-scored blocks and a replaced log. Compares the HCT
+threat metrics with and without the index, and times a lookup against the
+linear scan the explorer used to run per cell-spawn row.
+
+Usage: python3 test_mirror_threat_index.py [--rows 1000000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hct-app' / 'api'))
+
+import hct_metrics_collector
+from hct_metrics_collector import HistoryMetricsCollector, ReligionMetricsCollector
+from mirror_immune_integration import MirrorImmuneIntegration
+from mirror_threat_index import ThreatIndex
+
+CHAIN = "optimism"
+FIRST_BLOCK = 120_000_000
+SCORES = [0] * 12 + [20] * 4 + [30] * 2 + [50, 70, 80]
+
+
+def write_threat_log(path: Path, first: int, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        for number in range(first, first + count):
+            f.write(json.dumps({"block": hex(number), "threat_score": rng.choice(SCORES),
+                                "timestamp": "2026-01-01T00:00:00Z"}) + "\n")
+
+
+def scan_for_block(path: Path, block: str):
+    """The explorer's old per-row lookup: first matching line in the log"""
+    with open(path) as f:
+        for line in f:
+            data = json.loads(line.strip())
+            if data.get('block') == block:
+                return data
+    return None
+
+
+def hct_threat_metrics(mirror_root: Path):
+    history = HistoryMetricsCollector(str(mirror_root))
+    religion = ReligionMetricsCollector(str(mirror_root))
+
+    async def collect():
+        return (await history._compute_anomaly_learning(CHAIN),
+                await religion._compute_non_violence(CHAIN))
+
+    start = time.perf_counter()
+    metrics = asyncio.run(collect())
+    return metrics, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Threat index test and benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"🧪 Threat index test ({args.rows:,} threat rows)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror_root = Path(tmp)
+        chain_path = mirror_root / CHAIN
+        log = chain_path / "quantum" / "threat_scores.jsonl"
+        write_threat_log(log, FIRST_BLOCK, args.rows)
+        # Some blocks scored again later (re-mirrored), for anomaly learning's recurrence count
+        with open(log, 'a') as f:
+            for number in range(FIRST_BLOCK, FIRST_BLOCK + 2000, 7):
+                f.write(json.dumps({"block": hex(number), "threat_score": 80,
+                                    "timestamp": "2026-01-02T00:00:00Z"}) + "\n")
+
+        # HCT metrics from a full log scan first, then from the index
+        hct_metrics_collector.get_threat_index, saved = None, hct_metrics_collector.get_threat_index
+        scanned, scan_metrics_time = hct_threat_metrics(mirror_root)
+        hct_metrics_collector.get_threat_index = saved
+
+        index = ThreatIndex(chain_path)
+        start = time.perf_counter()
+        built = index.update()
+        build_time = time.perf_counter() - start
+        assert built == len(index) == args.rows + len(range(0, 2000, 7))
+
+        indexed, _ = hct_threat_metrics(mirror_root)
+        assert scanned == indexed, (scanned, indexed)
+        _, index_metrics_time = hct_threat_metrics(mirror_root)
+        print(f"✅ HCT anomaly learning / non-violence agree: {indexed[0]:.4f} / {indexed[1]:.4f}")
+
+        # Lookups match the log; re-scored blocks return the latest record
+        rng = random.Random(1)
+        lines = log.read_text().splitlines()
+        latest = {}
+        for line in lines:
+            record = json.loads(line)
+            latest[record['block']] = record
+        for _ in range(2000):
+            block = hex(rng.randrange(FIRST_BLOCK, FIRST_BLOCK + args.rows))
+            assert index.lookup(block) == latest[block]
+            assert index.score(int(block, 16)) == latest[block]['threat_score']
+        assert index.lookup(hex(FIRST_BLOCK + 7))['threat_score'] == 80
+        assert index.lookup(hex(FIRST_BLOCK - 1)) is None and index.score("garbage") == 0
+        print("✅ lookups match the log")
+
+        # Timing: indexed lookups vs the old linear scan (worst case: newest block)
+        probes = [hex(rng.randrange(FIRST_BLOCK, FIRST_BLOCK + args.rows)) for _ in range(10_000)]
+        start = time.perf_counter()
+        for block in probes:
+            index.lookup(block)
+        lookup_time = (time.perf_counter() - start) / len(probes)
+        start = time.perf_counter()
+        assert scan_for_block(log, hex(FIRST_BLOCK + args.rows - 1)) is not None
+        scan_time = time.perf_counter() - start
+
+        # Incremental update: complete lines only, visible to other readers
+        reader = ThreatIndex(chain_path)
+        with open(log, 'a') as f:
+            f.write(json.dumps({"block": hex(FIRST_BLOCK + args.rows), "threat_score": 50,
+                                "timestamp": "2026-01-03T00:00:00Z"}) + "\n")
+            f.write('{"block": "0x1", "threat')
+        start = time.perf_counter()
+        assert index.update() == 1
+        update_time = time.perf_counter() - start
+        assert index.update() == 0
+        reader.update()
+        assert reader.score(FIRST_BLOCK + args.rows) == 50
+        print("✅ incremental update indexes only complete new lines")
+
+        # Immune integration lookups and whole-history stats
+        integration = MirrorImmuneIntegration(str(mirror_root), CHAIN)
+        threat = integration.lookup_threat(hex(FIRST_BLOCK + args.rows))
+        assert threat.threat_score == 50 and threat.chain == CHAIN
+        assert integration.lookup_threat(hex(FIRST_BLOCK - 1)) is None
+        stats = integration._mirror_threat_stats()
+        assert stats['blocks'] == len(index) and stats['max'] == 80
+        integration.follower.close()
+        print("✅ immune integration lookups")
+
+        # A replaced log is re-indexed from the top, also for readers holding the old view
+        os.remove(log)
+        write_threat_log(log, FIRST_BLOCK + 10, 100, seed=2)
+        assert index.update() == 100
+        reader.update()
+        assert len(reader) == 100 and reader.score(FIRST_BLOCK + 5) == 0
+        assert reader.lookup(hex(FIRST_BLOCK + 10)) == json.loads(log.read_text().splitlines()[0])
+        print("✅ replaced log is re-indexed")
+
+    print("=" * 70)
+    print(f"  build index ({args.rows:,} rows): {build_time * 1000:9.1f}ms")
+    print(f"  incremental update (1 row):  {update_time * 1000:9.2f}ms")
+    print(f"  indexed lookup:              {lookup_time * 1e6:9.1f}µs")
+    print(f"  linear scan lookup:          {scan_time * 1000:9.1f}ms "
+          f"(x10 per /api/transactions call before)")
+    print(f"  HCT threat metrics, scan:    {scan_metrics_time * 1000:9.1f}ms")
+    print(f"  HCT threat metrics, index:   {index_metrics_time * 1000:9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
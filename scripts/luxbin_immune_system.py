@@ -7,15 +7,39 @@ Author: Nichole Christie
 License: MIT
 """
 
-import cirq
 import hashlib
 import random
 import time
 import os
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
 
+import numpy as np
+
+try:
+    import cirq
+    CIRQ_AVAILABLE = True
+except ImportError:
+    cirq = None
+    CIRQ_AVAILABLE = False
+
+# Transaction features scanned by detector cells, one per qubit
+SCAN_FEATURES = [
+    'gas_price_deviation',
+    'value_anomaly',
+    'recipient_reputation',
+    'temporal_pattern_break',
+    'smart_contract_risk',
+    'network_centrality_spike',
+    'validator_coordination',
+    'mempool_manipulation'
+]
+SCAN_QUBITS = len(SCAN_FEATURES)
+SCAN_REPETITIONS = 1000
+
 
 @dataclass
 class ThreatData:
@@ -37,9 +61,11 @@ class DetectorCell:
         self.false_positives = 0
         self.reputation = 100
 
-    def quantum_scan(self, transaction_data: Dict) -> Tuple[bool, float]:
+    def quantum_scan(self, transaction_data: Dict, simulator=None) -> Tuple[bool, float]:
         """Use quantum superposition to scan multiple threat patterns"""
-        qubits = [cirq.GridQubit(i, 0) for i in range(8)]
+        if not CIRQ_AVAILABLE:
+            raise RuntimeError("cirq is required for circuit scans (pip install cirq)")
+        qubits = [cirq.GridQubit(i, 0) for i in range(SCAN_QUBITS)]
         circuit = cirq.Circuit()
 
         # Encode transaction features into quantum state
@@ -52,8 +78,8 @@ class DetectorCell:
         circuit.append(cirq.measure(*qubits, key='threat_signature'))
 
         # Simulate and analyze
-        simulator = cirq.Simulator()
-        result = simulator.run(circuit, repetitions=1000)
+        simulator = simulator or cirq.Simulator()
+        result = simulator.run(circuit, repetitions=SCAN_REPETITIONS)
         threat_score = self._analyze_quantum_measurement(result)
 
         is_threat = threat_score > self.threat_threshold
@@ -62,23 +88,199 @@ class DetectorCell:
 
     def _encode_feature(self, data: Dict, index: int) -> float:
         """Map transaction features to quantum rotation angles"""
-        features = [
-            data.get('gas_price_deviation', 0),
-            data.get('value_anomaly', 0),
-            data.get('recipient_reputation', 0),
-            data.get('temporal_pattern_break', 0),
-            data.get('smart_contract_risk', 0),
-            data.get('network_centrality_spike', 0),
-            data.get('validator_coordination', 0),
-            data.get('mempool_manipulation', 0)
-        ]
-        return (features[index] / 100.0) * 3.14159
+        return (data.get(SCAN_FEATURES[index], 0) / 100.0) * 3.14159
 
     def _analyze_quantum_measurement(self, result) -> float:
         """Extract threat probability from quantum measurement"""
         measurements = result.measurements['threat_signature']
-        threat_count = sum(sum(row) for row in measurements)
-        return threat_count / (len(measurements) * 8)
+        # Count in NumPy: cirq returns int8 arrays, which overflow when summed with sum()
+        threat_count = int(np.count_nonzero(measurements))
+        return threat_count / (len(measurements) * SCAN_QUBITS)
+
+
+class QuantumScanEngine:
+    """Batched detector scans: N transactions x M detectors in one call
+
+    The scan circuit applies Ry(angle) then H to each qubit of |0...0>, a
+    product state, so each qubit reads 1 independently with probability
+    (1 - sin(angle)) / 2. A detector's score is the fraction of 1s over
+    repetitions x qubits; the "numpy" backend draws each qubit's count of
+    1s as Binomial(repetitions, p) for every transaction and detector at
+    once, which has the same distribution as simulating the circuit. The
+    "cirq" backend runs the circuits one by one for validation.
+    """
+
+    BACKENDS = ('numpy', 'cirq')
+
+    def __init__(self, backend: str = 'numpy', repetitions: int = SCAN_REPETITIONS,
+                 seed: Optional[int] = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown scan backend: {backend} (choose from {self.BACKENDS})")
+        if backend == 'cirq' and not CIRQ_AVAILABLE:
+            raise RuntimeError("cirq is required for the cirq scan backend (pip install cirq)")
+        self.backend = backend
+        self.repetitions = repetitions
+        self.rng = np.random.default_rng(seed)
+        self.simulator = cirq.Simulator(seed=seed) if backend == 'cirq' else None
+
+    @staticmethod
+    def encode(transactions: Sequence[Dict]) -> np.ndarray:
+        """Rotation angles, shape (transactions, qubits)"""
+        features = np.array([[tx.get(name, 0) for name in SCAN_FEATURES] for tx in transactions],
+                            dtype=np.float64).reshape(len(transactions), SCAN_QUBITS)
+        return (features / 100.0) * 3.14159
+
+    @staticmethod
+    def one_probabilities(angles: np.ndarray) -> np.ndarray:
+        """P(measure 1) per qubit after Ry(angle) then H"""
+        return np.clip((1.0 - np.sin(angles)) / 2.0, 0.0, 1.0)
+
+    def sample_scores(self, transactions: Sequence[Dict], scans: int) -> np.ndarray:
+        """Threat scores of ``scans`` independent scans per transaction, shape (transactions, scans)"""
+        p = self.one_probabilities(self.encode(transactions))
+        ones = self.rng.binomial(self.repetitions, p[:, None, :], size=(len(transactions), scans, SCAN_QUBITS))
+        return ones.sum(axis=2) / (self.repetitions * SCAN_QUBITS)
+
+    def scan_batch(self, transactions: Sequence[Dict],
+                   detectors: Sequence[DetectorCell]) -> Tuple[np.ndarray, np.ndarray]:
+        """Scan every transaction with every detector
+
+        Returns:
+            (is_threat, threat_scores), both shaped (transactions, detectors)
+        """
+        if self.backend == 'cirq':
+            results = [[detector.quantum_scan(tx, self.simulator) for detector in detectors]
+                       for tx in transactions]
+            scores = np.array([[score for _, score in row] for row in results],
+                              dtype=np.float64).reshape(len(transactions), len(detectors))
+        else:
+            scores = self.sample_scores(transactions, len(detectors))
+
+        thresholds = np.array([detector.threat_threshold for detector in detectors], dtype=np.float64)
+        return scores > thresholds, scores
+
+# ===== DETECTION EXECUTORS =====
+
+def scan_detectors(engine: QuantumScanEngine, detectors: Sequence[DetectorCell],
+                   transactions: Sequence[Dict], samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scan each transaction with its sampled detectors (row i of ``samples`` indexes ``detectors``)
+
+    Returns:
+        (votes, threat_scores), both shaped like ``samples``
+    """
+    if engine.backend == 'cirq':
+        scanned = [engine.scan_batch([tx], [detectors[i] for i in row]) for tx, row in zip(transactions, samples)]
+        return np.vstack([v for v, _ in scanned]), np.vstack([s for _, s in scanned])
+
+    thresholds = np.array([d.threat_threshold for d in detectors], dtype=np.float64)
+    scores = engine.sample_scores(transactions, samples.shape[1])
+    return scores > thresholds[samples], scores
+
+
+class DetectionExecutor:
+    """Runs detector scans in the event loop's thread (fine for the numpy backend)"""
+
+    workers = 1
+
+    def __init__(self, detectors: Sequence[DetectorCell], backend: str = 'numpy',
+                 repetitions: int = SCAN_REPETITIONS, seed: Optional[int] = None):
+        self.detectors = detectors
+        self.engine = QuantumScanEngine(backend, repetitions, seed)
+
+    async def scan(self, transactions: Sequence[Dict], samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return scan_detectors(self.engine, self.detectors, transactions, samples)
+
+    def close(self):
+        pass
+
+
+class ThreadDetectionExecutor(DetectionExecutor):
+    """Runs detector scans in a worker thread (keeps the event loop responsive; one core)"""
+
+    async def scan(self, transactions: Sequence[Dict], samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return await asyncio.to_thread(scan_detectors, self.engine, self.detectors, transactions, samples)
+
+
+# Per-worker detector state, set once when the pool starts the worker
+_worker_detectors: List[DetectorCell] = []
+_worker_settings: Dict = {}
+
+
+def _init_detection_worker(detector_state: List[Tuple[str, float]], backend: str, repetitions: int):
+    global _worker_detectors, _worker_settings
+    _worker_detectors = []
+    for cell_id, threshold in detector_state:
+        detector = DetectorCell(cell_id)
+        detector.threat_threshold = threshold
+        _worker_detectors.append(detector)
+    _worker_settings = {'backend': backend, 'repetitions': repetitions}
+
+
+def _run_detection_job(seed: Tuple[int, ...], transactions: List[Dict],
+                       samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    engine = QuantumScanEngine(_worker_settings['backend'], _worker_settings['repetitions'], seed=None)
+    engine.rng = np.random.default_rng(np.random.SeedSequence(seed))
+    if engine.simulator is not None:
+        engine.simulator = cirq.Simulator(seed=int(engine.rng.integers(2 ** 32)))
+    return scan_detectors(engine, _worker_detectors, transactions, samples)
+
+
+class ProcessDetectionExecutor(DetectionExecutor):
+    """Runs detector scans on a pool of pre-started worker processes
+
+    Each worker holds a copy of the detectors (ids and thresholds, taken when
+    the pool starts; call ``restart`` after changing them). A scan is split
+    into chunks of ``chunk_size`` transactions that run on all workers at
+    once. Each chunk draws from its own seed derived from ``seed`` and a
+    running chunk counter, so seeded results do not depend on which worker
+    ran which chunk.
+    """
+
+    def __init__(self, detectors: Sequence[DetectorCell], backend: str = 'numpy',
+                 repetitions: int = SCAN_REPETITIONS, seed: Optional[int] = None,
+                 workers: Optional[int] = None, chunk_size: int = 256):
+        super().__init__(detectors, backend, repetitions, seed)
+        self.backend = backend
+        self.repetitions = repetitions
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % (2 ** 63))
+        self.chunks_run = 0
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.restart()
+
+    def restart(self):
+        """(Re)start the workers with the detectors' current state"""
+        self.close()
+        state = [(d.cell_id, d.threat_threshold) for d in self.detectors]
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_detection_worker,
+                                        initargs=(state, self.backend, self.repetitions))
+        # Start every worker now rather than on the first transaction
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    async def scan(self, transactions: Sequence[Dict], samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        loop = asyncio.get_running_loop()
+        jobs = []
+        for start in range(0, len(transactions), self.chunk_size):
+            self.chunks_run += 1
+            end = start + self.chunk_size
+            jobs.append(loop.run_in_executor(self.pool, _run_detection_job, (self.seed, self.chunks_run),
+                                             list(transactions[start:end]), samples[start:end]))
+        results = await asyncio.gather(*jobs)
+        return np.vstack([v for v, _ in results]), np.vstack([s for _, s in results])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+DETECTION_EXECUTORS = {
+    'inline': DetectionExecutor,
+    'thread': ThreadDetectionExecutor,
+    'process': ProcessDetectionExecutor
+}
 
 
 class DefenderCell:
@@ -185,13 +387,223 @@ class DefenderCell:
         }
 
 
+# ===== THREAT MEMORY STORE =====
+
+def _leaf_hash(item: str) -> bytes:
+    return hashlib.sha256(b'\x00' + item.encode()).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b'\x01' + left + right).digest()
+
+
+class MerkleAccumulator:
+    """Append-only Merkle accumulator (a Merkle mountain range)
+
+    Leaves are never rewritten, so an append only hashes the new leaf up
+    through the perfect subtrees it completes: O(log n). The root bags the
+    peaks of those subtrees. Proofs carry the leaf's siblings up to its peak
+    plus the other peaks.
+    """
+
+    def __init__(self):
+        self.levels: List[List[bytes]] = [[]]  # levels[h][j]: node j of height h
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def append(self, item: str) -> int:
+        """Add a leaf; returns its index"""
+        index = len(self)
+        node = _leaf_hash(item)
+        height = 0
+        self.levels[0].append(node)
+        while len(self.levels[height]) % 2 == 0:
+            left, right = self.levels[height][-2:]
+            node = _node_hash(left, right)
+            height += 1
+            if height == len(self.levels):
+                self.levels.append([])
+            self.levels[height].append(node)
+        return index
+
+    def _peaks(self) -> List[Tuple[int, int]]:
+        """(height, position) of each perfect subtree, left to right"""
+        peaks, covered = [], 0
+        for height in reversed(range(len(self.levels))):
+            if len(self) - covered >= 1 << height:
+                peaks.append((height, covered >> height))
+                covered += 1 << height
+        return peaks
+
+    @staticmethod
+    def _bag(peaks: List[bytes]) -> bytes:
+        root = peaks[-1]
+        for peak in reversed(peaks[:-1]):
+            root = _node_hash(peak, root)
+        return root
+
+    def root(self) -> str:
+        if not len(self):
+            return hashlib.sha256(b'empty').hexdigest()
+        return self._bag([self.levels[h][j] for h, j in self._peaks()]).hex()
+
+    def proof(self, index: int) -> Dict:
+        """Inclusion proof for leaf ``index`` against the current root"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"No leaf {index} (accumulator has {len(self)})")
+        peaks = self._peaks()
+        peak_index = next(i for i, (h, j) in enumerate(peaks) if j == index >> h)
+        siblings = [(self.levels[h][(index >> h) ^ 1].hex(), (index >> h) & 1 == 1)
+                    for h in range(peaks[peak_index][0])]
+        return {
+            'index': index,
+            'siblings': siblings,  # (hash, sibling is on the left)
+            'peaks': [self.levels[h][j].hex() for h, j in peaks],
+            'peak_index': peak_index
+        }
+
+    @staticmethod
+    def verify(item: str, proof: Dict, root: str) -> bool:
+        node = _leaf_hash(item)
+        for sibling, is_left in proof['siblings']:
+            sibling = bytes.fromhex(sibling)
+            node = _node_hash(sibling, node) if is_left else _node_hash(node, sibling)
+        peaks = [bytes.fromhex(peak) for peak in proof['peaks']]
+        if peaks[proof['peak_index']] != node:
+            return False
+        return MerkleAccumulator._bag(peaks).hex() == root
+
+
+class ThreatMemoryStore:
+    """Threat memories shared by all memory cells
+
+    Feature vectors live in one NumPy matrix (a column per feature name seen),
+    so fuzzy recall compares a threat against every stored pattern in one
+    vectorized pass. Similarity is 1 - the mean absolute feature difference
+    over the features either side has (a missing feature counts as 0), on
+    the 0-100 feature scale. Each new signature is appended to a Merkle
+    accumulator.
+
+    The immune pipeline recalls and learns on different worker threads, so
+    the matrices and the accumulator are only touched under ``_lock``.
+    """
+
+    def __init__(self, match_threshold: float = 0.85, initial_capacity: int = 64):
+        self.match_threshold = match_threshold
+        self.memories: Dict[str, Dict] = {}  # signature -> memory
+        self.signatures: List[str] = []  # row -> signature
+        self.columns: Dict[str, int] = {}
+        self.vectors = np.zeros((initial_capacity, 8))
+        self.present = np.zeros((initial_capacity, 8), dtype=bool)
+        self.counts = np.zeros(initial_capacity, dtype=np.int64)  # Features per row
+        self.merkle = MerkleAccumulator()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    @staticmethod
+    def signature(features: Dict[str, float]) -> str:
+        """Exact-match key for a feature set"""
+        feature_string = ''.join(f"{k}:{v:.4f}" for k, v in sorted(features.items()))
+        return hashlib.sha256(feature_string.encode()).hexdigest()
+
+    def _encode(self, features: Dict[str, float], add_columns: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature vector and mask over the known columns; only ``add`` grows the matrices"""
+        if add_columns:
+            for name in features:
+                if name not in self.columns:
+                    self.columns[name] = len(self.columns)
+            self._reserve(len(self.signatures), len(self.columns))
+        vector = np.zeros(len(self.columns))
+        mask = np.zeros(len(self.columns), dtype=bool)
+        for name, value in features.items():
+            column = self.columns.get(name)
+            if column is not None:
+                vector[column] = value
+                mask[column] = True
+        return vector, mask
+
+    def _reserve(self, rows: int, columns: int):
+        capacity, width = self.vectors.shape
+        if rows < capacity and columns <= width:
+            return
+        capacity = max(capacity, 1) * 2 if rows >= capacity else capacity
+        width = max(width * 2, columns) if columns > width else width
+        vectors, present = np.zeros((capacity, width)), np.zeros((capacity, width), dtype=bool)
+        counts = np.zeros(capacity, dtype=np.int64)
+        used = len(self.signatures)
+        vectors[:used, :self.vectors.shape[1]] = self.vectors[:used]
+        present[:used, :self.present.shape[1]] = self.present[:used]
+        counts[:used] = self.counts[:used]
+        self.vectors, self.present, self.counts = vectors, present, counts
+
+    def add(self, signature: str, features: Dict[str, float], memory: Dict) -> Dict:
+        """Store a new pattern and append its signature to the accumulator"""
+        with self._lock:
+            vector, mask = self._encode(features, add_columns=True)
+            row = len(self.signatures)
+            width = len(vector)
+            self.vectors[row, :width], self.present[row, :width], self.counts[row] = vector, mask, mask.sum()
+            self.signatures.append(signature)
+            self.memories[signature] = memory
+            memory['merkle_index'] = self.merkle.append(signature)
+            return memory
+
+    def similarities(self, features: Dict[str, float]) -> np.ndarray:
+        """Similarity of ``features`` to every stored pattern, by row"""
+        with self._lock:
+            return self._similarities(features)
+
+    def _similarities(self, features: Dict[str, float]) -> np.ndarray:
+        rows = len(self.signatures)
+        if not rows:
+            return np.zeros(0)
+        vector, mask = self._encode(features, add_columns=False)
+        width = len(vector)
+        # Missing features are stored as 0, so the difference needs no masking
+        difference = np.abs(self.vectors[:rows, :width] - vector).sum(axis=1)
+        # Features no stored pattern has yet differ from every pattern by their full value
+        unseen = [abs(value) for name, value in features.items() if name not in self.columns]
+        if mask.all():
+            shared = self.counts[:rows]
+        else:
+            shared = self.present[:rows, :width][:, mask].sum(axis=1)
+        counted = self.counts[:rows] + int(mask.sum()) - shared + len(unseen)
+        mean_difference = (difference + sum(unseen)) / np.maximum(counted, 1)
+        return np.clip(1.0 - mean_difference / 100.0, 0.0, 1.0)
+
+    def nearest(self, features: Dict[str, float]) -> Tuple[Optional[Dict], float]:
+        """Most similar stored memory and its similarity"""
+        with self._lock:
+            similarities = self._similarities(features)
+            if not len(similarities):
+                return None, 0.0
+            row = int(np.argmax(similarities))
+            return self.memories[self.signatures[row]], float(similarities[row])
+
+    def proof(self, signature: str) -> Dict:
+        with self._lock:
+            return self.merkle.proof(self.memories[signature]['merkle_index'])
+
+    @property
+    def merkle_root(self) -> str:
+        with self._lock:
+            return self.merkle.root()
+
+
 class MemoryCell:
     """Immune Memory analog - Stores patterns of past attacks"""
 
-    def __init__(self, cell_id: str):
+    def __init__(self, cell_id: str, store: Optional[ThreatMemoryStore] = None):
         self.cell_id = cell_id
-        self.memory_storage: Dict[str, Dict] = {}
-        self.merkle_root = None
+        self.store = store if store is not None else ThreatMemoryStore()
+        self.memory_storage: Dict[str, Dict] = self.store.memories
+
+    @property
+    def merkle_root(self) -> str:
+        return self.store.merkle_root
 
     def store_threat_pattern(self, threat_data: ThreatData, response_effectiveness: float) -> Dict:
         """Permanently record successful immune response"""
@@ -215,9 +627,8 @@ class MemoryCell:
                 'quantum_fingerprint': self._quantum_encode(threat_data),
                 'features': threat_data.features
             }
-            self.memory_storage[signature] = memory
+            self.store.add(signature, threat_data.features, memory)
 
-        self._update_merkle_tree()
         return memory
 
     def recall_threat(self, new_threat_data: ThreatData) -> Optional[Dict]:
@@ -231,21 +642,21 @@ class MemoryCell:
             memory['occurrence_count'] += 1
             return self._enhance_response(memory)
 
-        # Fuzzy matching for evolved threats
-        for stored_sig, memory in self.memory_storage.items():
-            similarity = self._calculate_similarity(new_signature, stored_sig)
-            if similarity > 0.85:
-                return self._enhance_response(memory)
+        # Fuzzy matching for evolved threats: nearest stored feature vector
+        memory, similarity = self.store.nearest(new_threat_data.features)
+        if memory is not None and similarity > self.store.match_threshold:
+            return self._enhance_response(memory)
 
         return None
 
     def _generate_threat_signature(self, threat_data: ThreatData) -> str:
         """Create unique signature for threat pattern"""
-        feature_string = ''.join(f"{k}:{v:.4f}" for k, v in sorted(threat_data.features.items()))
-        return hashlib.sha256(feature_string.encode()).hexdigest()
+        return ThreatMemoryStore.signature(threat_data.features)
 
     def _quantum_encode(self, threat_data: ThreatData) -> str:
         """Create quantum fingerprint for fuzzy matching"""
+        if not CIRQ_AVAILABLE:
+            raise RuntimeError("cirq is required for quantum fingerprints (pip install cirq)")
         qubits = [cirq.GridQubit(i, 0) for i in range(8)]
         circuit = cirq.Circuit()
 
@@ -271,12 +682,6 @@ class MemoryCell:
 
         return fingerprint
 
-    def _calculate_similarity(self, sig1: str, sig2: str) -> float:
-        """Calculate similarity between threat signatures"""
-        # Hamming distance on hex strings
-        diff_count = sum(c1 != c2 for c1, c2 in zip(sig1, sig2))
-        return 1.0 - (diff_count / len(sig1))
-
     def _enhance_response(self, memory: Dict) -> Dict:
         """Strengthen response for repeat offenders"""
         avg_effectiveness = sum(memory['effectiveness_history']) / len(memory['effectiveness_history'])
@@ -288,31 +693,6 @@ class MemoryCell:
             'is_repeat_offender': True
         }
 
-    def _update_merkle_tree(self):
-        """Update Merkle root of immune memory"""
-        if not self.memory_storage:
-            self.merkle_root = hashlib.sha256(b'empty').hexdigest()
-            return
-
-        signatures = sorted(self.memory_storage.keys())
-        self.merkle_root = self._build_merkle(signatures)
-
-    def _build_merkle(self, items: List[str]) -> str:
-        """Build Merkle tree from items"""
-        if len(items) == 1:
-            return items[0]
-
-        if len(items) % 2 == 1:
-            items.append(items[-1])
-
-        next_level = []
-        for i in range(0, len(items), 2):
-            combined = items[i] + items[i + 1]
-            parent = hashlib.sha256(combined.encode()).hexdigest()
-            next_level.append(parent)
-
-        return self._build_merkle(next_level)
-
 
 class RegulatoryCell:
     """Regulatory T-Cell analog - Prevents auto-immune responses"""
@@ -427,17 +807,265 @@ class RegulatoryCell:
         return moderated
 
 
+# ===== STREAM PIPELINE =====
+
+class LatencyHistogram:
+    """Latency counts in fixed millisecond buckets"""
+
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+    def __init__(self):
+        self.counts = [0] * len(self.BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000.0
+        self.counts[int(np.searchsorted(self.BUCKETS_MS, ms))] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th percentile (ms)"""
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        seen = 0
+        for edge, count in zip(self.BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(edge, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max,
+            'buckets': {('inf' if edge == float('inf') else edge): count
+                        for edge, count in zip(self.BUCKETS_MS, self.counts) if count}
+        }
+
+
+@dataclass
+class _StreamItem:
+    seq: int
+    transaction: Dict
+    received: float
+    threat: Optional[ThreatData] = None
+    known_threat: Optional[Dict] = None
+    response: Optional[Dict] = None
+    approved: Optional[Dict] = None
+    result: Optional[Dict] = None
+
+
+_DONE = object()
+
+
+class ImmunePipeline:
+    """Staged, in-order transaction pipeline over a LuxbinImmuneSystem
+
+    Each phase of monitor_transaction is a stage with its own bounded input
+    queue and number of concurrent workers, so different transactions can be
+    in different phases at once. Detection takes whatever transactions are
+    waiting (up to ``batch_size``) as one executor batch. Transactions that
+    are not threats, or whose response is not approved, skip the remaining
+    stages. Results are released in input order; at most ``max_in_flight``
+    transactions are between intake and release, which bounds memory when one
+    transaction is slow. Stages learn and recall concurrently, so a threat
+    is recalled from memory once an earlier transaction's learning stage has
+    finished, not necessarily before the next transaction's recall.
+    """
+
+    STAGES = ('detect', 'recall', 'plan', 'regulate', 'execute', 'learn')
+
+    def __init__(self, system: "LuxbinImmuneSystem", batch_size: int = 256,
+                 concurrency: Optional[Dict[str, int]] = None, queue_size: int = 1024,
+                 max_in_flight: int = 4096):
+        self.system = system
+        self.batch_size = batch_size
+        self.concurrency = {
+            'detect': max(1, system.executor.workers),
+            'recall': 1, 'plan': 4, 'regulate': 4, 'execute': 4, 'learn': 1
+        }
+        self.concurrency.update(concurrency or {})
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram()
+                                                       for stage in self.STAGES + ('total',)}
+        self.processed = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Latency per stage call (detect: per batch) and end to end ('total')"""
+        return {
+            'processed': self.processed,
+            'concurrency': dict(self.concurrency),
+            'latency': {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+        }
+
+    async def _timed(self, stage: str, coroutine):
+        start = time.perf_counter()
+        try:
+            return await coroutine
+        finally:
+            self.histograms[stage].record(time.perf_counter() - start)
+
+    # ===== STAGES =====
+
+    async def _detect(self, items: List[_StreamItem]) -> List[Optional[str]]:
+        detections = await self._timed('detect', self.system._scan_batch([item.transaction for item in items]))
+        for item, threat in zip(items, detections):
+            item.threat = threat
+        return ['recall' if item.threat else None for item in items]
+
+    async def _recall(self, item: _StreamItem) -> Optional[str]:
+        item.known_threat = await self._timed('recall', self.system._memory_recall_phase(item.threat))
+        return 'plan'
+
+    async def _plan(self, item: _StreamItem) -> Optional[str]:
+        item.response = await self._timed('plan', self.system._response_planning_phase(item.threat, item.known_threat))
+        return 'regulate'
+
+    async def _regulate(self, item: _StreamItem) -> Optional[str]:
+        item.approved = await self._timed('regulate', self.system._regulatory_phase(item.threat, item.response))
+        return 'execute' if item.approved['approved'] else None
+
+    async def _execute(self, item: _StreamItem) -> Optional[str]:
+        item.result = await self._timed('execute', self.system._defense_execution_phase(item.approved))
+        return 'learn'
+
+    async def _learn(self, item: _StreamItem) -> Optional[str]:
+        await self._timed('learn', self.system._learning_phase(item.threat, item.result))
+        return None
+
+    # ===== RUNNING =====
+
+    async def run(self, transactions: Union[Iterable[Dict], AsyncIterable[Dict]]
+                  ) -> AsyncIterator[Tuple[Dict, Optional[Dict]]]:
+        """Yield (transaction, defense result or None) in input order"""
+        queues = {stage: asyncio.Queue(self.queue_size) for stage in self.STAGES}
+        finished: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        handlers = {'recall': self._recall, 'plan': self._plan, 'regulate': self._regulate,
+                    'execute': self._execute, 'learn': self._learn}
+
+        async def route(item: _StreamItem, stage: Optional[str]):
+            if stage is None:
+                finished.put_nowait(item)
+            else:
+                await queues[stage].put(item)
+
+        async def feed():
+            seq = 0
+
+            async def intake(transaction):
+                nonlocal seq
+                await slots.acquire()
+                await queues['detect'].put(_StreamItem(seq, transaction, time.perf_counter()))
+                seq += 1
+
+            if hasattr(transactions, '__aiter__'):
+                async for transaction in transactions:
+                    await intake(transaction)
+            else:
+                for transaction in transactions:
+                    await intake(transaction)
+            finished.put_nowait((_DONE, seq))
+
+        async def detect_worker():
+            queue = queues['detect']
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < self.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                for item, stage in zip(batch, await self._detect(batch)):
+                    await route(item, stage)
+
+        async def stage_worker(stage: str):
+            queue = queues[stage]
+            while True:
+                item = await queue.get()
+                await route(item, await handlers[stage](item))
+
+        async def supervised(coroutine):
+            # Failures are handed to the consumer through the results queue
+            try:
+                await coroutine
+            except Exception as e:
+                finished.put_nowait(e)
+
+        workers = [asyncio.create_task(supervised(feed()))]
+        workers += [asyncio.create_task(supervised(detect_worker())) for _ in range(self.concurrency['detect'])]
+        for stage in handlers:
+            workers += [asyncio.create_task(supervised(stage_worker(stage))) for _ in range(self.concurrency[stage])]
+
+        # Release results in order
+        ready: Dict[int, _StreamItem] = {}
+        next_seq, total = 0, None
+        try:
+            while total is None or next_seq < total:
+                finished_item = await finished.get()
+                if isinstance(finished_item, Exception):
+                    raise finished_item
+                if isinstance(finished_item, tuple):
+                    total = finished_item[1]
+                    continue
+                ready[finished_item.seq] = finished_item
+                while next_seq in ready:
+                    item = ready.pop(next_seq)
+                    if item.threat:
+                        self.system.threat_log.append(item.threat)
+                    self.histograms['total'].record(time.perf_counter() - item.received)
+                    self.processed += 1
+                    next_seq += 1
+                    slots.release()
+                    yield item.transaction, item.result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
 class LuxbinImmuneSystem:
     """Main immune system orchestrator"""
 
-    def __init__(self, num_detectors=100, num_memory=10, num_regulatory=5):
+    def __init__(self, num_detectors=100, num_memory=10, num_regulatory=5,
+                 scan_backend: str = 'numpy', seed: Optional[int] = None,
+                 executor: Union[str, DetectionExecutor] = 'inline', workers: Optional[int] = None):
+        """
+        Args:
+            scan_backend: 'numpy' (batched sampling) or 'cirq' (circuit simulation)
+            seed: Seed for detector sampling and scans
+            executor: Where detector scans run: 'inline', 'thread', 'process'
+                (a pool of ``workers`` processes) or a DetectionExecutor
+        """
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
         self.detector_cells = [DetectorCell(f"detector_{i}") for i in range(num_detectors)]
         self.defender_cells = []
-        self.memory_cells = [MemoryCell(f"memory_{i}") for i in range(num_memory)]
+        self.memory_store = ThreatMemoryStore()
+        self.memory_cells = [MemoryCell(f"memory_{i}", self.memory_store) for i in range(num_memory)]
         self.regulatory_cells = [RegulatoryCell(f"regulatory_{i}") for i in range(num_regulatory)]
 
+        if isinstance(executor, str):
+            if executor not in DETECTION_EXECUTORS:
+                raise ValueError(f"Unknown detection executor: {executor} (choose from {list(DETECTION_EXECUTORS)})")
+            options = {'workers': workers} if executor == 'process' else {}
+            executor = DETECTION_EXECUTORS[executor](self.detector_cells, scan_backend, seed=seed, **options)
+        self.executor = executor
+
         self.threat_log = []
         self.response_log = []
+        self.pipeline: Optional[ImmunePipeline] = None
+
+    def close(self):
+        """Stop detection workers"""
+        self.executor.close()
 
     async def monitor_transaction(self, transaction: Dict) -> Optional[Dict]:
         """Process single transaction through immune system"""
@@ -448,6 +1076,23 @@ class LuxbinImmuneSystem:
         if not threat_detected:
             return None
 
+        return await self._respond(threat_detected)
+
+    async def monitor_stream(self, transactions: Union[Iterable[Dict], AsyncIterable[Dict]],
+                             batch_size: int = 256, concurrency: Optional[Dict[str, int]] = None,
+                             queue_size: int = 1024) -> AsyncIterator[Tuple[Dict, Optional[Dict]]]:
+        """Process a (async) stream of transactions, yielding (transaction, defense result or None) in order
+
+        Runs the phases as a staged pipeline (see ImmunePipeline); per-stage
+        latency histograms are on ``self.pipeline`` while and after it runs.
+        """
+        self.pipeline = ImmunePipeline(self, batch_size, concurrency, queue_size)
+        async for transaction, result in self.pipeline.run(transactions):
+            yield transaction, result
+
+    async def _respond(self, threat_detected: ThreatData) -> Optional[Dict]:
+        """Phases 2-6 for a detected threat"""
+
         # Phase 2: Memory Recall
         known_threat = await self._memory_recall_phase(threat_detected)
 
@@ -470,54 +1115,51 @@ class LuxbinImmuneSystem:
 
     async def _detection_phase(self, transaction: Dict) -> Optional[ThreatData]:
         """Parallel quantum scanning by detector cells"""
+        return (await self.detect_batch([transaction]))[0]
 
-        # Sample subset of detectors
-        active_detectors = random.sample(self.detector_cells, min(50, len(self.detector_cells)))
-
-        # Parallel scanning
-        detection_tasks = [
-            asyncio.create_task(asyncio.to_thread(detector.quantum_scan, transaction))
-            for detector in active_detectors
-        ]
-
-        detection_results = await asyncio.gather(*detection_tasks)
+    async def detect_batch(self, transactions: List[Dict]) -> List[Optional[ThreatData]]:
+        """Detection phase for many transactions in one executor call"""
+        detections = await self._scan_batch(transactions)
+        self.threat_log.extend(d for d in detections if d)
+        return detections
 
-        # Count votes
-        threat_votes = sum(1 for is_threat, _ in detection_results if is_threat)
-        threat_scores = [score for _, score in detection_results]
-        avg_threat_score = sum(threat_scores) / len(threat_scores)
-
-        consensus_threshold = len(active_detectors) * 0.6  # 60% must agree
+    async def _scan_batch(self, transactions: List[Dict]) -> List[Optional[ThreatData]]:
+        if not transactions:
+            return []
 
-        if threat_votes >= consensus_threshold:
-            threat_data = ThreatData(
-                transaction_hash=transaction.get('hash', 'unknown'),
-                timestamp=time.time(),
-                threat_score=avg_threat_score,
-                features=transaction.get('features', {}),
-                is_threat=True
-            )
+        # Sample subset of detectors per transaction
+        sample_size = min(50, len(self.detector_cells))
+        keys = self.rng.random((len(transactions), len(self.detector_cells)))
+        samples = np.argsort(keys, axis=1)[:, :sample_size]
 
-            self.threat_log.append(threat_data)
-            return threat_data
+        votes, scores = await self.executor.scan(transactions, samples)
 
-        return None
+        # Count votes
+        threat_votes = votes.sum(axis=1)
+        avg_threat_scores = scores.mean(axis=1)
+        consensus_threshold = sample_size * 0.6  # 60% must agree
+
+        detections = []
+        for tx, tx_votes, avg_threat_score in zip(transactions, threat_votes, avg_threat_scores):
+            if tx_votes >= consensus_threshold:
+                threat_data = ThreatData(
+                    transaction_hash=tx.get('hash', 'unknown'),
+                    timestamp=time.time(),
+                    threat_score=float(avg_threat_score),
+                    features=tx.get('features', {}),
+                    is_threat=True
+                )
+                detections.append(threat_data)
+            else:
+                detections.append(None)
+        return detections
 
     async def _memory_recall_phase(self, threat: ThreatData) -> Optional[Dict]:
         """Check if threat matches known pattern"""
-        recall_tasks = [
-            asyncio.create_task(asyncio.to_thread(memory.recall_threat, threat))
-            for memory in self.memory_cells
-        ]
-
-        recall_results = await asyncio.gather(*recall_tasks)
-
-        # Return strongest matching memory
-        matches = [r for r in recall_results if r is not None]
-        if matches:
-            return max(matches, key=lambda x: x.get('effectiveness', 0))
-
-        return None
+        # Memory cells share one store: a single indexed lookup answers for all of them
+        if not self.memory_cells:
+            return None
+        return await asyncio.to_thread(self.memory_cells[0].recall_threat, threat)
 
     async def _response_planning_phase(self, threat: ThreatData, known_threat: Optional[Dict]) -> Dict:
         """Generate appropriate countermeasure"""
@@ -553,7 +1195,7 @@ class LuxbinImmuneSystem:
         """Prevent auto-immune reactions"""
 
         # Sample regulatory cells
-        active_regulators = random.sample(self.regulatory_cells, min(3, len(self.regulatory_cells)))
+        active_regulators = self.random.sample(self.regulatory_cells, min(3, len(self.regulatory_cells)))
 
         threat_dict = {
             'confidence_score': threat.threat_score,
@@ -607,17 +1249,9 @@ class LuxbinImmuneSystem:
         # Measure effectiveness (simplified)
         effectiveness = 0.8 if response_result.get('action') in ['QUARANTINE', 'RESTRICT'] else 0.5
 
-        # Store in all memory cells
-        storage_tasks = [
-            asyncio.create_task(asyncio.to_thread(
-                memory.store_threat_pattern,
-                threat,
-                effectiveness
-            ))
-            for memory in self.memory_cells
-        ]
-
-        await asyncio.gather(*storage_tasks)
+        # Store once in the memory cells' shared store
+        if self.memory_cells:
+            await asyncio.to_thread(self.memory_cells[0].store_threat_pattern, threat, effectiveness)
 
 
 # Example usage and testing
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Immune stream pipeline test and benchmark
+
+Feeds simulated mirror blocks (an async iterator of transactions arriving at
+a fixed block interval) through LuxbinImmuneSystem.monitor_stream and checks
+results come out once, in order, with the same detections and responses as
+running monitor_transaction one by one; that intake stops while the consumer
+is slow; and that source errors surface. Reports throughput against the
+sequential path, block lag at the ingest rate and per-stage latency
+histograms.
+
+Usage: python3 test_immune_pipeline.py [--blocks 20] [--block-size 200] [--block-time 0.25]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from luxbin_immune_system import SCAN_FEATURES, ImmunePipeline, LuxbinImmuneSystem
+from test_quantum_scan_engine import make_transaction
+
+
+def make_system(seed: int) -> LuxbinImmuneSystem:
+    system = LuxbinImmuneSystem(num_detectors=100, num_memory=3, seed=seed)
+    # The stock ahimsa rules veto every planned response (severity 9-10 without a
+    # redemption path); relax them here so execution and learning run too
+    for regulator in system.regulatory_cells:
+        regulator._check_ahimsa_violations = lambda response: []
+    return system
+
+
+def make_blocks(rng: random.Random, blocks: int, block_size: int):
+    chain = []
+    for _ in range(blocks):
+        block = [make_transaction(rng) for _ in range(block_size)]
+        for tx in rng.sample(block, max(1, block_size // 40)):
+            tx.update({name: 150.0 for name in SCAN_FEATURES})
+        chain.append(block)
+    # One attacker comes back in later blocks (recalled from memory)
+    chain[0][0].update({name: 150.0 for name in SCAN_FEATURES})
+    for block in chain[len(chain) // 2:]:
+        block[0] = dict(chain[0][0], hash='0x%064x' % rng.getrandbits(256))
+    return chain
+
+
+async def mirror_feed(blocks, block_time: float, arrivals: list):
+    """Blocks arriving every ``block_time`` seconds, as an async stream of transactions"""
+    for block in blocks:
+        arrivals.append(time.perf_counter())
+        for tx in block:
+            yield tx
+        await asyncio.sleep(block_time)
+
+
+async def run_sequential(system, transactions):
+    return [(tx, await system.monitor_transaction(tx)) for tx in transactions]
+
+
+async def run_stream(system, source, **options):
+    return [(tx, result) async for tx, result in system.monitor_stream(source, **options)]
+
+
+def outcome(results):
+    return [(tx['hash'], result and result['action']) for tx, result in results]
+
+
+async def check_backpressure(rng):
+    system = make_system(1)
+    pulled = 0
+
+    async def source():
+        nonlocal pulled
+        for _ in range(5000):
+            pulled += 1
+            yield make_transaction(rng)
+
+    pipeline = ImmunePipeline(system, batch_size=16, queue_size=8, max_in_flight=64)
+    consumed = 0
+    async for _ in pipeline.run(source()):
+        consumed += 1
+        if consumed % 500 == 0:
+            await asyncio.sleep(0.05)  # Slow consumer: the pipeline fills up and stops reading
+            assert pulled - consumed <= 64 + 1, (pulled, consumed)
+    assert consumed == pulled == 5000
+
+
+async def check_source_error(rng):
+    async def broken():
+        for _ in range(10):
+            yield make_transaction(rng)
+        raise ConnectionError("mirror went away")
+
+    try:
+        await run_stream(make_system(1), broken())
+    except ConnectionError:
+        return
+    raise AssertionError("source error was swallowed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Immune stream pipeline test and benchmark")
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--block-size", type=int, default=200)
+    parser.add_argument("--block-time", type=float, default=0.25)
+    args = parser.parse_args()
+
+    print("🧪 Immune stream pipeline test")
+    print("=" * 70)
+
+    rng = random.Random(3)
+    blocks = make_blocks(rng, args.blocks, args.block_size)
+    transactions = [tx for block in blocks for tx in block]
+
+    start = time.perf_counter()
+    sequential = asyncio.run(run_sequential(make_system(7), transactions))
+    sequential_time = time.perf_counter() - start
+
+    system = make_system(7)
+    start = time.perf_counter()
+    streamed = asyncio.run(run_stream(system, transactions, batch_size=256))
+    stream_time = time.perf_counter() - start
+
+    assert [tx['hash'] for tx, _ in streamed] == [tx['hash'] for tx in transactions]
+    assert outcome(streamed) == outcome(sequential)
+    assert [t.transaction_hash for t in system.threat_log] == [h for h, action in outcome(streamed) if action]
+    assert len(system.memory_store) >= 1 and system.pipeline.processed == len(transactions)
+    print(f"✅ {len(transactions):,} transactions out once, in order, with the sequential path's "
+          f"{sum(1 for _, r in streamed if r)} responses")
+
+    asyncio.run(check_backpressure(rng))
+    print("✅ a slow consumer stops intake (bounded in-flight window)")
+    asyncio.run(check_source_error(rng))
+    print("✅ source errors propagate to the consumer")
+
+    # At ingest rate: how far behind each block's arrival its last result comes out
+    system = make_system(7)
+    arrivals, lags = [], []
+
+    async def scan_at_ingest_rate():
+        count = 0
+        async for _ in system.monitor_stream(mirror_feed(blocks, args.block_time, arrivals)):
+            count += 1
+            if count % args.block_size == 0:
+                lags.append(time.perf_counter() - arrivals[count // args.block_size - 1])
+
+    asyncio.run(scan_at_ingest_rate())
+    assert len(lags) == args.blocks
+
+    print("=" * 70)
+    print(f"  sequential monitor_transaction: {len(transactions) / sequential_time:10.0f} tx/sec")
+    print(f"  monitor_stream pipeline:        {len(transactions) / stream_time:10.0f} tx/sec")
+    print(f"  ingest {args.block_size} tx every {args.block_time}s: block scanned within "
+          f"{max(lags) * 1000:.1f}ms of arrival (worst), {sum(lags) / len(lags) * 1000:.1f}ms avg")
+    print(f"  {'stage':<9} {'count':>7} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}  (ms)")
+    for stage, summary in system.pipeline.get_stats()['latency'].items():
+        print(f"  {stage:<9} {summary['count']:>7} {summary['mean_ms']:>9.3f} {summary['p50_ms']:>9.3f} "
+              f"{summary['p99_ms']:>9.3f} {summary['max_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Quantum scan engine test and benchmark
+
+Checks the vectorized detector scan against the closed-form qubit
+probabilities and against Cirq circuit simulation (when cirq is installed),
+checks seeded runs repeat, and compares detection throughput in tx/sec:
+50 Cirq scans per transaction (the previous detection phase) vs one batched
+NumPy scan.
+
+Usage: python3 test_quantum_scan_engine.py [--transactions 20000]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from luxbin_immune_system import (CIRQ_AVAILABLE, SCAN_FEATURES, SCAN_QUBITS, DetectorCell,
+                                  LuxbinImmuneSystem, QuantumScanEngine)
+
+
+def make_transaction(rng: random.Random, hot: bool = False):
+    # Features above 100 rotate past pi, where qubits lean towards 1 (the only way to score > 0.5)
+    low, high = (120, 180) if hot else (0, 100)
+    return {'hash': '0x%064x' % rng.getrandbits(256),
+            **{name: rng.uniform(low, high) for name in SCAN_FEATURES}}
+
+
+def expected_moments(engine: QuantumScanEngine, tx):
+    """Exact mean and standard deviation of one detector's threat score"""
+    p = engine.one_probabilities(engine.encode([tx]))[0]
+    n = engine.repetitions * SCAN_QUBITS
+    return p.mean(), np.sqrt((engine.repetitions * p * (1 - p)).sum()) / n
+
+
+def check_distribution(engine: QuantumScanEngine, tx, scans: int, label: str):
+    detectors = [DetectorCell(f"detector_{i}") for i in range(scans)]
+    _, scores = engine.scan_batch([tx], detectors)
+    mean, std = expected_moments(engine, tx)
+    observed = scores[0]
+    # Sample mean within 5 standard errors, sample std within 20%
+    assert abs(observed.mean() - mean) < 5 * std / np.sqrt(scans) + 1e-9, (label, observed.mean(), mean)
+    assert abs(observed.std() - std) < 0.2 * std + 1e-6, (label, observed.std(), std)
+    return observed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantum scan engine test and benchmark")
+    parser.add_argument("--transactions", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"🧪 Quantum scan engine test (cirq {'available' if CIRQ_AVAILABLE else 'not installed'})")
+    print("=" * 70)
+
+    rng = random.Random(7)
+    samples = [make_transaction(rng) for _ in range(4)] + [make_transaction(rng, hot=True) for _ in range(2)]
+    samples.append({name: 0 for name in SCAN_FEATURES})  # All qubits at p = 0.5
+
+    # Closed form matches the circuit: Ry(angle) then H reads 1 with (1 - sin(angle)) / 2
+    if CIRQ_AVAILABLE:
+        import cirq
+        for angle in (0.0, 0.7, np.pi / 2, 2.5, 4.0):
+            qubit = cirq.LineQubit(0)
+            state = cirq.final_state_vector(cirq.Circuit(cirq.Ry(rads=angle)(qubit), cirq.H(qubit)))
+            assert abs(abs(state[1]) ** 2 - QuantumScanEngine.one_probabilities(np.array(angle))) < 1e-6
+        print("✅ closed-form qubit probabilities match the circuit's state vector")
+
+    # Score distributions agree with the exact moments, for both backends
+    numpy_engine = QuantumScanEngine(seed=1)
+    for tx in samples:
+        check_distribution(numpy_engine, tx, 5000, 'numpy')
+    if CIRQ_AVAILABLE:
+        cirq_engine = QuantumScanEngine('cirq', seed=1)
+        for tx in samples[:3] + samples[-3:]:
+            circuit_scores = check_distribution(cirq_engine, tx, 200, 'cirq')
+            batched_scores = check_distribution(numpy_engine, tx, 200, 'numpy')
+            mean, std = expected_moments(numpy_engine, tx)
+            assert abs(circuit_scores.mean() - batched_scores.mean()) < 5 * std * np.sqrt(2 / 200)
+        print("✅ numpy and cirq score distributions agree with the exact moments")
+    else:
+        print("✅ numpy score distributions agree with the exact moments")
+
+    # Seeded engines repeat; thresholds are per detector
+    detectors = [DetectorCell(f"detector_{i}") for i in range(10)]
+    detectors[0].threat_threshold = 0.0
+    a = QuantumScanEngine(seed=42).scan_batch(samples, detectors)
+    b = QuantumScanEngine(seed=42).scan_batch(samples, detectors)
+    assert np.array_equal(a[1], b[1]) and a[1].shape == (len(samples), 10)
+    assert a[0][:, 0].all() and np.array_equal(a[0], a[1] > 0.75 * (np.arange(10) > 0))
+    print("✅ seeded scans repeat; per-detector thresholds respected")
+
+    # Detection phase: hot transactions reach consensus, ordinary ones don't
+    system = LuxbinImmuneSystem(num_detectors=100, seed=3)
+    batch = [make_transaction(rng) for _ in range(50)] + [make_transaction(rng, hot=True) for _ in range(50)]
+    detections = asyncio.run(system.detect_batch(batch))
+    assert [d is not None for d in detections] == [False] * 50 + [True] * 50
+    assert detections[-1].transaction_hash == batch[-1]['hash'] and len(system.threat_log) == 50
+    seeded = [d and d.threat_score for d in asyncio.run(LuxbinImmuneSystem(num_detectors=100, seed=3).detect_batch(batch))]
+    assert seeded == [d and d.threat_score for d in detections]
+    print("✅ batched detection phase flags exactly the hot transactions, reproducibly")
+
+    # Throughput
+    transactions = [make_transaction(rng, hot=i % 10 == 0) for i in range(args.transactions)]
+    start = time.perf_counter()
+    asyncio.run(system.detect_batch(transactions))
+    batched_rate = len(transactions) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for tx in transactions[:200]:
+        asyncio.run(system._detection_phase(tx))
+    single_rate = 200 / (time.perf_counter() - start)
+
+    cirq_rate = None
+    if CIRQ_AVAILABLE:
+        cirq_system = LuxbinImmuneSystem(num_detectors=100, scan_backend='cirq', seed=3)
+        start = time.perf_counter()
+        for tx in transactions[:3]:
+            asyncio.run(cirq_system._detection_phase(tx))
+        cirq_rate = 3 / (time.perf_counter() - start)
+
+    print("=" * 70)
+    print(f"  detection, 50 detectors/tx, cirq circuits:   {cirq_rate or float('nan'):10.2f} tx/sec")
+    print(f"  detection, numpy, one tx per call:           {single_rate:10.1f} tx/sec")
+    print(f"  detection, numpy, {len(transactions):,} tx per call:   {batched_rate:10.0f} tx/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Threat memory store test and benchmark
+
+Checks Merkle accumulator proofs at every size, vectorized nearest-pattern
+recall against a brute-force reference, that recall on one thread while
+another learns loses no rows, and that memory cells share one store. Times learning and recall at growing memory sizes against the
+previous per-cell dict (linear hex-Hamming scan, full Merkle rebuild per
+insert).
+
+Usage: python3 test_threat_memory_store.py [--patterns 20000]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from luxbin_immune_system import (SCAN_FEATURES, LuxbinImmuneSystem, MemoryCell, MerkleAccumulator,
+                                  ThreatData, ThreatMemoryStore)
+
+
+def make_threat(rng: random.Random, features=None) -> ThreatData:
+    features = features or {name: round(rng.uniform(0, 100), 2) for name in SCAN_FEATURES}
+    return ThreatData(transaction_hash='0x%064x' % rng.getrandbits(256), timestamp=time.time(),
+                      threat_score=0.9, features=features, is_threat=True)
+
+
+def reference_similarity(a, b):
+    names = set(a) | set(b)
+    difference = sum(abs(a.get(name, 0.0) - b.get(name, 0.0)) for name in names)
+    return max(0.0, 1.0 - difference / (100.0 * len(names)))
+
+
+class LegacyMemoryCell:
+    """The previous MemoryCell storage and recall, minus the quantum fingerprint"""
+
+    def __init__(self):
+        self.memory_storage = {}
+        self.merkle_root = None
+
+    def store_threat_pattern(self, threat_data, effectiveness):
+        signature = ThreatMemoryStore.signature(threat_data.features)
+        self.memory_storage[signature] = {'effectiveness_history': [effectiveness], 'occurrence_count': 1}
+        self.merkle_root = self._build_merkle(sorted(self.memory_storage.keys()))
+
+    def recall_threat(self, threat_data):
+        signature = ThreatMemoryStore.signature(threat_data.features)
+        if signature in self.memory_storage:
+            return self.memory_storage[signature]
+        for stored_sig, memory in self.memory_storage.items():
+            diff_count = sum(c1 != c2 for c1, c2 in zip(signature, stored_sig))
+            if 1.0 - diff_count / len(signature) > 0.85:
+                return memory
+        return None
+
+    def _build_merkle(self, items):
+        if len(items) == 1:
+            return items[0]
+        if len(items) % 2 == 1:
+            items.append(items[-1])
+        return self._build_merkle([hashlib.sha256((items[i] + items[i + 1]).encode()).hexdigest()
+                                   for i in range(0, len(items), 2)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Threat memory store test and benchmark")
+    parser.add_argument("--patterns", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print("🧪 Threat memory store test")
+    print("=" * 70)
+
+    # Every leaf's proof verifies at every size; tampering is caught
+    accumulator = MerkleAccumulator()
+    roots = [accumulator.root()]
+    for n in range(1, 130):
+        accumulator.append(f"leaf-{n - 1}")
+        root = accumulator.root()
+        assert root not in roots
+        roots.append(root)
+        for i in range(n):
+            assert MerkleAccumulator.verify(f"leaf-{i}", accumulator.proof(i), root), (n, i)
+    proof = accumulator.proof(77)
+    assert not MerkleAccumulator.verify("leaf-78", proof, accumulator.root())
+    assert not MerkleAccumulator.verify("leaf-77", proof, roots[-2])
+    assert len(proof['siblings']) <= 7 and len(proof['peaks']) <= 8
+    print("✅ Merkle accumulator proofs verify for every leaf at sizes 1-129")
+
+    # Vectorized similarity matches a brute-force reference, including missing features
+    rng = random.Random(11)
+    store = ThreatMemoryStore()
+    stored = []
+    for i in range(300):
+        features = {name: round(rng.uniform(0, 100), 2) for name in rng.sample(SCAN_FEATURES, rng.randint(5, 8))}
+        if i % 50 == 0:
+            features['bridge_exploit'] = rng.uniform(0, 100)  # Columns added as new features appear
+        store.add(ThreatMemoryStore.signature(features), features, {'features': features})
+        stored.append(features)
+    for _ in range(50):
+        query = {name: round(rng.uniform(0, 100), 2) for name in rng.sample(SCAN_FEATURES, 7)}
+        if rng.random() < 0.3:
+            query['never_seen'] = 40.0
+        similarities = store.similarities(query)
+        expected = [reference_similarity(query, features) for features in stored]
+        assert max(abs(a - b) for a, b in zip(similarities, expected)) < 1e-9
+        memory, best = store.nearest(query)
+        assert abs(best - max(expected)) < 1e-9 and memory['features'] == stored[expected.index(max(expected))]
+    print("✅ vectorized similarity matches the brute-force reference")
+
+    # Recall and learn run on different threads in the pipeline: growth must not drop rows
+    store = ThreatMemoryStore(initial_capacity=1)
+    learned = []
+    done = threading.Event()
+
+    def recall_loop(seed):
+        reader_rng = random.Random(seed)
+        while not done.is_set():
+            store.nearest({name: reader_rng.uniform(0, 100) for name in reader_rng.sample(SCAN_FEATURES, 4)})
+
+    readers = [threading.Thread(target=recall_loop, args=(seed,)) for seed in range(3)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for reader in readers:
+            reader.start()
+        for i in range(2000):
+            features = {name: round(rng.uniform(1, 100), 2) for name in rng.sample(SCAN_FEATURES, 6)}
+            features[f"feature_{i // 100}"] = 50.0  # New columns keep widening the matrix
+            store.add(ThreatMemoryStore.signature(features), features, {'features': features})
+            learned.append(features)
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+        sys.setswitchinterval(switch_interval)
+    assert len(store) == len(learned)
+    for row in range(0, len(learned), 7):
+        assert store.similarities(learned[row])[row] == 1.0, row
+    print("✅ recall on other threads while learning loses no stored rows")
+
+    # Memory cells share one store; evolved threats (small drift) are recalled
+    system = LuxbinImmuneSystem(num_detectors=10, num_memory=10, seed=1)
+    threat = make_threat(rng)
+    asyncio.run(system._learning_phase(threat, {'action': 'RESTRICT'}))
+    assert all(len(cell.memory_storage) == 1 for cell in system.memory_cells)
+    assert len({cell.merkle_root for cell in system.memory_cells}) == 1
+    evolved = make_threat(rng, {k: v + rng.uniform(-5, 5) for k, v in threat.features.items()})
+    different = make_threat(rng)
+    assert asyncio.run(system._memory_recall_phase(evolved))['is_repeat_offender']
+    assert asyncio.run(system._memory_recall_phase(different)) is None
+    known = asyncio.run(system._memory_recall_phase(threat))
+    memory = system.memory_store.memories[ThreatMemoryStore.signature(threat.features)]
+    assert known['response_type'] == 'restrict' and memory['occurrence_count'] == 2
+    assert MerkleAccumulator.verify(memory['signature'], system.memory_store.proof(memory['signature']),
+                                    system.memory_cells[3].merkle_root)
+    print("✅ memory cells share one store; drifted threats are recalled, new ones are not")
+
+    # Benchmark: learning and recall as memory grows
+    print("=" * 70)
+    MemoryCell._quantum_encode = lambda self, threat_data: None  # Same work as the legacy cell
+    threats = [make_threat(rng) for _ in range(args.patterns)]
+    probes = [make_threat(rng) for _ in range(200)]
+    cell, legacy = MemoryCell("memory_0"), LegacyMemoryCell()
+    checkpoints = sorted({min(args.patterns, n) for n in (1000, 5000, args.patterns)})
+    stored_count, store_time, legacy_store_time = 0, 0.0, 0.0
+    print(f"  {'patterns':>9} {'store/insert':>14} {'legacy':>12} {'recall':>12} {'legacy':>12}")
+    for checkpoint in checkpoints:
+        batch = threats[stored_count:checkpoint]
+        start = time.perf_counter()
+        for threat in batch:
+            cell.store_threat_pattern(threat, 0.8)
+        store_time = (time.perf_counter() - start) / len(batch)
+        # The legacy rebuild is O(n) per insert: time the last 50 inserts only
+        for threat in batch[:-50]:
+            legacy.memory_storage[ThreatMemoryStore.signature(threat.features)] = {}
+        start = time.perf_counter()
+        for threat in batch[-50:]:
+            legacy.store_threat_pattern(threat, 0.8)
+        legacy_store_time = (time.perf_counter() - start) / 50
+        stored_count = checkpoint
+
+        start = time.perf_counter()
+        for probe in probes:
+            cell.recall_threat(probe)
+        recall_time = (time.perf_counter() - start) / len(probes)
+        start = time.perf_counter()
+        for probe in probes[:20]:
+            legacy.recall_threat(probe)
+        legacy_recall_time = (time.perf_counter() - start) / 20
+        print(f"  {checkpoint:>9,} {store_time * 1e6:>12.1f}µs {legacy_store_time * 1e3:>10.2f}ms "
+              f"{recall_time * 1e6:>10.1f}µs {legacy_recall_time * 1e3:>10.2f}ms")
+    print("  (legacy recall ran per memory cell: x10 with the default 10 cells)")
+
+
+if __name__ == "__main__":
+    main()